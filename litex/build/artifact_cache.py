@@ -0,0 +1,135 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import io
+import os
+import json
+import tarfile
+import tempfile
+
+
+# LiteX Artifact Cache -----------------------------------------------------------------------------
+
+# Build outputs (bitstream, reports, exports, BIOS...) are stored as a tar.gz archive named after the
+# digest of the build inputs (see GenericToolchain inputs manifest) and restored on a hit so that the
+# vendor toolchain run can be skipped entirely.
+
+_ARTIFACTS_INDEX = "artifacts.json"
+
+
+def _pack_artifacts(artifacts):
+    index = sorted(artifacts.keys())
+    data  = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:gz") as archive:
+        index_bytes = json.dumps(index, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(_ARTIFACTS_INDEX)
+        info.size = len(index_bytes)
+        archive.addfile(info, fileobj=io.BytesIO(index_bytes))
+        for name in index:
+            archive.add(artifacts[name], arcname=f"files/{name}", recursive=False)
+    return data.getvalue()
+
+
+def _unpack_artifacts(data, destinations):
+    restored = {}
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+        index = json.load(archive.extractfile(_ARTIFACTS_INDEX))
+        for name in index:
+            dst = destinations(name)
+            if dst is None:
+                continue
+            src = archive.extractfile(f"files/{name}")
+            os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+            with open(dst, "wb") as f:
+                f.write(src.read())
+            restored[name] = dst
+    return restored
+
+
+class ArtifactCache:
+    """Base artifact cache, backends only have to provide raw `load`/`store` of archives."""
+    def load(self, digest):
+        raise NotImplementedError("ArtifactCache.load must be overloaded.")
+
+    def store(self, digest, data):
+        raise NotImplementedError("ArtifactCache.store must be overloaded.")
+
+    def get(self, digest, destinations):
+        """Restore artifacts of `digest`, `destinations(name)` returns the path to restore `name`
+        to (or None to skip it). Returns the {name: path} dict of restored files or None on miss."""
+        data = self.load(digest)
+        if data is None:
+            return None
+        return _unpack_artifacts(data, destinations)
+
+    def put(self, digest, artifacts):
+        """Store `artifacts` ({name: path}) under `digest`."""
+        self.store(digest, _pack_artifacts(artifacts))
+
+
+class LocalArtifactCache(ArtifactCache):
+    """Artifact cache stored in a local (or network mounted) directory."""
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def _archive_path(self, digest):
+        return os.path.join(self.path, digest[:2], digest + ".tar.gz")
+
+    def load(self, digest):
+        try:
+            with open(self._archive_path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, digest, data):
+        archive_path = self._archive_path(digest)
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        # Write to a temporary file and rename to never expose partial archives to other builds.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(archive_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, archive_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class HTTPArtifactCache(ArtifactCache):
+    """Artifact cache on a HTTP server: archives are fetched with GET and uploaded with PUT on
+    `<url>/<digest>.tar.gz`, which also matches S3-compatible object stores (public/pre-authorized
+    bucket URL or with authentication passed through `headers`)."""
+    def __init__(self, url, headers=None, timeout=60):
+        self.url     = url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+
+    def _archive_url(self, digest):
+        return f"{self.url}/{digest}.tar.gz"
+
+    def load(self, digest):
+        import requests
+        r = requests.get(self._archive_url(digest), headers=self.headers, timeout=self.timeout)
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.content
+
+    def store(self, digest, data):
+        import requests
+        r = requests.put(self._archive_url(digest), data=data, headers=self.headers, timeout=self.timeout)
+        r.raise_for_status()
+
+
+def get_artifact_cache(cache):
+    """Return an ArtifactCache from an ArtifactCache instance, a HTTP(S) URL or a directory path."""
+    if cache is None or isinstance(cache, ArtifactCache):
+        return cache
+    if cache.startswith(("http://", "https://")):
+        return HTTPArtifactCache(cache)
+    return LocalArtifactCache(cache)
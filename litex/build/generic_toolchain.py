@@ -6,11 +6,70 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
+import re
+import json
 import math
+import hashlib
 
 from migen.fhdl.structure import Signal, _Fragment
 
-from litex.gen import LiteXContext
+from litex.gen import LiteXContext, colorer
+
+from litex.build import tools
+from litex.build.bundle import _file_digest, _is_subpath
+from litex.build.artifact_cache import get_artifact_cache
+
+# Build Inputs Manifest ----------------------------------------------------------------------------
+
+# Generated files embed their generation date (LiteX banners/trailers: tools.generated_banner,
+# Verilog banner/trailer, Anlogic project), volatile strings (ex: build time of the SoC identifier,
+# see GenericToolchain.add_volatile_string), the build directory and the paths of the sources outside
+# of it; strip/normalize them so identical designs give identical digests (also across machines/
+# checkouts, allowing digests to key an artifact cache).
+_generation_date_re = re.compile(
+    rb"^(.*(?:Auto-[Gg]enerated by LiteX (?:\([^)]*\) )?on |// Date       : |<Project_Created_Time>))"
+    rb"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", re.MULTILINE)
+
+def _volatile_patterns(strings):
+    patterns = []
+    for string in strings:
+        data = string.encode("utf-8")
+        # As text and as 8-bit Memory init file (one hex byte per line, see fhdl.memory).
+        patterns.append(data)
+        patterns.append("".join(f"{c:02x}\n" for c in data).encode("utf-8"))
+    return patterns
+
+def _generated_file_digest(path, build_dir, volatile_patterns=[], external_paths={}):
+    with open(path, "rb") as f:
+        data = f.read()
+    data = _generation_date_re.sub(rb"\1", data)
+    for pattern in volatile_patterns:
+        data = data.replace(pattern, b"<volatile>")
+    data = data.replace(build_dir.encode("utf-8"), b"<build_dir>")
+    for external_path in sorted(external_paths, key=len, reverse=True):
+        data = data.replace(external_path.encode("utf-8"), external_paths[external_path].encode("utf-8"))
+    return hashlib.sha256(data).hexdigest()
+
+def _manifest_path(path, build_dir, external_paths={}):
+    # Relative to the build directory or to the normalized (content keyed) external sources paths.
+    path = os.path.abspath(path)
+    if _is_subpath(path, build_dir):
+        return os.path.relpath(path, build_dir).replace(os.sep, "/")
+    for external_path in sorted(external_paths, key=len, reverse=True):
+        if _is_subpath(path, external_path):
+            return external_paths[external_path] + path[len(external_path):].replace(os.sep, "/")
+    return path
+
+def _inputs_digest(toolchain, files):
+    h = hashlib.sha256()
+    h.update(toolchain.encode("utf-8"))
+    h.update(b"\0")
+    for path, digest in sorted(files.items()):
+        h.update(path.encode("utf-8"))
+        h.update(b"\0")
+        h.update(digest.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
 
 # Generic Toolchain --------------------------------------------------------------------------------
 
@@ -30,6 +89,9 @@ class GenericToolchain:
         self._vns        = None
         self._synth_opts = ""
 
+        # Strings changing on each build, excluded from the build inputs digest.
+        self.volatile_strings = []
+
         # Set Toolchain to LiteXContext.
         LiteXContext.toolchain = self
 
@@ -62,11 +124,14 @@ class GenericToolchain:
         return ("",{}) # empty since optional.
 
     def build(self, platform, fragment,
-        build_dir      = "build",
-        build_name     = "top",
-        synth_opts     = "",
-        run            = True,
-        build_backend  = "litex",
+        build_dir       = "build",
+        build_name      = "top",
+        synth_opts      = "",
+        run             = True,
+        build_backend   = "litex",
+        force_rebuild   = False,
+        artifact_cache  = None,
+        extra_artifacts = None,
         **kwargs):
 
         self._build_name = build_name
@@ -79,6 +144,7 @@ class GenericToolchain:
         os.makedirs(self._build_dir, exist_ok=True)
         cwd = os.getcwd()
         os.chdir(self._build_dir)
+        generated_files = tools.start_written_files_tracking()
         try:
             # Finalize Design.
             if not isinstance(self.fragment, _Fragment):
@@ -86,10 +152,11 @@ class GenericToolchain:
             platform.finalize(self.fragment)
 
             # Generate Verilog.
-            v_output = platform.get_verilog(self.fragment, name=build_name, **kwargs)
+            v_file   = build_name + ".v"
+            v_output = platform.get_verilog(self.fragment, name=build_name, output_file=v_file, **kwargs)
             self._vns = v_output.ns
-            v_file = build_name + ".v"
             v_output.write(v_file)
+            generated_files += [os.path.abspath(f) for f in [v_file, *v_output.data_files.keys()]]
 
             # Finalize toolchain (after gateware is complete)
             self.finalize()
@@ -121,9 +188,20 @@ class GenericToolchain:
                 # Generate build script.
                 script = self.build_script()
 
-                # Run.
+                # Run (skipped when inputs are unchanged since the last successful run).
                 if run:
-                    self.run_script(script)
+                    manifest = self._get_inputs_manifest(generated_files)
+                    if force_rebuild or not self._is_build_up_to_date(manifest):
+                        self._remove_inputs_manifest()
+                        cache = get_artifact_cache(artifact_cache)
+                        extra_artifacts = dict(extra_artifacts or {})
+                        if force_rebuild or not self._restore_artifacts(cache, manifest, extra_artifacts):
+                            self.run_script(script)
+                            self._store_artifacts(cache, manifest, generated_files, extra_artifacts)
+                        self._write_inputs_manifest(manifest)
+                    else:
+                        print(colorer("Gateware inputs unchanged since last build, skipping toolchain run "
+                            "(force_rebuild/--force-rebuild to override).", color="yellow"))
 
             # Edalize backend.
             else:
@@ -165,8 +243,135 @@ class GenericToolchain:
 
             return v_output.ns
         finally:
+            tools.stop_written_files_tracking(generated_files)
             os.chdir(cwd)
 
+    # Build Inputs Manifest ------------------------------------------------------------------------
+
+    def get_inputs_manifest_filename(self):
+        return self._build_name + ".inputs.json"
+
+    def get_bitstream_filename(self):
+        ext = self.platform.get_bitstream_extension("sram")
+        return None if ext is None else self._build_name + ext
+
+    def add_volatile_string(self, string):
+        """Exclude `string` (changing on each build, ex: build time) from the build inputs digest."""
+        if string not in self.volatile_strings:
+            self.volatile_strings.append(string)
+
+    def _get_inputs_manifest(self, generated_files):
+        build_dir = os.getcwd()
+        files     = {}
+        # Platform sources/includes. Outside of the build directory (ex: CPU cores from pythondata
+        # packages, LiteX sources), they are keyed by their contents instead of their location.
+        external = {}
+        for filename, *_ in self.platform.sources:
+            path = os.path.abspath(filename)
+            if os.path.isfile(path):
+                digest = _file_digest(path)
+                if not _is_subpath(path, build_dir):
+                    external[path] = f"<source>/{digest[:16]}/{os.path.basename(path)}"
+                files.setdefault(_manifest_path(path, build_dir, external), digest)
+        for include_path in self.platform.verilog_include_paths:
+            include_path  = os.path.abspath(include_path)
+            include_files = {}
+            for root, dirs, filenames in os.walk(include_path):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    path = os.path.join(root, filename)
+                    include_files[os.path.relpath(path, include_path).replace(os.sep, "/")] = _file_digest(path)
+            if not _is_subpath(include_path, build_dir):
+                external[include_path] = "<include>/" + _inputs_digest("include", include_files)[:16]
+            for name, digest in include_files.items():
+                files.setdefault(_manifest_path(os.path.join(include_path, name), build_dir, external), digest)
+        # Generated files (Verilog, constraints, project, scripts).
+        volatile = _volatile_patterns(self.volatile_strings)
+        for path in generated_files:
+            if os.path.isfile(path):
+                files[_manifest_path(path, build_dir, external)] = _generated_file_digest(path, build_dir, volatile, external)
+        toolchain = type(self).__module__ + "." + type(self).__qualname__
+        return {
+            "format"    : "litex-toolchain-inputs-v1",
+            "toolchain" : toolchain,
+            "digest"    : _inputs_digest(toolchain, files),
+            "files"     : files,
+        }
+
+    def _is_build_up_to_date(self, manifest):
+        bitstream = self.get_bitstream_filename()
+        if bitstream is None or not os.path.exists(bitstream):
+            return False
+        try:
+            with open(self.get_inputs_manifest_filename(), "r", encoding="utf-8") as f:
+                last_manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return last_manifest.get("digest") == manifest["digest"]
+
+    # Artifact Cache -------------------------------------------------------------------------------
+
+    def get_build_artifacts(self, generated_files):
+        """Return the {name: path} build outputs (bitstreams, reports...) to store in the artifact
+        cache: by default, files of the build directory prefixed with the build name that are not
+        toolchain inputs."""
+        excluded = set(generated_files) | {os.path.abspath(self.get_inputs_manifest_filename())}
+        artifacts = {}
+        for filename in sorted(os.listdir(".")):
+            path = os.path.abspath(filename)
+            if not os.path.isfile(path) or path in excluded:
+                continue
+            if filename.startswith(self._build_name):
+                artifacts[filename] = path
+        return artifacts
+
+    def _restore_artifacts(self, cache, manifest, extra_artifacts):
+        if cache is None:
+            return False
+        def destinations(name):
+            kind, _, filename = name.partition("/")
+            # Gateware artifacts are restored to the build directory.
+            if kind == "gateware" and filename == os.path.basename(filename) and filename not in ["", ".", ".."]:
+                return filename
+            # Extra artifacts are only restored when missing (never overwrite freshly generated files).
+            if kind == "extra" and filename in extra_artifacts and not os.path.exists(extra_artifacts[filename]):
+                return extra_artifacts[filename]
+            return None
+        try:
+            restored = cache.get(manifest["digest"], destinations)
+        except Exception as e:
+            print(colorer(f"Unable to read artifact cache ({e}), running toolchain.", color="red"))
+            return False
+        if restored is None:
+            return False
+        bitstream = self.get_bitstream_filename()
+        if bitstream is not None and not os.path.exists(bitstream):
+            return False
+        print(colorer(f"Gateware restored from artifact cache ({manifest['digest'][:12]}), skipping toolchain run.", color="yellow"))
+        return True
+
+    def _store_artifacts(self, cache, manifest, generated_files, extra_artifacts):
+        if cache is None:
+            return
+        artifacts = {f"gateware/{name}": path for name, path in self.get_build_artifacts(generated_files).items()}
+        for name, path in extra_artifacts.items():
+            if os.path.isfile(path):
+                artifacts[f"extra/{name}"] = path
+        try:
+            cache.put(manifest["digest"], artifacts)
+        except Exception as e:
+            print(colorer(f"Unable to store build artifacts to artifact cache ({e}).", color="red"))
+
+    def _remove_inputs_manifest(self):
+        # Invalidate the manifest before running so that a failed/interrupted run is never reused.
+        if os.path.exists(self.get_inputs_manifest_filename()):
+            os.remove(self.get_inputs_manifest_filename())
+
+    def _write_inputs_manifest(self, manifest):
+        with open(self.get_inputs_manifest_filename(), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+
     def add_period_constraint(self, platform, clk, period, keep=True, name=None):
         if clk is None:
             return
@@ -29,7 +29,21 @@ def language_by_filename(name):
     return None
 
 
+# Files written through write_to_file are recorded here while tracking is active (see
+# GenericToolchain.build which uses this to find the generated project/constraints/scripts files).
+_written_files_trackers = []
+
+def start_written_files_tracking():
+    files = []
+    _written_files_trackers.append(files)
+    return files
+
+def stop_written_files_tracking(files):
+    _written_files_trackers.remove(files)
+
 def write_to_file(filename, contents, force_unix=False):
+    for files in _written_files_trackers:
+        files.append(os.path.abspath(filename))
     newline = None
     if force_unix:
         newline = "\n"
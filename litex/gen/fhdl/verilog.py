@@ -13,7 +13,9 @@
 # This file is Copyright (c) 2018 Robin Ole Heinemann <robin.ole.heinemann@t-online.de>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import os
 import time
+import shutil
 import datetime
 import collections
 import re
@@ -761,6 +763,77 @@ def lower_complex_inout_slices(f):
                     setattr(obj, attr, expr)
     return f
 
+# ------------------------------------------------------------------------------------------------ #
+#                                         OUTPUT                                                   #
+# ------------------------------------------------------------------------------------------------ #
+
+class _VerilogWriter:
+    """Verilog source accumulator: sections are either collected (and joined once at the end) or,
+    when a filename is provided, streamed to the file as they are produced so that memory usage is
+    bounded by the largest section instead of the whole netlist."""
+    def __init__(self, filename=None):
+        self.filename = filename
+        self._parts   = []
+        self._file    = None
+
+    def __enter__(self):
+        if self.filename is not None:
+            self._file = open(self.filename, "w")
+        return self
+
+    def __exit__(self, *args):
+        if self._file is not None:
+            self._file.close()
+
+    def __iadd__(self, s):
+        if self._file is not None:
+            self._file.write(s)
+        else:
+            self._parts.append(s)
+        return self
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+
+class VerilogConvOutput(ConvOutput):
+    """ConvOutput whose main source can be streamed to a file during conversion (main_filename). In
+    this case, main_source is only read back from the file on access."""
+    def __init__(self):
+        self._main_source  = ""
+        self.main_filename = None
+        ConvOutput.__init__(self)
+
+    @property
+    def main_source(self):
+        if self.main_filename is not None:
+            with open(self.main_filename, "r") as f:
+                return f.read()
+        return self._main_source
+
+    @main_source.setter
+    def main_source(self, src):
+        self._main_source = src
+
+    def set_main_source(self, writer):
+        if isinstance(writer, _VerilogWriter):
+            if writer.filename is not None:
+                self.main_filename = os.path.abspath(writer.filename)
+                return
+            writer = writer.getvalue()
+        self.main_filename = None
+        self._main_source  = writer
+
+    def write(self, main_filename):
+        if self.main_filename is None:
+            with open(main_filename, "w") as f:
+                f.write(self._main_source)
+        elif os.path.abspath(main_filename) != self.main_filename:
+            shutil.copyfile(self.main_filename, main_filename)
+        for filename, content in self.data_files.items():
+            with open(filename, "w") as f:
+                f.write(content)
+
 # ------------------------------------------------------------------------------------------------ #
 #                                    FHDL --> VERILOG                                              #
 # ------------------------------------------------------------------------------------------------ #
@@ -904,7 +977,7 @@ class _HierarchicalBuildContext:
     time_unit: str
     time_precision: str
     ios: set
-    conv_output: ConvOutput = field(default_factory=ConvOutput)
+    conv_output: ConvOutput = field(default_factory=VerilogConvOutput)
     root: object = None
     global_clock_domains: object = None
     all_signals: set = field(default_factory=set)
@@ -913,7 +986,7 @@ class _HierarchicalBuildContext:
     ns: object = None
 
 
-def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_translate, regs_init, comb_cycle_policy, time_unit, time_precision):
+def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_translate, regs_init, comb_cycle_policy, time_unit, time_precision, output_file=None):
     if LiteXContext.top is None:
         raise ValueError("Hierarchical Verilog generation requires LiteXContext.top to be set.")
 
@@ -1370,73 +1443,73 @@ def _convert_hierarchical(f, ios, name, platform, special_overrides, attr_transl
 
     _compute_ports(ctx.root)
 
-    verilog = ""
-    verilog += _generate_banner(
-        filename=ctx.name,
-        device=getattr(ctx.platform, "device", "Unknown"),
-        top=ctx.top.__class__.__name__ if ctx.top is not None else "Unknown",
-        hierarchical=True,
-    )
-    verilog += _generate_timescale(time_unit=ctx.time_unit, time_precision=ctx.time_precision)
-    verilog += _generate_separator("Hierarchy")
-    verilog += _generate_hierarchy(top=ctx.top)
-
-    def _emit(node):
-        nonlocal verilog
-        for child in node.hier_children:
-            _emit(child)
-        interconnect_signals = set()
-        for child in node.hier_children:
-            interconnect_signals |= child.external_signals
-        declared_signals = node.local_signals | interconnect_signals
-        child_output_signals = set()
-        for child in node.hier_children:
-            for sig, direction in child.port_directions.items():
-                if direction == "output":
-                    child_output_signals.add(sig)
-        force_wires = {s for s in interconnect_signals if s not in node.local_targets}
-        force_wires |= child_output_signals
-        parts = []
-        parts.append(_generate_separator(f"Module: {node.module_name}"))
-        parts.append(_generate_module_with_ports(
-            ios=sorted(node.external_signals, key=lambda x: ctx.ns.get_name(x)),
-            name=node.module_name,
-            ns=ctx.ns,
-            attr_translate=ctx.attr_translate,
-            port_directions=node.port_directions,
-            port_wires=node.port_wires,
-        ))
-        parts.append(_generate_separator("Signals"))
-        parts.append(_generate_signals(
-            f=node.fragment,
-            ios=set(node.external_signals),
-            name=node.module_name,
-            ns=ctx.ns,
-            attr_translate=ctx.attr_translate,
-            regs_init=ctx.regs_init,
-            signals_override=declared_signals,
-            force_wires=force_wires,
-        ))
-        parts.append(_generate_separator("Submodules"))
-        parts.append(_generate_submodule_instances(node, ctx.ns))
-        parts.append(_generate_separator("Combinatorial Logic"))
-        parts.append(_generate_combinatorial_logic(node.fragment, ctx.ns, ctx.comb_cycle_policy))
-        parts.append(_generate_separator("Synchronous Logic"))
-        parts.append(_generate_synchronous_logic(node.fragment, ctx.ns))
-        parts.append(_generate_separator("Specialized Logic"))
-        parts.append(_generate_specials(
-            name=node.module_name,
-            overrides=ctx.special_overrides,
-            specials=node.fragment.specials - node.lowered_specials,
-            namespace=ctx.ns,
-            add_data_file=ctx.conv_output.add_data_file,
-            attr_translate=ctx.attr_translate,
-        ))
-        parts.append("endmodule\n")
-        verilog += "".join(parts)
-
-    _emit(ctx.root)
-    verilog += _generate_trailer()
+    with _VerilogWriter(output_file) as verilog:
+        verilog += _generate_banner(
+            filename=ctx.name,
+            device=getattr(ctx.platform, "device", "Unknown"),
+            top=ctx.top.__class__.__name__ if ctx.top is not None else "Unknown",
+            hierarchical=True,
+        )
+        verilog += _generate_timescale(time_unit=ctx.time_unit, time_precision=ctx.time_precision)
+        verilog += _generate_separator("Hierarchy")
+        verilog += _generate_hierarchy(top=ctx.top)
+
+        def _emit(node):
+            nonlocal verilog
+            for child in node.hier_children:
+                _emit(child)
+            interconnect_signals = set()
+            for child in node.hier_children:
+                interconnect_signals |= child.external_signals
+            declared_signals = node.local_signals | interconnect_signals
+            child_output_signals = set()
+            for child in node.hier_children:
+                for sig, direction in child.port_directions.items():
+                    if direction == "output":
+                        child_output_signals.add(sig)
+            force_wires = {s for s in interconnect_signals if s not in node.local_targets}
+            force_wires |= child_output_signals
+            parts = []
+            parts.append(_generate_separator(f"Module: {node.module_name}"))
+            parts.append(_generate_module_with_ports(
+                ios=sorted(node.external_signals, key=lambda x: ctx.ns.get_name(x)),
+                name=node.module_name,
+                ns=ctx.ns,
+                attr_translate=ctx.attr_translate,
+                port_directions=node.port_directions,
+                port_wires=node.port_wires,
+            ))
+            parts.append(_generate_separator("Signals"))
+            parts.append(_generate_signals(
+                f=node.fragment,
+                ios=set(node.external_signals),
+                name=node.module_name,
+                ns=ctx.ns,
+                attr_translate=ctx.attr_translate,
+                regs_init=ctx.regs_init,
+                signals_override=declared_signals,
+                force_wires=force_wires,
+            ))
+            parts.append(_generate_separator("Submodules"))
+            parts.append(_generate_submodule_instances(node, ctx.ns))
+            parts.append(_generate_separator("Combinatorial Logic"))
+            parts.append(_generate_combinatorial_logic(node.fragment, ctx.ns, ctx.comb_cycle_policy))
+            parts.append(_generate_separator("Synchronous Logic"))
+            parts.append(_generate_synchronous_logic(node.fragment, ctx.ns))
+            parts.append(_generate_separator("Specialized Logic"))
+            parts.append(_generate_specials(
+                name=node.module_name,
+                overrides=ctx.special_overrides,
+                specials=node.fragment.specials - node.lowered_specials,
+                namespace=ctx.ns,
+                add_data_file=ctx.conv_output.add_data_file,
+                attr_translate=ctx.attr_translate,
+            ))
+            parts.append("endmodule\n")
+            verilog += "".join(parts)
+
+        _emit(ctx.root)
+        verilog += _generate_trailer()
     ctx.conv_output.set_main_source(verilog)
     ctx.conv_output.ns = ctx.ns
     return ctx.conv_output
@@ -1452,6 +1525,8 @@ def convert(f, ios=set(), name="top", platform=None,
     # Sim parameters.
     time_unit      = "1ns",
     time_precision = "1ps",
+    # Output parameters.
+    output_file    = None,
     ):
 
     # Build Logic.
@@ -1475,10 +1550,11 @@ def convert(f, ios=set(), name="top", platform=None,
             comb_cycle_policy = comb_cycle_policy,
             time_unit         = time_unit,
             time_precision    = time_precision,
+            output_file       = output_file,
         )
 
     # Create ConvOutput for flat path.
-    r = ConvOutput()
+    r = VerilogConvOutput()
 
     # Flat Verilog generation.
     f, lowered_specials = _prepare_fragment(
@@ -1506,58 +1582,57 @@ def convert(f, ios=set(), name="top", platform=None,
 
     # Build Verilog.
     # --------------
-    verilog = ""
-
-    # Banner.
-    verilog += _generate_banner(
-        filename     = name,
-        device       = getattr(platform, "device", "Unknown"),
-        top          = LiteXContext.top.__class__.__name__ if LiteXContext.top is not None else "Unknown",
-        hierarchical = False
-    )
+    with _VerilogWriter(output_file) as verilog:
+        # Banner.
+        verilog += _generate_banner(
+            filename     = name,
+            device       = getattr(platform, "device", "Unknown"),
+            top          = LiteXContext.top.__class__.__name__ if LiteXContext.top is not None else "Unknown",
+            hierarchical = False
+        )
 
-    # Timescale.
-    verilog += _generate_timescale(
-        time_unit      = time_unit,
-        time_precision = time_precision
-    )
+        # Timescale.
+        verilog += _generate_timescale(
+            time_unit      = time_unit,
+            time_precision = time_precision
+        )
 
-    # Module Definition.
-    verilog += _generate_separator("Module")
-    verilog += _generate_module(f, ios, name, ns, attr_translate)
-
-    # Module Hierarchy.
-    verilog += _generate_separator("Hierarchy")
-    verilog += _generate_hierarchy(top=LiteXContext.top)
-
-    # Module Signals.
-    verilog += _generate_separator("Signals")
-    verilog += _generate_signals(f, ios, name, ns, attr_translate, regs_init)
-
-    # Combinatorial Logic.
-    verilog += _generate_separator("Combinatorial Logic")
-    verilog += _generate_combinatorial_logic(f, ns, comb_cycle_policy)
-
-    # Synchronous Logic.
-    verilog += _generate_separator("Synchronous Logic")
-    verilog += _generate_synchronous_logic(f, ns)
-
-    # Specials
-    verilog += _generate_separator("Specialized Logic")
-    verilog += _generate_specials(
-        name           = name,
-        overrides      = special_overrides,
-        specials       = f.specials - lowered_specials,
-        namespace      = ns,
-        add_data_file  = r.add_data_file,
-        attr_translate = attr_translate
-    )
+        # Module Definition.
+        verilog += _generate_separator("Module")
+        verilog += _generate_module(f, ios, name, ns, attr_translate)
+
+        # Module Hierarchy.
+        verilog += _generate_separator("Hierarchy")
+        verilog += _generate_hierarchy(top=LiteXContext.top)
+
+        # Module Signals.
+        verilog += _generate_separator("Signals")
+        verilog += _generate_signals(f, ios, name, ns, attr_translate, regs_init)
+
+        # Combinatorial Logic.
+        verilog += _generate_separator("Combinatorial Logic")
+        verilog += _generate_combinatorial_logic(f, ns, comb_cycle_policy)
+
+        # Synchronous Logic.
+        verilog += _generate_separator("Synchronous Logic")
+        verilog += _generate_synchronous_logic(f, ns)
+
+        # Specials
+        verilog += _generate_separator("Specialized Logic")
+        verilog += _generate_specials(
+            name           = name,
+            overrides      = special_overrides,
+            specials       = f.specials - lowered_specials,
+            namespace      = ns,
+            add_data_file  = r.add_data_file,
+            attr_translate = attr_translate
+        )
 
-    # Module End.
-    verilog += "endmodule\n"
+        # Module End.
+        verilog += "endmodule\n"
 
-    # Trailer.
-    verilog += _generate_trailer()
+        # Trailer.
+        verilog += _generate_trailer()
 
     r.set_main_source(verilog)
     r.ns = ns
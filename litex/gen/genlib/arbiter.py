@@ -0,0 +1,217 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Arbitration policies for LiteX interconnects.
+
+All arbiters share the interface of migen's RoundRobin: `request` (one bit per requester), `grant`
+(index of the granted requester) and `ce` (with the SP_CE switch policy) so that they can be used
+as drop-in replacements in bus arbiters.
+"""
+
+from migen import *
+from migen.genlib.roundrobin import RoundRobin, SP_WITHDRAW, SP_CE
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _argmax(module, request, levels):
+    """Return the index of the requester with the highest level (lowest index on ties)."""
+    n     = len(levels)
+    best  = Constant(0, bits_for(max(n - 1, 1)))
+    level = Constant(0, max(len(l) for l in levels))
+    found = Constant(0, 1)
+    for i, l in enumerate(levels):
+        select    = Signal()
+        new_best  = Signal(max=max(2, n))
+        new_level = Signal(len(level))
+        new_found = Signal()
+        module.comb += [
+            select.eq(request[i] & (~found | (l > level))),
+            new_best.eq(Mux(select, i, best)),
+            new_level.eq(Mux(select, l, level)),
+            new_found.eq(found | request[i]),
+        ]
+        best, level, found = new_best, new_level, new_found
+    return best
+
+
+class _Arbiter(Module):
+    def __init__(self, n, switch_policy=SP_WITHDRAW):
+        self.request = Signal(n)
+        self.grant   = Signal(max=max(2, n))
+        self.switch_policy = switch_policy
+        if switch_policy == SP_CE:
+            self.ce = Signal()
+
+        # Switch condition: current requester withdraws (SP_WITHDRAW) or ce (SP_CE).
+        self.switch = Signal()
+        if switch_policy == SP_CE:
+            self.comb += self.switch.eq(self.ce & (self.request != 0))
+        else:
+            requests = Array(self.request[i] for i in range(n))
+            self.comb += self.switch.eq(~requests[self.grant] & (self.request != 0))
+
+# Fixed Priority -----------------------------------------------------------------------------------
+
+class PriorityArbiter(_Arbiter):
+    """Fixed priority arbiter: the requester with the highest priority (then lowest index) is
+    granted on each switch. Lower priority requesters can starve."""
+    def __init__(self, n, priorities=None, switch_policy=SP_WITHDRAW):
+        _Arbiter.__init__(self, n, switch_policy)
+        if priorities is None:
+            priorities = [0]*n
+        assert len(priorities) == n
+
+        # # #
+
+        if n > 1:
+            best = _argmax(self, self.request, [Constant(p, bits_for(max(priorities))) for p in priorities])
+            self.sync += If(self.switch, self.grant.eq(best))
+        else:
+            self.comb += self.grant.eq(0)
+
+# Weighted Round-Robin -----------------------------------------------------------------------------
+
+class WeightedRoundRobin(_Arbiter):
+    """Weighted round-robin arbiter with per-requester credits.
+
+    Each requester starts with `weights[i]` credits and consumes one credit per grant; requesters
+    with credits left are served in round-robin order and all credits are reloaded when no
+    requester has credits left, so requesters get grants in proportion of their weights.
+    """
+    def __init__(self, n, weights=None, switch_policy=SP_WITHDRAW):
+        _Arbiter.__init__(self, n, switch_policy)
+        if weights is None:
+            weights = [1]*n
+        assert len(weights) == n
+        assert min(weights) >= 1
+        self.credits = credits = [Signal(max=w + 1, reset=w) for w in weights]
+
+        # # #
+
+        if n == 1:
+            self.comb += self.grant.eq(0)
+            return
+
+        # Eligible requesters (reload credits when no requester has credits left).
+        credited = Signal(n)
+        eligible = Signal(n)
+        reload   = Signal()
+        self.comb += [
+            credited.eq(self.request & Cat(*[c != 0 for c in credits])),
+            reload.eq(credited == 0),
+            eligible.eq(Mux(reload, self.request, credited)),
+        ]
+
+        # Next requester in round-robin order (current requester last).
+        next_grant = Signal(max=max(2, n))
+        cases = {}
+        for i in range(n):
+            switch = [next_grant.eq(i)]
+            for j in reversed(range(i + 1, i + n + 1)):
+                t = j % n
+                switch = [If(eligible[t], next_grant.eq(t)).Else(*switch)]
+            cases[i] = switch
+        self.comb += Case(self.grant, cases)
+
+        # Grant and consume/reload credits.
+        self.sync += If(self.switch, self.grant.eq(next_grant))
+        for i, w in enumerate(weights):
+            self.sync += If(self.switch,
+                If(reload,
+                    credits[i].eq(w - (next_grant == i))
+                ).Elif(next_grant == i,
+                    credits[i].eq(credits[i] - 1)
+                )
+            )
+
+# QoS ----------------------------------------------------------------------------------------------
+
+class QoSArbiter(_Arbiter):
+    """QoS arbiter with anti-starvation aging.
+
+    The requester with the highest `max(qos[i], floors[i]) + age[i]` level is granted on each switch
+    (lowest index on ties). The age of waiting requesters is incremented every `aging` cycles
+    (saturating at the maximum QoS level) and cleared when granted, so low QoS requesters are
+    eventually served.
+    """
+    def __init__(self, n, floors=None, qos_width=4, aging=16, switch_policy=SP_WITHDRAW):
+        _Arbiter.__init__(self, n, switch_policy)
+        if floors is None:
+            floors = [0]*n
+        assert len(floors) == n
+        self.qos = [Signal(qos_width) for _ in range(n)]
+        self.age = [Signal(qos_width) for _ in range(n)]
+
+        # # #
+
+        if n == 1:
+            self.comb += self.grant.eq(0)
+            return
+
+        # Aging tick.
+        tick = Signal()
+        if aging > 1:
+            prescaler = Signal(max=aging)
+            self.sync += [
+                prescaler.eq(prescaler + 1),
+                If(prescaler == (aging - 1), prescaler.eq(0)),
+            ]
+            self.comb += tick.eq(prescaler == (aging - 1))
+        else:
+            self.comb += tick.eq(1)
+
+        # Age waiting requesters.
+        levels = []
+        for i in range(n):
+            age = self.age[i]
+            self.sync += [
+                If((self.grant == i) | ~self.request[i],
+                    age.eq(0)
+                ).Elif(tick & (age != (2**qos_width - 1)),
+                    age.eq(age + 1)
+                )
+            ]
+            qos   = self.qos[i]
+            level = Signal(qos_width + 1)
+            self.comb += level.eq(Mux(qos > floors[i], qos, floors[i]) + age)
+            levels.append(level)
+
+        best = _argmax(self, self.request, levels)
+        self.sync += If(self.switch, self.grant.eq(best))
+
+# Arbiter Selection --------------------------------------------------------------------------------
+
+supported_arbiter_policies = ["round-robin", "priority", "weighted", "qos"]
+
+def get_arbiter(n, policy="round-robin", switch_policy=SP_WITHDRAW, priorities=None, qos_width=4, aging=16):
+    """Create an arbiter for `n` requesters.
+
+    `priorities` (one value or None per requester) are the fixed priorities (policy "priority",
+    default 0), the weights (policy "weighted", default 1) or the static QoS floors (policy "qos",
+    default 0, QoS arbiters also expose a `qos` list of Signals for dynamic values).
+    """
+    if policy not in supported_arbiter_policies:
+        raise ValueError(f"Unsupported Arbiter policy: {policy}.")
+    if priorities is None:
+        priorities = [None]*n
+    if len(priorities) != n:
+        raise ValueError(f"Arbiter priorities count ({len(priorities)}) must match requesters count ({n}).")
+    default = {"round-robin": 0, "priority": 0, "weighted": 1, "qos": 0}[policy]
+    priorities = [default if p is None else p for p in priorities]
+    if policy == "weighted" and min(priorities, default=1) < 1:
+        raise ValueError(f"Arbiter weights must be >= 1 (got {priorities}).")
+    if policy == "qos" and max(priorities, default=0) >= 2**qos_width:
+        raise ValueError(f"Arbiter QoS levels must fit on {qos_width}-bit (got {priorities}).")
+    if min(priorities, default=0) < 0:
+        raise ValueError(f"Arbiter priorities must be >= 0 (got {priorities}).")
+    if policy == "round-robin" or n <= 1:
+        return RoundRobin(n, switch_policy)
+    if policy == "priority":
+        return PriorityArbiter(n, priorities, switch_policy)
+    if policy == "weighted":
+        return WeightedRoundRobin(n, priorities, switch_policy)
+    if policy == "qos":
+        return QoSArbiter(n, priorities, qos_width=qos_width, aging=aging, switch_policy=switch_policy)
@@ -0,0 +1,189 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Address decoders for LiteX interconnects.
+
+Interconnect Decoders select slaves with one decoder function per slave (taking the address and
+returning the slave selection). Instead of one full comparator per slave, TreeDecoder generates
+these functions from the regions map as a binary tree: regions are split on the highest address
+bit that differs between them and address bits shared by all the regions of a sub-tree (common
+prefixes) are only compared once.
+"""
+
+from migen import *
+from migen.fhdl.structure import _Slice
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def logic_depth(n, lut_inputs=6):
+    """Estimated number of LUT levels required to reduce `n` signals."""
+    depth = 0
+    while n > 1:
+        n      = (n + lut_inputs - 1)//lut_inputs
+        depth += 1
+    return depth
+
+
+def _bit(region, b):
+    index, lo, value = region
+    return (value >> (b - lo)) & 1
+
+
+def _bits(region, hi, lo):
+    """Value of bits [hi:lo] of the address matching `region`."""
+    index, region_lo, value = region
+    return (value >> (lo - region_lo)) & (2**(hi - lo + 1) - 1)
+
+# Tree Decoder -------------------------------------------------------------------------------------
+
+class TreeDecoder(Module):
+    """Binary/priority tree address decoder.
+
+    `regions` is a list of (origin, size) pairs expressed in units of the decoded address (sizes
+    are powers of 2 and origins aligned on sizes, regions do not overlap).
+
+    With mode="full", the decoding is exact: addresses outside of all the regions select no slave.
+    With mode="priority", only the address bits required to discriminate the regions are decoded
+    (smallest logic but addresses outside of the regions alias to a slave instead of producing a
+    bus error). With register=True, the slave selections are registered (1 cycle decode latency).
+    """
+    supported_modes = ["full", "priority"]
+
+    def __init__(self, regions, address_width, mode="full", register=False):
+        if mode not in self.supported_modes:
+            raise ValueError(f"Unsupported TreeDecoder mode: {mode}.")
+        if len(regions) == 0:
+            raise ValueError("TreeDecoder requires at least one region.")
+        self.address_width = address_width
+        self.mode          = mode
+        self.register      = register
+        self.latency       = int(register)
+
+        # Regions prefixes: (index, lo, value) with address[lo:] == value.
+        prefixes = []
+        for i, (origin, size) in enumerate(regions):
+            lo = log2_int(size, need_pow2=False)
+            if size != 2**lo:
+                raise ValueError(f"TreeDecoder region {i} size (0x{size:x}) must be a power of 2.")
+            if (origin & (size - 1)) != 0:
+                raise ValueError(f"TreeDecoder region {i} origin (0x{origin:x}) must be aligned on size.")
+            if (origin + size) > 2**address_width:
+                raise ValueError(f"TreeDecoder region {i} exceeds the {address_width}-bit address space.")
+            prefixes.append((i, lo, origin >> lo))
+        for a in prefixes:
+            for b in prefixes[a[0] + 1:]:
+                lo = max(a[1], b[1])
+                if (a[2] >> (lo - a[1])) == (b[2] >> (lo - b[1])):
+                    raise ValueError(f"TreeDecoder regions {a[0]} and {b[0]} overlap.")
+        self.regions = regions
+        self.tree    = self._build(prefixes, address_width - 1)
+
+        # Decoded address bits per region and compared bits (flat decoders compare address_width - lo
+        # bits for each region).
+        self.decoded_bits  = [0]*len(regions)
+        self.compared_bits = 0
+        self._count_bits(self.tree, 0)
+        self.flat_bits = [address_width - lo for _, lo, _ in prefixes]
+
+        self._decoders = {}
+
+    # Tree -----------------------------------------------------------------------------------------
+
+    def _build(self, regions, hi):
+        if len(regions) == 1:
+            return ("leaf", regions[0], hi)
+        # Split on the highest bit that differs (regions agree on and decode the bits above).
+        split = hi
+        while len(set(_bit(r, split) for r in regions)) == 1:
+            split -= 1
+        children = [self._build([r for r in regions if _bit(r, split) == v], split - 1) for v in range(2)]
+        return ("node", regions[0], hi, split, children)
+
+    def _count_bits(self, tree, bits):
+        if tree[0] == "leaf":
+            _, (index, lo, value), hi = tree
+            if self.mode == "full":
+                bits               += max(hi - lo + 1, 0)
+                self.compared_bits += max(hi - lo + 1, 0)
+            self.decoded_bits[index] = bits
+        else:
+            _, region, hi, split, children = tree
+            if self.mode == "full":
+                bits               += hi - split
+                self.compared_bits += hi - split
+            self.compared_bits += 1
+            for child in children:
+                self._count_bits(child, bits + 1)
+
+    def _generate(self, adr, tree, sel, selects):
+        if tree[0] == "leaf":
+            _, region, hi = tree
+            index, lo, value = region
+            if (self.mode == "full") and (hi >= lo):
+                sel = sel & (adr[lo:hi + 1] == _bits(region, hi, lo))
+            selects[region[0]] = sel
+        else:
+            _, region, hi, split, children = tree
+            node_sel = sel
+            if (self.mode == "full") and (hi > split):
+                # Common prefix of the sub-tree, compared once.
+                node_sel = Signal()
+                self.comb += node_sel.eq(sel & (adr[split + 1:hi + 1] == _bits(region, hi, split + 1)))
+            for v, child in enumerate(children):
+                child_sel = Signal()
+                self.comb += child_sel.eq(node_sel & (adr[split] == v))
+                self._generate(adr, child, child_sel, selects)
+
+    def get_selects(self, adr):
+        """Return the list of slave selections for `adr` (generated once per address signal)."""
+        # Interconnects can pass new slices of the same address to each decoder function.
+        if isinstance(adr, _Slice):
+            key = (id(adr.value), adr.start, adr.stop)
+        else:
+            key = id(adr)
+        if key not in self._decoders:
+            if len(adr) != self.address_width:
+                raise ValueError(f"TreeDecoder address width mismatch ({len(adr)} vs {self.address_width}).")
+            selects = [None]*len(self.regions)
+            self._generate(adr, self.tree, 1, selects)
+            outputs = []
+            for sel in selects:
+                output = Signal()
+                if self.register:
+                    self.sync += output.eq(sel)
+                else:
+                    self.comb += output.eq(sel)
+                outputs.append(output)
+            self._decoders[key] = (adr, outputs)
+        return self._decoders[key][1]
+
+    def get_decoders(self):
+        """Return the decoder functions of the regions (for Interconnect/Decoder `slaves`)."""
+        decoders = []
+        for i in range(len(self.regions)):
+            decoder = lambda adr, i=i: self.get_selects(adr)[i]
+            decoder.latency = self.latency
+            decoders.append(decoder)
+        return decoders
+
+    # Report ---------------------------------------------------------------------------------------
+
+    def get_logic_depth(self, lut_inputs=6):
+        """Estimated LUT levels of the tree and flat decoders (worst region)."""
+        tree = max(logic_depth(n, lut_inputs) for n in self.decoded_bits)
+        flat = max(logic_depth(n, lut_inputs) for n in self.flat_bits)
+        return tree, flat
+
+    def report(self, lut_inputs=6):
+        tree, flat = self.get_logic_depth(lut_inputs)
+        return "{} regions, {} compared address bits (flat: {}), estimated logic depth: {} LUT{} levels (flat: {}){}".format(
+            len(self.regions),
+            self.compared_bits,
+            sum(self.flat_bits),
+            tree,
+            lut_inputs,
+            flat,
+            ", registered" if self.register else "")
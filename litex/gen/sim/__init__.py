@@ -1 +1,2 @@
 from litex.gen.sim.core import Simulator, generate_gtkw_savefile, run_simulation, passive
+from litex.gen.sim.verification import StreamDriver, StreamMonitor, Scoreboard, WishboneMaster, AXIMaster
@@ -0,0 +1,304 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Verification helpers for LiteX simulations.
+
+Stream drivers/monitors, Wishbone/AXI bus masters and a scoreboard to write shorter and faster
+testbenches. All the signals of an endpoint/channel are assigned or sampled in a single simulator
+request per cycle (the simulator accepts lists of statements/values) instead of one yield per
+signal. Random backpressure/idle cycles are configured in percent (as in the existing tests).
+"""
+
+import random
+from collections import deque
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _stall(prng, rand):
+    return (rand > 0) and (prng.randrange(100) < rand)
+
+
+def _endpoint_fields(endpoint):
+    """Names of the first/last/payload/param fields of a stream endpoint."""
+    layout = endpoint.description.payload_layout + endpoint.description.param_layout
+    return ["first", "last"] + [f[0] for f in layout]
+
+# Stream Driver ------------------------------------------------------------------------------------
+
+class StreamDriver:
+    """Stream driver.
+
+    Beats queued with `send`/`send_packet` are presented on `endpoint` by `generator()` (fields not
+    specified in a beat are driven to 0), with `valid_rand` percent of random idle cycles between
+    beats. The generator returns when all the queued beats have been accepted.
+    """
+    def __init__(self, endpoint, valid_rand=0, seed=42):
+        self.endpoint   = endpoint
+        self.valid_rand = valid_rand
+        self.prng       = random.Random(seed)
+        self.fields     = _endpoint_fields(endpoint)
+        self.queue      = deque()
+        self.sent       = []
+
+    def send(self, beat=None, **fields):
+        beat = dict(beat or {}, **fields)
+        for name in beat.keys():
+            if name not in self.fields:
+                raise ValueError(f"StreamDriver: Unknown field {name}.")
+        self.queue.append(beat)
+
+    def send_packet(self, datas, field="data", **params):
+        for i, data in enumerate(datas):
+            self.send({field: data, "first": int(i == 0), "last": int(i == (len(datas) - 1))}, **params)
+
+    def generator(self):
+        ep = self.endpoint
+        while self.queue:
+            if _stall(self.prng, self.valid_rand):
+                yield ep.valid.eq(0)
+                yield
+                continue
+            beat = self.queue.popleft()
+            yield [ep.valid.eq(1)] + [getattr(ep, name).eq(beat.get(name, 0)) for name in self.fields]
+            yield
+            while not (yield ep.ready):
+                yield
+            self.sent.append(beat)
+        yield ep.valid.eq(0)
+
+# Stream Monitor -----------------------------------------------------------------------------------
+
+class StreamMonitor:
+    """Stream monitor.
+
+    Records the beats transferred on `endpoint` (as dicts of the first/last/payload/param fields, or
+    of `fields`) in `beats` and the packets (lists of beats ended by last) in `packets`, and calls
+    `callback` (for example Scoreboard.observe) on each beat. When `drive_ready` is set, ready is
+    driven with `ready_rand` percent of random backpressure.
+    """
+    def __init__(self, endpoint, ready_rand=0, seed=42, fields=None, callback=None, drive_ready=True):
+        self.endpoint    = endpoint
+        self.ready_rand  = ready_rand
+        self.prng        = random.Random(seed)
+        self.fields      = _endpoint_fields(endpoint) if fields is None else fields
+        self.callback    = callback
+        self.drive_ready = drive_ready
+        self.beats       = []
+        self.packets     = []
+        self._packet     = []
+
+    def _receive(self, beat):
+        self.beats.append(beat)
+        self._packet.append(beat)
+        if beat.get("last", 0):
+            self.packets.append(self._packet)
+            self._packet = []
+        if self.callback is not None:
+            self.callback(beat)
+
+    def generator(self, count=None):
+        """Monitor `endpoint` (passive when `count` is None, else until `count` beats are received)."""
+        if count is None:
+            yield "passive"
+        ep      = self.endpoint
+        signals = [ep.valid, ep.ready] + [getattr(ep, name) for name in self.fields]
+        while (count is None) or (len(self.beats) < count):
+            if self.drive_ready:
+                yield ep.ready.eq(int(not _stall(self.prng, self.ready_rand)))
+            yield
+            values = (yield signals)
+            if values[0] and values[1]:
+                self._receive(dict(zip(self.fields, values[2:])))
+        if self.drive_ready:
+            yield ep.ready.eq(0)
+
+# Scoreboard ---------------------------------------------------------------------------------------
+
+class Scoreboard:
+    """Scoreboard comparing observed items to expected ones.
+
+    Items are matched in order (or to any pending expected item with ordered=False). Dict items
+    match when all the fields of the expected item are equal in the observed one (extra observed
+    fields are ignored), other items are compared with ==. `check()` raises an AssertionError on
+    mismatches, unexpected items or pending expected items.
+    """
+    def __init__(self, ordered=True, compare=None):
+        self.ordered    = ordered
+        self.compare    = self._compare if compare is None else compare
+        self.expected   = deque()
+        self.matched    = 0
+        self.mismatches = []
+        self.unexpected = []
+
+    @staticmethod
+    def _compare(expected, observed):
+        if isinstance(expected, dict) and isinstance(observed, dict):
+            return all(observed.get(k) == v for k, v in expected.items())
+        return expected == observed
+
+    def expect(self, item):
+        self.expected.append(item)
+
+    def expect_all(self, items):
+        for item in items:
+            self.expect(item)
+
+    def observe(self, item):
+        if not self.expected:
+            self.unexpected.append(item)
+        elif self.ordered:
+            expected = self.expected.popleft()
+            if self.compare(expected, item):
+                self.matched += 1
+            else:
+                self.mismatches.append((expected, item))
+        else:
+            for i, expected in enumerate(self.expected):
+                if self.compare(expected, item):
+                    del self.expected[i]
+                    self.matched += 1
+                    break
+            else:
+                self.unexpected.append(item)
+
+    @property
+    def done(self):
+        return len(self.expected) == 0
+
+    def check(self):
+        errors = []
+        for expected, observed in self.mismatches[:8]:
+            errors.append(f"mismatch: expected {expected}, observed {observed}")
+        for observed in self.unexpected[:8]:
+            errors.append(f"unexpected: {observed}")
+        if self.expected:
+            errors.append(f"{len(self.expected)} expected item(s) not observed (first: {self.expected[0]})")
+        if errors:
+            raise AssertionError("Scoreboard: {} matched, {} error(s):\n{}".format(
+                self.matched, len(self.mismatches) + len(self.unexpected) + int(len(self.expected) > 0),
+                "\n".join(errors)))
+
+# Wishbone Master ----------------------------------------------------------------------------------
+
+class WishboneMaster:
+    """Wishbone Classic/Pipelined master (`write`/`read` generators, a bus error raises ValueError)."""
+    def __init__(self, bus):
+        self.bus = bus
+
+    def _transaction(self, statements):
+        bus = self.bus
+        yield [bus.cyc.eq(1), bus.stb.eq(1)] + statements
+        yield
+        if getattr(bus, "pipelined", False):
+            while (yield bus.stall):
+                yield
+            yield bus.stb.eq(0)
+        while True:
+            ack, err, dat_r = (yield [bus.ack, bus.err, bus.dat_r])
+            if ack or err:
+                break
+            yield
+        yield [bus.cyc.eq(0), bus.stb.eq(0), bus.we.eq(0)]
+        if err:
+            raise ValueError("bus error")
+        return dat_r
+
+    def write(self, adr, dat, sel=None):
+        if sel is None:
+            sel = 2**len(self.bus.sel) - 1
+        yield from self._transaction([self.bus.adr.eq(adr), self.bus.dat_w.eq(dat), self.bus.sel.eq(sel), self.bus.we.eq(1)])
+
+    def read(self, adr, sel=None):
+        if sel is None:
+            sel = 2**len(self.bus.sel) - 1
+        return (yield from self._transaction([self.bus.adr.eq(adr), self.bus.sel.eq(sel), self.bus.we.eq(0)]))
+
+# AXI Master ---------------------------------------------------------------------------------------
+
+class AXIMaster:
+    """AXI/AXI-Lite master.
+
+    `write`/`read` do single accesses and return the response (and data), `write_burst`/
+    `read_burst` do INCR bursts (AXI only). The address and write data channels are driven
+    concurrently and `ready_rand` percent of random backpressure is applied on the b/r channels.
+    """
+    def __init__(self, bus, ready_rand=0, seed=42):
+        self.bus        = bus
+        self.ready_rand = ready_rand
+        self.prng       = random.Random(seed)
+        self.axi_full   = hasattr(bus.aw, "len")
+        self.size       = (bus.data_width//8 - 1).bit_length()
+
+    def _send(self, channels):
+        # channels: list of (channel, beats), beats being dicts of the channel fields.
+        pending    = [(channel, deque(beats)) for channel, beats in channels if beats]
+        statements = []
+        for channel, beats in pending:
+            statements += [channel.valid.eq(1)] + [getattr(channel, k).eq(v) for k, v in beats[0].items()]
+        yield statements
+        while pending:
+            yield
+            readys     = (yield [channel.ready for channel, beats in pending])
+            statements = []
+            for (channel, beats), ready in zip(pending, readys):
+                if not ready:
+                    continue
+                beats.popleft()
+                if beats:
+                    statements += [getattr(channel, k).eq(v) for k, v in beats[0].items()]
+                else:
+                    statements.append(channel.valid.eq(0))
+            pending = [(channel, beats) for channel, beats in pending if beats]
+            if statements:
+                yield statements
+
+    def _receive(self, channel, fields):
+        while True:
+            ready = int(not _stall(self.prng, self.ready_rand))
+            yield channel.ready.eq(ready)
+            yield
+            values = (yield [channel.valid] + [getattr(channel, f) for f in fields])
+            if ready and values[0]:
+                yield channel.ready.eq(0)
+                return dict(zip(fields, values[1:]))
+
+    def _check_burst(self, length):
+        if (length > 1) and (not self.axi_full):
+            raise ValueError("AXIMaster: Bursts require an AXI interface.")
+
+    def write_burst(self, addr, datas, strb=None, id=0):
+        self._check_burst(len(datas))
+        if strb is None:
+            strb = 2**len(self.bus.w.strb) - 1
+        aw = {"addr": addr}
+        ws = [{"data": data, "strb": strb} for data in datas]
+        if self.axi_full:
+            aw.update({"len": len(datas) - 1, "size": self.size, "burst": 0b01, "id": id})
+            for i, w in enumerate(ws):
+                w["last"] = int(i == (len(ws) - 1))
+        yield from self._send([(self.bus.aw, [aw]), (self.bus.w, ws)])
+        return (yield from self._receive(self.bus.b, ["resp"]))["resp"]
+
+    def write(self, addr, data, strb=None, id=0):
+        return (yield from self.write_burst(addr, [data], strb=strb, id=id))
+
+    def read_burst(self, addr, length, id=0):
+        self._check_burst(length)
+        ar = {"addr": addr}
+        if self.axi_full:
+            ar.update({"len": length - 1, "size": self.size, "burst": 0b01, "id": id})
+        yield from self._send([(self.bus.ar, [ar])])
+        datas = []
+        resp  = 0
+        for i in range(length):
+            r = (yield from self._receive(self.bus.r, ["data", "resp"]))
+            datas.append(r["data"])
+            resp = resp or r["resp"]
+        return datas, resp
+
+    def read(self, addr, id=0):
+        datas, resp = (yield from self.read_burst(addr, 1, id=id))
+        return datas[0], resp
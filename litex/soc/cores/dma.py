@@ -7,13 +7,16 @@
 """Direct Memory Access (DMA) reader and writer modules."""
 
 from migen import *
+from migen.genlib.fifo import SyncFIFO
 
 from litex.gen import *
 from litex.gen.common import reverse_bytes
 
 from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.csr_eventmanager import *
 from litex.soc.interconnect import stream
 from litex.soc.interconnect import wishbone
+from litex.soc.interconnect import axi
 
 # Helpers ------------------------------------------------------------------------------------------
 
@@ -52,6 +55,62 @@ def add_wishbone_burst_cti(module, bus, last, bursting):
         )
     ]
 
+def add_axi_burst_requests(module, sink, ax, accept_ok, issue_ok, max_burst_length, data_width):
+    """Group contiguous sink addresses in AXI INCR burst requests.
+
+    Sink beats are accepted while ``accept_ok`` and accumulated in a burst that is requested on
+    ``ax`` (when ``issue_ok``) on ``sink.last``, after ``max_burst_length`` beats, before a 4KB
+    boundary or as soon as the sink can't extend it. Returns the (accept, issue) handshakes.
+    """
+    shift            = log2_int(data_width//8)
+    boundary_bits    = 12 - shift
+    max_burst_length = min(max_burst_length, 2**boundary_bits)
+
+    start    = Signal(len(sink.address))
+    count    = Signal(max=max_burst_length + 1)
+    closed   = Signal()
+    boundary = Signal()
+    accept   = Signal()
+    issue    = Signal()
+
+    module.comb += [
+        # Accept contiguous beats until the burst is closed.
+        accept.eq(sink.valid & accept_ok & ~closed & ((count == 0) | (sink.address == (start + count)))),
+        sink.ready.eq(accept),
+        boundary.eq((sink.address + 1)[:boundary_bits] == 0),
+
+        # Request the closed burst.
+        ax.valid.eq(closed & issue_ok),
+        ax.addr.eq(start << shift),
+        ax.burst.eq(axi.BURST_INCR),
+        ax.len.eq(count - 1),
+        ax.size.eq(shift),
+        issue.eq(ax.valid & ax.ready),
+    ]
+    module.sync += [
+        If(issue,
+            count.eq(0),
+            closed.eq(0),
+        ).Elif(accept,
+            If(count == 0,
+                start.eq(sink.address)
+            ),
+            count.eq(count + 1),
+            If(sink.last | (count == (max_burst_length - 1)) | boundary,
+                closed.eq(1)
+            )
+        ).Elif(count != 0,
+            # Sink idle, not contiguous or no space: Request the pending burst.
+            closed.eq(1)
+        )
+    ]
+    return accept, issue
+
+def check_axi_max_burst_length(bus, max_burst_length):
+    limit = {"axi3": 16, "axi4": 256}[bus.version]
+    if not (1 <= max_burst_length <= limit):
+        raise ValueError(f"AXI DMA max_burst_length must be between 1 and {limit} (got {max_burst_length}).")
+
 # WishboneDMAReader --------------------------------------------------------------------------------
 
 class WishboneDMAReader(LiteXModule):
@@ -80,6 +139,9 @@ class WishboneDMAReader(LiteXModule):
         before presenting it on the stream, while ``"big"`` leaves it unchanged. Raw word users
         can set ``with_byteswap=False`` explicitly to keep the Wishbone word order independent of
         CPU endianness.
+
+        On Pipelined Wishbone buses, reads are issued back-to-back with up to ``fifo_depth``
+        outstanding requests (bounded by the free space of the FIFO).
         """
         if not isinstance(bus, wishbone.Interface):
             raise TypeError("DMAReader requires a Wishbone bus.")
@@ -88,26 +150,34 @@ class WishboneDMAReader(LiteXModule):
         self.bus    = bus
         self.sink   = sink   = stream.Endpoint([("address", bus.adr_width, ("last", 1))])
         self.source = source = stream.Endpoint([("data",    bus.data_width)])
+        self.busy   = Signal()
 
         # # #
 
+        self.comb += self.busy.eq(bus.cyc)
+
         # FIFO..
         self.fifo = fifo = stream.SyncFIFO([("data", bus.data_width)], depth=fifo_depth)
 
+        # Pipelined Reads -> FIFO.
+        if bus.pipelined:
+            self.add_pipelined_reads(endianness, fifo_depth, with_byteswap)
+
         # Reads -> FIFO.
-        self.comb += [
-            bus.stb.eq(sink.valid & fifo.sink.ready),
-            bus.cyc.eq(sink.valid & fifo.sink.ready),
-            bus.we.eq(0),
-            bus.sel.eq(2**(bus.data_width//8)-1),
-            bus.adr.eq(sink.address),
-            fifo.sink.last.eq(sink.last),
-            fifo.sink.data.eq(format_bytes(bus.dat_r, endianness, with_byteswap)),
-            If(bus.stb & bus.ack,
-                sink.ready.eq(1),
-                fifo.sink.valid.eq(1),
-            ),
-        ]
+        else:
+            self.comb += [
+                bus.stb.eq(sink.valid & fifo.sink.ready),
+                bus.cyc.eq(sink.valid & fifo.sink.ready),
+                bus.we.eq(0),
+                bus.sel.eq(2**(bus.data_width//8)-1),
+                bus.adr.eq(sink.address),
+                fifo.sink.last.eq(sink.last),
+                fifo.sink.data.eq(format_bytes(bus.dat_r, endianness, with_byteswap)),
+                If(bus.stb & bus.ack,
+                    sink.ready.eq(1),
+                    fifo.sink.valid.eq(1),
+                ),
+            ]
 
         # FIFO -> Output.
         self.comb += fifo.source.connect(source)
@@ -124,6 +194,32 @@ class WishboneDMAReader(LiteXModule):
         if with_csr:
             self.add_csr()
 
+    def add_pipelined_reads(self, endianness, fifo_depth, with_byteswap):
+        # Issue back-to-back requests while the FIFO can store all outstanding responses.
+        bus    = self.bus
+        sink   = self.sink
+        fifo   = self.fifo
+        pending, issue, retire = wishbone.add_pending_counter(self, bus, fifo_depth)
+
+        # Last flags of outstanding requests, returned in order with the responses.
+        last_fifo = SyncFIFO(1, fifo_depth)
+        self.submodules += last_fifo
+
+        self.comb += [
+            bus.stb.eq(sink.valid & ((fifo.level + pending) < fifo_depth)),
+            bus.cyc.eq(bus.stb | (pending != 0)),
+            bus.we.eq(0),
+            bus.sel.eq(2**(bus.data_width//8)-1),
+            bus.adr.eq(sink.address),
+            sink.ready.eq(issue),
+            last_fifo.we.eq(issue),
+            last_fifo.din.eq(sink.last),
+            last_fifo.re.eq(retire),
+            fifo.sink.valid.eq(retire),
+            fifo.sink.last.eq(last_fifo.dout),
+            fifo.sink.data.eq(format_bytes(bus.dat_r, endianness, with_byteswap)),
+        ]
+
     def add_ctrl(self, default_base=0, default_length=0, default_enable=0, default_loop=0):
         self.base   = Signal(64, reset=default_base)
         self.length = Signal(32, reset=default_length)
@@ -135,9 +231,9 @@ class WishboneDMAReader(LiteXModule):
         # # #
 
         shift   = log2_int(self.bus.data_width//8)
-        base    = Signal(self.bus.adr_width)
-        offset  = Signal(self.bus.adr_width)
-        length  = Signal(self.bus.adr_width)
+        base    = Signal(len(self.sink.address))
+        offset  = Signal(len(self.sink.address))
+        length  = Signal(len(self.sink.address))
         self.comb += base.eq(self.base[shift:])
         self.comb += length.eq(self.length[shift:])
 
@@ -164,7 +260,7 @@ class WishboneDMAReader(LiteXModule):
                 )
             )
         )
-        fsm.act("DONE", self.done.eq(1))
+        fsm.act("DONE", self.done.eq(~self.busy))
 
     def add_csr(self, default_base=0, default_length=0, default_enable=0, default_loop=0):
         if not hasattr(self, "base"):
@@ -204,13 +300,17 @@ class WishboneDMAWriter(LiteXModule):
     sink : Record("address", "data")
         Sink for MMAP addresses/datas to be written.
     """
-    def __init__(self, bus, endianness="little", with_csr=False, bursting=None, with_byteswap=None):
+    def __init__(self, bus, endianness="little", with_csr=False, bursting=None, with_byteswap=None,
+        max_pending=16):
         """Create a Wishbone DMA writer.
 
         ``endianness`` preserves the legacy behavior: ``"little"`` byte-swaps stream words before
         writing them to Wishbone, while ``"big"`` leaves them unchanged. Raw word users can set
         ``with_byteswap=False`` explicitly to keep the stream word order independent of CPU
         endianness.
+
+        On Pipelined Wishbone buses, writes are issued back-to-back with up to ``max_pending``
+        outstanding requests.
         """
         if not isinstance(bus, wishbone.Interface):
             raise TypeError("DMAWriter requires a Wishbone bus.")
@@ -218,9 +318,12 @@ class WishboneDMAWriter(LiteXModule):
             raise ValueError("DMAWriter requires a writable Wishbone bus.")
         self.bus  = bus
         self.sink = sink = stream.Endpoint([("address", bus.adr_width), ("data", bus.data_width)])
+        self.busy = Signal()
 
         # # #
 
+        self.comb += self.busy.eq(bus.cyc)
+
         # Writes.
         data = Signal(bus.data_width)
         self.comb += [
@@ -233,6 +336,15 @@ class WishboneDMAWriter(LiteXModule):
             sink.ready.eq(bus.ack),
         ]
 
+        # Pipelined Writes: Issue back-to-back requests, keep cyc until all are acked.
+        if bus.pipelined:
+            pending, issue, retire = wishbone.add_pending_counter(self, bus, max_pending)
+            self.comb += [
+                bus.stb.eq(sink.valid & (pending != max_pending)),
+                bus.cyc.eq(sink.valid | (pending != 0)),
+                sink.ready.eq(issue),
+            ]
+
         # Optional Wishbone burst support.
         add_wishbone_burst_cti(
             module     = self,
@@ -259,9 +371,9 @@ class WishboneDMAWriter(LiteXModule):
         # # #
 
         shift   = log2_int(self.bus.data_width//8)
-        base    = Signal(self.bus.adr_width)
-        offset  = Signal(self.bus.adr_width)
-        length  = Signal(self.bus.adr_width)
+        base    = Signal(len(self._sink.address))
+        offset  = Signal(len(self._sink.address))
+        length  = Signal(len(self._sink.address))
         self.comb += base.eq(self.base[shift:])
         self.comb += length.eq(self.length[shift:])
 
@@ -291,7 +403,7 @@ class WishboneDMAWriter(LiteXModule):
                 )
             )
         )
-        fsm.act("DONE", self.done.eq(1))
+        fsm.act("DONE", self.done.eq(~self.busy))
 
     def add_csr(self, default_base=0, default_length=0, default_enable=0, default_loop=0):
         if not hasattr(self, "base"):
@@ -315,3 +427,620 @@ class WishboneDMAWriter(LiteXModule):
             self._done.status.eq(self.done),
             self._offset.status.eq(self.offset),
         ]
+
+# AXIDMAReader -------------------------------------------------------------------------------------
+
+class AXIDMAReader(LiteXModule):
+    """Read data from AXI MMAP memory.
+
+    For every address written to the sink, one word will be produced on the source. Contiguous
+    addresses are grouped in INCR bursts (up to ``max_burst_length`` beats, not crossing 4KB
+    boundaries) and multiple bursts are kept outstanding (bounded by the free space of the FIFO).
+
+    Parameters
+    ----------
+    bus : bus
+        AXI bus of the SoC to read from.
+
+    Attributes
+    ----------
+    sink : Record("address")
+        Sink for MMAP addresses to be read.
+
+    source : Record("data")
+        Source for MMAP word results from reading.
+    """
+    def __init__(self, bus, endianness="little", fifo_depth=512, max_burst_length=256, with_csr=False,
+        with_byteswap=None):
+        if not isinstance(bus, axi.AXIInterface):
+            raise TypeError("AXIDMAReader requires an AXI bus.")
+        if "r" not in bus.mode:
+            raise ValueError("AXIDMAReader requires a readable AXI bus.")
+        check_axi_max_burst_length(bus, max_burst_length)
+        shift = log2_int(bus.data_width//8)
+        self.bus    = bus
+        self.sink   = sink   = stream.Endpoint([("address", bus.address_width - shift)])
+        self.source = source = stream.Endpoint([("data",    bus.data_width)])
+        self.busy   = Signal()
+
+        # # #
+
+        # FIFO.
+        self.fifo = fifo = stream.SyncFIFO([("data", bus.data_width)], depth=fifo_depth)
+
+        # Reserve FIFO space for each accepted address (released when the word leaves the FIFO).
+        reserved = Signal(max=fifo_depth + 1)
+        accept, issue = add_axi_burst_requests(self, sink, bus.ar,
+            accept_ok        = reserved < fifo_depth,
+            issue_ok         = 1,
+            max_burst_length = max_burst_length,
+            data_width       = bus.data_width,
+        )
+        release = Signal()
+        self.comb += release.eq(source.valid & source.ready)
+        self.sync += [
+            If(accept & ~release,
+                reserved.eq(reserved + 1)
+            ).Elif(~accept & release,
+                reserved.eq(reserved - 1)
+            )
+        ]
+        self.comb += self.busy.eq(reserved != fifo.level)
+
+        # Last flags of outstanding beats, returned in order with the data.
+        last_fifo = SyncFIFO(1, fifo_depth)
+        self.submodules += last_fifo
+
+        # Reads -> FIFO.
+        self.comb += [
+            last_fifo.we.eq(accept),
+            last_fifo.din.eq(sink.last),
+            last_fifo.re.eq(bus.r.valid),
+            bus.r.ready.eq(1),
+            fifo.sink.valid.eq(bus.r.valid),
+            fifo.sink.last.eq(last_fifo.dout),
+            fifo.sink.data.eq(format_bytes(bus.r.data, endianness, with_byteswap)),
+        ]
+
+        # FIFO -> Output.
+        self.comb += fifo.source.connect(source)
+
+        # CSRs.
+        if with_csr:
+            self.add_csr()
+
+    # Same control/CSRs than the Wishbone DMA Reader.
+    add_ctrl = WishboneDMAReader.add_ctrl
+    add_csr  = WishboneDMAReader.add_csr
+
+# AXIDMAWriter -------------------------------------------------------------------------------------
+
+class AXIDMAWriter(LiteXModule):
+    """Write data to AXI MMAP memory.
+
+    Contiguous addresses are grouped in INCR bursts (up to ``max_burst_length`` beats, not crossing
+    4KB boundaries), the data of the bursts being buffered in a ``fifo_depth`` FIFO, and up to
+    ``max_pending`` bursts are kept outstanding.
+
+    Parameters
+    ----------
+    bus : bus
+        AXI bus of the SoC to write to.
+
+    Attributes
+    ----------
+    sink : Record("address", "data")
+        Sink for MMAP addresses/datas to be written.
+    """
+    def __init__(self, bus, endianness="little", fifo_depth=512, max_burst_length=256, max_pending=16,
+        with_csr=False, with_byteswap=None):
+        if not isinstance(bus, axi.AXIInterface):
+            raise TypeError("AXIDMAWriter requires an AXI bus.")
+        if "w" not in bus.mode:
+            raise ValueError("AXIDMAWriter requires a writable AXI bus.")
+        check_axi_max_burst_length(bus, max_burst_length)
+        shift = log2_int(bus.data_width//8)
+        self.bus  = bus
+        self.sink = sink = stream.Endpoint([("address", bus.address_width - shift), ("data", bus.data_width)])
+        self.busy = Signal()
+
+        # # #
+
+        # Data FIFO / Bursts FIFO.
+        self.fifo   = fifo   = stream.SyncFIFO([("data", bus.data_width)], depth=fifo_depth)
+        self.bursts = bursts = stream.SyncFIFO([("len", len(bus.aw.len))], depth=max_pending)
+
+        # Sink -> Data FIFO / AW.
+        pending = Signal(max=max_pending + 1)
+        accept, issue = add_axi_burst_requests(self, sink, bus.aw,
+            accept_ok        = fifo.sink.ready,
+            issue_ok         = pending != max_pending,
+            max_burst_length = max_burst_length,
+            data_width       = bus.data_width,
+        )
+        self.comb += [
+            fifo.sink.valid.eq(accept),
+            fifo.sink.data.eq(format_bytes(sink.data, endianness, with_byteswap)),
+            bursts.sink.valid.eq(issue),
+            bursts.sink.len.eq(bus.aw.len),
+        ]
+
+        # Data FIFO -> W (once the burst has been requested).
+        beat = Signal(len(bus.aw.len))
+        self.comb += [
+            bus.w.valid.eq(bursts.source.valid & fifo.source.valid),
+            bus.w.last.eq(beat == bursts.source.len),
+            bus.w.data.eq(fifo.source.data),
+            bus.w.strb.eq(2**(bus.data_width//8)-1),
+            fifo.source.ready.eq(bursts.source.valid & bus.w.ready),
+            bursts.source.ready.eq(fifo.source.valid & bus.w.ready & bus.w.last),
+        ]
+        self.sync += [
+            If(bus.w.valid & bus.w.ready,
+                beat.eq(beat + 1),
+                If(bus.w.last,
+                    beat.eq(0)
+                )
+            )
+        ]
+
+        # B: Outstanding bursts.
+        self.comb += bus.b.ready.eq(1)
+        self.sync += [
+            If(issue & ~bus.b.valid,
+                pending.eq(pending + 1)
+            ).Elif(~issue & bus.b.valid,
+                pending.eq(pending - 1)
+            )
+        ]
+        self.comb += self.busy.eq(fifo.source.valid | (pending != 0))
+
+        # CSRs.
+        if with_csr:
+            self.add_csr()
+
+    # Same control/CSRs than the Wishbone DMA Writer.
+    add_ctrl = WishboneDMAWriter.add_ctrl
+    add_csr  = WishboneDMAWriter.add_csr
+
+# Scatter-Gather DMA -------------------------------------------------------------------------------
+
+# Descriptors are 16-byte aligned linked-list entries in memory, the last one pointing to the first
+# one to create a ring:
+# - 0x0: Buffer address (bytes, aligned on the bus data width).
+# - 0x4: Control: Length (bytes) [23:0], LAST [29], IRQ [30], OWN [31].
+# - 0x8: Next descriptor address (bytes).
+# - 0xc: Reserved (software use).
+# Descriptors with OWN set are processed by the DMA that clears OWN (and updates Length with the
+# transferred length and LAST with the end of packet on writes) once done. The DMA waits on the
+# first descriptor not owned until a kick.
+
+SGDMA_DESCRIPTOR_SIZE = 16
+
+SGDMA_LENGTH_BITS = 24
+SGDMA_LAST        = (1 << 29)
+SGDMA_IRQ         = (1 << 30)
+SGDMA_OWN         = (1 << 31)
+
+sgdma_descriptor_layout = [
+    ("descriptor", 32), # Descriptor address.
+    ("address",    32), # Buffer address.
+    ("length",     SGDMA_LENGTH_BITS),
+    ("eop",         1), # End of packet (LAST).
+    ("irq",         1),
+]
+
+class _SGDMADescriptorFetcher(LiteXModule):
+    """Fetch owned descriptors from the ring (up to `depth` prefetched) and write back completed
+    descriptors. Fetching stops on the oldest in-flight descriptor (queued/processed but not yet
+    written back) when the ring wraps on it."""
+    def __init__(self, bus, depth=4):
+        self.bus       = bus
+        self.enable    = Signal()
+        self.base      = Signal(32)
+        self.kick      = Signal()
+        self.source    = stream.Endpoint(sgdma_descriptor_layout)
+        self.writeback = stream.Endpoint([("descriptor", 32), ("control", 32)])
+        self.idle      = Signal()
+
+        # # #
+
+        ptr     = Signal(32)
+        words   = Array(Signal(32) for _ in range(3))
+        count   = Signal(2)
+        kicked  = Signal()
+        control = words[1]
+
+        # Descriptors FIFO (Prefetch).
+        self.fifo = fifo = ResetInserter()(stream.SyncFIFO(sgdma_descriptor_layout, depth, buffered=True))
+        self.comb += [
+            fifo.reset.eq(~self.enable),
+            fifo.source.connect(self.source),
+        ]
+
+        # In-flight descriptors addresses (queued or processed, written back in order).
+        self.inflight = inflight = ResetInserter()(stream.SyncFIFO([("descriptor", 32)], depth + 2))
+        ptr_inflight = Signal()
+        self.comb += [
+            inflight.reset.eq(~self.enable),
+            inflight.sink.descriptor.eq(ptr),
+            inflight.sink.valid.eq(fifo.sink.valid & fifo.sink.ready),
+            inflight.source.ready.eq(self.writeback.valid & self.writeback.ready),
+            ptr_inflight.eq(inflight.source.valid & (inflight.source.descriptor == ptr)),
+        ]
+
+        # Kick (sticky until next fetch).
+        self.sync += [
+            If(~self.enable,
+                kicked.eq(0)
+            ).Elif(self.kick,
+                kicked.eq(1)
+            )
+        ]
+
+        self.comb += [
+            bus.sel.eq(2**(bus.data_width//8)-1),
+            fifo.sink.descriptor.eq(ptr),
+            fifo.sink.address.eq(words[0]),
+            fifo.sink.length.eq(control[:SGDMA_LENGTH_BITS]),
+            fifo.sink.eop.eq((control & SGDMA_LAST) != 0),
+            fifo.sink.irq.eq((control & SGDMA_IRQ) != 0),
+        ]
+
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += fsm.reset.eq(~self.enable)
+        fsm.act("IDLE",
+            NextValue(ptr, self.base),
+            NextState("FETCH")
+        )
+        fsm.act("FETCH",
+            NextValue(count, 0),
+            If(self.writeback.valid,
+                NextState("WRITEBACK")
+            ).Elif(fifo.sink.ready & inflight.sink.ready & ~ptr_inflight,
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.adr.eq(ptr[2:] + count),
+            If(bus.ack,
+                NextValue(words[count], bus.dat_r),
+                NextValue(count, count + 1),
+                If(count == 2,
+                    NextState("CHECK")
+                )
+            )
+        )
+        fsm.act("CHECK",
+            If((control & SGDMA_OWN) != 0,
+                fifo.sink.valid.eq(1),
+                NextValue(ptr, words[2]),
+                NextState("FETCH")
+            ).Else(
+                NextValue(kicked, 0),
+                NextState("WAIT")
+            )
+        )
+        fsm.act("WAIT",
+            self.idle.eq(fifo.level == 0),
+            NextValue(count, 0),
+            If(self.writeback.valid,
+                NextState("WRITEBACK")
+            ).Elif(kicked,
+                NextState("FETCH")
+            )
+        )
+        fsm.act("WRITEBACK",
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.we.eq(1),
+            bus.adr.eq(self.writeback.descriptor[2:] + 1),
+            bus.dat_w.eq(self.writeback.control),
+            If(bus.ack,
+                self.writeback.ready.eq(1),
+                NextState("FETCH")
+            )
+        )
+
+
+class _WishboneSGDMA(LiteXModule):
+    def __init__(self, bus, prefetch_depth, burst_length, bursting):
+        if not isinstance(bus, wishbone.Interface):
+            raise TypeError("SGDMA requires a Wishbone bus.")
+        if bus.addressing != "word":
+            raise ValueError("SGDMA requires a word-addressed Wishbone bus.")
+        if bursting is None:
+            bursting = bus.bursting
+        self.bus = bus
+
+        # Control/Status.
+        self.enable    = Signal()
+        self.base      = Signal(32)
+        self.kick      = Signal()
+        self.idle      = Signal()
+        self.completed = Signal(32)
+        self.irq       = Signal()
+        self.irq_count   = Signal(8, reset=1)
+        self.irq_timeout = Signal(32)
+
+        # # #
+
+        # Buses: Descriptors (32-bit) and Data (Bus data width) arbitrated on Bus.
+        self.data_bus = wishbone.Interface(data_width=bus.data_width, adr_width=bus.adr_width)
+        self.desc_bus = wishbone.Interface(data_width=32, adr_width=bus.adr_width + log2_int(bus.data_width//32))
+        if bus.data_width != 32:
+            desc_bus = wishbone.Interface(data_width=bus.data_width, adr_width=bus.adr_width)
+            self.desc_converter = wishbone.Converter(self.desc_bus, desc_bus)
+        else:
+            desc_bus = self.desc_bus
+        shared = bus
+        if bus.pipelined:
+            shared = wishbone.Interface(data_width=bus.data_width, adr_width=bus.adr_width, bursting=bus.bursting)
+            self.bus_converter = wishbone.Converter(shared, bus)
+        self.arbiter = wishbone.Arbiter([self.data_bus, desc_bus], shared)
+
+        # Descriptors Fetcher.
+        self.fetcher = fetcher = _SGDMADescriptorFetcher(self.desc_bus, depth=prefetch_depth)
+        self.comb += [
+            fetcher.enable.eq(self.enable),
+            fetcher.base.eq(self.base),
+            fetcher.kick.eq(self.kick),
+        ]
+
+        # Descriptor/Data Engine.
+        self.shift   = shift = log2_int(bus.data_width//8)
+        self.desc    = desc  = Record(sgdma_descriptor_layout)
+        self.offset  = Signal(SGDMA_LENGTH_BITS)
+        self.words   = Signal(SGDMA_LENGTH_BITS)
+        self.adr     = Signal(bus.adr_width)
+        self.beat_last  = Signal()
+        self.burst_last = Signal()
+        self.comb += [
+            self.words.eq((desc.length + (2**shift - 1))[shift:]),
+            self.adr.eq(desc.address[shift:] + self.offset),
+            self.beat_last.eq(self.offset == (self.words - 1)),
+            self.burst_last.eq(self.beat_last),
+        ]
+        if bursting:
+            if burst_length > 1:
+                burst_bits = log2_int(burst_length)
+                self.comb += If(self.adr[:burst_bits] == (burst_length - 1), self.burst_last.eq(1))
+            add_wishbone_burst_cti(
+                module   = self,
+                bus      = self.data_bus,
+                last     = self.burst_last,
+                bursting = True,
+            )
+
+        # Interrupt Coalescing: Interrupt after irq_count IRQ descriptors or irq_timeout cycles
+        # after the first pending one (each when non-zero).
+        self.irq_event = Signal()
+        irq_pending = Signal(8)
+        irq_timer   = Signal(32)
+        self.sync += [
+            If(~self.enable,
+                irq_pending.eq(0),
+                irq_timer.eq(0),
+                self.completed.eq(0),
+            ).Elif(self.irq,
+                irq_pending.eq(self.irq_event),
+                irq_timer.eq(0),
+            ).Else(
+                If(self.irq_event,
+                    irq_pending.eq(irq_pending + 1)
+                ),
+                If(irq_pending != 0,
+                    irq_timer.eq(irq_timer + 1)
+                )
+            ),
+            If(fetcher.writeback.valid & fetcher.writeback.ready,
+                self.completed.eq(self.completed + 1)
+            )
+        ]
+        self.comb += [
+            self.irq.eq(
+                ((self.irq_count   != 0) & (irq_pending >= self.irq_count)) |
+                ((self.irq_timeout != 0) & (irq_pending != 0) & (irq_timer >= self.irq_timeout))
+            ),
+        ]
+
+        # Idle.
+        self.engine_idle = Signal()
+        self.comb += self.idle.eq(fetcher.idle & self.engine_idle & ~fetcher.writeback.valid)
+
+    def complete(self, control):
+        """Write back the current descriptor with `control` and generate the IRQ event (to use in
+        an FSM state, completed on writeback.ready)."""
+        writeback = self.fetcher.writeback
+        return [
+            writeback.valid.eq(1),
+            writeback.descriptor.eq(self.desc.descriptor),
+            writeback.control.eq(control),
+            If(writeback.ready,
+                self.irq_event.eq(self.desc.irq)
+            )
+        ]
+
+    def add_csr(self, name, default_irq_count=1):
+        self._base        = CSRStorage(32, description=f"{name} first descriptor address.")
+        self._enable      = CSRStorage(description=f"{name} enable (descriptors ring restarts from base).")
+        self._kick        = CSR()
+        self._kick.description = f"{name} kick: re-fetch descriptors after giving them to the DMA."
+        self._idle        = CSRStatus(description=f"{name} idle (waiting on a not owned descriptor).")
+        self._completed   = CSRStatus(32, description=f"{name} completed descriptors count.")
+        self._irq_count   = CSRStorage(8, reset=default_irq_count, description=f"{name} IRQ descriptors count before interrupt (0: disabled).")
+        self._irq_timeout = CSRStorage(32, description=f"{name} interrupt timeout (cycles) after the first pending IRQ descriptor (0: disabled).")
+
+        self.ev = EventManager()
+        self.ev.done = EventSourcePulse(description=f"{name} IRQ descriptor(s) completed.")
+        self.ev.finalize()
+
+        # # #
+
+        self.comb += [
+            # Control.
+            self.base.eq(self._base.storage),
+            self.enable.eq(self._enable.storage),
+            self.kick.eq(self._kick.re),
+            self.irq_count.eq(self._irq_count.storage),
+            self.irq_timeout.eq(self._irq_timeout.storage),
+            # Status.
+            self._idle.status.eq(self.idle),
+            self._completed.status.eq(self.completed),
+            # IRQ.
+            self.ev.done.trigger.eq(self.irq),
+        ]
+
+# WishboneSGDMAReader ------------------------------------------------------------------------------
+
+class WishboneSGDMAReader(_WishboneSGDMA):
+    """Read data from Wishbone MMAP memory described by a Scatter-Gather descriptors ring.
+
+    The buffers of the owned descriptors are read (with `burst_length` aligned bursts on bursting
+    buses) and streamed on the source, source.last being set at the end of the descriptors with
+    LAST set. Up to `prefetch_depth` descriptors are fetched ahead of the transfers.
+
+    Parameters
+    ----------
+    bus : bus
+        Wishbone bus of the SoC to read from (descriptors and data).
+
+    Attributes
+    ----------
+    source : Record("data")
+        Source for MMAP word results from reading.
+    """
+    def __init__(self, bus, endianness="little", fifo_depth=16, prefetch_depth=4, burst_length=8,
+        bursting=None, with_csr=False, with_byteswap=None):
+        _WishboneSGDMA.__init__(self, bus, prefetch_depth, burst_length, bursting)
+
+        # # #
+
+        # Reader.
+        self.reader = reader = WishboneDMAReader(self.data_bus,
+            endianness    = endianness,
+            fifo_depth    = fifo_depth,
+            bursting      = False,
+            with_byteswap = with_byteswap,
+        )
+        self.source = reader.source
+
+        # FSM.
+        desc = self.desc
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += fsm.reset.eq(~self.enable)
+        fsm.act("IDLE",
+            self.engine_idle.eq(reader.fifo.level == 0),
+            self.fetcher.source.ready.eq(1),
+            If(self.fetcher.source.valid,
+                NextValue(desc.raw_bits(), self.fetcher.source.payload.raw_bits()),
+                NextValue(self.offset, 0),
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            If(self.words == 0,
+                NextState("COMPLETE")
+            ).Else(
+                reader.sink.valid.eq(1),
+                reader.sink.address.eq(self.adr),
+                reader.sink.last.eq(self.beat_last & desc.eop),
+                If(reader.sink.ready,
+                    NextValue(self.offset, self.offset + 1),
+                    If(self.beat_last,
+                        NextState("COMPLETE")
+                    )
+                )
+            )
+        )
+        fsm.act("COMPLETE",
+            *self.complete(Cat(desc.length, Constant(0, 5), desc.eop, desc.irq, Constant(0, 1))),
+            If(self.fetcher.writeback.ready,
+                NextState("IDLE")
+            )
+        )
+
+        # CSRs.
+        if with_csr:
+            self.add_csr("DMA Reader")
+
+# WishboneSGDMAWriter ------------------------------------------------------------------------------
+
+class WishboneSGDMAWriter(_WishboneSGDMA):
+    """Write stream data to Wishbone MMAP memory described by a Scatter-Gather descriptors ring.
+
+    The sink is written to the buffers of the owned descriptors (with `burst_length` aligned bursts
+    on bursting buses), a descriptor is completed when its buffer is full or on sink.last (LAST is
+    then set in the written back descriptor, Length being the transferred length). Up to
+    `prefetch_depth` descriptors are fetched ahead of the transfers.
+
+    Parameters
+    ----------
+    bus : bus
+        Wishbone bus of the SoC to write to (descriptors and data).
+
+    Attributes
+    ----------
+    sink : Record("data")
+        Sink for MMAP words to be written.
+    """
+    def __init__(self, bus, endianness="little", prefetch_depth=4, burst_length=8, bursting=None,
+        with_csr=False, with_byteswap=None):
+        _WishboneSGDMA.__init__(self, bus, prefetch_depth, burst_length, bursting)
+        self.sink = sink = stream.Endpoint([("data", bus.data_width)])
+
+        # # #
+
+        # Writer.
+        self.writer = writer = WishboneDMAWriter(self.data_bus,
+            endianness    = endianness,
+            bursting      = False,
+            with_byteswap = with_byteswap,
+        )
+
+        # FSM.
+        desc = self.desc
+        eop  = Signal()
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += fsm.reset.eq(~self.enable)
+        fsm.act("IDLE",
+            self.engine_idle.eq(1),
+            self.fetcher.source.ready.eq(1),
+            If(self.fetcher.source.valid,
+                NextValue(desc.raw_bits(), self.fetcher.source.payload.raw_bits()),
+                NextValue(self.offset, 0),
+                NextValue(eop, 0),
+                NextState("WRITE")
+            )
+        )
+        fsm.act("WRITE",
+            If(self.words == 0,
+                NextState("COMPLETE")
+            ).Else(
+                writer.sink.valid.eq(sink.valid),
+                writer.sink.address.eq(self.adr),
+                writer.sink.data.eq(sink.data),
+                sink.ready.eq(writer.sink.ready),
+                If(sink.valid & sink.ready,
+                    NextValue(self.offset, self.offset + 1),
+                    If(self.beat_last | sink.last,
+                        NextValue(eop, sink.last),
+                        NextState("COMPLETE")
+                    )
+                )
+            )
+        )
+        length = Signal(SGDMA_LENGTH_BITS)
+        self.comb += length.eq(Mux(self.offset == self.words, desc.length, self.offset << self.shift))
+        fsm.act("COMPLETE",
+            *self.complete(Cat(length, Constant(0, 5), eop, desc.irq, Constant(0, 1))),
+            If(self.fetcher.writeback.ready,
+                NextState("IDLE")
+            )
+        )
+
+        # CSRs.
+        if with_csr:
+            self.add_csr("DMA Writer")
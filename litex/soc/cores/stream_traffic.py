@@ -0,0 +1,316 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Stream traffic generator/checker for bandwidth benchmarking.
+
+StreamTrafficGenerator generates packets on a stream source (configurable packet length with
+optional random lengths, inter-packet gap and number of packets) and StreamTrafficChecker checks
+them on a stream sink. The first beat of each packet carries the packet sequence number and the
+following beats carry a PRBS (or counter) payload restarted on each packet (so that the checker
+resynchronizes after lost packets). Both cores count packets/bytes and measure the cycles between
+their first and last transfers (cycle-accurate throughput).
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.cores.prbs import PRBS15Generator, PRBS31Generator
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def traffic_description(data_width):
+    return [("data", data_width)]
+
+
+class _TrafficPayload(LiteXModule):
+    """Expected payload of the beats of a packet (sequence number, then PRBS or counter words)."""
+    def __init__(self, data_width, seq_width):
+        self.clear   = Signal()
+        self.prbs    = Signal()
+        self.advance = Signal() # Beat transferred.
+        self.restart = Signal() # Packet transferred.
+        self.seq     = Signal(seq_width)
+        self.first   = Signal(reset=1)
+        self.data    = Signal(data_width)
+
+        # # #
+
+        prbs    = ResetInserter()(CEInserter()(PRBS31Generator(data_width)))
+        counter = Signal(data_width)
+        self.submodules += prbs
+        self.comb += [
+            prbs.ce.eq(self.advance),
+            prbs.reset.eq(self.clear | self.restart),
+        ]
+        self.sync += [
+            If(self.clear,
+                self.first.eq(1),
+                counter.eq(0),
+                self.seq.eq(0),
+            ).Elif(self.restart,
+                self.first.eq(1),
+                counter.eq(0),
+                self.seq.eq(self.seq + 1),
+            ).Elif(self.advance,
+                self.first.eq(0),
+                counter.eq(counter + 1),
+            )
+        ]
+        self.comb += [
+            If(self.first,
+                self.data.eq(self.seq),
+            ).Elif(self.prbs,
+                self.data.eq(prbs.o),
+            ).Else(
+                self.data.eq(counter),
+            )
+        ]
+
+
+class _TrafficCounters(LiteXModule):
+    """Packets/bytes counters and cycles between the first and last transfers."""
+    def __init__(self, endpoint, bytes_per_beat):
+        self.clear   = Signal()
+        self.packets = Signal(32)
+        self.bytes   = Signal(64)
+        self.cycles  = Signal(64)
+
+        # # #
+
+        running  = Signal()
+        elapsed  = Signal(64)
+        transfer = Signal()
+        self.comb += transfer.eq(endpoint.valid & endpoint.ready)
+        self.sync += [
+            If(self.clear,
+                running.eq(0),
+                elapsed.eq(0),
+                self.packets.eq(0),
+                self.bytes.eq(0),
+                self.cycles.eq(0),
+            ).Else(
+                If(running | transfer,
+                    running.eq(1),
+                    elapsed.eq(elapsed + 1),
+                ),
+                If(transfer,
+                    self.bytes.eq(self.bytes + bytes_per_beat),
+                    self.cycles.eq(elapsed + 1),
+                    If(endpoint.last,
+                        self.packets.eq(self.packets + 1)
+                    )
+                )
+            )
+        ]
+
+# Stream Traffic Generator -------------------------------------------------------------------------
+
+class StreamTrafficGenerator(LiteXModule):
+    """Stream traffic generator.
+
+    When enabled, `count` packets (or packets continuously when 0) of `length` beats (plus
+    `length_mask` masked random beats) are generated on `source`, separated by `gap` idle cycles.
+    `done` is set at the end of the run; packets/bytes/cycles are cleared when enabled.
+    """
+    def __init__(self, data_width=32, seq_width=32, with_csr=True):
+        self.source = source = stream.Endpoint(traffic_description(data_width))
+        self.enable      = Signal()
+        self.prbs        = Signal(reset=1)
+        self.length      = Signal(16, reset=64)
+        self.length_mask = Signal(16)
+        self.gap         = Signal(16)
+        self.count       = Signal(32)
+        self.done        = Signal()
+
+        # # #
+
+        bytes_per_beat = max(data_width//8, 1)
+
+        # Payload.
+        self.payload = payload = _TrafficPayload(data_width, min(seq_width, data_width))
+        transfer = source.valid & source.ready
+        self.comb += [
+            payload.clear.eq(~self.enable),
+            payload.prbs.eq(self.prbs),
+            payload.advance.eq(transfer),
+            payload.restart.eq(transfer & source.last),
+            source.data.eq(payload.data),
+            source.first.eq(payload.first),
+        ]
+
+        # Counters.
+        self.counters = counters = _TrafficCounters(source, bytes_per_beat)
+        enable_d = Signal()
+        self.sync += enable_d.eq(self.enable)
+        self.comb += counters.clear.eq(self.enable & ~enable_d)
+
+        # Random lengths.
+        random = PRBS15Generator(16)
+        self.submodules += random
+        next_length = Signal(17)
+        self.comb += next_length.eq(Mux(self.length == 0, 1, self.length) + (random.o & self.length_mask))
+
+        # FSM.
+        beat    = Signal(17)
+        length  = Signal(17)
+        gap     = Signal(16)
+        packets = Signal(32)
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += fsm.reset.eq(~self.enable)
+        fsm.act("IDLE",
+            NextValue(packets, 0),
+            NextValue(beat,    0),
+            NextValue(length,  next_length),
+            NextState("SEND"),
+        )
+        fsm.act("SEND",
+            source.valid.eq(1),
+            source.last.eq(beat == (length - 1)),
+            If(source.ready,
+                NextValue(beat, beat + 1),
+                If(source.last,
+                    NextValue(packets, packets + 1),
+                    NextValue(gap, 1),
+                    If((self.count != 0) & (packets == (self.count - 1)),
+                        NextState("DONE")
+                    ).Elif(self.gap != 0,
+                        NextState("GAP")
+                    ).Else(
+                        NextValue(beat,   0),
+                        NextValue(length, next_length),
+                    )
+                )
+            )
+        )
+        fsm.act("GAP",
+            NextValue(gap, gap + 1),
+            If(gap == self.gap,
+                NextValue(beat,   0),
+                NextValue(length, next_length),
+                NextState("SEND")
+            )
+        )
+        fsm.act("DONE",
+            self.done.eq(1)
+        )
+
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._enable      = CSRStorage(description="Generator enable (start a run, clears the counters).")
+        self._prbs        = CSRStorage(reset=1, description="PRBS payload (else counter payload).")
+        self._length      = CSRStorage(16, reset=64, description="Packet length (in beats).")
+        self._length_mask = CSRStorage(16, description="Packet length random increment mask (in beats).")
+        self._gap         = CSRStorage(16, description="Inter-packet gap (in cycles).")
+        self._count       = CSRStorage(32, description="Number of packets to generate (0: continuous).")
+        self._done        = CSRStatus(description="Generator run done.")
+        self._packets     = CSRStatus(32, description="Generated packets.")
+        self._bytes       = CSRStatus(64, description="Generated bytes.")
+        self._cycles      = CSRStatus(64, description="Cycles between the first and last generated beats.")
+
+        # # #
+
+        self.comb += [
+            # Control.
+            self.enable.eq(self._enable.storage),
+            self.prbs.eq(self._prbs.storage),
+            self.length.eq(self._length.storage),
+            self.length_mask.eq(self._length_mask.storage),
+            self.gap.eq(self._gap.storage),
+            self.count.eq(self._count.storage),
+            # Status.
+            self._done.status.eq(self.done),
+            self._packets.status.eq(self.counters.packets),
+            self._bytes.status.eq(self.counters.bytes),
+            self._cycles.status.eq(self.counters.cycles),
+        ]
+
+# Stream Traffic Checker ---------------------------------------------------------------------------
+
+class StreamTrafficChecker(LiteXModule):
+    """Stream traffic checker.
+
+    Checks the packets generated by a StreamTrafficGenerator on `sink` (always ready): `errors`
+    counts the payload beats that differ from the expected PRBS/counter payload and `seq_errors`
+    the packets with an unexpected sequence number (lost, duplicated or reordered packets).
+    Counters are cleared with `clear`.
+    """
+    def __init__(self, data_width=32, seq_width=32, with_csr=True):
+        self.sink = sink = stream.Endpoint(traffic_description(data_width))
+        self.clear      = Signal()
+        self.prbs       = Signal(reset=1)
+        self.errors     = Signal(32)
+        self.seq_errors = Signal(32)
+
+        # # #
+
+        bytes_per_beat = max(data_width//8, 1)
+        seq_width      = min(seq_width, data_width)
+
+        # Expected payload.
+        self.payload = payload = _TrafficPayload(data_width, seq_width)
+        transfer = Signal()
+        self.comb += [
+            sink.ready.eq(1),
+            transfer.eq(sink.valid & sink.ready),
+            payload.clear.eq(self.clear),
+            payload.prbs.eq(self.prbs),
+            payload.advance.eq(transfer),
+            payload.restart.eq(transfer & sink.last),
+        ]
+
+        # Counters.
+        self.counters = counters = _TrafficCounters(sink, bytes_per_beat)
+        self.comb += counters.clear.eq(self.clear)
+
+        # Checks (resynchronize on received sequence numbers).
+        seq = Signal(seq_width)
+        self.sync += [
+            If(self.clear,
+                seq.eq(0),
+                self.errors.eq(0),
+                self.seq_errors.eq(0),
+            ).Elif(transfer,
+                If(payload.first,
+                    seq.eq(sink.data[:seq_width] + 1),
+                    If(sink.data[:seq_width] != seq,
+                        self.seq_errors.eq(self.seq_errors + 1)
+                    )
+                ).Elif(sink.data != payload.data,
+                    self.errors.eq(self.errors + 1)
+                )
+            )
+        ]
+
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._reset      = CSR()
+        self._prbs       = CSRStorage(reset=1, description="PRBS payload (else counter payload).")
+        self._packets    = CSRStatus(32, description="Received packets.")
+        self._bytes      = CSRStatus(64, description="Received bytes.")
+        self._cycles     = CSRStatus(64, description="Cycles between the first and last received beats.")
+        self._errors     = CSRStatus(32, description="Payload errors (beats).")
+        self._seq_errors = CSRStatus(32, description="Sequence errors (packets).")
+
+        # # #
+
+        self.comb += [
+            # Control.
+            self.clear.eq(self._reset.re),
+            self.prbs.eq(self._prbs.storage),
+            # Status.
+            self._packets.status.eq(self.counters.packets),
+            self._bytes.status.eq(self.counters.bytes),
+            self._cycles.status.eq(self.counters.cycles),
+            self._errors.status.eq(self.errors),
+            self._seq_errors.status.eq(self.seq_errors),
+        ]
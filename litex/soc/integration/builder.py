@@ -15,8 +15,10 @@
 import os
 import sys
 import shutil
+import hashlib
 import inspect
 import argparse
+import tempfile
 import subprocess
 
 from packaging.version import Version
@@ -25,6 +27,8 @@ from litex import get_data_mod
 from litex.gen import colorer
 
 from litex.build.bundle import BuildBundle, get_pythonpath_roots, remap_path
+from litex.build.bundle import _EXCLUDED_DIR_NAMES, _file_digest
+from litex.build.artifact_cache import get_artifact_cache
 from litex.build.tools import write_to_file
 from litex.build.log import build_log_context
 
@@ -51,8 +55,35 @@ def _create_dir(d, remove_if_exists=False):
         shutil.rmtree(dir_path)
     os.makedirs(dir_path, exist_ok=True)
 
+def _update_tree_digest(h, path):
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in _EXCLUDED_DIR_NAMES)
+        for filename in sorted(files):
+            full_path = os.path.join(root, filename)
+            h.update(os.path.relpath(full_path, path).encode("utf-8"))
+            h.update(b"\0")
+            h.update(_file_digest(full_path).encode("utf-8"))
+            h.update(b"\0")
+
+def _get_compiler_version(variables_contents):
+    variables = dict(line.split("=", 1) for line in variables_contents.splitlines() if "=" in line)
+    triple    = variables.get("TRIPLE", "")
+    if variables.get("CLANG", "0") == "1":
+        cc = "clang"
+    elif triple == "--native--":
+        cc = "gcc"
+    else:
+        cc = f"{triple}-gcc"
+    try:
+        return subprocess.check_output([cc, "--version"], stderr=subprocess.DEVNULL).decode("utf-8")
+    except (OSError, subprocess.CalledProcessError):
+        return cc
+
 # Software Packages --------------------------------------------------------------------------------
 
+# Marker (holding the cache key) written in software package directories restored from software cache.
+_SOFTWARE_CACHE_MARKER = ".litex_software_cache"
+
 soc_software_packages = [
     # picolibc
     "libc",
@@ -88,6 +119,10 @@ class Builder:
         # Compilation.
         compile_software = True,
         compile_gateware = True,
+        export_only      = False,
+        force_rebuild    = False,
+        artifact_cache   = None,
+        software_cache   = None,
         build_backend    = "litex",
         build_log        = True,
 
@@ -134,6 +169,10 @@ class Builder:
         # Compilation.
         self.compile_software = compile_software
         self.compile_gateware = compile_gateware
+        self.export_only      = export_only
+        self.force_rebuild    = force_rebuild
+        self.artifact_cache   = artifact_cache or os.getenv("LITEX_ARTIFACT_CACHE")
+        self.software_cache   = software_cache or os.getenv("LITEX_SOFTWARE_CACHE")
         self.build_backend    = build_backend
         self.build_log        = build_log
 
@@ -406,18 +445,102 @@ class Builder:
         for name, src_dir in self.software_packages:
             _create_dir(os.path.join(self.software_dir, name))
 
+    def _get_software_cache_key(self):
+        # Common key of all software packages: toolchain/flags/paths (variables.mak), generated
+        # headers/linker scripts and shared LiteX software sources. Build directory specific paths
+        # are normalized so that identical software can be shared between build directories.
+        h = hashlib.sha256()
+        def update(data):
+            h.update(data.encode("utf-8") if isinstance(data, str) else data)
+            h.update(b"\0")
+        variables_contents = self._get_variables_contents()
+        update(variables_contents.replace(self.include_dir, "<include_dir>"))
+        update(_get_compiler_version(variables_contents))
+        for name in ["picolibc", "compiler_rt"]:
+            update(getattr(get_data_mod("software", name), "version_str", ""))
+        for filename in sorted(os.listdir(self.generated_dir)):
+            path = os.path.join(self.generated_dir, filename)
+            if filename != "variables.mak" and os.path.isfile(path):
+                update(filename)
+                with open(path, "rb") as f:
+                    update(f.read().replace(self.include_dir.encode("utf-8"), b"<include_dir>"))
+        update(_file_digest(os.path.join(soc_directory, "software", "common.mak")))
+        _update_tree_digest(h, os.path.join(soc_directory, "software", "include"))
+        _update_tree_digest(h, os.path.dirname(inspect.getfile(self.soc.cpu.__class__)))
+        return h.hexdigest()
+
+    @staticmethod
+    def _get_software_package_key(key, name, src_dir):
+        # Packages are chained: a package is only reused when all packages built before it are.
+        h = hashlib.sha256()
+        h.update(f"{key}\0{name}\0".encode("utf-8"))
+        _update_tree_digest(h, src_dir)
+        return h.hexdigest()
+
+    def _restore_software_package(self, cache, key, dst_dir):
+        marker     = os.path.join(dst_dir, _SOFTWARE_CACHE_MARKER)
+        marker_key = None
+        if os.path.exists(marker):
+            with open(marker) as f:
+                marker_key = f.read()
+        if marker_key == key:
+            return True
+        with tempfile.TemporaryDirectory(dir=self.software_dir) as tmp_dir:
+            tmp_dst_dir = os.path.join(tmp_dir, "package")
+            try:
+                restored = cache.get(key, lambda name: os.path.join(tmp_dst_dir, name))
+            except Exception as e:
+                print(colorer(f"Unable to read software cache ({e}).", color="red"))
+                restored = None
+            if restored is None:
+                # Objects/dependencies restored for another key/build directory would confuse make.
+                if marker_key is not None:
+                    _create_dir(dst_dir, remove_if_exists=True)
+                return False
+            os.makedirs(tmp_dst_dir, exist_ok=True)
+            with open(os.path.join(tmp_dst_dir, _SOFTWARE_CACHE_MARKER), "w") as f:
+                f.write(key)
+            shutil.rmtree(dst_dir, ignore_errors=True)
+            shutil.move(tmp_dst_dir, dst_dir)
+        return True
+
+    def _store_software_package(self, cache, key, dst_dir):
+        files = {}
+        for root, dirs, filenames in os.walk(dst_dir):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                if os.path.isfile(path) and not os.path.islink(path):
+                    files[os.path.relpath(path, dst_dir).replace(os.sep, "/")] = path
+        try:
+            cache.put(key, files)
+        except Exception as e:
+            print(colorer(f"Unable to store software to software cache ({e}).", color="red"))
+
     def _generate_rom_software(self, compile_bios=True):
         # Compile all software packages.
         cpu_count = os.cpu_count() or 1
+        cache     = get_artifact_cache(self.software_cache) if self.compile_software else None
+        key       = self._get_software_cache_key() if cache is not None else None
         for name, src_dir in self.software_packages:
             # Skip BIOS compilation when disabled.
             if name == "bios" and not compile_bios:
                 continue
-            # Compile software package.
+            # Compile software package (or reuse it from software cache).
             dst_dir  = os.path.join(self.software_dir, name)
             makefile = os.path.join(src_dir, "Makefile")
             if self.compile_software:
+                if cache is not None:
+                    key = self._get_software_package_key(key, name, src_dir)
+                    if self._restore_software_package(cache, key, dst_dir):
+                        print(colorer(f"Reusing {name} from software cache ({key[:12]}).", color="yellow"))
+                        continue
+                elif os.path.exists(os.path.join(dst_dir, _SOFTWARE_CACHE_MARKER)):
+                    # Objects/dependencies restored from software cache (for another build directory)
+                    # would confuse make.
+                    _create_dir(dst_dir, remove_if_exists=True)
                 subprocess.check_call(["make", f"-j{cpu_count}", "-C", dst_dir, "-f", makefile])
+                if cache is not None:
+                    self._store_software_package(cache, key, dst_dir)
 
     def _initialize_rom_software(self):
         # Get BIOS data from compiled BIOS binary.
@@ -565,6 +688,11 @@ class Builder:
         # Export SoC Mapping.
         self._generate_csr_map()
 
+        # Export only: stop once SoC mapping/software headers are generated (no software build, no
+        # gateware lowering/Verilog generation).
+        if self.export_only:
+            return None
+
         # Archive resolved build inputs before invoking external tools.
         self._create_build_bundle(
             with_bios        = with_bios,
@@ -598,6 +726,10 @@ class Builder:
                     # Only initialize if not already initialized.
                     if not getattr(self.soc, "rom").mem.init:
                         self._initialize_rom_software()
+                        # BIOS build time (__DATE__/__TIME__) is compiled into the ROM contents.
+                        if self.compile_gateware and ("CONFIG_BIOS_NO_BUILD_TIME" not in self.soc.constants):
+                            print(colorer("BIOS build time changes the ROM contents on each build: toolchain run "
+                                "can't be skipped/restored from artifact cache (--no-ident-version to allow it).", color="yellow"))
 
         # Translate compile_gateware to run.
         if "run" not in kwargs:
@@ -608,6 +740,19 @@ class Builder:
 
         kwargs["build_backend"] = self.build_backend
 
+        # Only forwarded when set and supported by the toolchain.
+        if self.force_rebuild and "force_rebuild" not in kwargs:
+            if self._toolchain_supports("force_rebuild"):
+                kwargs["force_rebuild"] = True
+            else:
+                print(colorer("force_rebuild ignored: not supported by the toolchain.", color="yellow"))
+        if self.artifact_cache and "artifact_cache" not in kwargs:
+            if self._toolchain_supports("artifact_cache"):
+                kwargs["artifact_cache"]  = self.artifact_cache
+                kwargs["extra_artifacts"] = self._get_extra_artifacts()
+            else:
+                print(colorer("artifact_cache ignored: not supported by the toolchain.", color="yellow"))
+
         # Build SoC and pass Verilog Name Space to do_exit.
         vns = self.soc.build(build_dir=self.gateware_dir, **kwargs)
         self.soc.do_exit(vns=vns)
@@ -623,6 +768,23 @@ class Builder:
 
         return vns
 
+    def _toolchain_supports(self, arg):
+        # Check that the toolchain build explicitly accepts arg (not only through **kwargs).
+        toolchain = getattr(self.soc.platform, "toolchain", None)
+        if not hasattr(toolchain, "build"):
+            return False
+        return arg in inspect.signature(toolchain.build).parameters
+
+    def _get_extra_artifacts(self):
+        # Exports/Software stored along with the gateware in the artifact cache.
+        artifacts = {
+            "csr.json" : self.csr_json,
+            "csr.csv"  : self.csr_csv,
+            "csr.svd"  : self.csr_svd,
+            "bios.bin" : self.get_bios_filename(),
+        }
+        return {name: path for name, path in artifacts.items() if path is not None}
+
     def get_bios_filename(self):
         return os.path.join(self.software_dir, "bios", "bios.bin")
 
@@ -653,6 +815,10 @@ def builder_args(parser):
     builder_group.add_argument("--no-compile",            action="store_true", help="Disable software and gateware compilation.")
     builder_group.add_argument("--no-compile-software",   action="store_true", help="Disable software compilation only.")
     builder_group.add_argument("--no-compile-gateware",   action="store_true", help="Disable gateware compilation only.")
+    builder_group.add_argument("--export-only",           action="store_true", help="Only finalize the SoC and generate SoC mapping exports/software headers (no software/gateware build, no Verilog).")
+    builder_group.add_argument("--force-rebuild",         action="store_true", help="Force gateware toolchain run even when inputs are unchanged since last build.")
+    builder_group.add_argument("--artifact-cache",        default=None,        help="Shared gateware artifact cache (directory or HTTP(S)/S3 URL, default: $LITEX_ARTIFACT_CACHE).")
+    builder_group.add_argument("--software-cache",        default=None,        help="Shared compiled software/BIOS cache (directory or HTTP(S)/S3 URL, default: $LITEX_SOFTWARE_CACHE).")
     builder_group.add_argument("--soc-csv", "--csr-csv",  default=None,        help=f"Write SoC mapping to the specified CSV file (always generated, default: <output-dir>/csr.csv). {export_help}")
     builder_group.add_argument("--soc-json", "--csr-json", default=None,       help=f"Write SoC mapping to the specified JSON file (always generated, default: <output-dir>/csr.json). {export_help}")
     builder_group.add_argument("--soc-svd", "--csr-svd",  default=None,        help=f"Write SoC mapping to the specified SVD file. {export_help}")
@@ -687,6 +853,10 @@ def builder_argdict(args):
         "build_log"                : args.build_log,
         "compile_software"         : (not args.no_compile) and (not args.no_compile_software),
         "compile_gateware"         : (not args.no_compile) and (not args.no_compile_gateware),
+        "export_only"              : args.export_only,
+        "force_rebuild"            : args.force_rebuild,
+        "artifact_cache"           : args.artifact_cache,
+        "software_cache"           : args.software_cache,
         "csr_csv"                  : args.soc_csv,
         "csr_json"                 : args.soc_json,
         "csr_svd"                  : args.soc_svd,
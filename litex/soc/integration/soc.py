@@ -21,6 +21,7 @@ from litex.gen                import colorer
 from litex.gen                import LiteXModule, LiteXContext
 from litex.build.log         import buffer_build_log, start_pending_build_log
 from litex.gen.genlib.misc    import WaitTimer
+from litex.gen.genlib.decoder import TreeDecoder
 from litex.gen.fhdl.hierarchy import LiteXHierarchyExplorer
 
 from litex.soc.interconnect.csr              import *
@@ -107,10 +108,16 @@ def SoCConstant(value):
 # SoCRegion ----------------------------------------------------------------------------------------
 
 class SoCRegion:
-    def __init__(self, origin=None, size=None, mode="rw", cached=True, linker=False, decode=True):
+    def __init__(self, origin=None, size=None, mode="rw", cached=True, linker=False, decode=True, pipeline=None):
         self.logger    = logging.getLogger("SoCRegion")
         self.origin    = origin
         self.decode    = decode
+        # Register slices stages between the interconnect and the Slave (None: Bus default).
+        if (pipeline is not None) and ((not isinstance(pipeline, int)) or isinstance(pipeline, bool) or (pipeline < 0)):
+            self.logger.error("Region pipeline must be a {} (got {}).".format(
+                colorer("positive integer"), colorer(repr(pipeline), color="red")))
+            raise SoCError()
+        self.pipeline  = pipeline
         if (not isinstance(size, int)) or isinstance(size, bool):
             self.logger.error("Region size must be an {} (got {}).".format(
                 colorer("integer"), colorer(repr(size), color="red")))
@@ -184,7 +191,8 @@ class SoCBusHandler(LiteXModule):
     supported_address_width = [32, 64]
     supported_addressing    = ["word", "byte"]
     supported_interconnect  = ["shared", "crossbar"]
-    supported_arbiter       = ["default", "transaction"]
+    supported_arbiter       = ["default", "transaction", "id", "priority", "weighted", "qos"]
+    supported_decoder       = ["default", "tree", "priority"]
 
     # Creation -------------------------------------------------------------------------------------
     def __init__(self, name="SoCBusHandler",
@@ -194,10 +202,13 @@ class SoCBusHandler(LiteXModule):
         addressing       = None,
         timeout          = int(1e6),
         bursting         = False,
+        pipelined        = False,
         interconnect     = "shared", interconnect_register=True,
         arbiter          = "default",
         low_latency      = False,
         reserved_regions = None,
+        decoder          = "default", decoder_register=False,
+        pipeline         = 0,
     ):
         self.logger = logging.getLogger(name)
         self.logger.info("Creating Bus Handler...")
@@ -262,11 +273,44 @@ class SoCBusHandler(LiteXModule):
                 colorer(arbiter),
                 colorer(", ".join(self.supported_arbiter))))
             raise SoCError()
-        if standard != "wishbone" and arbiter != "default":
+        if standard != "wishbone" and arbiter == "transaction":
             self.logger.error("{} can only be used with {} Bus.".format(
                 colorer("Bus Arbiter", color="red"),
                 colorer("Wishbone")))
             raise SoCError()
+        if standard != "axi" and arbiter == "id":
+            self.logger.error("{} can only be used with {} Bus.".format(
+                colorer("Bus Arbiter", color="red"),
+                colorer("AXI")))
+            raise SoCError()
+        if standard != "wishbone" and pipelined:
+            self.logger.error("{} can only be used with {} Bus.".format(
+                colorer("Bus Pipelining", color="red"),
+                colorer("Wishbone")))
+            raise SoCError()
+        if decoder not in self.supported_decoder:
+            self.logger.error("Unsupported {} {}, supported are: {:s}".format(
+                colorer("Bus Decoder", color="red"),
+                colorer(decoder),
+                colorer(", ".join(self.supported_decoder))))
+            raise SoCError()
+        if decoder_register and ((decoder == "default") or (standard != "wishbone") or pipelined):
+            self.logger.error("{} can only be used with {} Decoder on {} Bus.".format(
+                colorer("Bus Decoder register", color="red"),
+                colorer("tree/priority"),
+                colorer("Wishbone (non-pipelined)")))
+            raise SoCError()
+
+        if (not isinstance(pipeline, int)) or isinstance(pipeline, bool) or (pipeline < 0):
+            self.logger.error("{} must be a positive integer (got {}).".format(
+                colorer("Bus Pipeline", color="red"),
+                colorer(repr(pipeline))))
+            raise SoCError()
+        if pipeline and pipelined:
+            self.logger.error("{} can only be used with {} Bus.".format(
+                colorer("Bus Pipeline", color="red"),
+                colorer("Wishbone Classic/AXI-Lite/AXI")))
+            raise SoCError()
 
         # Create Bus
         self.standard              = standard
@@ -274,11 +318,17 @@ class SoCBusHandler(LiteXModule):
         self.address_width         = address_width
         self.addressing            = addressing
         self.bursting              = bursting
+        self.pipelined             = pipelined
         self.interconnect          = interconnect
         self.interconnect_register = interconnect_register
         self.arbiter               = arbiter
+        self.decoder               = decoder
+        self.decoder_register      = decoder_register
+        self.pipeline              = pipeline
         self.low_latency           = low_latency
         self.masters               = {}
+        self.master_priorities     = {}
+        self.master_pipelines      = {}
         self.slaves                = {}
         self.regions               = {}
         self.io_regions            = {}
@@ -354,7 +404,9 @@ class SoCBusHandler(LiteXModule):
             # If no Origin specified, allocate Region.
             if region.origin is None:
                 allocated = True
+                pipeline  = region.pipeline
                 region    = self.alloc_region(name, region.size, region.cached, linker=region.linker, mode=region.mode)
+                region.pipeline = pipeline
                 self.regions[name] = region
             # Else add Region.
             else:
@@ -522,6 +574,8 @@ class SoCBusHandler(LiteXModule):
             "bursting"      : getattr(interface, "bursting", False),
             "mode"          : interface.mode,
         }
+        if isinstance(interface, wishbone.Interface):
+            args["pipelined"] = interface.pipelined
         if hasattr(interface, "clock_domain"):
             args["clock_domain"] = interface.clock_domain if clock_domain is None else clock_domain
         if isinstance(interface, axi.AXIInterface):
@@ -629,6 +683,7 @@ class SoCBusHandler(LiteXModule):
                     data_width    = self.data_width,
                     address_width = self.address_width,
                     addressing    = self.addressing)
+                args.pop("pipelined", None)
                 if main_bus_cls is axi.AXIInterface:
                     args["id_width"] = self.get_axi_id_width()
                 else:
@@ -671,11 +726,35 @@ class SoCBusHandler(LiteXModule):
                 self.submodules += bridge
                 return adapted_interface
 
+        # Bus-Pipelining conversion helper.
+        def bus_pipelining_convert(interface, direction, pipelined):
+            # Non-Wishbone or same Pipelining, return un-modified interface.
+            if not isinstance(interface, wishbone.Interface) or (interface.pipelined == pipelined):
+                return interface
+            # Different Pipelining: Return adapted interface.
+            else:
+                args = self._get_interface_args(interface)
+                args["pipelined"] = pipelined
+                adapted_interface = wishbone.Interface(**args)
+                if direction == "m2s":
+                    master, slave = interface, adapted_interface
+                elif direction == "s2m":
+                    master, slave = adapted_interface, interface
+                bridge_cls = {
+                    True  : wishbone.Pipelined2Classic,
+                    False : wishbone.Classic2Pipelined,
+                }[master.pipelined]
+                self.submodules += bridge_cls(master, slave)
+                return adapted_interface
+
         # Interface conversion.
+        # Pipelined Wishbone Interfaces are bridged to Classic ones before Bus-Standard bridges.
         adapted_interface = interface
         adapted_interface = bus_data_width_convert(adapted_interface, direction)
         adapted_interface = bus_addressing_convert(adapted_interface, direction)
+        adapted_interface = bus_pipelining_convert(adapted_interface, direction, self.pipelined and (self.standard == "wishbone"))
         adapted_interface =   bus_standard_convert(adapted_interface, direction)
+        adapted_interface = bus_pipelining_convert(adapted_interface, direction, self.pipelined)
 
         if type(interface) != type(adapted_interface) or interface.data_width != adapted_interface.data_width:
             fmt = "{name} Bus {adapted} from {from_bus} {from_bits}-bit to {to_bus} {to_bits}-bit."
@@ -803,6 +882,38 @@ class SoCBusHandler(LiteXModule):
 
         return sys_interface
 
+    # Add Register Slices -------------------------------------------------------------------------
+    def add_register_slices(self, name, interface, stages, direction="m2s"):
+        if stages == 0:
+            return interface
+
+        interface_cls = type(interface)
+        slice_cls = {
+            wishbone.Interface   : wishbone.RegisterSlice,
+            axi.AXILiteInterface : axi.AXILiteRegisterSlice,
+            axi.AXIInterface     : axi.AXIRegisterSlice,
+        }.get(interface_cls)
+        if (slice_cls is None) or getattr(interface, "pipelined", False):
+            self.logger.error("{} {} Register Slices for {}.".format(
+                colorer(name, color="red"),
+                colorer("unsupported", color="red"),
+                colorer(interface_cls.__name__)))
+            raise SoCError()
+
+        adapted_interface = interface_cls(**self._get_interface_args(interface))
+        if direction == "m2s":
+            master, slave = interface, adapted_interface
+        else:
+            master, slave = adapted_interface, interface
+        self.submodules += slice_cls(master, slave, stages=stages)
+
+        self.logger.info("{} Bus {} with {} stage(s).".format(
+            colorer(name),
+            colorer("pipelined", color="cyan"),
+            colorer(stages)))
+
+        return adapted_interface
+
     def _check_name_available(self, collection, role, name):
         if name in collection:
             self.logger.error("{} {} as {}:".format(
@@ -812,10 +923,25 @@ class SoCBusHandler(LiteXModule):
             self.logger.error(self)
             raise SoCError()
 
-    def add_master(self, name=None, master=None, region=None):
+    def add_master(self, name=None, master=None, region=None, priority=None, pipeline=0):
+        # priority: Master priority ("priority" arbiter), weight ("weighted" arbiter) or static QoS
+        # level ("qos" arbiter), defaults to the arbiter's default when None.
+        # pipeline: Register slices stages between the Master and the interconnect.
         if name is None:
             name = "master{:d}".format(len(self.masters))
         self._check_name_available(self.masters, "Bus Master", name)
+        if (priority is not None) and (not isinstance(priority, int) or priority < 0):
+            self.logger.error("{} {} for {} Bus Master, must be a positive integer.".format(
+                colorer("Invalid priority", color="red"),
+                colorer(priority),
+                colorer(name, color="underline")))
+            raise SoCError()
+        if (not isinstance(pipeline, int)) or isinstance(pipeline, bool) or (pipeline < 0):
+            self.logger.error("{} {} for {} Bus Master, must be a positive integer.".format(
+                colorer("Invalid pipeline", color="red"),
+                colorer(pipeline),
+                colorer(name, color="underline")))
+            raise SoCError()
         if region:
             master = self.add_remapper(name, master, region.origin, region.size)
         if isinstance(master, wishbone.Interface) and master.addressing == "byte" and self.addressing == "word":
@@ -830,6 +956,8 @@ class SoCBusHandler(LiteXModule):
         except Exception:
             del self.masters[name]
             raise
+        self.master_priorities[name] = priority
+        self.master_pipelines[name]  = pipeline
         self.logger.info("{} {} as Bus Master.".format(
             colorer(name,    color="underline"),
             colorer("added", color="green")))
@@ -964,14 +1092,24 @@ class SoCBusHandler(LiteXModule):
 
         self._interconnect = None
         if len(self.masters) and len(self.slaves):
+            # Register Slices between Masters/Slaves and the interconnect.
+            masters = {}
+            for name, master in self.masters.items():
+                masters[name] = self.add_register_slices(name, master, self.master_pipelines.get(name, 0), "m2s")
+            slaves = {}
+            for name, slave in self.slaves.items():
+                stages = self.regions[name].pipeline
+                stages = self.pipeline if stages is None else stages
+                slaves[name] = self.add_register_slices(name, slave, stages, "s2m")
+
             slave_name = next(iter(self.slaves))
             # If 1 bus_master, 1 bus_slave and no address translation, use InterconnectPointToPoint.
             if ((len(self.masters) == 1)  and
                 (len(self.slaves)  == 1)  and
                 (self.regions[slave_name].origin == 0)):
                 self._interconnect = interconnect_p2p_cls(
-                    master = next(iter(self.masters.values())),
-                    slave  = next(iter(self.slaves.values())))
+                    master = next(iter(masters.values())),
+                    slave  = next(iter(slaves.values())))
             # Otherwise, use InterconnectShared/Crossbar.
             else:
                 # Check Region decoder use.
@@ -989,23 +1127,50 @@ class SoCBusHandler(LiteXModule):
                     "shared"  : interconnect_shared_cls,
                     "crossbar": interconnect_crossbar_cls,
                 }[self.interconnect]
+                decoders = [self.regions[n].decoder(self) for n in self.slaves.keys()]
+                if self.decoder != "default":
+                    decoders = self.get_tree_decoders()
                 interconnect_kwargs = dict(
-                    masters        = list(self.masters.values()),
-                    slaves         = [(self.regions[n].decoder(self), s) for n, s in self.slaves.items()],
+                    masters        = list(masters.values()),
+                    slaves         = list(zip(decoders, slaves.values())),
                     register       = self.interconnect_register,
                     timeout_cycles = self.timeout,
                 )
                 if self.standard == "wishbone":
+                    # Priority/Weighted/QoS policies are applied on each transaction.
                     interconnect_kwargs["arbiter"] = {
                         "default"     : "cycle",
                         "transaction" : "transaction",
-                    }[self.arbiter]
+                    }.get(self.arbiter, "transaction")
+                if self.standard == "axi":
+                    interconnect_kwargs["arbiter"] = {
+                        "id" : "id",
+                    }.get(self.arbiter, "default")
+                if self.arbiter in ["priority", "weighted", "qos"]:
+                    interconnect_kwargs["policy"]     = self.arbiter
+                    interconnect_kwargs["priorities"] = [self.master_priorities.get(n) for n in self.masters.keys()]
                 self._interconnect = interconnect_cls(**interconnect_kwargs)
             self.logger.info("Interconnect: {} ({} <-> {}).".format(
                 colorer(self._interconnect.__class__.__name__),
                 colorer(len(self.masters)),
                 colorer(len(self.slaves))))
 
+    def get_tree_decoders(self):
+        # Regions in units of the decoded address (see SoCRegion.decoder).
+        shift = 0
+        if not ((self.standard == "wishbone") and (self.addressing == "byte")):
+            shift = log2_int(self.data_width//8)
+        regions = [(self.regions[n].origin >> shift, self.regions[n].size_pow2 >> shift) for n in self.slaves.keys()]
+        self.tree_decoder = TreeDecoder(regions,
+            address_width = self.address_width - shift,
+            mode          = {"tree": "full", "priority": "priority"}[self.decoder],
+            register      = self.decoder_register,
+        )
+        self.logger.info("Decoder: {} ({}).".format(
+            colorer(self.decoder),
+            self.tree_decoder.report()))
+        return self.tree_decoder.get_decoders()
+
     # Str ------------------------------------------------------------------------------------------
     def __str__(self):
         r = "{}-bit {} Bus, {}GiB Address Space.\n".format(
@@ -1106,7 +1271,8 @@ class SoCCSRHandler(SoCLocHandler):
     supported_ordering      = ["big", "little"]
 
     # Creation -------------------------------------------------------------------------------------
-    def __init__(self, data_width=32, address_width=14, alignment=32, paging=0x800, ordering="big", reserved_csrs=None):
+    def __init__(self, data_width=32, address_width=14, alignment=32, paging=0x800, ordering="big", reserved_csrs=None,
+        posted_writes=0, read_ahead=False, segments=0, segment_register=False):
         SoCLocHandler.__init__(self, "CSR", n_locs=alignment//8*(2**address_width)//paging)
         self.logger = logging.getLogger("SoCCSRHandler")
         self.logger.info("Creating CSR Handler...")
@@ -1159,14 +1325,31 @@ class SoCCSRHandler(SoCLocHandler):
                 colorer(", ".join("{}".format(x) for x in self.supported_ordering))))
             raise SoCError()
 
+        # Check CSR Segments.
+        if segments and ((segments != 2**log2_int(segments, False)) or (segments > self.n_locs)):
+            self.logger.error("Unsupported {} {}, must be a power of 2 <= {}.".format(
+                colorer("Segments", color="red"),
+                colorer(segments),
+                colorer(self.n_locs)))
+            raise SoCError()
+        if segments and segment_register and read_ahead:
+            self.logger.error("{} can't be used with {} CSR Segments.".format(
+                colorer("Read-ahead", color="red"),
+                colorer("registered")))
+            raise SoCError()
+
         # Create CSR Handler.
-        self.data_width    = data_width
-        self.address_width = address_width
-        self.alignment     = alignment
-        self.paging        = paging
-        self.ordering      = ordering
-        self.masters       = {}
-        self.regions       = {}
+        self.data_width       = data_width
+        self.address_width    = address_width
+        self.alignment        = alignment
+        self.paging           = paging
+        self.ordering         = ordering
+        self.posted_writes    = posted_writes
+        self.read_ahead       = read_ahead
+        self.segments         = segments
+        self.segment_register = segment_register
+        self.masters          = {}
+        self.regions          = {}
         self.logger.info("{}-bit CSR Bus, {}-bit Aligned, {}KiB Address Space, {}B Paging, {} Ordering (Up to {} Locations).".format(
             colorer(self.data_width),
             colorer(self.alignment),
@@ -1174,6 +1357,10 @@ class SoCCSRHandler(SoCLocHandler):
             colorer(self.paging),
             colorer(self.ordering),
             colorer(self.n_locs)))
+        if segments:
+            self.logger.info("CSR Bus split in {} Segments{}.".format(
+                colorer(segments),
+                " (registered)" if segment_register else ""))
 
         # Add reserved CSRs.
         self.logger.info("Adding {} CSRs...".format(colorer("reserved", color="cyan")))
@@ -1182,6 +1369,12 @@ class SoCCSRHandler(SoCLocHandler):
 
         self.logger.info("CSR Handler {}.".format(colorer("created", color="green")))
 
+    # Latency --------------------------------------------------------------------------------------
+    @property
+    def latency(self):
+        """Additional read latency of the CSR interconnect (registered segments)."""
+        return 2 if (self.segments and self.segment_register) else 0
+
     # Add Master -----------------------------------------------------------------------------------
     def add_master(self, name=None, master=None):
         if name is None:
@@ -1352,9 +1545,13 @@ class SoC(LiteXModule):
         bus_addressing       = None,
         bus_timeout          = int(1e6),
         bus_bursting         = False,
+        bus_pipelined        = False,
         bus_interconnect     = "shared",
         bus_arbiter          = "default",
         bus_low_latency      = False,
+        bus_decoder          = "default",
+        bus_decoder_register = False,
+        bus_pipeline         = 0,
         bus_reserved_regions = None,
 
         csr_data_width       = 32,
@@ -1362,6 +1559,10 @@ class SoC(LiteXModule):
         csr_paging           = 0x800,
         csr_ordering         = "big",
         csr_reserved_csrs    = None,
+        csr_posted_writes    = 0,
+        csr_read_ahead       = False,
+        csr_segments         = 0,
+        csr_segment_register = False,
 
         irq_n_irqs           = 32,
         irq_reserved_irqs    = None,
@@ -1404,20 +1605,28 @@ class SoC(LiteXModule):
             addressing       = bus_addressing,
             timeout          = bus_timeout,
             bursting         = bus_bursting,
+            pipelined        = bus_pipelined,
             interconnect     = bus_interconnect,
             arbiter          = bus_arbiter,
             low_latency      = bus_low_latency,
+            decoder          = bus_decoder,
+            decoder_register = bus_decoder_register,
+            pipeline         = bus_pipeline,
             reserved_regions = bus_reserved_regions,
            )
 
         # SoC CSR Handler --------------------------------------------------------------------------
         self.csr = SoCCSRHandler(
-            data_width    = csr_data_width,
-            address_width = csr_address_width,
-            alignment     = 32,
-            paging        = csr_paging,
-            ordering      = csr_ordering,
-            reserved_csrs = csr_reserved_csrs,
+            data_width       = csr_data_width,
+            address_width    = csr_address_width,
+            alignment        = 32,
+            paging           = csr_paging,
+            ordering         = csr_ordering,
+            reserved_csrs    = csr_reserved_csrs,
+            posted_writes    = csr_posted_writes,
+            read_ahead       = csr_read_ahead,
+            segments         = csr_segments,
+            segment_register = csr_segment_register,
         )
 
         # SoC IRQ Handler --------------------------------------------------------------------------
@@ -1511,11 +1720,14 @@ class SoC(LiteXModule):
             "axi-lite": axi.AXILiteInterface,
             "axi"     : axi.AXIInterface,
         }[self.bus.standard]
-        ram_bus = interface_cls(
+        ram_bus_kwargs = dict(
             data_width    = self.bus.data_width,
             address_width = self.bus.address_width,
             bursting      = self.bus.bursting
         )
+        if self.bus.standard == "wishbone":
+            ram_bus_kwargs["pipelined"] = self.bus.pipelined
+        ram_bus = interface_cls(**ram_bus_kwargs)
         self.check_if_exists(name)
         ram = ram_cls(size, bus=ram_bus, init=contents, read_only=("w" not in mode), name=name)
         self.bus.add_slave(name=name, slave=ram.bus, region=SoCRegion(origin=origin, size=size, mode=mode))
@@ -1620,7 +1832,7 @@ class SoC(LiteXModule):
         return hyperram
 
     # Add CSR Bridge -------------------------------------------------------------------------------
-    def add_csr_bridge(self, name="csr", origin=None, with_register=False):
+    def add_csr_bridge(self, name="csr", origin=None, with_register=False, posted_writes=0, read_ahead=False):
         csr_bridge_cls = {
             "wishbone": wishbone.Wishbone2CSR,
             "axi-lite": axi.AXILite2CSR,
@@ -1633,6 +1845,23 @@ class SoC(LiteXModule):
         }[self.bus.standard]
         csr_bridge_name = f"{name}_bridge"
         self.check_if_exists(csr_bridge_name)
+        bridge_kwargs = {}
+        if posted_writes or read_ahead:
+            if self.bus.standard != "wishbone":
+                self.logger.error("CSR Bridge {} only {} on Wishbone Bus.".format(
+                    colorer("posted writes/read-ahead", color="red"),
+                    colorer("supported")))
+                raise SoCError()
+            if self.csr.latency:
+                self.logger.error("CSR Bridge {} can't be used with {} CSR Segments.".format(
+                    colorer("posted writes/read-ahead", color="red"),
+                    colorer("registered")))
+                raise SoCError()
+            # Posted writes/read-ahead use the un-registered access.
+            with_register = False
+            bridge_kwargs = dict(posted_writes=posted_writes, read_ahead=read_ahead)
+        if self.csr.latency:
+            bridge_kwargs["latency"] = self.csr.latency
         data_width     = self.csr.data_width
         bus_data_width = self.bus.data_width if self.bus.standard == "wishbone" else data_width
         csr_bridge = csr_bridge_cls(
@@ -1643,7 +1872,8 @@ class SoC(LiteXModule):
                 address_width = self.csr.address_width,
                 data_width    = data_width,
                 alignment     = self.csr.alignment),
-            register = with_register)
+            register = with_register,
+            **bridge_kwargs)
         self.logger.info("CSR Bridge {} {}.".format(
             colorer(name, color="underline"),
             colorer("added", color="green")))
@@ -1965,6 +2195,8 @@ class SoC(LiteXModule):
             name          = "csr",
             origin        = csr_origin,
             with_register = hasattr(self, "sdram"),
+            posted_writes = self.csr.posted_writes,
+            read_ahead    = self.csr.read_ahead,
         )
 
         self.bus.finalize()
@@ -2004,7 +2236,14 @@ class SoC(LiteXModule):
             alignment          = self.csr.alignment,
             paging             = self.csr.paging,
             ordering           = self.csr.ordering)
-        if len(self.csr.masters) and len(self.csr_bankarray.get_buses()):
+        if len(self.csr.masters) and len(self.csr_bankarray.get_buses()) and self.csr.segments:
+            self.csr_interconnect = csr_bus.InterconnectSplit(
+                masters  = list(self.csr.masters.values()),
+                slaves   = self.csr_bankarray.get_mapped_buses(),
+                segments = self.csr.segments,
+                paging   = self.csr.paging,
+                register = self.csr.segment_register)
+        elif len(self.csr.masters) and len(self.csr_bankarray.get_buses()):
             self.csr_interconnect = csr_bus.InterconnectShared(
                 masters = list(self.csr.masters.values()),
                 slaves  = self.csr_bankarray.get_buses())
@@ -2145,7 +2384,13 @@ class LiteXSoC(SoC):
         from litex.soc.cores.identifier import Identifier
         self.check_if_exists(name)
         if with_build_time:
-            identifier += " " + build_time()
+            identifier_build_time = build_time()
+            identifier += " " + identifier_build_time
+            # Only changes on each build: not considered as a change of the gateware inputs (toolchain
+            # run skipped/restored from the artifact cache, keeping the build time of the last run).
+            toolchain = getattr(self.platform, "toolchain", None)
+            if hasattr(toolchain, "add_volatile_string"):
+                toolchain.add_volatile_string(identifier_build_time)
         else:
             self.add_config("BIOS_NO_BUILD_TIME")
         self.add_module(name=name, module=Identifier(identifier))
@@ -2283,6 +2528,11 @@ class LiteXSoC(SoC):
         l2_cache_min_data_width = 128,
         l2_cache_reverse        = False,
         l2_cache_full_memory_we = True,
+        l2_cache_ways           = 1,
+        l2_cache_replacement    = "lru",
+        l2_cache_write_through  = False,
+        l2_cache_prefetch       = False,
+        l2_cache_with_csr       = False,
         **kwargs):
 
         # Checks.
@@ -2453,14 +2703,35 @@ class LiteXSoC(SoC):
             # L2 Cache
             if l2_cache_size != 0:
                 # Insert L2 cache inbetween Wishbone bus and LiteDRAM
-                l2_cache_size = max(l2_cache_size, int(2*port.data_width/8)) # Use minimal size if lower
-                l2_cache_size = 2**int(math.log2(l2_cache_size))                  # Round to nearest power of 2
                 l2_cache_data_width = max(port.data_width, l2_cache_min_data_width)
-                l2_cache = wishbone.Cache(
-                    cachesize = l2_cache_size//4,
-                    master    = wb_sdram,
-                    slave     = wishbone.Interface(data_width=l2_cache_data_width, address_width=32, addressing="word"),
-                    reverse   = l2_cache_reverse)
+                l2_cache_set_associative = (
+                    (l2_cache_ways != 1)   or
+                    l2_cache_write_through or
+                    l2_cache_prefetch      or
+                    l2_cache_with_csr
+                )
+                l2_cache_min_size = int(2*port.data_width/8)
+                if l2_cache_set_associative:
+                    l2_cache_min_size = max(l2_cache_min_size, int(2*l2_cache_ways*l2_cache_data_width/8))
+                l2_cache_size = max(l2_cache_size, l2_cache_min_size) # Use minimal size if lower
+                l2_cache_size = 2**int(math.log2(l2_cache_size))       # Round to nearest power of 2
+                if l2_cache_set_associative:
+                    l2_cache = wishbone.SetAssociativeCache(
+                        cachesize     = l2_cache_size//4,
+                        master        = wb_sdram,
+                        slave         = wishbone.Interface(data_width=l2_cache_data_width, address_width=32, addressing="word"),
+                        ways          = l2_cache_ways,
+                        replacement   = l2_cache_replacement,
+                        write_through = l2_cache_write_through,
+                        prefetch      = l2_cache_prefetch,
+                        with_csr      = l2_cache_with_csr,
+                        reverse       = l2_cache_reverse)
+                else:
+                    l2_cache = wishbone.Cache(
+                        cachesize = l2_cache_size//4,
+                        master    = wb_sdram,
+                        slave     = wishbone.Interface(data_width=l2_cache_data_width, address_width=32, addressing="word"),
+                        reverse   = l2_cache_reverse)
                 if l2_cache_full_memory_we:
                     l2_cache = FullMemoryWE()(l2_cache)
                 self.l2_cache = l2_cache
@@ -3544,9 +3815,13 @@ class SoCCore(LiteXSoC):
         bus_addressing             = None,
         bus_timeout                = int(1e6),
         bus_bursting               = False,
+        bus_pipelined              = False,
         bus_interconnect           = "shared",
         bus_arbiter                = "default",
         bus_low_latency            = False,
+        bus_decoder                = "default",
+        bus_decoder_register       = False,
+        bus_pipeline               = 0,
 
         # CPU parameters.
         cpu_type                   = "vexriscv",
@@ -3575,6 +3850,10 @@ class SoCCore(LiteXSoC):
         csr_address_width          = 14,
         csr_paging                 = 0x800,
         csr_ordering               = "big",
+        csr_posted_writes          = 0,
+        csr_read_ahead             = False,
+        csr_segments               = 0,
+        csr_segment_register       = False,
 
         # Interrupt parameters.
         irq_n_irqs                 = 32,
@@ -3626,9 +3905,13 @@ class SoCCore(LiteXSoC):
             bus_addressing       = bus_addressing,
             bus_timeout          = bus_timeout,
             bus_bursting         = bus_bursting,
+            bus_pipelined        = bus_pipelined,
             bus_interconnect     = bus_interconnect,
             bus_arbiter          = bus_arbiter,
             bus_low_latency      = bus_low_latency,
+            bus_decoder          = bus_decoder,
+            bus_decoder_register = bus_decoder_register,
+            bus_pipeline         = bus_pipeline,
             bus_reserved_regions = {},
 
             csr_data_width       = csr_data_width,
@@ -3636,6 +3919,10 @@ class SoCCore(LiteXSoC):
             csr_paging           = csr_paging,
             csr_ordering         = csr_ordering,
             csr_reserved_csrs    = self.csr_map,
+            csr_posted_writes    = csr_posted_writes,
+            csr_read_ahead       = csr_read_ahead,
+            csr_segments         = csr_segments,
+            csr_segment_register = csr_segment_register,
 
             irq_n_irqs           = irq_n_irqs,
             irq_reserved_irqs    = {},
@@ -3822,9 +4109,13 @@ def soc_core_args(parser, cpu_type="vexriscv", cpu_variant=None):
     soc_group.add_argument("--bus-addressing",    default=None,                       choices=SoCBusHandler.supported_addressing,    help="Bus addressing (default: word for wishbone, byte for axi/axi-lite).")
     soc_group.add_argument("--bus-timeout",       default=int(1e6),    type=auto_int,                                                help="Bus timeout in cycles.")
     soc_group.add_argument("--bus-bursting",      action="store_true",                                                               help="Enable burst cycles on the bus if supported.")
+    soc_group.add_argument("--bus-pipelined",     action="store_true",                                                               help="Enable Wishbone B4 Pipelined mode on the bus.")
     soc_group.add_argument("--bus-interconnect",  default="shared",                   choices=SoCBusHandler.supported_interconnect,  help="Select bus interconnect.")
     soc_group.add_argument("--bus-arbiter",       default="default",                  choices=SoCBusHandler.supported_arbiter,        help="Select bus arbiter.")
     soc_group.add_argument("--bus-low-latency",  action="store_true",                                                               help="Enable low-latency bus bridges when available.")
+    soc_group.add_argument("--bus-decoder",       default="default",                  choices=SoCBusHandler.supported_decoder,        help="Select bus decoder.")
+    soc_group.add_argument("--bus-decoder-register", action="store_true",                                                           help="Register bus decoder (Wishbone only).")
+    soc_group.add_argument("--bus-pipeline",      default=0,           type=auto_int,                                                help="Bus register slices stages between the interconnect and the slaves.")
 
     # CPU parameters.
     soc_group.add_argument("--cpu-type",                 default="vexriscv",                 help="Select CPU: {}.".format(", ".join(map(str, cpu.CPUS.keys()))))
@@ -3853,6 +4144,10 @@ def soc_core_args(parser, cpu_type="vexriscv", cpu_variant=None):
     soc_group.add_argument("--csr-address-width", default=14,    type=auto_int, choices=SoCCSRHandler.supported_address_width, help="CSR bus address-width.")
     soc_group.add_argument("--csr-paging",        default=0x800, type=auto_int, choices=SoCCSRHandler.supported_paging,        help="CSR bus paging.")
     soc_group.add_argument("--csr-ordering",      default="big",                choices=SoCCSRHandler.supported_ordering,      help="CSR registers ordering.")
+    soc_group.add_argument("--csr-posted-writes", default=0,     type=auto_int,                                                help="CSR bridge posted writes FIFO depth (0: disabled).")
+    soc_group.add_argument("--csr-read-ahead",    action="store_true",                                                         help="Enable CSR bridge read-ahead of the next CSR.")
+    soc_group.add_argument("--csr-segments",      default=0,     type=auto_int,                                                help="Split CSR bus in segments (sub-buses by CSR location, 0: disabled).")
+    soc_group.add_argument("--csr-segment-register", action="store_true",                                                      help="Register CSR segments (higher Fmax on large CSR buses, +2 cycles CSR read latency).")
 
     # Identifier parameters.
     soc_group.add_argument("--ident",                    default=None,        type=str,      help="SoC identifier.")
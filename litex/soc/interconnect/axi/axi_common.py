@@ -11,6 +11,7 @@ from migen import *
 from migen.genlib import roundrobin
 
 from litex.gen.genlib.misc import WaitTimer
+from litex.gen.genlib.arbiter import get_arbiter
 
 from litex.build.generic_platform import *
 
@@ -208,3 +209,39 @@ def axi_layout_flat(axi, axi_full=False):
                     if name in omit_names:
                         continue
                     yield ch, name, get_dir(ch, direction)
+
+# AXI Register Slice Helpers -----------------------------------------------------------------------
+
+def add_register_slices(module, master, slave, stages=1, pipe_valid=True, pipe_ready=True):
+    """Connect AXI/AXI-Lite `master` to `slave` with `stages` stream.Buffer register slices on each
+    channel (pipe_valid cuts the valid/payload paths, pipe_ready cuts the ready paths)."""
+    channels = [("aw", "m2s"), ("w", "m2s"), ("b", "s2m"), ("ar", "m2s"), ("r", "s2m")]
+    for name, direction in channels:
+        source = getattr(master if direction == "m2s" else slave, name)
+        sink   = getattr(slave  if direction == "m2s" else master, name)
+        for i in range(stages):
+            buf = stream.Buffer(source.description, pipe_valid=pipe_valid, pipe_ready=pipe_ready)
+            module.submodules += buf
+            module.comb += source.connect(buf.sink)
+            source = buf.source
+        module.comb += source.connect(sink)
+
+# AXI Arbitration Helpers --------------------------------------------------------------------------
+
+def add_channel_arbiter(module, masters, channel_masters, channel, policy="round-robin", priorities=None):
+    """Create the arbiter of an address channel for `channel_masters` (subset of `masters`).
+
+    `priorities` are given per master (see litex.gen.genlib.arbiter.get_arbiter) and the `qos` of
+    the address channel is used as the dynamic QoS level with the "qos" policy.
+    """
+    if priorities is not None:
+        if len(priorities) != len(masters):
+            raise ValueError(f"AXI Arbiter priorities count ({len(priorities)}) must match masters count ({len(masters)}).")
+        priorities = [p for p, m in zip(priorities, masters) if any(m is cm for cm in channel_masters)]
+    rr = get_arbiter(len(channel_masters), policy, roundrobin.SP_CE, priorities)
+    if hasattr(rr, "qos"):
+        for i, m in enumerate(channel_masters):
+            ax = getattr(m, channel)
+            if hasattr(ax, "qos"):
+                module.comb += rr.qos[i].eq(ax.qos)
+    return rr
@@ -1042,6 +1042,17 @@ class AXIClockDomainCrossing(LiteXModule):
                 r_cdc.source.connect(master.r),
             ]
 
+# AXI Register Slice -------------------------------------------------------------------------------
+
+class AXIRegisterSlice(LiteXModule):
+    """AXI Register Slice (registers all the channels, each stage adds 1 cycle of latency)"""
+    def __init__(self, master, slave, stages=1, pipe_valid=True, pipe_ready=True):
+        add_register_slices(self, master, slave,
+            stages     = stages,
+            pipe_valid = pipe_valid,
+            pipe_ready = pipe_ready,
+        )
+
 # AXI Timeout --------------------------------------------------------------------------------------
 
 class AXITimeout(LiteXModule):
@@ -1133,13 +1144,14 @@ class AXIArbiter(LiteXModule):
 
     Arbitrate between master interfaces and connect one to the target. New master will not be
     selected until all requests have been responded to. Arbitration for write and read channels is
-    done separately.
+    done separately, with the `policy` of litex.gen.genlib.arbiter (round-robin by default).
     """
-    def __init__(self, masters, target):
+    def __init__(self, masters, target, policy="round-robin", priorities=None):
+        masters       = list(masters)
         write_masters = [m for m in masters if "w" in m.mode]
         read_masters  = [m for m in masters if "r" in m.mode]
-        self.rr_write = roundrobin.RoundRobin(len(write_masters), roundrobin.SP_CE)
-        self.rr_read  = roundrobin.RoundRobin(len(read_masters), roundrobin.SP_CE)
+        self.rr_write = add_channel_arbiter(self, masters, write_masters, "aw", policy, priorities)
+        self.rr_read  = add_channel_arbiter(self, masters, read_masters,  "ar", policy, priorities)
 
         def get_sig(interface, channel, name):
             return getattr(getattr(interface, channel), name)
@@ -1194,6 +1206,161 @@ class AXIArbiter(LiteXModule):
         if len(read_masters):
             self.comb += self.rr_read.request.eq(Cat(*[m.ar.valid | m.r.valid for m in read_masters]))
 
+class AXIIDArbiter(LiteXModule):
+    """AXI ID-aware arbiter
+
+    Arbitrate between master interfaces and connect them to the target with multiple outstanding
+    transactions: the grant can switch on each address phase and responses are routed back to the
+    masters by ID. Master IDs are prefixed with the master index when the target ID is wide enough,
+    otherwise they are remapped to the master index and the original IDs are restored from the
+    issue order (responses to a same ID are returned in order). Write data follows the order of the
+    granted write addresses. Up to `max_pending` transactions can be outstanding per master.
+    """
+    def __init__(self, masters, target, max_pending=16, policy="round-robin", priorities=None):
+        masters       = list(masters)
+        write_masters = [m for m in masters if "w" in m.mode]
+        read_masters  = [m for m in masters if "r" in m.mode]
+
+        def get_sig(interface, channel, name):
+            return getattr(getattr(interface, channel), name)
+
+        # Master ID Prefixing/Remapping.
+        n_masters   = max(len(write_masters), len(read_masters))
+        index_width = bits_for(n_masters - 1) if n_masters > 1 else 0
+        id_width    = max(m.id_width for m in masters)
+        if target.id_width >= (id_width + index_width):
+            self.id_mode = "prefix"
+        elif target.id_width >= index_width:
+            self.id_mode = "remap"
+        else:
+            raise ValueError("AXI ID Arbiter target ID width ({}) too small for {} masters.".format(
+                target.id_width, n_masters))
+
+        def get_target_id(master_id, index):
+            if self.id_mode == "prefix":
+                return master_id | (index << id_width)
+            return index
+
+        def get_index(target_id):
+            if index_width == 0:
+                return 0
+            if self.id_mode == "prefix":
+                return target_id[id_width:id_width + index_width]
+            return target_id[:index_width]
+
+        def add_channels(ms, ax, data, resp, data_order):
+            ax_target   = getattr(target, ax)
+            resp_target = getattr(target, resp)
+            resp_last   = resp_target.last if resp == "r" else 1
+
+            # Address Arbitration: switch after each accepted address (or when idle).
+            rr = add_channel_arbiter(self, masters, ms, ax, policy, priorities)
+            self.submodules += rr
+            self.comb += [
+                rr.request.eq(Cat(*[get_sig(m, ax, "valid") for m in ms])),
+                rr.ce.eq(~ax_target.valid | ax_target.ready),
+            ]
+
+            # Outstanding transactions per master.
+            resp_index  = get_index(resp_target.id)
+            ax_allowed  = Signal()
+            ax_accepted = Signal()
+            counters    = []
+            id_fifos    = []
+            for i, m in enumerate(ms):
+                counter = _AXIRequestCounter(
+                    request      = ax_accepted & (rr.grant == i),
+                    response     = resp_target.valid & resp_target.ready & resp_last & (resp_index == i),
+                    max_requests = max_pending + 1,
+                )
+                self.submodules += counter
+                counters.append(counter)
+                if self.id_mode == "remap":
+                    id_fifo = stream.SyncFIFO([("id", id_width)], depth=max_pending)
+                    self.submodules += id_fifo
+                    self.comb += [
+                        id_fifo.sink.valid.eq(ax_accepted & (rr.grant == i)),
+                        id_fifo.sink.id.eq(get_sig(m, ax, "id")),
+                        id_fifo.source.ready.eq(resp_target.valid & resp_target.ready & resp_last & (resp_index == i)),
+                    ]
+                    id_fifos.append(id_fifo)
+            full = Array(c.full for c in counters)
+            self.comb += ax_accepted.eq(ax_target.valid & ax_target.ready)
+
+            # Write Data order (index of the granted write addresses).
+            if data_order is not None:
+                self.comb += [
+                    data_order.sink.valid.eq(ax_accepted),
+                    data_order.sink.index.eq(rr.grant),
+                ]
+
+            # Address Channel.
+            if data_order is None:
+                self.comb += ax_allowed.eq(~full[rr.grant])
+            else:
+                self.comb += ax_allowed.eq(~full[rr.grant] & data_order.sink.ready)
+            for channel, name, direction in target.layout_flat():
+                if (channel != ax) or (direction != DIR_M_TO_S):
+                    continue
+                if name == "id":
+                    choices = Array(get_target_id(get_sig(m, ax, "id"), i) for i, m in enumerate(ms))
+                else:
+                    choices = Array(get_sig(m, ax, name) for m in ms)
+                self.comb += get_sig(target, ax, name).eq(choices[rr.grant])
+            self.comb += If(~ax_allowed, ax_target.valid.eq(0))
+            for i, m in enumerate(ms):
+                self.comb += get_sig(m, ax, "ready").eq(ax_target.ready & ax_allowed & (rr.grant == i))
+
+            # Write Data Channel.
+            if data is not None:
+                data_target = getattr(target, data)
+                index       = data_order.source.index
+                for channel, name, direction in target.layout_flat():
+                    if (channel != data) or (direction != DIR_M_TO_S):
+                        continue
+                    if name == "id":
+                        choices = Array(get_target_id(m.w.id, i) for i, m in enumerate(ms))
+                    else:
+                        choices = Array(get_sig(m, data, name) for m in ms)
+                    self.comb += get_sig(target, data, name).eq(choices[index])
+                self.comb += [
+                    If(~data_order.source.valid, data_target.valid.eq(0)),
+                    data_order.source.ready.eq(data_target.valid & data_target.ready & data_target.last),
+                ]
+                for i, m in enumerate(ms):
+                    self.comb += m.w.ready.eq(data_target.ready & data_order.source.valid & (index == i))
+
+            # Response Channel: routed by ID.
+            for i, m in enumerate(ms):
+                m_resp = getattr(m, resp)
+                for channel, name, direction in target.layout_flat():
+                    if (channel != resp) or (direction != DIR_S_TO_M):
+                        continue
+                    source = get_sig(target, resp, name)
+                    dest   = get_sig(m, resp, name)
+                    if name == "valid":
+                        self.comb += dest.eq(source & (resp_index == i))
+                    elif name == "id":
+                        if self.id_mode == "prefix":
+                            self.comb += dest.eq(source[:id_width])
+                        else:
+                            self.comb += dest.eq(id_fifos[i].source.id)
+                    else:
+                        self.comb += dest.eq(source)
+            self.comb += resp_target.ready.eq(Reduce("OR", [
+                get_sig(m, resp, "ready") & (resp_index == i) for i, m in enumerate(ms)]))
+
+            return rr, counters
+
+        # Write Channels.
+        if len(write_masters):
+            self.w_order = w_order = stream.SyncFIFO([("index", max(index_width, 1))], depth=max_pending)
+            self.rr_write, self.wr_pending = add_channels(write_masters, "aw", "w", "b", w_order)
+
+        # Read Channels.
+        if len(read_masters):
+            self.rr_read, self.rd_pending = add_channels(read_masters, "ar", None, "r", None)
+
 class AXIDecoder(LiteXModule):
     """AXI decoder
 
@@ -1323,14 +1490,27 @@ class AXIInterconnectPointToPoint(LiteXModule):
     def __init__(self, master, slave):
         self.comb += master.connect(slave)
 
+def get_arbiter_cls(arbiter):
+    # "default": Grant locked until all responses have been returned (AXIArbiter).
+    # "id"     : Grant switched on each address phase, responses routed by ID (AXIIDArbiter).
+    if arbiter not in ["default", "id"]:
+        raise ValueError(f"Unsupported AXI Arbiter: {arbiter}.")
+    return {"default": AXIArbiter, "id": AXIIDArbiter}[arbiter]
+
 class AXIInterconnectShared(LiteXModule):
     """AXI shared interconnect"""
-    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6):
+    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6, arbiter="default",
+        policy="round-robin", priorities=None):
         data_width = get_check_parameters(ports=masters + [s for _, s in slaves])
+        arbiter_cls = get_arbiter_cls(arbiter)
         adr_width = max([m.address_width for m in masters])
         id_width = max([m.id_width for m in masters])
+        if arbiter == "id":
+            # Prefix master IDs with the master index when slaves can return them.
+            index_width = bits_for(len(masters) - 1) if len(masters) > 1 else 0
+            id_width    = min([id_width + index_width] + [s.id_width for _, s in slaves])
         shared = AXIInterface(data_width=data_width, address_width=adr_width, id_width=id_width)
-        self.arbiter = AXIArbiter(masters, shared)
+        self.arbiter = arbiter_cls(masters, shared, policy=policy, priorities=priorities)
         self.decoder = AXIDecoder(shared, slaves)
         if timeout_cycles is not None:
             self.timeout = AXITimeout(shared, timeout_cycles)
@@ -1340,8 +1520,10 @@ class AXICrossbar(LiteXModule):
 
     MxN crossbar for M masters and N slaves.
     """
-    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6):
+    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6, arbiter="default",
+        policy="round-robin", priorities=None):
         data_width = get_check_parameters(ports=masters + [s for _, s in slaves])
+        arbiter_cls = get_arbiter_cls(arbiter)
         adr_width = max([m.address_width for m in masters])
         id_width = max([m.id_width for m in masters])
         matches, busses = zip(*slaves)
@@ -1353,4 +1535,4 @@ class AXICrossbar(LiteXModule):
             self.submodules += AXIDecoder(master, slaves, register)
         # Arbitrate each access column onto its slave.
         for masters, bus in zip(access_s_m, busses):
-            self.submodules += AXIArbiter(masters, bus)
+            self.submodules += arbiter_cls(masters, bus, policy=policy, priorities=priorities)
@@ -200,8 +200,10 @@ class AXILiteOffset(LiteXModule):
 
 # AXI-Lite to Simple Bus ---------------------------------------------------------------------------
 
-def axi_lite_to_simple(axi_lite, port_adr, port_dat_r=None, port_dat_w=None, port_re=None, port_we=None):
-    """Connection of AXILite to simple bus with 1-cycle latency, such as CSR bus or Memory port"""
+def axi_lite_to_simple(axi_lite, port_adr, port_dat_r=None, port_dat_w=None, port_re=None, port_we=None, latency=0):
+    """Connection of AXILite to simple bus with 1-cycle latency, such as CSR bus or Memory port
+
+    (`latency` additional cycles are waited on reads, for pipelined buses)."""
     bus_data_width = axi_lite.data_width
     adr_shift      = log2_int(bus_data_width//8)
     do_read        = Signal()
@@ -251,9 +253,18 @@ def axi_lite_to_simple(axi_lite, port_adr, port_dat_r=None, port_dat_w=None, por
         fsm.act("START-TRANSACTION",
             If(do_read,
                 port_adr.eq(axi_lite.ar.addr[adr_shift:]),
-                NextState("LATCH-READ-RESPONSE"),
+                NextState("WAIT-READ-RESPONSE" if latency else "LATCH-READ-RESPONSE"),
             )
         )
+        if latency:
+            wait = Signal(max=max(2, latency))
+            fsm.act("WAIT-READ-RESPONSE",
+                NextValue(wait, wait + 1),
+                If(wait == (latency - 1),
+                    NextValue(wait, 0),
+                    NextState("LATCH-READ-RESPONSE")
+                )
+            )
         fsm.act("LATCH-READ-RESPONSE",
             NextValue(last_was_read, 1),
             axi_lite.r.data.eq(port_dat_r),
@@ -654,6 +665,17 @@ class AXILiteClockDomainCrossing(LiteXModule):
                 r_cdc.source.connect(master.r),
             ]
 
+# AXI-Lite Register Slice --------------------------------------------------------------------------
+
+class AXILiteRegisterSlice(LiteXModule):
+    """AXILite Register Slice (registers all the channels, each stage adds 1 cycle of latency)"""
+    def __init__(self, master, slave, stages=1, pipe_valid=True, pipe_ready=True):
+        add_register_slices(self, master, slave,
+            stages     = stages,
+            pipe_valid = pipe_valid,
+            pipe_ready = pipe_ready,
+        )
+
 # AXI-Lite Timeout ---------------------------------------------------------------------------------
 
 class AXILiteTimeout(LiteXModule):
@@ -744,13 +766,14 @@ class AXILiteArbiter(LiteXModule):
 
     Arbitrate between master interfaces and connect one to the target. New master will not be
     selected until all requests have been responded to. Arbitration for write and read channels is
-    done separately.
+    done separately, with the `policy` of litex.gen.genlib.arbiter (round-robin by default).
     """
-    def __init__(self, masters, target):
+    def __init__(self, masters, target, policy="round-robin", priorities=None):
+        masters       = list(masters)
         write_masters = [m for m in masters if "w" in m.mode]
         read_masters  = [m for m in masters if "r" in m.mode]
-        self.rr_write = roundrobin.RoundRobin(len(write_masters), roundrobin.SP_CE)
-        self.rr_read  = roundrobin.RoundRobin(len(read_masters), roundrobin.SP_CE)
+        self.rr_write = add_channel_arbiter(self, masters, write_masters, "aw", policy, priorities)
+        self.rr_read  = add_channel_arbiter(self, masters, read_masters,  "ar", policy, priorities)
 
         def get_sig(interface, channel, name):
             return getattr(getattr(interface, channel), name)
@@ -936,11 +959,12 @@ class AXILiteInterconnectPointToPoint(LiteXModule):
 
 class AXILiteInterconnectShared(LiteXModule):
     """AXI Lite shared interconnect"""
-    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6):
+    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6,
+        policy="round-robin", priorities=None):
         data_width = get_check_parameters(ports=masters + [s for _, s in slaves])
         adr_width = max([m.address_width for m in masters])
         shared = AXILiteInterface(data_width=data_width, address_width=adr_width)
-        self.arbiter = AXILiteArbiter(masters, shared)
+        self.arbiter = AXILiteArbiter(masters, shared, policy=policy, priorities=priorities)
         self.decoder = AXILiteDecoder(shared, slaves)
         if timeout_cycles is not None:
             self.timeout = AXILiteTimeout(shared, timeout_cycles)
@@ -950,7 +974,8 @@ class AXILiteCrossbar(LiteXModule):
 
     MxN crossbar for M masters and N slaves.
     """
-    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6):
+    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6,
+        policy="round-robin", priorities=None):
         data_width = get_check_parameters(ports=masters + [s for _, s in slaves])
         adr_width = max([m.address_width for m in masters])
         matches, busses = zip(*slaves)
@@ -962,4 +987,4 @@ class AXILiteCrossbar(LiteXModule):
             self.submodules += AXILiteDecoder(master, slaves, register)
         # Arbitrate each access column onto its slave.
         for masters, bus in zip(access_s_m, busses):
-            self.submodules += AXILiteArbiter(masters, bus)
+            self.submodules += AXILiteArbiter(masters, bus, policy=policy, priorities=priorities)
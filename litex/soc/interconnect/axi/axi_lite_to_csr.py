@@ -21,7 +21,7 @@ from litex.soc.interconnect.axi.axi_lite import *
 # AXI-Lite to CSR ----------------------------------------------------------------------------------
 
 class AXILite2CSR(LiteXModule):
-    def __init__(self, axi_lite=None, bus_csr=None, register=False):
+    def __init__(self, axi_lite=None, bus_csr=None, register=False, latency=0):
         # TODO: unused register argument
         if axi_lite is None:
             axi_lite = AXILiteInterface()
@@ -39,6 +39,7 @@ class AXILite2CSR(LiteXModule):
             port_re    = self.csr.re,
             port_dat_r = self.csr.dat_r,
             port_dat_w = self.csr.dat_w,
-            port_we    = self.csr.we)
+            port_we    = self.csr.we,
+            latency    = latency)
         self.fsm = fsm
         self.comb += comb
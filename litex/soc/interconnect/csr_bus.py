@@ -110,6 +110,61 @@ class InterconnectShared(Module):
             self.comb += masters[i].dat_r.eq(intermediate.dat_r)
         self.comb += intermediate.connect(*slaves)
 
+
+class InterconnectSplit(Module):
+    """CSR Interconnect split in segments.
+
+    The slaves are grouped in `segments` sub-buses decoded from the upper bits of their CSR location
+    (the CSR address space is divided in `paging` sized locations), each sub-bus only sees the
+    accesses to its segment and only ORs the dat_r of its slaves (no additional read latency).
+    With register=True, the requests and the read data of each segment are also registered to cut
+    the timing paths of large CSR buses: this improves Fmax but reads then return after `latency`
+    (2) additional cycles (to be configured on the CSR bridges).
+
+    `slaves` is a list of (location, bus) tuples.
+    """
+    def __init__(self, masters, slaves, segments, paging=0x800, register=False):
+        self.latency = 2 if register else 0
+        self.segments = segments
+
+        master = Interface.like(masters[0])
+        self.submodules += InterconnectShared(masters, [master])
+
+        aligned_paging = paging//4
+        location_bits  = len(master.adr) - log2_int(aligned_paging)
+        segment_bits   = log2_int(segments)
+        if segment_bits > location_bits:
+            raise ValueError(f"CSR segments ({segments}) must be <= CSR locations ({2**location_bits}).")
+
+        # # #
+
+        segment = master.adr[len(master.adr) - segment_bits:]
+        dat_rs  = []
+        self.buses = []
+        for n in range(segments):
+            segment_slaves = [bus for location, bus in slaves if (location >> (location_bits - segment_bits)) == n]
+            if not segment_slaves:
+                continue
+            bus = Interface.like(master)
+            sel = (segment == n) if segment_bits else 1
+            request = [
+                bus.adr.eq(master.adr),
+                bus.dat_w.eq(master.dat_w),
+                bus.re.eq(master.re & sel),
+                bus.we.eq(master.we & sel),
+            ]
+            if register:
+                dat_r = Signal(len(bus.dat_r), reset_less=True)
+                self.sync += request
+                self.sync += dat_r.eq(bus.dat_r)
+            else:
+                dat_r = bus.dat_r
+                self.comb += request
+            self.comb += bus.connect(*segment_slaves)
+            self.buses.append(bus)
+            dat_rs.append(dat_r)
+        self.comb += master.dat_r.eq(Reduce("OR", dat_rs) if dat_rs else 0)
+
 # CSR SRAM -----------------------------------------------------------------------------------------
 
 class SRAM(Module):
@@ -311,3 +366,9 @@ class CSRBankArray(Module):
 
     def get_buses(self):
         return [i.bus for i in self.get_rmaps() + self.get_mmaps()]
+
+    def get_mapped_buses(self):
+        """Return the (location, bus) of the banks and memories."""
+        banks = [(mapaddr, rmap.bus) for name, csrs,   mapaddr, rmap in self.banks]
+        srams = [(mapaddr, mmap.bus) for name, memory, mapaddr, mmap in self.srams]
+        return banks + srams
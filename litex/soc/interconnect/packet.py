@@ -13,6 +13,7 @@ from migen.genlib.roundrobin import *
 from litex.gen import *
 
 from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import CSR, CSRStatus, CSRStorage
 
 # Status -------------------------------------------------------------------------------------------
 
@@ -55,6 +56,136 @@ class Arbiter(LiteXModule):
                 cases[i] = [master.connect(slave, **kwargs)]
             self.comb += Case(self.grant, cases)
 
+# Deficit Round-Robin Arbiter ----------------------------------------------------------------------
+
+class DRRArbiter(LiteXModule):
+    """Deficit Round-Robin packet arbiter.
+
+    Masters are visited in round-robin order. Each visit adds the master's quantum (in bytes,
+    `quanta`, default: one beat) to its deficit counter and the master keeps the grant for further
+    packets while its deficit is positive. The bytes of the transferred beats are subtracted from
+    the deficit (the last beat only counts the bytes up to `last_be` when present). Packets are
+    never interrupted: overshoots are carried as a negative deficit, so that masters get a share of
+    the bandwidth proportional to their quantum regardless of their packet sizes. The positive
+    deficit of a master is cleared when the grant moves away from it while idle. When no other
+    master is valid, the granted master is served regardless of its deficit, which then saturates
+    (at 0 or at its current negative value): a lone master is served at full throughput without
+    being charged for the otherwise idle bandwidth nor having its debt dropped.
+
+    `bytes` are the (wrapping) per-master transferred bytes counters. With `with_csr`, quanta are
+    configurable through CSRs and bytes counters are exposed as CSRs.
+    """
+    def __init__(self, masters, slave, quanta=None, quantum_width=16, with_csr=False, **kwargs):
+        n = len(masters)
+        if n == 0:
+            raise ValueError("DRRArbiter requires at least one master.")
+        bytes_per_beat = max(len(slave.data)//8, 1) if hasattr(slave, "data") else 1
+        if quanta is None:
+            quanta = [bytes_per_beat]*n
+        if len(quanta) != n:
+            raise ValueError(f"DRRArbiter quanta count ({len(quanta)}) must match masters count ({n}).")
+        if (min(quanta) < 1) or (max(quanta) >= 2**quantum_width):
+            raise ValueError(f"DRRArbiter quanta must be between 1 and {2**quantum_width - 1} (got {quanta}).")
+        self.grant   = Signal(max=max(n, 2))
+        self.quanta  = [Signal(quantum_width, reset=q) for q in quanta]
+        self.deficit = [Signal((32, True)) for _ in range(n)]
+        self.bytes   = [Signal(32) for _ in range(n)]
+        self.clear   = Signal()
+        self.n       = n
+
+        # # #
+
+        valids   = Signal(n)
+        others   = Signal()
+        locked   = Signal()
+        serve    = Signal()
+        switch   = Signal()
+        transfer = Signal()
+        self.comb += [
+            valids.eq(Cat(*[m.valid for m in masters])),
+            others.eq(Cat(*[m.valid & (self.grant != i) for i, m in enumerate(masters)]) != 0),
+            transfer.eq(slave.valid & slave.ready),
+        ]
+
+        # Transferred bytes.
+        beat_bytes = Signal(max=bytes_per_beat + 1)
+        self.comb += beat_bytes.eq(bytes_per_beat)
+        if hasattr(slave, "last_be"):
+            for i in range(len(slave.last_be)):
+                self.comb += If(slave.last & slave.last_be[i], beat_bytes.eq(i + 1))
+
+        # Serve the granted master during packets and while its deficit is positive (or while no other
+        # master is valid), switch at the end of the packets when the deficit is exhausted and another
+        # master is valid or when the granted master is not served.
+        deficits      = Array(self.deficit)
+        deficit_after = Signal((32, True))
+        self.comb += [
+            serve.eq(locked | (valids.part(self.grant, 1) & ((deficits[self.grant] > 0) | ~others))),
+            deficit_after.eq(deficits[self.grant] - beat_bytes),
+            switch.eq((~serve & (valids != 0)) | (transfer & slave.last & (deficit_after <= 0) & others)),
+        ]
+        self.sync += If(transfer, locked.eq(~slave.last))
+        cases = {}
+        for i, master in enumerate(masters):
+            cases[i] = If(serve, master.connect(slave, **kwargs))
+        self.comb += Case(self.grant, cases)
+
+        # Next master in round-robin order (current master last).
+        next_grant = Signal(max=max(n, 2))
+        cases = {}
+        for i in range(n):
+            choice = [next_grant.eq(i)]
+            for j in reversed(range(i + 1, i + n + 1)):
+                t = j % n
+                choice = [If(valids[t], next_grant.eq(t)).Else(*choice)]
+            cases[i] = choice
+        self.comb += Case(self.grant, cases)
+        self.sync += If(switch, self.grant.eq(next_grant))
+
+        # Deficits/Bytes.
+        for i in range(n):
+            charged = Signal((32, True))
+            deficit = Signal((32, True))
+            self.comb += [
+                charged.eq(self.deficit[i] - Mux(transfer & (self.grant == i), beat_bytes, 0)),
+                deficit.eq(charged),
+                # Saturate when no other master is valid.
+                If(~others & (charged < 0),
+                    deficit.eq(Mux(self.deficit[i] > 0, 0, self.deficit[i]))
+                )
+            ]
+            self.sync += [
+                If(switch & (next_grant == i),
+                    self.deficit[i].eq(Mux(deficit > 0, 0, deficit) + self.quanta[i])
+                ).Elif(switch & (self.grant == i) & (deficit > 0),
+                    self.deficit[i].eq(0)
+                ).Else(
+                    self.deficit[i].eq(deficit)
+                ),
+                If(self.clear,
+                    self.bytes[i].eq(0)
+                ).Elif(transfer & (self.grant == i),
+                    self.bytes[i].eq(self.bytes[i] + beat_bytes)
+                )
+            ]
+
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._clear = CSR()
+        self.comb += self.clear.eq(self._clear.re)
+        for i in range(self.n):
+            quantum = CSRStorage(len(self.quanta[i]), reset=self.quanta[i].reset.value, name=f"quantum{i}",
+                description=f"Master {i} quantum (bytes per round).")
+            count   = CSRStatus(32, name=f"bytes{i}", description=f"Master {i} transferred bytes (wrapping).")
+            setattr(self, f"_quantum{i}", quantum)
+            setattr(self, f"_bytes{i}",   count)
+            self.comb += [
+                self.quanta[i].eq(quantum.storage),
+                count.status.eq(self.bytes[i]),
+            ]
+
 # Dispatcher ---------------------------------------------------------------------------------------
 
 class Dispatcher(LiteXModule):
@@ -405,13 +536,362 @@ class Depacketizer(LiteXModule):
             else:
                 self.comb += source.error.eq(Mux(sink_d.last, sink_d.error, sink.error))
 
+# Wide Packetizer/Depacketizer ---------------------------------------------------------------------
+
+def _last_be_bytes(last_be, lo, hi):
+    """Return whether the (one-hot) last_be points to a byte in [lo:hi]."""
+    return last_be[lo:hi] != 0 if hi > lo else 0
+
+
+class WidePacketizer(LiteXModule):
+    """Packetizer for wide datapaths.
+
+    Same interface as Packetizer but without restriction on the header length (which can be
+    smaller than the data width) and with one output beat per cycle in all alignment cases: the
+    payload is shifted by the header leftover bytes (header.length % bytes per beat) with static
+    byte lanes (the header length being fixed, the barrel shift is done at elaboration) and the
+    bytes shifted out of the last beat are sent in an extra beat.
+
+    When both endpoints have a (one-hot) last_be, the last beat is only sent when the payload
+    bytes do not fit in the previous one and last_be is adjusted.
+    """
+    def __init__(self, sink_description, source_description, header):
+        self.sink   = sink   = stream.Endpoint(sink_description)
+        self.source = source = stream.Endpoint(source_description)
+        self.header = Signal(header.length*8)
+
+        # # #
+
+        # Parameters.
+        data_width      = len(sink.data)
+        bytes_per_clk   = data_width//8
+        header_words    = (header.length*8)//data_width
+        header_leftover = header.length%bytes_per_clk
+        with_last_be    = hasattr(sink, "last_be") and hasattr(source, "last_be")
+        lo = header_leftover*8               # Header leftover bits.
+        hi = (bytes_per_clk - header_leftover)*8 # Payload bits fitting in a beat after the leftover.
+
+        # Signals.
+        count      = Signal(max=header_words + 2) # <header_words: Header, header_words: First data.
+        carry      = Signal(max(lo, 1))
+        flush      = Signal()
+        flush_be   = Signal(bytes_per_clk) if with_last_be else None
+        error_d    = Signal()
+        need_flush = Signal()
+
+        # Header Encode.
+        self.comb += header.encode(sink, self.header)
+
+        # Flush of the last payload bytes (unaligned).
+        if header_leftover:
+            if with_last_be:
+                self.comb += need_flush.eq(_last_be_bytes(sink.last_be, bytes_per_clk - header_leftover, bytes_per_clk))
+            else:
+                self.comb += need_flush.eq(1)
+
+        # Header Send.
+        header_cases = {}
+        for i in range(header_words):
+            header_cases[i] = source.data.eq(self.header[i*data_width:(i + 1)*data_width])
+
+        # Data Send.
+        if header_leftover:
+            data = Mux(count == header_words,
+                Cat(self.header[header_words*data_width:], sink.data[:hi]),
+                Cat(carry, sink.data[:hi]))
+        else:
+            data = sink.data
+
+        self.comb += [
+            If(flush,
+                source.valid.eq(1),
+                source.last.eq(1),
+                source.data.eq(carry),
+            ).Elif(count < header_words,
+                source.valid.eq(sink.valid),
+                source.first.eq(count == 0),
+                Case(count, header_cases),
+            ).Else(
+                source.valid.eq(sink.valid),
+                source.first.eq(count == 0),
+                source.last.eq(sink.last & ~need_flush),
+                source.data.eq(data),
+                sink.ready.eq(source.ready),
+            )
+        ]
+        self.sync += [
+            If(flush,
+                If(source.ready, flush.eq(0))
+            ).Elif(source.valid & source.ready,
+                If(count < header_words,
+                    count.eq(count + 1)
+                ).Else(
+                    count.eq(header_words + 1),
+                    carry.eq(sink.data[hi:]) if header_leftover else [],
+                    error_d.eq(sink.error) if hasattr(sink, "error") else [],
+                    If(sink.last,
+                        count.eq(0),
+                        flush.eq(need_flush),
+                    )
+                )
+            )
+        ]
+
+        # Last BE.
+        if with_last_be and header_leftover:
+            self.sync += If(~flush, flush_be.eq(sink.last_be[hi//8:]))
+            self.comb += [
+                If(flush,
+                    source.last_be.eq(flush_be)
+                ).Elif(source.last,
+                    source.last_be.eq(Cat(Constant(0, header_leftover), sink.last_be[:hi//8]))
+                )
+            ]
+        elif with_last_be:
+            self.comb += If(source.last, source.last_be.eq(sink.last_be))
+
+        # Error.
+        if hasattr(sink, "error") and hasattr(source, "error"):
+            self.comb += source.error.eq(Mux(flush, error_d, sink.error))
+
+
+class WideDepacketizer(LiteXModule):
+    """Depacketizer for wide datapaths.
+
+    Same interface as Depacketizer but without restriction on the header length (which can be
+    smaller than the data width) and consuming one input beat per cycle in all alignment cases:
+    the payload is shifted by the header leftover bytes (header.length % bytes per beat) with
+    static byte lanes, the header beats are consumed without output and the beats of the next
+    packet are accepted while the last payload bytes are flushed. Packets ending within the header
+    are dropped.
+
+    Without last_be, the payload bytes not filling a complete output beat are dropped (as with
+    Depacketizer). When both endpoints have a (one-hot) last_be, the payload is byte exact and
+    last_be is adjusted.
+    """
+    def __init__(self, sink_description, source_description, header):
+        self.sink   = sink   = stream.Endpoint(sink_description)
+        self.source = source = stream.Endpoint(source_description)
+        self.header = Signal(header.length*8)
+
+        # # #
+
+        # Parameters.
+        data_width      = len(sink.data)
+        bytes_per_clk   = data_width//8
+        header_words    = (header.length*8)//data_width
+        header_leftover = header.length%bytes_per_clk
+        with_last_be    = hasattr(sink, "last_be") and hasattr(source, "last_be")
+        lo = header_leftover*8 # Header leftover bits.
+
+        # Signals.
+        count      = Signal(max=header_words + 2) # <header_words: Header, header_words: Leftover.
+        carry      = Signal(data_width - lo)
+        flush      = Signal()
+        flush_be   = Signal(bytes_per_clk) if with_last_be else None
+        first      = Signal(reset=1)
+        error_d    = Signal()
+        need_flush = Signal()
+        header_end = header_words + int(header_leftover != 0)
+
+        # Header Receive/Decode.
+        header_cases = {}
+        for i in range(header_words):
+            header_cases[i] = self.header[i*data_width:(i + 1)*data_width].eq(sink.data)
+        if header_leftover:
+            header_cases[header_words] = self.header[header_words*data_width:].eq(sink.data[:lo])
+        self.sync += If(sink.valid & sink.ready & (count < header_end), Case(count, header_cases))
+        self.comb += header.decode(self.header, source)
+
+        # Flush of the last payload bytes (unaligned, last_be only).
+        if header_leftover and with_last_be:
+            self.comb += need_flush.eq(_last_be_bytes(sink.last_be, header_leftover, bytes_per_clk))
+
+        # Data Receive.
+        data = Cat(carry, sink.data[:lo]) if header_leftover else sink.data
+        self.comb += [
+            If(count < header_end,
+                # Header beats: no output, accepted while flushing the previous packet.
+                sink.ready.eq(~flush | source.ready),
+            ).Else(
+                source.valid.eq(sink.valid),
+                source.last.eq(sink.last & ~need_flush),
+                source.data.eq(data),
+                sink.ready.eq(source.ready),
+            ),
+            source.first.eq(first),
+            If(flush,
+                source.valid.eq(1),
+                source.last.eq(1),
+                source.data.eq(carry),
+            )
+        ]
+        self.sync += [
+            If(source.valid & source.ready,
+                first.eq(source.last),
+                If(flush, flush.eq(0))
+            ),
+            If(sink.valid & sink.ready,
+                If(count < header_end,
+                    count.eq(count + 1)
+                ),
+                If(count >= header_words,
+                    carry.eq(sink.data[lo:]),
+                    error_d.eq(sink.error) if hasattr(sink, "error") else [],
+                ),
+                If(sink.last,
+                    count.eq(0),
+                    # Packets ending within the header are dropped (only the leftover beat with
+                    # payload bytes is flushed).
+                    flush.eq(need_flush & (count >= header_words)),
+                )
+            )
+        ]
+
+        # Last BE.
+        if with_last_be and header_leftover:
+            self.sync += If(sink.valid & sink.ready, flush_be.eq(sink.last_be[lo//8:]))
+            self.comb += [
+                If(flush,
+                    source.last_be.eq(flush_be)
+                ).Elif(source.last,
+                    source.last_be.eq(Cat(Constant(0, bytes_per_clk - header_leftover), sink.last_be[:lo//8]))
+                )
+            ]
+        elif with_last_be:
+            self.comb += If(source.last, source.last_be.eq(sink.last_be))
+
+        # Error.
+        if hasattr(sink, "error") and hasattr(source, "error"):
+            self.comb += source.error.eq(Mux(flush, error_d, sink.error))
+
 # PacketFIFO ---------------------------------------------------------------------------------------
 
+class _PacketCommitFIFO(LiteXModule):
+    """Payload FIFO with packet commit/discard.
+
+    Written beats only become readable once committed (`commit` asserted with the last written
+    beat), `discard` drops the uncommitted beats (and the beat presented on the sink this cycle).
+    """
+    def __init__(self, description, depth):
+        assert depth >= 1
+        self.sink      = sink   = stream.Endpoint(description)
+        self.source    = source = stream.Endpoint(description)
+        self.commit    = Signal()
+        self.discard   = Signal()
+        self.depth     = depth
+        self.level     = Signal(max=depth + 1) # Written beats (committed and uncommitted).
+        self.committed = Signal(max=depth + 1) # Committed (readable) beats.
+
+        # # #
+
+        fifo_layout = [
+            ("payload", description.payload_layout),
+            ("first",   1),
+            ("last",    1),
+        ]
+        fifo_in  = Record(fifo_layout)
+        fifo_out = Record(fifo_layout)
+        self.comb += [
+            fifo_in.payload.eq(sink.payload),
+            fifo_in.first.eq(sink.first),
+            fifo_in.last.eq(sink.last),
+            source.payload.eq(fifo_out.payload),
+            source.first.eq(fifo_out.first),
+            source.last.eq(fifo_out.last),
+        ]
+
+        # Storage.
+        storage = Memory(layout_len(fifo_layout), depth)
+        wrport  = storage.get_port(write_capable=True)
+        rdport  = storage.get_port(async_read=True)
+        self.specials += storage, wrport, rdport
+
+        # Pointers.
+        def next_ptr(ptr):
+            return Mux(ptr == (depth - 1), 0, ptr + 1)
+        wr_ptr     = Signal(max=max(depth, 2))
+        commit_ptr = Signal(max=max(depth, 2))
+        rd_ptr     = Signal(max=max(depth, 2))
+
+        # Write/Read.
+        write = Signal()
+        read  = Signal()
+        self.comb += [
+            sink.ready.eq(self.level != depth),
+            write.eq(sink.valid & sink.ready & ~self.discard),
+            wrport.adr.eq(wr_ptr),
+            wrport.dat_w.eq(fifo_in.raw_bits()),
+            wrport.we.eq(write),
+            source.valid.eq(self.committed != 0),
+            read.eq(source.valid & source.ready),
+            rdport.adr.eq(rd_ptr),
+            fifo_out.raw_bits().eq(rdport.dat_r),
+        ]
+        self.sync += [
+            If(read, rd_ptr.eq(next_ptr(rd_ptr))),
+            If(self.discard,
+                wr_ptr.eq(commit_ptr),
+                self.level.eq(self.committed - read),
+            ).Else(
+                If(write, wr_ptr.eq(next_ptr(wr_ptr))),
+                self.level.eq(self.level + write - read),
+            ),
+            If(self.commit & ~self.discard,
+                commit_ptr.eq(Mux(write, next_ptr(wr_ptr), wr_ptr)),
+                self.committed.eq(self.level + write - read),
+            ).Else(
+                self.committed.eq(self.committed - read),
+            )
+        ]
+
+
 class PacketFIFO(LiteXModule):
-    def __init__(self, layout, payload_depth, param_depth=None, buffered=False):
+    """Packet FIFO.
+
+    Payload and params are stored in separate FIFOs (params once per packet).
+
+    With mode="store-and-forward", packets are only forwarded once complete (params are sampled on
+    the last beat); payload_depth must then be large enough to store the largest packet. With
+    mode="cut-through", beats are forwarded as soon as they are stored (params are sampled on the
+    first beat). With drop_on_overflow (store-and-forward only), the sink is never stalled: packets
+    that do not fit in the FIFOs are dropped and counted in `dropped_packets`/`dropped_beats`.
+
+    `level` (stored beats) and `packets` (stored complete packets) are compared against the
+    `almost_full`/`almost_empty` (in bytes of the data field) and `packets_almost_full`/
+    `packets_almost_empty` thresholds to provide early flow control indications (defaults to the
+    full/empty conditions).
+    """
+    supported_modes = ["store-and-forward", "cut-through"]
+
+    def __init__(self, layout, payload_depth, param_depth=None, buffered=False,
+        mode                 = "store-and-forward",
+        drop_on_overflow     = False,
+        almost_full          = None,
+        almost_empty         = None,
+        packets_almost_full  = None,
+        packets_almost_empty = None):
+        if mode not in self.supported_modes:
+            raise ValueError(f"Unsupported PacketFIFO mode: {mode}.")
+        if drop_on_overflow and (mode != "store-and-forward"):
+            raise ValueError("PacketFIFO drop_on_overflow requires store-and-forward mode.")
+        if drop_on_overflow and (payload_depth < 1):
+            raise ValueError("PacketFIFO drop_on_overflow requires a payload_depth >= 1.")
         self.sink   = sink   = stream.Endpoint(layout)
         self.source = source = stream.Endpoint(layout)
 
+        # Occupancy.
+        self.level                = Signal(max=payload_depth + 1)
+        self.packets              = Signal(max=payload_depth + 2)
+        self.almost_full          = Signal()
+        self.almost_empty         = Signal()
+        self.packets_almost_full  = Signal()
+        self.packets_almost_empty = Signal()
+
+        # Drops.
+        self.dropped_packets = Signal(32)
+        self.dropped_beats   = Signal(32)
+
         # # #
 
         # Parameters.
@@ -421,31 +901,112 @@ class PacketFIFO(LiteXModule):
             param_layout = [("dummy", 1)]
         if param_depth is None:
             param_depth = payload_depth
+        data_width     = len(sink.data) if hasattr(sink, "data") else len(sink.payload)
+        bytes_per_beat = max(data_width//8, 1)
 
         # Create the FIFOs.
         payload_description = stream.EndpointDescription(payload_layout=payload_layout)
         param_description   = stream.EndpointDescription(param_layout=param_layout)
         # Allow param dequeue/enqueue overlap on packet boundaries.
         param_depth         = param_depth + 1 # +1 to allow dequeuing current while enqueuing next.
-        self.payload_fifo = payload_fifo = stream.SyncFIFO(payload_description, payload_depth, buffered)
+        if drop_on_overflow:
+            self.payload_fifo = payload_fifo = _PacketCommitFIFO(payload_description, payload_depth)
+        else:
+            self.payload_fifo = payload_fifo = stream.SyncFIFO(payload_description, payload_depth, buffered)
         self.param_fifo   = param_fifo   = stream.SyncFIFO(param_description,   param_depth,   buffered)
 
         # Connect Sink to FIFOs.
         self.comb += [
             sink.connect(param_fifo.sink,   keep=set([e[0] for e in param_layout])),
             sink.connect(payload_fifo.sink, keep=set([e[0] for e in payload_layout] + ["first", "last"])),
-            # Qualify with payload_fifo.sink.ready: with the last beat stalled on a full payload
-            # FIFO, the params would otherwise be (re-)enqueued every cycle, later replaying as
-            # phantom packets with stale payload.
-            param_fifo.sink.valid.eq(sink.valid & sink.last & payload_fifo.sink.ready),
-            payload_fifo.sink.valid.eq(sink.valid & param_fifo.sink.ready),
-            sink.ready.eq(param_fifo.sink.ready & payload_fifo.sink.ready),
         ]
+        if drop_on_overflow:
+            # Never stall the sink: drop packets overflowing the payload FIFO or the param FIFO.
+            dropping = Signal()
+            overflow = Signal()
+            self.comb += [
+                overflow.eq(sink.valid & ~dropping & (~payload_fifo.sink.ready | (sink.last & ~param_fifo.sink.ready))),
+                payload_fifo.sink.valid.eq(sink.valid & ~dropping & ~overflow),
+                payload_fifo.discard.eq(overflow),
+                payload_fifo.commit.eq(sink.valid & sink.last & ~dropping & ~overflow),
+                param_fifo.sink.valid.eq(payload_fifo.commit),
+                sink.ready.eq(1),
+            ]
+            self.sync += [
+                If(overflow & ~sink.last,
+                    dropping.eq(1)
+                ).Elif(sink.valid & sink.last,
+                    dropping.eq(0)
+                ),
+                If(overflow,
+                    self.dropped_packets.eq(self.dropped_packets + 1)
+                ),
+                If(overflow,
+                    self.dropped_beats.eq(self.dropped_beats + (payload_fifo.level - payload_fifo.committed) + 1)
+                ).Elif(sink.valid & dropping,
+                    self.dropped_beats.eq(self.dropped_beats + 1)
+                ),
+            ]
+        elif mode == "store-and-forward":
+            self.comb += [
+                # Qualify with payload_fifo.sink.ready: with the last beat stalled on a full payload
+                # FIFO, the params would otherwise be (re-)enqueued every cycle, later replaying as
+                # phantom packets with stale payload.
+                param_fifo.sink.valid.eq(sink.valid & sink.last & payload_fifo.sink.ready),
+                payload_fifo.sink.valid.eq(sink.valid & param_fifo.sink.ready),
+                sink.ready.eq(param_fifo.sink.ready & payload_fifo.sink.ready),
+            ]
+        else:
+            # Enqueue the params on the first beat of the packets.
+            self.sink_status = sink_status = Status(sink)
+            self.comb += [
+                param_fifo.sink.valid.eq(sink.valid & sink_status.first & payload_fifo.sink.ready),
+                payload_fifo.sink.valid.eq(sink.valid & (~sink_status.first | param_fifo.sink.ready)),
+                sink.ready.eq(payload_fifo.sink.ready & (~sink_status.first | param_fifo.sink.ready)),
+            ]
 
         # Connect FIFOs to Source.
+        if mode == "store-and-forward":
+            # Params are only enqueued for complete packets.
+            self.comb += [
+                param_fifo.source.connect(source,   omit={"last",  "ready", "dummy"}),
+                payload_fifo.source.connect(source, omit={"valid", "ready"}),
+            ]
+        else:
+            self.comb += [
+                param_fifo.source.connect(source,   omit={"valid", "last", "ready", "dummy"}),
+                payload_fifo.source.connect(source, omit={"valid", "ready"}),
+                source.valid.eq(param_fifo.source.valid & payload_fifo.source.valid),
+            ]
         self.comb += [
-            param_fifo.source.connect(source,   omit={"last",  "ready", "dummy"}),
-            payload_fifo.source.connect(source, omit={"valid", "ready"}),
             param_fifo.source.ready.eq(  source.valid & source.last & source.ready),
             payload_fifo.source.ready.eq(source.valid &               source.ready),
         ]
+
+        # Occupancy.
+        sink_last   = Signal()
+        source_last = Signal()
+        self.comb += [
+            self.level.eq(payload_fifo.level),
+            source_last.eq(source.valid & source.ready & source.last),
+        ]
+        if drop_on_overflow:
+            self.comb += sink_last.eq(payload_fifo.commit)
+        else:
+            self.comb += sink_last.eq(sink.valid & sink.ready & sink.last)
+        self.sync += self.packets.eq(self.packets + sink_last - source_last)
+
+        if almost_full is None:
+            almost_full = payload_depth*bytes_per_beat
+        if almost_empty is None:
+            almost_empty = 0
+        if packets_almost_full is None:
+            packets_almost_full = param_depth
+        if packets_almost_empty is None:
+            packets_almost_empty = 0
+        self.comb += [
+            self.almost_full.eq(         self.level   >= (almost_full + bytes_per_beat - 1)//bytes_per_beat),
+            self.almost_empty.eq(        self.level   <= almost_empty//bytes_per_beat),
+            self.packets_almost_full.eq( self.packets >= packets_almost_full),
+            self.packets_almost_empty.eq(self.packets <= packets_almost_empty),
+        ]
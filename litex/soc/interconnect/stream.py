@@ -11,7 +11,7 @@ import math
 from migen import *
 from migen.util.misc import xdir
 from migen.genlib import fifo
-from migen.genlib.cdc import MultiReg, PulseSynchronizer, AsyncResetSynchronizer
+from migen.genlib.cdc import MultiReg, PulseSynchronizer, AsyncResetSynchronizer, GrayCounter
 
 from litex.gen import *
 
@@ -244,10 +244,309 @@ class AsyncFIFO(_FIFOWrapper):
             depth      = depth
         )
 
+
+def get_cdc_min_depth(ratio=1.0, latency=2, credit_batch=1):
+    """Minimum (power of 2) depth of a credit-based CDC FIFO to sustain line rate.
+
+    `ratio` is the frequency ratio between the source and destination domains (f_from/f_to),
+    `latency` the synchronization latency (in cycles of the receiving domain, 2 for MultiReg) of
+    each direction of the crossing and `credit_batch` the number of credits returned at once. The
+    FIFO has to cover the round-trip of the credits at the rate of the slowest domain.
+    """
+    if ratio <= 0:
+        raise ValueError(f"CDC frequency ratio ({ratio}) must be > 0.")
+    # Round-trip in destination domain cycles: data crossing (+ pointer register), credits batching
+    # and credits crossing (+ batches and credits registers).
+    rate       = min(ratio, 1.0)
+    round_trip = (latency + 1) + (credit_batch - 1)/rate + (latency + 2)/ratio
+    depth      = max(4, math.ceil(rate*round_trip))
+    return 2**log2_int(depth, need_pow2=False)
+
+
+class _CreditAsyncFIFO(Module):
+    """Credit-based asynchronous FIFO ("write"/"read" domains, migen FIFO interface).
+
+    The write side owns `depth` credits (writable when credits are left) and consumes one credit
+    per write. The read side returns the credits in batches of `credit_batch` reads: the number of
+    returned batches is synchronized to the write side as a Gray code (one increment per batch).
+    """
+    def __init__(self, width, depth, credit_batch=1):
+        self.din      = Signal(width, reset_less=True)
+        self.we       = Signal()
+        self.writable = Signal()
+        self.dout     = Signal(width, reset_less=True)
+        self.re       = Signal()
+        self.readable = Signal()
+        self.width    = width
+        self.depth    = depth
+
+        # # #
+
+        depth_bits = log2_int(depth, True)
+
+        # Data path (Gray-coded write pointer synchronized to the read side).
+        produce = ClockDomainsRenamer("write")(GrayCounter(depth_bits + 1))
+        consume = ClockDomainsRenamer("read")(GrayCounter(depth_bits + 1))
+        self.submodules += produce, consume
+        self.comb += [
+            produce.ce.eq(self.writable & self.we),
+            consume.ce.eq(self.readable & self.re),
+        ]
+        produce_rdomain = Signal(depth_bits + 1)
+        produce.q.attr.add("no_retiming")
+        self.specials += MultiReg(produce.q, produce_rdomain, "read")
+        self.comb += self.readable.eq(consume.q != produce_rdomain)
+
+        storage = Memory(width, depth)
+        self.specials += storage
+        wrport = storage.get_port(write_capable=True, clock_domain="write")
+        rdport = storage.get_port(clock_domain="read")
+        self.specials += wrport, rdport
+        self.comb += [
+            wrport.adr.eq(produce.q_binary[:-1]),
+            wrport.dat_w.eq(self.din),
+            wrport.we.eq(produce.ce),
+            rdport.adr.eq(consume.q_next_binary[:-1]),
+            self.dout.eq(rdport.dat_r),
+        ]
+
+        # Credits return (read side, in batches).
+        batch_bits = bits_for(depth//credit_batch) + 1
+        pending    = Signal(max=max(credit_batch, 2))
+        batches    = ClockDomainsRenamer("read")(GrayCounter(batch_bits))
+        self.submodules += batches
+        self.comb += batches.ce.eq(consume.ce & (pending == (credit_batch - 1)))
+        self.sync.read += If(consume.ce,
+            If(pending == (credit_batch - 1),
+                pending.eq(0)
+            ).Else(
+                pending.eq(pending + 1)
+            )
+        )
+
+        # Credits (write side).
+        batches_wdomain        = Signal(batch_bits)
+        batches_wdomain_binary = Signal(batch_bits)
+        batches_returned       = Signal(batch_bits)
+        batches.q.attr.add("no_retiming")
+        self.specials += MultiReg(batches.q, batches_wdomain, "write")
+        self.comb += batches_wdomain_binary[-1].eq(batches_wdomain[-1])
+        for i in reversed(range(batch_bits - 1)):
+            self.comb += batches_wdomain_binary[i].eq(batches_wdomain_binary[i + 1] ^ batches_wdomain[i])
+        returned = Signal(batch_bits)
+        credits  = Signal(max=depth + 1, reset=depth)
+        self.comb += [
+            returned.eq(batches_wdomain_binary - batches_returned),
+            self.writable.eq(credits != 0),
+        ]
+        self.sync.write += [
+            batches_returned.eq(batches_wdomain_binary),
+            credits.eq(credits - produce.ce + returned*credit_batch),
+        ]
+
+
+class CreditAsyncFIFO(_FIFOWrapper):
+    """Credit-based stream AsyncFIFO ("write"/"read" domains).
+
+    sink.ready only depends on the local credits counter and credits are returned in batches of
+    `credit_batch`; size `depth` with get_cdc_min_depth to sustain line rate.
+    """
+    def __init__(self, layout, depth=None, credit_batch=1):
+        depth = get_cdc_min_depth(credit_batch=credit_batch) if depth is None else depth
+        if depth != 2**log2_int(depth, need_pow2=False):
+            raise ValueError(f"CreditAsyncFIFO depth ({depth}) must be a power of 2.")
+        if not (1 <= credit_batch <= depth):
+            raise ValueError(f"CreditAsyncFIFO credit_batch ({credit_batch}) must be between 1 and depth ({depth}).")
+        _FIFOWrapper.__init__(self,
+            fifo_class = lambda width, depth: _CreditAsyncFIFO(width, depth, credit_batch),
+            layout     = layout,
+            depth      = depth
+        )
+        self.depth = depth
+
+class MultiLaneSyncFIFO(LiteXModule):
+    """Multi-lane (banked) synchronous FIFO.
+
+    The payload fields of `layout` are split in `lanes` lanes (all the fields except `keep` must
+    have a width multiple of `lanes`) and each lane is stored in its own `depth`-deep FIFO bank
+    (narrower memories than a SyncFIFO of the full stream width).
+
+    When the payload has a `keep` field (one bit per lane, lanes kept from lane 0), only the kept
+    lanes are written and the lanes are packed across the banks: output beats are rebuilt with
+    all lanes kept, except at the end of the packets (last). Beats without kept lanes are dropped,
+    except last beats: the packet then ends on its last stored lanes, or on a last output beat
+    without kept lanes when all its lanes have already been read.
+
+    Params are stored once per packet in a `param_depth`-deep FIFO (default: `depth`).
+
+    `lane_level` are the levels of the banks (in lanes) and `level` the total number of stored lanes.
+    """
+    def __init__(self, layout, depth, lanes, buffered=False, param_depth=None):
+        self.sink   = sink   = Endpoint(layout)
+        self.source = source = Endpoint(layout)
+        description = sink.description
+        if depth < 2:
+            raise ValueError(f"MultiLaneSyncFIFO depth ({depth}) must be >= 2.")
+        if lanes < 1:
+            raise ValueError(f"MultiLaneSyncFIFO lanes ({lanes}) must be >= 1.")
+        with_keep = "keep" in [f[0] for f in description.payload_layout]
+        if with_keep and (len(sink.keep) != lanes):
+            raise ValueError(f"MultiLaneSyncFIFO keep width ({len(sink.keep)}) must match lanes ({lanes}).")
+        lane_fields = []
+        for name, width in [f[:2] for f in description.payload_layout]:
+            if name == "keep":
+                continue
+            if width % lanes:
+                raise ValueError(f"MultiLaneSyncFIFO {name} width ({width}) must be a multiple of lanes ({lanes}).")
+            lane_fields.append((name, width//lanes))
+        # Lanes of last beats without kept lanes are written as an empty lane ending the packet.
+        lane_layout = lane_fields + [("first", 1), ("last", 1)] + ([("empty", 1)] if with_keep else [])
+        self.depth      = depth
+        self.lanes      = lanes
+        self.lane_level = []
+        self.level      = Signal(max=lanes*(depth + 1) + 1)
+
+        # # #
+
+        fifo_class = fifo.SyncFIFOBuffered if buffered else fifo.SyncFIFO
+        self.banks = banks = [fifo_class(layout_len(lane_layout), depth) for _ in range(lanes)]
+        self.submodules += banks
+        for bank in banks:
+            self.lane_level.append(bank.level)
+        self.comb += self.level.eq(sum(self.lane_level))
+
+        def lane_slice(ep, name, width, i):
+            return getattr(ep, name)[i*width:(i + 1)*width]
+
+        # Params (stored once per packet).
+        with_params = len(description.param_layout) > 0
+        if with_params:
+            self.params = params = SyncFIFO(description.param_layout, depth if param_depth is None else param_depth, buffered)
+            sink_first = Signal(reset=1)
+            self.sync += If(sink.valid & sink.ready, sink_first.eq(sink.last))
+            self.comb += [
+                params.sink.payload.eq(sink.param),
+                params.sink.valid.eq(sink.valid & sink.ready & sink_first),
+            ]
+
+        # Write: kept lanes are written in the banks, starting from wr_lane.
+        keep     = sink.keep if with_keep else Constant(2**lanes - 1, lanes)
+        count    = Signal(max=lanes + 1)
+        empty    = Signal()
+        wr_lane  = Signal(max=max(lanes, 2))
+        writable = Signal()
+        write    = Signal()
+        units    = [Record(lane_layout) for _ in range(lanes)]
+        for i in range(lanes):
+            self.comb += If(keep[i], count.eq(i + 1))
+        if with_keep:
+            self.comb += [
+                empty.eq(sink.last & (keep == 0)),
+                If(empty, count.eq(1)),
+                units[0].empty.eq(empty),
+            ]
+        for i in range(lanes):
+            for name, width in lane_fields:
+                self.comb += getattr(units[i], name).eq(lane_slice(sink, name, width, i))
+            self.comb += [
+                units[i].first.eq(sink.first & (i == 0)),
+                units[i].last.eq( sink.last  & (count == (i + 1))),
+            ]
+        self.comb += writable.eq(Cat(*[bank.writable for bank in banks]) == (2**lanes - 1))
+        if with_params:
+            self.comb += If(sink_first & ~params.sink.ready, writable.eq(0))
+        self.comb += [
+            sink.ready.eq(writable),
+            write.eq(sink.valid & writable),
+        ]
+        for i, bank in enumerate(banks):
+            cases = {}
+            for r in range(lanes):
+                j = (i - r) % lanes
+                cases[r] = [
+                    bank.din.eq(units[j].raw_bits()),
+                    bank.we.eq(write & (count > j)),
+                ]
+            self.comb += Case(wr_lane, cases)
+        wr_next = Signal(max=2*lanes)
+        self.comb += wr_next.eq(wr_lane + count)
+        self.sync += If(write,
+            If(wr_next >= lanes,
+                wr_lane.eq(wr_next - lanes)
+            ).Else(
+                wr_lane.eq(wr_next)
+            )
+        )
+
+        # Read: lanes are read from the banks starting from rd_lane, up to the end of the packet.
+        rd_lane   = Signal(max=max(lanes, 2))
+        readable  = Signal(lanes)
+        available = Signal(lanes)
+        outputs   = [Record(lane_layout) for _ in range(lanes)]
+        for j in range(lanes):
+            cases = {}
+            for r in range(lanes):
+                cases[r] = [
+                    outputs[j].raw_bits().eq(banks[(r + j) % lanes].dout),
+                    readable[j].eq(banks[(r + j) % lanes].readable),
+                ]
+            self.comb += Case(rd_lane, cases)
+            self.comb += available[j].eq(readable[:j + 1] == (2**(j + 1) - 1))
+        read_count = Signal(max=lanes + 1)
+        self.comb += If(available[lanes - 1], read_count.eq(lanes))
+        for j in reversed(range(lanes)):
+            self.comb += If(available[j] & outputs[j].last, read_count.eq(j + 1))
+        read = Signal()
+        self.comb += [
+            source.valid.eq(read_count != 0),
+            source.first.eq(outputs[0].first),
+            read.eq(source.valid & source.ready),
+        ]
+        for j in range(lanes):
+            self.comb += If(read_count == (j + 1), source.last.eq(outputs[j].last))
+            for name, width in lane_fields:
+                self.comb += lane_slice(source, name, width, j).eq(getattr(outputs[j], name))
+            if with_keep:
+                self.comb += source.keep[j].eq((read_count > j) & ~outputs[j].empty)
+        if with_params:
+            self.comb += [
+                If(~params.source.valid, source.valid.eq(0)),
+                source.param.eq(params.source.payload),
+                params.source.ready.eq(read & source.last),
+            ]
+        for i, bank in enumerate(banks):
+            cases = {}
+            for r in range(lanes):
+                cases[r] = bank.re.eq(read & (read_count > ((i - r) % lanes)))
+            self.comb += Case(rd_lane, cases)
+        rd_next = Signal(max=2*lanes)
+        self.comb += rd_next.eq(rd_lane + read_count)
+        self.sync += If(read,
+            If(rd_next >= lanes,
+                rd_lane.eq(rd_next - lanes)
+            ).Else(
+                rd_lane.eq(rd_next)
+            )
+        )
+
 # ClockDomainCrossing ------------------------------------------------------------------------------
 
 class ClockDomainCrossing(LiteXModule, DUID):
-    def __init__(self, layout, cd_from="sys", cd_to="sys", depth=None, buffered=False, with_common_rst=False):
+    """Stream Clock Domain Crossing.
+
+    With mode="ready-valid" (default), an AsyncFIFO is used. With mode="credit", a CreditAsyncFIFO
+    is used and, when `depth` is not specified, sized for line rate from the frequency `ratio`
+    (f_from/f_to), the synchronization `latency` and `credit_batch` (see get_cdc_min_depth).
+    """
+    supported_modes = ["ready-valid", "credit"]
+
+    def __init__(self, layout, cd_from="sys", cd_to="sys", depth=None, buffered=False, with_common_rst=False,
+        mode         = "ready-valid",
+        ratio        = 1.0,
+        latency      = 2,
+        credit_batch = 1):
+        if mode not in self.supported_modes:
+            raise ValueError(f"Unsupported ClockDomainCrossing mode: {mode}.")
         DUID.__init__(self)
         self.sink   = Endpoint(layout)
         self.source = Endpoint(layout)
@@ -289,7 +588,12 @@ class ClockDomainCrossing(LiteXModule, DUID):
                 ]
 
             # Add Asynchronous FIFO
-            cdc = AsyncFIFO(layout, depth, buffered=buffered)
+            if mode == "credit":
+                if depth is None:
+                    depth = get_cdc_min_depth(ratio=ratio, latency=latency, credit_batch=credit_batch)
+                cdc = CreditAsyncFIFO(layout, depth, credit_batch=credit_batch)
+            else:
+                cdc = AsyncFIFO(layout, depth, buffered=buffered)
             cdc = ClockDomainsRenamer({"write": cd_from, "read": cd_to})(cdc)
             self.submodules += cdc
 
@@ -481,20 +785,156 @@ class _IdentityConverter(LiteXModule):
         ]
 
 
+class WidthConverter(LiteXModule):
+    """Width converter for any nbits_from/nbits_to ratio.
+
+    Data are handled in units of `unit` bits (default: gcd of the widths, or bytes with
+    `with_keep`) stored in a buffer of `from + to - gcd(from, to)` bits (the minimum to accept one
+    input beat per cycle while sending one output beat per cycle, versus a lcm-sized buffer for
+    Gearbox): both sides sustain one transfer per cycle when the other side is not limiting.
+
+    Packets are preserved: an output beat never mixes two packets (the last output beat of a
+    packet is sent with the remaining units). With `with_keep`, endpoints have a `keep` field (one
+    bit per unit, contiguous from the first unit) and only the kept units of the input beats are
+    forwarded (source.keep indicating the valid units), otherwise partial last output beats are
+    padded. A last input beat without kept units ends the packet on its last buffered unit, or is
+    forwarded as a last output beat without kept units when none is still buffered. With
+    `reverse`, units are ordered from the MSBs.
+    """
+    def __init__(self, nbits_from, nbits_to, unit=None, with_keep=False, reverse=False):
+        if unit is None:
+            unit = 8 if with_keep else math.gcd(nbits_from, nbits_to)
+        if (nbits_from % unit) or (nbits_to % unit):
+            raise ValueError(f"WidthConverter widths ({nbits_from}/{nbits_to}) must be multiples of unit ({unit}).")
+        units_from = nbits_from//unit
+        units_to   = nbits_to//unit
+        depth      = units_from + units_to - math.gcd(units_from, units_to)
+        self.depth   = depth*unit
+        self.latency = 1
+        self.sink    = sink   = Endpoint([("data", nbits_from)] + ([("keep", units_from)] if with_keep else []))
+        self.source  = source = Endpoint([("data", nbits_to)]   + ([("keep", units_to)]   if with_keep else []))
+
+        # # #
+
+        def units(signal, n, width=unit):
+            _units = [signal[i*width:(i + 1)*width] for i in range(n)]
+            return Cat(*reversed(_units)) if reverse else signal
+
+        # Buffer (units, with the packet ends flagged).
+        buf_data = Signal(depth*unit)
+        buf_last = Signal(depth)
+        level    = Signal(max=depth + 1)
+        first    = Signal(reset=1)
+
+        # Output: up to units_to units, stopping on the end of the packet.
+        has_last = Signal()
+        last_pos = Signal(max=max(units_to, 2))
+        count    = Signal(max=units_to + 1)
+        shift    = Signal(max=units_to + 1)
+        self.comb += has_last.eq(buf_last[:units_to] != 0)
+        for i in reversed(range(units_to)):
+            self.comb += If(buf_last[i], last_pos.eq(i))
+        self.comb += [
+            count.eq(Mux(has_last, last_pos + 1, units_to)),
+            source.valid.eq((level >= units_to) | has_last),
+            source.first.eq(first),
+            source.last.eq(has_last),
+            source.data.eq(units(buf_data[:nbits_to], units_to)),
+            If(source.valid & source.ready, shift.eq(count)),
+        ]
+        if with_keep:
+            self.comb += source.keep.eq(units(Cat(*[count > i for i in range(units_to)]), units_to, 1))
+        self.sync += If(source.valid & source.ready, first.eq(source.last))
+
+        # Input: accepted when the remaining units and the input units fit in the buffer.
+        n_in    = Signal(max=units_from + 1)
+        in_data = Signal(nbits_from)
+        in_last = Signal(units_from)
+        self.comb += in_data.eq(units(sink.data, units_from))
+        if with_keep:
+            in_keep = Signal(units_from)
+            self.comb += in_keep.eq(units(sink.keep, units_from, 1))
+            for i in range(units_from):
+                self.comb += If(in_keep[i], n_in.eq(i + 1))
+        else:
+            self.comb += n_in.eq(units_from)
+        self.comb += sink.ready.eq((level - shift) <= (depth - units_from))
+        for i in range(units_from):
+            self.comb += in_last[i].eq(sink.last & (n_in == (i + 1)))
+
+        # Last input beat without units: flag the last buffered unit when it is kept in the buffer
+        # and belongs to the packet, else send an empty last output beat once the buffer is drained.
+        # Such a beat does not need room in the buffer.
+        empty_last = Signal()
+        end_attach = Signal()
+        end_empty  = Signal()
+        if with_keep:
+            buf_last_array = Array(buf_last[i] for i in range(depth))
+            self.comb += [
+                If(sink.last & (n_in == 0), sink.ready.eq(1)),
+                end_attach.eq(sink.valid & sink.ready & sink.last & (n_in == 0) &
+                    (level > shift) & ~buf_last_array[level - 1]),
+                end_empty.eq(sink.valid & sink.ready & sink.last & (n_in == 0) & ~end_attach),
+                If(empty_last,
+                    sink.ready.eq(0),
+                    If(level == 0,
+                        source.valid.eq(1),
+                        source.last.eq(1),
+                        count.eq(0),
+                    )
+                )
+            ]
+            self.sync += [
+                If(end_empty,
+                    empty_last.eq(1)
+                ).Elif(source.valid & source.ready & (level == 0),
+                    empty_last.eq(0)
+                )
+            ]
+
+        # Buffer update: insert the input units after the buffered units then shift out the
+        # output units.
+        tmp_data = Signal((depth + units_to)*unit)
+        tmp_last = Signal(depth + units_to)
+        self.comb += [
+            tmp_data.eq(buf_data),
+            tmp_last.eq(buf_last),
+        ]
+        insert_cases = {}
+        for l in range(min(depth, depth + units_to - units_from) + 1):
+            insert_cases[l] = [
+                tmp_data[l*unit:(l + units_from)*unit].eq(in_data),
+                tmp_last[l:l + units_from].eq(in_last),
+            ]
+        self.comb += If(sink.valid & sink.ready, Case(level, insert_cases))
+        if with_keep:
+            self.comb += If(end_attach, Case(level, {l: tmp_last[l - 1].eq(1) for l in range(1, depth + 1)}))
+        shift_cases = {}
+        for s in range(units_to + 1):
+            shift_cases[s] = [
+                buf_data.eq(tmp_data[s*unit:(s + depth)*unit]),
+                buf_last.eq(tmp_last[s:s + depth]),
+            ]
+        self.sync += [
+            Case(shift, shift_cases),
+            level.eq(level - shift + Mux(sink.valid & sink.ready, n_in, 0)),
+        ]
+
+
 def _get_converter_ratio(nbits_from, nbits_to):
     if nbits_from > nbits_to:
         converter_cls = _DownConverter
-        if nbits_from % nbits_to:
-            raise ValueError("Ratio must be an int")
         ratio = nbits_from//nbits_to
     elif nbits_from < nbits_to:
         converter_cls = _UpConverter
-        if nbits_to % nbits_from:
-            raise ValueError("Ratio must be an int")
         ratio = nbits_to//nbits_from
     else:
         converter_cls = _IdentityConverter
         ratio = 1
+    # Non-integer ratio.
+    if (nbits_from % nbits_to) and (nbits_to % nbits_from):
+        converter_cls = WidthConverter
+        ratio = None
     return converter_cls, ratio
 
 
@@ -506,7 +946,12 @@ class Converter(Module): # FIXME: Switch to LiteXModule.
 
         # # #
 
-        converter = self.cls(nbits_from, nbits_to, self.ratio, reverse)
+        if self.cls == WidthConverter:
+            if report_valid_token_count:
+                raise ValueError("Converter valid token count requires an integer ratio.")
+            converter = WidthConverter(nbits_from, nbits_to, reverse=reverse)
+        else:
+            converter = self.cls(nbits_from, nbits_to, self.ratio, reverse)
         self.submodules += converter
         self.latency = converter.latency
 
@@ -805,6 +1250,166 @@ class Monitor(LiteXModule):
                 count  = self._packets.status
             )
 
+# Stream Profiler ----------------------------------------------------------------------------------
+
+class StreamProfiler(LiteXModule):
+    """Stream profiler.
+
+    Counts the cycles, transfers (valid & ready), backpressure (valid & ~ready: stalled by the
+    downstream) and starvation (~valid & ready: starved by the upstream) cycles and the packets of
+    `endpoint`. When an `egress` endpoint is provided, the packet latency (in cycles, from the first
+    beat of a packet on `endpoint` to the first beat of the packet on `egress`, packets being
+    forwarded in order, at least one cycle later, with up to `latency_depth` packets in flight) is
+    measured with min/max/sum and a histogram of `latency_bins` bins of `latency_bin_width` cycles
+    (the last bin also counting the larger latencies). When more than `latency_depth` packets are in
+    flight, the measurement is paused until all the in-flight packets have reached `egress` (to keep
+    the timestamps paired with their packets) and the unmeasured packets are counted in
+    latency_overflows.
+
+    As with Monitor, counters are cleared with reset and copied to the status CSRs with latch.
+    """
+    def __init__(self, endpoint, egress=None, count_width=32,
+        latency_width     = 16,
+        latency_depth     = 16,
+        latency_bins      = 8,
+        latency_bin_width = 16):
+        self._reset        = CSR()
+        self._latch        = CSR()
+        self._cycles       = CSRStatus(count_width, description="Number of profiled cycles.")
+        self._transfers    = CSRStatus(count_width, description="Number of transfer cycles (valid & ready).")
+        self._backpressure = CSRStatus(count_width, description="Number of backpressure cycles (valid & ~ready).")
+        self._starvation   = CSRStatus(count_width, description="Number of starvation cycles (~valid & ready).")
+        self._packets      = CSRStatus(count_width, description="Number of transferred packets.")
+        if egress is not None:
+            if latency_bin_width != 2**log2_int(latency_bin_width, need_pow2=False):
+                raise ValueError(f"StreamProfiler latency_bin_width ({latency_bin_width}) must be a power of 2.")
+            self._latency_count = CSRStatus(count_width,                 description="Number of packet latency measurements.")
+            self._latency_min   = CSRStatus(latency_width,               description="Minimum packet latency (cycles).")
+            self._latency_max   = CSRStatus(latency_width,               description="Maximum packet latency (cycles).")
+            self._latency_sum   = CSRStatus(count_width + latency_width, description="Sum of the packet latencies (cycles).")
+            self._latency_overflows = CSRStatus(count_width, description="Number of packets not measured (more than latency_depth packets in flight).")
+            for i in range(latency_bins):
+                lo = i*latency_bin_width
+                hi = "+" if i == (latency_bins - 1) else f"-{lo + latency_bin_width - 1}"
+                setattr(self, f"_latency_bin{i}", CSRStatus(count_width, name=f"latency_bin{i}",
+                    description=f"Number of packets with a latency of {lo}{hi} cycles."))
+        self.reset = Signal() # Reset from logic.
+        self.latch = Signal() # Latch from logic.
+
+        # # #
+
+        reset = Signal()
+        latch = Signal()
+        self.comb += [
+            reset.eq(self._reset.re | self.reset),
+            latch.eq(self._latch.re | self.latch),
+        ]
+
+        # Endpoint Counters.
+        transfer = endpoint.valid & endpoint.ready
+        self.add_counter(reset, latch, 1,                                   self._cycles.status)
+        self.add_counter(reset, latch, transfer,                            self._transfers.status)
+        self.add_counter(reset, latch, endpoint.valid & ~endpoint.ready,    self._backpressure.status)
+        self.add_counter(reset, latch, ~endpoint.valid & endpoint.ready,    self._starvation.status)
+        self.add_counter(reset, latch, transfer & endpoint.last,            self._packets.status)
+
+        # Latency.
+        if egress is None:
+            return
+
+        ingress_start = self.packet_start(endpoint)
+        egress_start  = self.packet_start(egress)
+
+        # Track the in-flight packets.
+        inflight = Signal(count_width)
+        self.sync += inflight.eq(inflight + ingress_start - egress_start)
+
+        # Timestamp the packets on endpoint (paused from an overflow until no packet is in flight).
+        timestamp = Signal(latency_width)
+        self.sync += timestamp.eq(timestamp + 1)
+        self.timestamps = timestamps = SyncFIFO([("timestamp", latency_width)], latency_depth)
+        paused   = Signal()
+        overflow = Signal()
+        self.comb += [
+            timestamps.sink.valid.eq(ingress_start & (~paused | (inflight == 0))),
+            timestamps.sink.timestamp.eq(timestamp),
+            overflow.eq(ingress_start & ~(timestamps.sink.valid & timestamps.sink.ready)),
+        ]
+        self.sync += [
+            If(overflow,
+                paused.eq(1)
+            ).Elif(inflight == 0,
+                paused.eq(0)
+            )
+        ]
+        self.add_counter(reset, latch, overflow, self._latency_overflows.status)
+
+        # Measure the latency on egress.
+        latency = Signal(latency_width)
+        measure = Signal()
+        self.comb += [
+            measure.eq(egress_start & timestamps.source.valid),
+            timestamps.source.ready.eq(measure),
+            latency.eq(timestamp - timestamps.source.timestamp),
+        ]
+        latency_min = Signal(latency_width, reset=2**latency_width - 1)
+        latency_max = Signal(latency_width)
+        latency_sum = Signal(count_width + latency_width)
+        self.sync += [
+            If(reset,
+                latency_min.eq(2**latency_width - 1),
+                latency_max.eq(0),
+                latency_sum.eq(0),
+            ).Elif(measure,
+                If(latency < latency_min, latency_min.eq(latency)),
+                If(latency > latency_max, latency_max.eq(latency)),
+                latency_sum.eq(latency_sum + latency),
+            ),
+            If(reset,
+                self._latency_min.status.eq(2**latency_width - 1),
+                self._latency_max.status.eq(0),
+                self._latency_sum.status.eq(0),
+            ).Elif(latch,
+                self._latency_min.status.eq(latency_min),
+                self._latency_max.status.eq(latency_max),
+                self._latency_sum.status.eq(latency_sum),
+            )
+        ]
+        self.add_counter(reset, latch, measure, self._latency_count.status)
+
+        # Histogram.
+        latency_bin = Signal(max=max(latency_bins, 2))
+        self.comb += If((latency >> log2_int(latency_bin_width)) >= (latency_bins - 1),
+            latency_bin.eq(latency_bins - 1)
+        ).Else(
+            latency_bin.eq(latency >> log2_int(latency_bin_width))
+        )
+        for i in range(latency_bins):
+            self.add_counter(reset, latch, measure & (latency_bin == i), getattr(self, f"_latency_bin{i}").status)
+
+    def packet_start(self, endpoint):
+        """Return the first transfer of the packets of `endpoint`."""
+        ongoing = Signal()
+        start   = Signal()
+        self.comb += start.eq(endpoint.valid & endpoint.ready & ~ongoing)
+        self.sync += If(endpoint.valid & endpoint.ready, ongoing.eq(~endpoint.last))
+        return start
+
+    def add_counter(self, reset, latch, enable, status):
+        """Saturating counter of `enable` cycles, copied to `status` on latch."""
+        count = Signal(len(status))
+        self.sync += [
+            If(reset,
+                count.eq(0),
+                status.eq(0),
+            ).Else(
+                If(enable & (count != (2**len(count) - 1)),
+                    count.eq(count + 1)
+                ),
+                If(latch, status.eq(count))
+            )
+        ]
+
 # Pipe ---------------------------------------------------------------------------------------------
 
 class PipeValid(LiteXModule):
@@ -1024,9 +1629,58 @@ class Pack(LiteXModule):
 
 # Pipeline -----------------------------------------------------------------------------------------
 
+def _is_registered(module):
+    """Return True when the source of `module` is driven from registers (valid/payload path cut)."""
+    if hasattr(module, "registered"):
+        return module.registered
+    if isinstance(module, PipeValid):
+        return True
+    if isinstance(module, Buffer):
+        return hasattr(module, "pipe_valid")
+    if isinstance(module, _FIFOWrapper):
+        return getattr(module, "depth", 1) >= 1
+    if isinstance(module, PipelinedActor):
+        return module.latency >= 1
+    return False
+
+
+def get_comb_depth(module):
+    """Estimated combinational depth of a Pipeline module (in logic levels, from its sink to its
+    source or registers).
+
+    Modules can provide their own estimate with a `comb_depth` attribute (and a `registered`
+    attribute when their source is driven from registers). Endpoints and registered modules are
+    estimated to 0, other modules to 1.
+    """
+    if isinstance(module, Endpoint):
+        return 0
+    if hasattr(module, "comb_depth"):
+        return module.comb_depth
+    return 0 if _is_registered(module) else 1
+
+
 class Pipeline(LiteXModule):
-    def __init__(self, *modules):
-        self.modules = list(modules)
+    """Chain of stream modules/endpoints (connected from source to sink).
+
+    With `max_comb_depth` and/or `max_stages`, the pipeline is automatically balanced: Buffer
+    stages (with `pipe_valid` and optionally `pipe_ready`) are inserted between the modules so that
+    the estimated combinational depth (see get_comb_depth) of the valid/payload paths between
+    registers does not exceed `max_comb_depth`, or is minimized with at most `max_stages` inserted
+    stages. Each inserted stage adds one cycle of latency; inserted stages are available in `stages`.
+    """
+    def __init__(self, *modules, max_comb_depth=None, max_stages=None, pipe_valid=True, pipe_ready=False):
+        if (max_comb_depth is not None) and (max_comb_depth < 1):
+            raise ValueError(f"Pipeline max_comb_depth ({max_comb_depth}) must be >= 1.")
+        if (max_stages is not None) and (max_stages < 0):
+            raise ValueError(f"Pipeline max_stages ({max_stages}) must be >= 0.")
+        if (max_comb_depth is not None or max_stages is not None) and not pipe_valid:
+            raise ValueError("Pipeline balancing requires pipe_valid stages (pipe_ready stages don't cut the valid/payload paths).")
+        self.modules        = list(modules)
+        self.max_comb_depth = max_comb_depth
+        self.max_stages     = max_stages
+        self.pipe_valid     = pipe_valid
+        self.pipe_ready     = pipe_ready
+        self.stages         = []
         if len(self.modules):
             self.finalize()
 
@@ -1034,15 +1688,58 @@ class Pipeline(LiteXModule):
         assert not self.finalized
         self.modules.append(module)
 
+    def _cuts(self, max_comb_depth):
+        """Return the links (index of the next module) where stages are inserted (greedy)."""
+        cuts  = []
+        depth = 0
+        for i, m in enumerate(self.modules):
+            d = get_comb_depth(m)
+            if (i > 0) and (depth > 0) and (depth + d > max_comb_depth) and (m is not self.modules[i - 1]):
+                cuts.append(i)
+                depth = 0
+            depth += d
+            if _is_registered(m):
+                depth = 0
+        return cuts
+
+    def get_cuts(self):
+        """Return the links (index of the next module) where balancing stages are inserted."""
+        if (self.max_comb_depth is None) and (self.max_stages is None):
+            return []
+        if self.max_stages is None:
+            return self._cuts(self.max_comb_depth)
+        # Smallest combinational depth reachable with max_stages stages.
+        max_comb_depth = max([1] + [get_comb_depth(m) for m in self.modules])
+        while len(self._cuts(max_comb_depth)) > self.max_stages:
+            max_comb_depth += 1
+        if self.max_comb_depth is not None:
+            if max_comb_depth > self.max_comb_depth:
+                raise ValueError(f"Pipeline max_comb_depth ({self.max_comb_depth}) can't be reached with {self.max_stages} stage(s).")
+            max_comb_depth = self.max_comb_depth
+        return self._cuts(max_comb_depth)
+
     def do_finalize(self):
-        n = len(self.modules)
-        m = self.modules[0]
+        # Insert balancing stages.
+        modules = list(self.modules)
+        for i in reversed(self.get_cuts()):
+            m     = modules[i - 1]
+            stage = Buffer(
+                layout     = (m if isinstance(m, Endpoint) else m.source).description,
+                pipe_valid = self.pipe_valid,
+                pipe_ready = self.pipe_ready,
+            )
+            self.submodules += stage
+            self.stages.insert(0, stage)
+            modules.insert(i, stage)
+
+        n = len(modules)
+        m = modules[0]
         # Expose sink of first module if available.
         if hasattr(m, "sink"):
             self.sink = m.sink
         # Iterate on Modules/Endpoints.
         for i in range(1, n):
-            m_n = self.modules[i]
+            m_n = modules[i]
             # If m is an Endpoint, use it as Source, else use Module.source.
             source = m if isinstance(m, Endpoint) else m.source
             # If m_n is an Endpoint, use it as Sink, else use Module.sink.
@@ -7,7 +7,7 @@
 # Copyright (c) 2022 Antmicro <www.antmicro.com>
 # SPDX-License-Identifier: BSD-2-Clause
 
-"""Wishbone Classic support for LiteX (Standard HandShaking/Synchronous Feedback)"""
+"""Wishbone Classic/Pipelined support for LiteX (Standard HandShaking/Synchronous Feedback)"""
 
 from math import log2
 
@@ -17,6 +17,7 @@ from migen.genlib.record import *
 
 from litex.gen import *
 from litex.gen.genlib.misc import split, displacer, chooser, WaitTimer
+from litex.gen.genlib.arbiter import get_arbiter
 
 from litex.build.generic_platform import *
 
@@ -38,6 +39,13 @@ _layout = [
     ("err",              1, DIR_S_TO_M)
 ]
 
+# Wishbone B4 Pipelined mode adds a stall signal: a request is accepted on each cycle where stb is
+# asserted and stall is not, responses (ack/err) are returned in order and multiple requests can be
+# outstanding while cyc is held.
+_layout_pipelined = _layout + [
+    ("stall",            1, DIR_S_TO_M),
+]
+
 CTI_BURST_NONE         = 0b000
 CTI_BURST_CONSTANT     = 0b001
 CTI_BURST_INCREMENTING = 0b010
@@ -45,7 +53,7 @@ CTI_BURST_END          = 0b111
 
 
 class Interface(Record):
-    def __init__(self, data_width=32, adr_width=30, bursting=False, addressing="word", mode="rw", **kwargs):
+    def __init__(self, data_width=32, adr_width=30, bursting=False, addressing="word", mode="rw", pipelined=False, **kwargs):
         if addressing not in ["word", "byte"]:
             raise ValueError("Unsupported Wishbone addressing: {}.".format(addressing))
         if mode not in ["rw", "r", "w"]:
@@ -59,7 +67,8 @@ class Interface(Record):
         self.bursting      = bursting
         self.addressing    = addressing
         self.mode          = mode
-        Record.__init__(self, set_layout_parameters(_layout,
+        self.pipelined     = pipelined
+        Record.__init__(self, set_layout_parameters(_layout_pipelined if pipelined else _layout,
             adr_width  = self.adr_width,
             data_width = self.data_width,
             sel_width  = self.data_width//8,
@@ -77,14 +86,23 @@ class Interface(Record):
             bursting      = other.bursting,
             addressing    = other.addressing,
             mode          = other.mode,
+            pipelined     = other.pipelined,
         )
 
     def _do_transaction(self):
         yield self.cyc.eq(1)
         yield self.stb.eq(1)
         yield
-        while not (yield self.ack):
-            yield
+        if self.pipelined:
+            # Request is accepted when not stalled, response can come on the same cycle or later.
+            while (yield self.stall):
+                yield
+            yield self.stb.eq(0)
+            while not ((yield self.ack) | (yield self.err)):
+                yield
+        else:
+            while not (yield self.ack):
+                yield
         yield self.cyc.eq(0)
         yield self.stb.eq(0)
 
@@ -221,6 +239,12 @@ class Offset(Module):
 # Wishbone Clock Domain Crossing -------------------------------------------------------------------
 
 class ClockDomainCrossing(LiteXModule):
+    """Wishbone Clock Domain Crossing.
+
+    Crosses the requests/responses of `master` (in `cd_from`) to `slave` (in `cd_to`) one access
+    at a time. Pipelined Interfaces are supported through Pipelined2Classic/Classic2Pipelined
+    bridges (accesses are still not overlapped across the clock domains).
+    """
     def __init__(self, master, slave, cd_from="sys", cd_to="sys"):
         assert isinstance(master, Interface)
         assert isinstance(slave,  Interface)
@@ -230,6 +254,7 @@ class ClockDomainCrossing(LiteXModule):
         assert len(master.sel)   == len(slave.sel)
         assert len(master.cti)   == len(slave.cti)
         assert len(master.bte)   == len(slave.bte)
+        assert master.pipelined  == slave.pipelined
 
         # Same Clock Domain, direct connection.
         if cd_from == cd_to:
@@ -238,6 +263,16 @@ class ClockDomainCrossing(LiteXModule):
 
         # # #
 
+        # Pipelined Interfaces are bridged to Classic cycles (one request in flight at a time).
+        if master.pipelined:
+            classic = Interface(data_width=len(master.dat_w), adr_width=master.adr_width, addressing=master.addressing, mode=master.mode)
+            self.submodules += Pipelined2Classic(master, classic)
+            master = classic
+        if slave.pipelined:
+            classic = Interface(data_width=len(slave.dat_w), adr_width=slave.adr_width, addressing=slave.addressing, mode=slave.mode)
+            self.submodules += ClockDomainsRenamer(cd_to)(Classic2Pipelined(classic, slave))
+            slave = classic
+
         request_layout = [
             ("adr",   len(master.adr)),
             ("dat_w", len(master.dat_w)),
@@ -339,6 +374,57 @@ class ClockDomainCrossing(LiteXModule):
             )
         )
 
+# Wishbone Register Slice -------------------------------------------------------------------------
+
+class RegisterSlice(LiteXModule):
+    """Wishbone Register Slice.
+
+    Registers the requests and the responses between `master` and `slave` to cut the timing paths
+    of long interconnect paths. Each stage adds 2 cycles of latency to the accesses (Wishbone
+    classic only). A master deasserting cyc aborts the access in progress.
+    """
+    def __init__(self, master, slave, stages=1):
+        if master.pipelined or slave.pipelined:
+            raise ValueError("Wishbone RegisterSlice only supports Wishbone Classic.")
+        if stages < 1:
+            raise ValueError(f"Wishbone RegisterSlice stages must be >= 1 (got {stages}).")
+
+        # # #
+
+        interfaces = [master] + [Interface.like(master) for _ in range(stages - 1)] + [slave]
+        for m, s in zip(interfaces[:-1], interfaces[1:]):
+            self.add_stage(m, s)
+
+    def add_stage(self, master, slave):
+        request = [name for name, _, direction in master.layout
+            if (direction == DIR_M_TO_S) and (name not in ["cyc", "stb"])]
+        self.sync += [
+            master.ack.eq(0),
+            master.err.eq(0),
+            # Access in progress: Wait for slave response and return it to master.
+            If(slave.cyc & slave.stb,
+                If(slave.ack | slave.err,
+                    slave.cyc.eq(0),
+                    slave.stb.eq(0),
+                    master.ack.eq(slave.ack),
+                    master.err.eq(slave.err),
+                    master.dat_r.eq(slave.dat_r),
+                )
+            # New access: Register master request.
+            ).Elif(master.cyc & master.stb & ~master.ack & ~master.err,
+                slave.cyc.eq(1),
+                slave.stb.eq(1),
+                *[getattr(slave, name).eq(getattr(master, name)) for name in request],
+            ),
+            # Master abort.
+            If(~master.cyc,
+                slave.cyc.eq(0),
+                slave.stb.eq(0),
+                master.ack.eq(0),
+                master.err.eq(0),
+            )
+        ]
+
 # Wishbone Timeout ---------------------------------------------------------------------------------
 
 class Timeout(LiteXModule):
@@ -349,8 +435,16 @@ class Timeout(LiteXModule):
 
         timer = WaitTimer(cycles)
         self.submodules += timer
+        if master.pipelined:
+            # Pipelined: Wait on stalled requests and outstanding responses, the stall is released
+            # with the faked ack so that the request/response accounting stays balanced.
+            self.comb += [
+                timer.wait.eq(master.cyc & ~master.ack & ~master.err),
+                If(timer.done, master.stall.eq(0))
+            ]
+        else:
+            self.comb += timer.wait.eq(master.stb & master.cyc & ~master.ack)
         self.comb += [
-            timer.wait.eq(master.stb & master.cyc & ~master.ack),
             If(timer.done,
                 master.dat_r.eq((2**len(master.dat_w))-1),
                 master.ack.eq(1),
@@ -380,41 +474,93 @@ def get_check_parameters(ports):
 
     return data_width, addressing
 
+def get_check_pipelined(ports):
+    # Pipelined and Classic Interfaces have different handshakes, they have to be bridged with
+    # Pipelined2Classic/Classic2Pipelined (or a Converter) before reaching the Interconnect.
+    pipelined = ports[0].pipelined
+    for port in ports[1:]:
+        if port.pipelined != pipelined:
+            raise ValueError("Wishbone Pipelined and Classic Interfaces connected to the same Interconnect.")
+    return pipelined
+
+def add_pending_counter(module, bus, max_pending):
+    """Track the outstanding requests of a Pipelined Wishbone bus.
+
+    Returns the (pending, issue, retire) signals: ``issue`` is asserted when a request is accepted,
+    ``retire`` when a response is returned. Deasserting cyc aborts all outstanding requests.
+    """
+    pending = Signal(max=max_pending + 1)
+    issue   = Signal()
+    retire  = Signal()
+    module.comb += [
+        issue.eq(bus.cyc & bus.stb & ~bus.stall),
+        retire.eq(bus.cyc & (bus.ack | bus.err)),
+    ]
+    module.sync += [
+        If(~bus.cyc,
+            pending.eq(0)
+        ).Elif(issue & ~retire,
+            pending.eq(pending + 1)
+        ).Elif(~issue & retire,
+            pending.eq(pending - 1)
+        )
+    ]
+    return pending, issue, retire
+
 class InterconnectPointToPoint(LiteXModule):
     def __init__(self, master, slave):
         self.comb += master.connect(slave)
 
 
 class Arbiter(LiteXModule):
-    def __init__(self, masters=None, target=None, controllers=None, mode="cycle"):
+    # policy selects the arbitration between masters ("round-robin", "priority", "weighted" or "qos",
+    # see litex.gen.genlib.arbiter) with priorities giving the per-master priority/weight/QoS level.
+    def __init__(self, masters=None, target=None, controllers=None, mode="cycle", max_pending=16,
+        policy="round-robin", priorities=None):
         assert target is not None
         assert (masters is not None) or (controllers is not None)
         if controllers is not None:
             masters = controllers
+        pipelined = get_check_pipelined(list(masters) + [target])
+
+        if pipelined:
+            self.pending, issue, retire = add_pending_counter(self, target, max_pending)
 
         if mode == "cycle":
-            self.rr = roundrobin.RoundRobin(len(masters))
+            self.rr = get_arbiter(len(masters), policy, roundrobin.SP_WITHDRAW, priorities)
         elif mode == "transaction":
-            self.rr = roundrobin.RoundRobin(len(masters), roundrobin.SP_CE)
+            self.rr = get_arbiter(len(masters), policy, roundrobin.SP_CE, priorities)
             cycs = Array(m.cyc for m in masters)
-            self.comb += self.rr.ce.eq(target.ack | target.err | ~cycs[self.rr.grant])
+            if pipelined:
+                # Only switch when the granted master has no outstanding request.
+                self.comb += self.rr.ce.eq(~cycs[self.rr.grant] | ((self.pending == 0) & ~issue))
+            else:
+                self.comb += self.rr.ce.eq(target.ack | target.err | ~cycs[self.rr.grant])
         else:
             raise ValueError(f"Unsupported Wishbone Arbiter mode: {mode}.")
 
         # mux master->slave signals
-        for name, size, direction in _layout:
+        for name, size, direction in target.layout:
             if direction == DIR_M_TO_S:
                 choices = Array(getattr(m, name) for m in masters)
                 self.comb += getattr(target, name).eq(choices[self.rr.grant])
 
+        # limit outstanding requests (pipelined)
+        full = Signal()
+        if pipelined:
+            self.comb += full.eq(self.pending == max_pending)
+            self.comb += If(full, target.stb.eq(0))
+
         # connect slave->master signals
-        for name, size, direction in _layout:
+        for name, size, direction in target.layout:
             if direction == DIR_S_TO_M:
                 source = getattr(target, name)
                 for i, m in enumerate(masters):
                     dest = getattr(m, name)
                     if name == "ack" or name == "err":
                         self.comb += dest.eq(source & (self.rr.grant == i))
+                    elif name == "stall":
+                        self.comb += dest.eq(source | full | (self.rr.grant != i))
                     else:
                         self.comb += dest.eq(source)
 
@@ -430,7 +576,9 @@ class Decoder(LiteXModule):
     # 1) wishbone.Slave reference.
     # register adds flip-flops after the address comparators. Improves timing,
     # but breaks Wishbone combinatorial feedback.
-    def __init__(self, master, slaves, register=False):
+    # With Pipelined Interfaces, requests to a slave are only issued while no other slave has
+    # outstanding requests, so responses always come back in order.
+    def __init__(self, master, slaves, register=False, max_pending=16):
         ns = len(slaves)
         slave_sel = Signal(ns)
         slave_sel_r = Signal(ns)
@@ -438,11 +586,26 @@ class Decoder(LiteXModule):
         # decode slave addresses
         self.comb += [slave_sel[i].eq(fun(master.adr))
             for i, (fun, bus) in enumerate(slaves)]
-        if register:
+
+        # Registered decoders (latency attribute, see TreeDecoder) select slaves one cycle late.
+        latency = max(getattr(fun, "latency", 0) for fun, bus in slaves)
+
+        if get_check_pipelined([master] + [bus for _, bus in slaves]):
+            if latency:
+                raise ValueError("Registered decoders are not supported on Pipelined Wishbone.")
+            self.add_pipelined(master, slaves, slave_sel, slave_sel_r, max_pending)
+            return
+        if register and not latency:
             self.sync += slave_sel_r.eq(slave_sel)
         else:
             self.comb += slave_sel_r.eq(slave_sel)
 
+        # With registered decoders, accesses are only forwarded from their second cycle.
+        decoded = Constant(1)
+        if latency:
+            decoded = Signal()
+            self.sync += decoded.eq(master.cyc & master.stb & ~master.ack & ~master.err)
+
         # connect master->slaves signals except cyc
         for slave in slaves:
             for name, size, direction in _layout:
@@ -450,7 +613,7 @@ class Decoder(LiteXModule):
                     self.comb += getattr(slave[1], name).eq(getattr(master, name))
 
         # combine cyc with slave selection signals
-        self.comb += [slave[1].cyc.eq(master.cyc & slave_sel[i])
+        self.comb += [slave[1].cyc.eq(master.cyc & slave_sel[i] & decoded)
             for i, slave in enumerate(slaves)]
 
         # generate master ack (resp. err) by ORing all slave acks (resp. errs)
@@ -463,31 +626,71 @@ class Decoder(LiteXModule):
         masked = [Replicate(slave_sel_r[i], len(master.dat_r)) & slaves[i][1].dat_r for i in range(ns)]
         self.comb += master.dat_r.eq(Reduce("OR", masked))
 
+    def add_pipelined(self, master, slaves, slave_sel, slave_sel_r, max_pending):
+        self.pending, issue, retire = add_pending_counter(self, master, max_pending)
+
+        # remember the slave with outstanding requests and block requests to other slaves
+        blocked = Signal()
+        self.sync += If(issue, slave_sel_r.eq(slave_sel))
+        self.comb += blocked.eq(
+            ((self.pending != 0) & (slave_sel != slave_sel_r)) |
+            (self.pending == max_pending)
+        )
+
+        # connect master->slaves signals except cyc/stb
+        for slave in slaves:
+            for name, size, direction in master.layout:
+                if direction == DIR_M_TO_S and name not in ["cyc", "stb"]:
+                    self.comb += getattr(slave[1], name).eq(getattr(master, name))
+
+        # keep cyc on the slave with outstanding requests, gate stb with slave selection
+        for i, (fun, bus) in enumerate(slaves):
+            self.comb += [
+                bus.cyc.eq(master.cyc & Mux(self.pending != 0, slave_sel_r[i], slave_sel[i])),
+                bus.stb.eq(master.stb & slave_sel[i] & ~blocked),
+            ]
+
+        # stall from the selected slave (or when blocked)
+        self.comb += master.stall.eq(blocked | Reduce("OR", [
+            slave_sel[i] & bus.stall for i, (fun, bus) in enumerate(slaves)]))
+
+        # generate master ack/err and mux (1-hot) slave data return with responding slave
+        self.comb += [
+            master.ack.eq(Reduce("OR", [bus.ack for _, bus in slaves])),
+            master.err.eq(Reduce("OR", [bus.err for _, bus in slaves])),
+            master.dat_r.eq(Reduce("OR", [
+                Replicate(bus.ack, len(master.dat_r)) & bus.dat_r for _, bus in slaves])),
+        ]
+
 
 class InterconnectShared(LiteXModule):
-    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6, arbiter="cycle"):
+    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6, arbiter="cycle",
+        policy="round-robin", priorities=None):
         data_width, addressing = get_check_parameters(ports=masters + [s for _, s in slaves])
+        pipelined = get_check_pipelined(ports=masters + [s for _, s in slaves])
         adr_width = max([m.adr_width for m in masters])
-        shared = Interface(data_width=data_width, adr_width=adr_width, addressing=addressing)
-        self.arbiter = Arbiter(masters, shared, mode=arbiter)
+        shared = Interface(data_width=data_width, adr_width=adr_width, addressing=addressing, pipelined=pipelined)
+        self.arbiter = Arbiter(masters, shared, mode=arbiter, policy=policy, priorities=priorities)
         self.decoder = Decoder(shared, slaves, register)
         if timeout_cycles is not None:
             self.timeout = Timeout(shared, timeout_cycles)
 
 
 class Crossbar(LiteXModule):
-    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6, arbiter="cycle"):
+    def __init__(self, masters, slaves, register=False, timeout_cycles=1e6, arbiter="cycle",
+        policy="round-robin", priorities=None):
         data_width, addressing = get_check_parameters(ports=masters + [s for _, s in slaves])
+        pipelined = get_check_pipelined(ports=masters + [s for _, s in slaves])
         matches, busses = zip(*slaves)
         adr_width = max([m.adr_width for m in masters])
-        access = [[Interface(data_width=data_width, adr_width=adr_width, addressing=addressing) for j in slaves] for i in masters]
+        access = [[Interface(data_width=data_width, adr_width=adr_width, addressing=addressing, pipelined=pipelined) for j in slaves] for i in masters]
         # decode each master into its access row
         for row, master in zip(access, masters):
             row = list(zip(matches, row))
             self.submodules += Decoder(master, row, register)
         # arbitrate each access column onto its slave
         for column, bus in zip(zip(*access), busses):
-            self.submodules += Arbiter(column, bus, mode=arbiter)
+            self.submodules += Arbiter(column, bus, mode=arbiter, policy=policy, priorities=priorities)
 
 # Wishbone Data Width Converter --------------------------------------------------------------------
 
@@ -512,6 +715,8 @@ class DownConverter(LiteXModule):
             raise ValueError("Master must be word-addressed (byte addressing not supported).")
         if slave.addressing != "word":
             raise ValueError("Slave must be word-addressed (byte addressing not supported).")
+        if master.pipelined or slave.pipelined:
+            raise ValueError("Pipelined Interfaces must be converted with Converter.")
         dw_from = len(master.dat_w)
         dw_to   = len(slave.dat_w)
         ratio   = dw_from//dw_to
@@ -590,6 +795,8 @@ class UpConverter(LiteXModule):
             raise ValueError("Master must be word-addressed (byte addressing not supported).")
         if slave.addressing != "word":
             raise ValueError("Slave must be word-addressed (byte addressing not supported).")
+        if master.pipelined or slave.pipelined:
+            raise ValueError("Pipelined Interfaces must be converted with Converter.")
         dw_from = len(master.dat_w)
         dw_to   = len(slave.dat_w)
         ratio   = dw_to//dw_from
@@ -614,12 +821,55 @@ class UpConverter(LiteXModule):
         ]
         self.comb += Case(master.adr[:int(log2(ratio))], cases)
 
+class Pipelined2Classic(LiteXModule):
+    """Pipelined2Classic
+
+    This module connects a Pipelined master to a Classic slave. The request is stalled until the
+    slave acknowledges it, so only one request is outstanding at a time.
+    """
+    def __init__(self, master, slave):
+        assert master.pipelined and not slave.pipelined
+
+        # # #
+
+        self.comb += [
+            master.connect(slave, omit={"stall"}),
+            master.stall.eq(~(slave.ack | slave.err)),
+        ]
+
+class Classic2Pipelined(LiteXModule):
+    """Classic2Pipelined
+
+    This module connects a Classic master to a Pipelined slave. The Classic request is issued
+    once to the slave and held until the response is returned.
+    """
+    def __init__(self, master, slave):
+        assert slave.pipelined and not master.pipelined
+
+        # # #
+
+        issued = Signal()
+        self.comb += [
+            master.connect(slave, omit={"stb"}),
+            slave.stb.eq(master.stb & ~issued),
+        ]
+        self.sync += [
+            If(~master.cyc | slave.ack | slave.err,
+                issued.eq(0)
+            ).Elif(slave.stb & ~slave.stall,
+                issued.eq(1)
+            )
+        ]
+
 class Converter(LiteXModule):
     """Converter
 
     This module is a wrapper for DownConverter and UpConverter.
     It should preferably be used rather than direct instantiations
     of specific converters.
+
+    Pipelined/Classic Interfaces are bridged with Pipelined2Classic/Classic2Pipelined, Data-Width
+    conversion of Pipelined Interfaces is done on Classic cycles.
     """
     def __init__(self, master, slave):
         self.master = master
@@ -636,6 +886,17 @@ class Converter(LiteXModule):
         dw_from = len(master.dat_r)
         dw_to   = len(slave.dat_r)
 
+        # Pipelined/Classic bridging.
+        if (master.pipelined or slave.pipelined) and ((dw_from != dw_to) or (master.pipelined != slave.pipelined)):
+            if master.pipelined:
+                classic = Interface(data_width=dw_from, adr_width=master.adr_width, addressing=master.addressing, mode=master.mode)
+                self.submodules += Pipelined2Classic(master, classic)
+                master = classic
+            if slave.pipelined:
+                classic = Interface(data_width=dw_to, adr_width=slave.adr_width, addressing=slave.addressing, mode=slave.mode)
+                self.submodules += Classic2Pipelined(classic, slave)
+                slave = classic
+
         # DownConverter.
         if dw_from > dw_to:
             downconverter = DownConverter(master, slave)
@@ -690,7 +951,7 @@ class SRAM(LiteXModule):
         # Burst support.
         # --------------
 
-        if self.bus.bursting:
+        if self.bus.bursting and not self.bus.pipelined:
             adr_wrap_mask = Array((0b0000, 0b0011, 0b0111, 0b1111))
             adr_wrap_max  = adr_wrap_mask[-1].bit_length()
 
@@ -771,7 +1032,7 @@ class SRAM(LiteXModule):
                 for i in range(self.mem.width//8)]
         # Address and data
         self.comb += port.adr.eq(self.bus.adr[:len(port.adr)])
-        if self.bus.bursting:
+        if self.bus.bursting and not self.bus.pipelined:
             self.comb += If(adr_burst & adr_latched,
                 port.adr.eq(adr_next[:len(port.adr)]),
             )
@@ -783,15 +1044,33 @@ class SRAM(LiteXModule):
             self.comb += port.dat_w.eq(self.bus.dat_w)
 
         # Generate Ack.
-        self.sync += [
-            self.bus.ack.eq(0),
-            If(self.bus.cyc & self.bus.stb & (~self.bus.ack | adr_burst), self.bus.ack.eq(1))
-        ]
+        if self.bus.pipelined:
+            # Pipelined: Never stall, one request accepted and acked per cycle.
+            self.comb += self.bus.stall.eq(0)
+            self.sync += self.bus.ack.eq(self.bus.cyc & self.bus.stb)
+        else:
+            self.sync += [
+                self.bus.ack.eq(0),
+                If(self.bus.cyc & self.bus.stb & (~self.bus.ack | adr_burst), self.bus.ack.eq(1))
+            ]
 
 # Wishbone To CSR ----------------------------------------------------------------------------------
 
 class Wishbone2CSR(LiteXModule):
-    def __init__(self, bus_wishbone=None, bus_csr=None, register=True):
+    """Wishbone to CSR bridge.
+
+    With ``posted_writes`` (write FIFO depth), writes are acked immediately and drained to the CSR
+    bus from the FIFO (reads wait for the FIFO to be drained). With ``read_ahead``, the address of
+    the CSR following the last read one (next sub-register of multi-word CSRs) is presented on the
+    CSR bus while idle and a read to it is acked immediately with the pre-read data (the read is
+    still presented on the CSR bus for its read strobe, so a read issued on the next cycle is not
+    read ahead). Both rely on CSR slaves returning the data of the presented address on the next
+    cycle (as CSR banks and memories do) and use the un-registered access.
+
+    With ``latency``, reads wait for the additional cycles of a pipelined CSR interconnect (see
+    csr_bus.InterconnectSplit) before returning the CSR data.
+    """
+    def __init__(self, bus_wishbone=None, bus_csr=None, register=True, posted_writes=0, read_ahead=False, latency=0):
         self.csr = bus_csr
         if self.csr is None:
             # If no CSR bus provided, create it with default parameters.
@@ -809,6 +1088,10 @@ class Wishbone2CSR(LiteXModule):
             raise ValueError("Wishbone data width must be a multiple of CSR data width.")
         if (self.csr.alignment % csr_data_width) != 0:
             raise ValueError("CSR alignment must be a multiple of CSR data width.")
+        if (posted_writes or read_ahead) and register:
+            raise ValueError("Wishbone2CSR posted writes/read-ahead require register=False.")
+        if (posted_writes or read_ahead) and latency:
+            raise ValueError("Wishbone2CSR posted writes/read-ahead require latency=0.")
 
         # # #
 
@@ -847,8 +1130,113 @@ class Wishbone2CSR(LiteXModule):
         )
         selected_r = Signal(max=max(2, ratio))
 
+        def get_dat_r():
+            return [
+                self.wishbone.dat_r.eq(0),
+                Case(selected, {
+                    i: self.wishbone.dat_r[
+                        i*csr_data_width:(i + 1)*csr_data_width
+                    ].eq(self.csr.dat_r)
+                    for i in range(ratio)
+                }),
+            ]
+
+        # Read latency of the CSR interconnect.
+        wait = Signal(max=max(2, latency))
+        def wait_latency(fsm):
+            if latency:
+                fsm.act("WAIT",
+                    NextValue(wait, wait + 1),
+                    If(wait == (latency - 1),
+                        NextValue(wait, 0),
+                        NextState("ACK")
+                    )
+                )
+            return "WAIT" if latency else "ACK"
+
+        # Posted Writes / Read-Ahead Access.
+        if posted_writes or read_ahead:
+            adr    = Signal(len(self.csr.adr))
+            access = Signal()
+            self.comb += [
+                adr.eq(csr_adr),
+                access.eq(self.wishbone.cyc & self.wishbone.stb),
+            ]
+
+            # Write FIFO (drained to the CSR bus with priority over reads).
+            drain = Signal()
+            if posted_writes:
+                self.write_fifo = write_fifo = stream.SyncFIFO([
+                    ("adr", len(self.csr.adr)),
+                    ("dat", csr_data_width),
+                ], depth=posted_writes)
+                self.comb += [
+                    write_fifo.sink.adr.eq(adr),
+                    write_fifo.sink.dat.eq(dat_ws[selected]),
+                    drain.eq(write_fifo.source.valid),
+                    write_fifo.source.ready.eq(1),
+                ]
+
+            # Read-Ahead: Data of prefetch_adr is on csr.dat_r when prefetch_valid.
+            prefetch_adr    = Signal(len(self.csr.adr))
+            prefetch_valid  = Signal()
+            prefetch_update = Signal()
+            self.sync += [
+                If(prefetch_update,
+                    prefetch_adr.eq(adr + 1),
+                    prefetch_valid.eq(0),
+                ).Else(
+                    prefetch_valid.eq((self.csr.adr == prefetch_adr) & ~self.csr.we)
+                )
+            ]
+            hit = Signal()
+            if read_ahead:
+                self.comb += hit.eq(prefetch_valid & (adr == prefetch_adr))
+
+            self.fsm = fsm = FSM(reset_state="IDLE")
+            fsm.act("IDLE",
+                If(drain,
+                    self.csr.adr.eq(write_fifo.source.adr),
+                    self.csr.dat_w.eq(write_fifo.source.dat),
+                    self.csr.we.eq(1),
+                ).Else(
+                    self.csr.adr.eq(prefetch_adr),
+                    self.csr.dat_w.eq(dat_ws[selected]),
+                ),
+                If(access & self.wishbone.we,
+                    If(self.wishbone.sel == 0,
+                        self.wishbone.ack.eq(1)
+                    ).Else(*([
+                        # Posted Write.
+                        write_fifo.sink.valid.eq(1),
+                        self.wishbone.ack.eq(write_fifo.sink.ready)
+                    ] if posted_writes else [
+                        self.csr.adr.eq(adr),
+                        self.csr.we.eq(1),
+                        NextState("ACK")
+                    ]))
+                ).Elif(access & ~drain,
+                    # Read (Immediate on Read-Ahead hit).
+                    self.csr.adr.eq(adr),
+                    self.csr.re.eq(self.wishbone.sel != 0),
+                    prefetch_update.eq(1),
+                    If(hit,
+                        self.wishbone.ack.eq(1),
+                        *get_dat_r()
+                    ).Else(
+                        NextState("ACK")
+                    )
+                )
+            )
+            fsm.act("ACK",
+                self.csr.adr.eq(prefetch_adr),
+                self.wishbone.ack.eq(1),
+                *get_dat_r(),
+                NextState("IDLE")
+            )
+
         # Registered Access.
-        if register:
+        elif register:
             self.fsm = fsm = FSM(reset_state="IDLE")
             fsm.act("IDLE",
                 NextValue(self.csr.dat_w, dat_ws[selected]),
@@ -864,7 +1252,11 @@ class Wishbone2CSR(LiteXModule):
                 NextValue(self.csr.adr, 0),
                 NextValue(self.csr.re, 0),
                 NextValue(self.csr.we, 0),
-                NextState("ACK")
+                If(self.csr.re,
+                    NextState(wait_latency(fsm))
+                ).Else(
+                    NextState("ACK")
+                )
             )
             fsm.act("ACK",
                 self.wishbone.ack.eq(1),
@@ -886,7 +1278,11 @@ class Wishbone2CSR(LiteXModule):
                     self.csr.adr.eq(csr_adr),
                     self.csr.re.eq(~self.wishbone.we & (self.wishbone.sel != 0)),
                     self.csr.we.eq( self.wishbone.we & (self.wishbone.sel != 0)),
-                    NextState("ACK")
+                    If(self.wishbone.we,
+                        NextState("ACK")
+                    ).Else(
+                        NextState(wait_latency(fsm))
+                    )
                 )
             )
             fsm.act("ACK",
@@ -1078,3 +1474,419 @@ class Cache(LiteXModule):
                 )
             )
         )
+
+
+class SetAssociativeCache(LiteXModule):
+    """Set-Associative Cache
+
+    This module is a set-associative wishbone cache that can be used as a L2 cache. Cachesize (in
+    32-bit words) is the size of the data store (all ways) and must be a power of 2.
+
+    Replacement of the ways is done with the `replacement` policy ("lru", "plru" or "random") after
+    filling the invalid ways. Writes are written back on eviction or, with `write_through`, directly
+    forwarded to the slave (updating the cache on hits, no allocation on misses). With `prefetch`,
+    the line following two sequential misses is fetched after the second miss. Hits, misses,
+    evictions and prefetches can be counted through CSRs with `with_csr`.
+    """
+    supported_ways        = [1, 2, 4, 8]
+    supported_replacement = ["lru", "plru", "random"]
+
+    def __init__(self, cachesize, master, slave, ways=4, replacement="lru", write_through=False,
+        prefetch=False, with_csr=False, reverse=True):
+        self.master = master
+        self.slave  = slave
+
+        self.hit_event      = Signal()
+        self.miss_event     = Signal()
+        self.evict_event    = Signal()
+        self.prefetch_event = Signal()
+
+        # # #
+
+        # Parameters.
+        # -----------
+        dw_from = len(master.dat_r)
+        dw_to   = len(slave.dat_r)
+        if dw_to > dw_from and (dw_to % dw_from) != 0:
+            raise ValueError("Slave data width must be a multiple of {dw}".format(dw=dw_from))
+        if dw_to < dw_from and (dw_from % dw_to) != 0:
+            raise ValueError("Master data width must be a multiple of {dw}".format(dw=dw_to))
+        if master.addressing != "word":
+            raise ValueError("Cache master must be word-addressed (byte addressing not supported).")
+        if slave.addressing != "word":
+            raise ValueError("Cache slave must be word-addressed (byte addressing not supported).")
+        if ways not in self.supported_ways:
+            raise ValueError("Unsupported Cache ways {}, supported are: {}.".format(ways, self.supported_ways))
+        if replacement not in self.supported_replacement:
+            raise ValueError("Unsupported Cache replacement {}, supported are: {}.".format(
+                replacement, ", ".join(self.supported_replacement)))
+
+        # Address Split.
+        # --------------
+        # TAG | SET NUMBER | LINE OFFSET.
+        offsetbits = log2_int(max(dw_to//dw_from, 1))
+        addressbits = len(slave.adr) + offsetbits
+        linebits    = log2_int(cachesize//ways) - offsetbits
+        tagbits     = addressbits - linebits
+        wordbits    = log2_int(max(dw_from//dw_to, 1))
+        waybits     = log2_int(ways)
+        if linebits < 1:
+            raise ValueError("Cache size too small for {} ways.".format(ways))
+        adr_offset, adr_line, adr_tag = split(master.adr, offsetbits, linebits, tagbits)
+        word = Signal(wordbits) if wordbits else None
+        linew = dw_to*2**wordbits
+
+        # Lookup Address (Master or Prefetch).
+        # ------------------------------------
+        prefetching = Signal()
+        prefetch_adr = Signal(linebits + tagbits)
+        lookup_line  = Signal(linebits)
+        lookup_tag   = Signal(tagbits)
+        self.comb += [
+            If(prefetching,
+                Cat(lookup_line, lookup_tag).eq(prefetch_adr)
+            ).Else(
+                lookup_line.eq(adr_line),
+                lookup_tag.eq(adr_tag)
+            )
+        ]
+
+        # Ways (Data/Tag Memories).
+        # -------------------------
+        tag_layout = [("tag", tagbits), ("valid", 1), ("dirty", 1)]
+        data_ports = []
+        tag_ports  = []
+        tag_dos    = []
+        tag_di     = Record(tag_layout)
+        for i in range(ways):
+            data_mem  = Memory(linew, 2**linebits)
+            data_port = data_mem.get_port(write_capable=True, we_granularity=8)
+            tag_mem   = Memory(layout_len(tag_layout), 2**linebits)
+            tag_port  = tag_mem.get_port(write_capable=True)
+            self.specials += data_mem, data_port, tag_mem, tag_port
+            tag_do = Record(tag_layout)
+            self.comb += [
+                data_port.adr.eq(lookup_line),
+                tag_port.adr.eq(lookup_line),
+                tag_do.raw_bits().eq(tag_port.dat_r),
+                tag_port.dat_w.eq(tag_di.raw_bits()),
+            ]
+            data_ports.append(data_port)
+            tag_ports.append(tag_port)
+            tag_dos.append(tag_do)
+        self.comb += tag_di.tag.eq(lookup_tag)
+
+        # Hit Detection.
+        # --------------
+        hits    = Signal(ways)
+        hit     = Signal()
+        hit_way = Signal(max=max(ways, 2))
+        self.comb += [
+            hits.eq(Cat(*[tag_do.valid & (tag_do.tag == lookup_tag) for tag_do in tag_dos])),
+            hit.eq(hits != 0),
+        ]
+        for i in range(ways):
+            self.comb += If(hits[i], hit_way.eq(i))
+
+        # Replacement.
+        # ------------
+        access     = Signal()
+        repl_way   = Signal(max=max(ways, 2))
+        if ways == 1:
+            pass
+        elif replacement == "random":
+            # Free-running counter used as pseudo-random way selection.
+            self.sync += repl_way.eq(repl_way + 1)
+        else:
+            if replacement == "lru":
+                # Ways ordered from most (first) to least (last) recently used.
+                repl_width = ways*waybits
+                repl_init  = sum(i << (i*waybits) for i in range(ways))
+            else:
+                # Tree Pseudo-LRU (one bit per node pointing to the least recently used half).
+                repl_width = ways - 1
+                repl_init  = 0
+            repl_mem  = Memory(repl_width, 2**linebits, init=[repl_init]*2**linebits)
+            repl_port = repl_mem.get_port(write_capable=True)
+            self.specials += repl_mem, repl_port
+            self.comb += [
+                repl_port.adr.eq(lookup_line),
+                repl_port.we.eq(access),
+            ]
+            if replacement == "lru":
+                order     = [repl_port.dat_r[i*waybits:(i+1)*waybits] for i in range(ways)]
+                new_order = [Signal(waybits) for i in range(ways)]
+                position  = Signal(waybits)
+                for i in range(ways):
+                    self.comb += If(order[i] == hit_way, position.eq(i))
+                self.comb += [
+                    repl_way.eq(order[-1]),
+                    new_order[0].eq(hit_way),
+                    repl_port.dat_w.eq(Cat(*new_order)),
+                ]
+                for i in range(1, ways):
+                    self.comb += new_order[i].eq(Mux(position >= i, order[i - 1], order[i]))
+            else:
+                def plru_path(way):
+                    node = 0
+                    for level in reversed(range(waybits)):
+                        direction = (way >> level) & 0b1
+                        yield node, direction
+                        node = 2*node + 1 + direction
+                bits  = repl_port.dat_r
+                cases = {}
+                for i in range(ways):
+                    path = list(plru_path(i))
+                    self.comb += If(Cat(*[bits[n] for n, d in path]) == sum(d << k for k, (n, d) in enumerate(path)),
+                        repl_way.eq(i)
+                    )
+                    cases[i] = [repl_port.dat_w.eq(bits)] + [repl_port.dat_w[n].eq(~d) for n, d in plru_path(i)]
+                self.comb += Case(hit_way, cases)
+
+        # Victim selection (Invalid ways first).
+        victim    = Signal(max=max(ways, 2))
+        victim_r  = Signal(max=max(ways, 2))
+        invalids  = Signal(ways)
+        self.comb += [
+            invalids.eq(Cat(*[~tag_do.valid for tag_do in tag_dos])),
+            victim.eq(repl_way),
+        ]
+        for i in reversed(range(ways)):
+            self.comb += If(invalids[i], victim.eq(i))
+        victim_tag   = Array(tag_do.tag   for tag_do in tag_dos)[victim_r]
+        victim_dirty = Array(tag_do.valid & tag_do.dirty for tag_do in tag_dos)[victim]
+
+        # Data Path.
+        # ----------
+        write_from_slave = Signal()
+        write_through_on = Signal()
+        wr_hit     = Signal()
+        wr_way     = Signal(max=max(ways, 2))
+        hit_r      = Signal()
+        hit_way_r  = Signal(max=max(ways, 2))
+        hit_data   = Signal(linew)
+        evict_data = Signal(linew)
+        if adr_offset is None:
+            adr_offset_r = None
+        else:
+            adr_offset_r = Signal(offsetbits, reset_less=True)
+            self.sync += adr_offset_r.eq(adr_offset)
+
+        for i, data_port in enumerate(data_ports):
+            self.comb += [
+                If(write_from_slave,
+                    If(victim_r == i,
+                        displacer(slave.dat_r, word, data_port.dat_w),
+                        displacer(Replicate(1, dw_to//8), word, data_port.we)
+                    )
+                ).Else(
+                    data_port.dat_w.eq(Replicate(master.dat_w, max(dw_to//dw_from, 1))),
+                    If(master.cyc & master.stb & master.we & master.ack & wr_hit & (wr_way == i),
+                        displacer(master.sel, adr_offset, data_port.we, 2**offsetbits, reverse=reverse)
+                    )
+                )
+            ]
+        if word is not None:
+            write_through_data = [
+                chooser(master.dat_w, word, slave.dat_w),
+                chooser(master.sel,   word, slave.sel),
+            ]
+        else:
+            write_through_data = [
+                slave.dat_w.eq(Replicate(master.dat_w, max(dw_to//dw_from, 1))),
+                displacer(master.sel, adr_offset, slave.sel, 2**offsetbits, reverse=reverse),
+            ]
+        self.comb += [
+            hit_data.eq(Array(data_port.dat_r for data_port in data_ports)[hit_way]),
+            evict_data.eq(Array(data_port.dat_r for data_port in data_ports)[victim_r]),
+            chooser(hit_data, adr_offset_r, master.dat_r, reverse=reverse),
+            If(write_through_on,
+                *write_through_data
+            ).Else(
+                chooser(evict_data, word, slave.dat_w),
+                slave.sel.eq(2**(dw_to//8)-1),
+            )
+        ]
+
+        def slave_adr(line, tag):
+            if word is not None:
+                return slave.adr.eq(Cat(word, line, tag))
+            else:
+                return slave.adr.eq(Cat(line, tag))
+
+        # Slave word compute.
+        # -------------------
+        word_clr = Signal()
+        word_inc = Signal()
+        if word is not None:
+            self.sync += [
+                If(word_clr,
+                    word.eq(0),
+                ).Elif(word_inc,
+                    word.eq(word+1)
+                )
+            ]
+
+        def word_is_last(word):
+            if word is not None:
+                return word == 2**wordbits-1
+            else:
+                return 1
+
+        def tag_write(way, **fields):
+            return [tag_di.valid.eq(1)] + [getattr(tag_di, k).eq(v) for k, v in fields.items()] + [
+                Array(tag_port.we for tag_port in tag_ports)[way].eq(1)]
+
+        # Prefetch.
+        # ---------
+        prefetch_pending = Signal()
+        last_miss        = Signal(linebits + tagbits)
+        missed           = Signal()
+
+        # FSM.
+        # ----
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(missed, 0),
+            # Pending prefetch first: the master is expected to access the prefetched line next.
+            If(prefetch_pending,
+                NextValue(prefetch_pending, 0),
+                NextValue(prefetching, 1),
+                NextState("PREFETCH_LOOKUP")
+            ).Elif(master.cyc & master.stb,
+                NextState("TEST_HIT")
+            )
+        )
+        fsm.act("TEST_HIT",
+            word_clr.eq(1),
+            wr_hit.eq(hit),
+            wr_way.eq(hit_way),
+            If(hit,
+                access.eq(1),
+                self.hit_event.eq(~missed),
+                If(master.we & write_through,
+                    NextValue(hit_r,     1),
+                    NextValue(hit_way_r, hit_way),
+                    NextState("WRITE_THROUGH")
+                ).Else(
+                    master.ack.eq(1),
+                    If(master.we,
+                        *tag_write(hit_way, dirty=1)
+                    ),
+                    NextState("IDLE")
+                )
+            ).Else(
+                self.miss_event.eq(1),
+                NextValue(missed, 1),
+                NextValue(last_miss, Cat(adr_line, adr_tag)),
+                If(Cat(adr_line, adr_tag) == (last_miss + 1),
+                    NextValue(prefetch_pending, int(prefetch)),
+                    NextValue(prefetch_adr, Cat(adr_line, adr_tag) + 1)
+                ),
+                If(master.we & write_through,
+                    # No allocation on write misses.
+                    NextValue(hit_r, 0),
+                    NextState("WRITE_THROUGH")
+                ).Else(
+                    NextValue(victim_r, victim),
+                    If(victim_dirty,
+                        NextState("EVICT")
+                    ).Else(
+                        NextState("REFILL")
+                    )
+                )
+            )
+        )
+        fsm.act("WRITE_THROUGH",
+            write_through_on.eq(1),
+            slave_adr(adr_line, adr_tag),
+            wr_hit.eq(hit_r),
+            wr_way.eq(hit_way_r),
+            slave.stb.eq(1),
+            slave.cyc.eq(1),
+            slave.we.eq(1),
+            If(slave.ack,
+                word_inc.eq(1),
+                If(word_is_last(word),
+                    master.ack.eq(1),
+                    NextState("IDLE")
+                )
+            )
+        )
+        fsm.act("EVICT",
+            slave_adr(lookup_line, victim_tag),
+            slave.stb.eq(1),
+            slave.cyc.eq(1),
+            slave.we.eq(1),
+            If(slave.ack,
+                word_inc.eq(1),
+                If(word_is_last(word),
+                    self.evict_event.eq(1),
+                    word_clr.eq(1),
+                    NextState("REFILL")
+                )
+            )
+        )
+        fsm.act("REFILL",
+            slave_adr(lookup_line, lookup_tag),
+            slave.stb.eq(1),
+            slave.cyc.eq(1),
+            slave.we.eq(0),
+            If(slave.ack,
+                write_from_slave.eq(1),
+                word_inc.eq(1),
+                If(word_is_last(word),
+                    *tag_write(victim_r, dirty=0),
+                    If(prefetching,
+                        NextValue(prefetching, 0),
+                        NextState("IDLE")
+                    ).Else(
+                        NextState("TEST_HIT")
+                    )
+                )
+            )
+        )
+        fsm.act("PREFETCH_LOOKUP",
+            NextState("PREFETCH_TEST")
+        )
+        fsm.act("PREFETCH_TEST",
+            word_clr.eq(1),
+            # Only prefetch into clean ways (no eviction).
+            If(hit | victim_dirty,
+                NextValue(prefetching, 0),
+                NextState("IDLE")
+            ).Else(
+                self.prefetch_event.eq(1),
+                NextValue(victim_r, victim),
+                NextState("REFILL")
+            )
+        )
+
+        # CSRs.
+        # -----
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._hits       = csr.CSRStatus(32, description="Cache hits count.")
+        self._misses     = csr.CSRStatus(32, description="Cache misses count.")
+        self._evictions  = csr.CSRStatus(32, description="Cache evictions (dirty line write-backs) count.")
+        self._prefetches = csr.CSRStatus(32, description="Cache line prefetches count.")
+        self._clear      = csr.CSR()
+
+        # # #
+
+        for event, status in [
+            (self.hit_event,      self._hits),
+            (self.miss_event,     self._misses),
+            (self.evict_event,    self._evictions),
+            (self.prefetch_event, self._prefetches)]:
+            counter = Signal(32)
+            self.sync += [
+                If(self._clear.re,
+                    counter.eq(0)
+                ).Elif(event & (counter != (2**32 - 1)),
+                    counter.eq(counter + 1)
+                )
+            ]
+            self.comb += status.status.eq(counter)
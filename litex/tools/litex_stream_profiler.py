@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""LiteX Stream Profiler utility.
+
+Reads the counters of the StreamProfilers of a SoC over a RemoteClient (litex_server bridge) and
+prints per-endpoint utilization (transfer/backpressure/starvation cycles) and packet latencies.
+"""
+
+import time
+import argparse
+
+from litex.tools.litex_client import RemoteClient
+
+# Helpers ------------------------------------------------------------------------------------------
+
+_counters = ["cycles", "transfers", "backpressure", "starvation", "packets"]
+
+def find_profilers(regs, filter=None):
+    """Return the names of the StreamProfilers present in `regs` (bus.regs)."""
+    profilers = []
+    for name in regs.__dict__.keys():
+        if name.endswith("_backpressure"):
+            profiler = name[:-len("_backpressure")]
+            if (filter is None) or (filter in profiler):
+                profilers.append(profiler)
+    return profilers
+
+
+def reset_profiler(regs, name):
+    getattr(regs, f"{name}_reset").write(1)
+
+
+def read_profiler(regs, name):
+    """Latch and read the counters of StreamProfiler `name` (returned as a dict)."""
+    getattr(regs, f"{name}_latch").write(1)
+    stats = {}
+    for counter in _counters:
+        stats[counter] = getattr(regs, f"{name}_{counter}").read()
+    if hasattr(regs, f"{name}_latency_count"):
+        for counter in ["count", "min", "max", "sum", "overflows"]:
+            if hasattr(regs, f"{name}_latency_{counter}"):
+                stats[f"latency_{counter}"] = getattr(regs, f"{name}_latency_{counter}").read()
+        bins = []
+        while hasattr(regs, f"{name}_latency_bin{len(bins)}"):
+            bins.append(getattr(regs, f"{name}_latency_bin{len(bins)}").read())
+        stats["latency_bins"] = bins
+    return stats
+
+
+def _percent(value, total):
+    return 100*value/total if total else 0.0
+
+
+def format_profiler(name, stats):
+    """Format the `stats` of StreamProfiler `name` (from read_profiler) as a text report."""
+    cycles = stats["cycles"]
+    idle   = cycles - stats["transfers"] - stats["backpressure"] - stats["starvation"]
+    lines  = [
+        f"{name}:",
+        f"  cycles       : {cycles}",
+        f"  transfers    : {stats['transfers']} ({_percent(stats['transfers'], cycles):.2f}% utilization)",
+        f"  backpressure : {stats['backpressure']} ({_percent(stats['backpressure'], cycles):.2f}%)",
+        f"  starvation   : {stats['starvation']} ({_percent(stats['starvation'], cycles):.2f}%)",
+        f"  idle         : {idle} ({_percent(idle, cycles):.2f}%)",
+        f"  packets      : {stats['packets']}",
+    ]
+    if "latency_count" in stats:
+        count = stats["latency_count"]
+        if count:
+            lines.append("  latency      : min {} / avg {:.2f} / max {} cycles ({} packets)".format(
+                stats["latency_min"], stats["latency_sum"]/count, stats["latency_max"], count))
+        else:
+            lines.append("  latency      : no packets")
+        if stats.get("latency_overflows", 0):
+            lines.append(f"  unmeasured   : {stats['latency_overflows']} packets (too many packets in flight)")
+        for i, value in enumerate(stats["latency_bins"]):
+            lines.append(f"    bin{i:<3d}     : {value} ({_percent(value, count):.2f}%)")
+    return "\n".join(lines)
+
+# Profile ------------------------------------------------------------------------------------------
+
+def run(host, csr_csv, port, filter=None, reset=False, loop=False, interval=1.0):
+    with RemoteClient(host=host, csr_csv=csr_csv, port=port) as bus:
+        profilers = find_profilers(bus.regs, filter)
+        if not profilers:
+            print("No StreamProfiler found.")
+            return
+        if reset:
+            for name in profilers:
+                reset_profiler(bus.regs, name)
+        while True:
+            if loop or reset:
+                time.sleep(interval)
+            for name in profilers:
+                print(format_profiler(name, read_profiler(bus.regs, name)))
+            if not loop:
+                break
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX Stream Profiler utility.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--csr-csv",  default="csr.csv",   help="CSR configuration file")
+    parser.add_argument("--host",     default="localhost", help="Host ip address")
+    parser.add_argument("--port",     default="1234",      help="Host bind port.")
+    parser.add_argument("--filter",   default=None,        help="StreamProfilers filter.")
+    parser.add_argument("--reset",    action="store_true", help="Reset the counters and wait --interval before reading them.")
+    parser.add_argument("--loop",     action="store_true", help="Read the counters every --interval.")
+    parser.add_argument("--interval", default="1.0",       help="Measurement interval (in seconds).")
+    args = parser.parse_args()
+
+    run(
+        host     = args.host,
+        csr_csv  = args.csr_csv,
+        port     = int(args.port, 0),
+        filter   = args.filter,
+        reset    = args.reset,
+        loop     = args.loop,
+        interval = float(args.interval),
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""LiteX Stream Traffic utility.
+
+Drives a StreamTrafficGenerator (and optional StreamTrafficChecker) of a SoC over a RemoteClient
+(litex_server bridge), sweeps the packet sizes and reports the achieved bandwidth and errors of the
+stream path between them.
+"""
+
+import time
+import argparse
+
+from litex.tools.litex_client import RemoteClient
+
+# Helpers ------------------------------------------------------------------------------------------
+
+_counters = ["packets", "bytes", "cycles"]
+
+def find_generators(regs, filter=None):
+    """Return the names of the StreamTrafficGenerators present in `regs` (bus.regs)."""
+    return _find(regs, "_length_mask", filter)
+
+
+def find_checkers(regs, filter=None):
+    """Return the names of the StreamTrafficCheckers present in `regs` (bus.regs)."""
+    return _find(regs, "_seq_errors", filter)
+
+
+def _find(regs, suffix, filter):
+    names = []
+    for name in regs.__dict__.keys():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            if (filter is None) or (filter in name):
+                names.append(name)
+    return names
+
+
+def _read(regs, name, counters):
+    return {counter: getattr(regs, f"{name}_{counter}").read() for counter in counters}
+
+
+def run_traffic(regs, generator, checker=None, length=64, length_mask=0, gap=0, count=1024, prbs=True, timeout=10.0):
+    """Run `count` packets of `length` beats on `generator` and return the counters (as a dict)."""
+    if count == 0:
+        raise ValueError("Continuous traffic (count=0) can't be measured, please provide a count.")
+    getattr(regs, f"{generator}_enable").write(0)
+    for csr, value in [("length", length), ("length_mask", length_mask), ("gap", gap), ("count", count), ("prbs", int(prbs))]:
+        getattr(regs, f"{generator}_{csr}").write(value)
+    if checker is not None:
+        getattr(regs, f"{checker}_prbs").write(int(prbs))
+        getattr(regs, f"{checker}_reset").write(1)
+    getattr(regs, f"{generator}_enable").write(1)
+    start = time.time()
+    while not getattr(regs, f"{generator}_done").read():
+        if (time.time() - start) > timeout:
+            getattr(regs, f"{generator}_enable").write(0)
+            raise TimeoutError(f"{generator}: Traffic not done after {timeout}s.")
+    # Wait for the packets still in flight between the generator and the checker.
+    if checker is not None:
+        while getattr(regs, f"{checker}_packets").read() != count:
+            if (time.time() - start) > timeout:
+                getattr(regs, f"{generator}_enable").write(0)
+                raise TimeoutError(f"{checker}: Traffic not received after {timeout}s.")
+    stats = {"length": length, "generator": _read(regs, generator, _counters)}
+    if checker is not None:
+        stats["checker"] = _read(regs, checker, _counters + ["errors", "seq_errors"])
+    getattr(regs, f"{generator}_enable").write(0)
+    return stats
+
+
+def bandwidth(counters, sys_clk_freq):
+    """Bandwidth (in bits/s) of `counters` (bytes transferred in cycles at `sys_clk_freq`)."""
+    if counters["cycles"] == 0:
+        return 0.0
+    return 8*counters["bytes"]*sys_clk_freq/counters["cycles"]
+
+
+def format_results(results, sys_clk_freq):
+    """Format the `results` of run_traffic as a text table."""
+    lines = ["{:>8s} {:>10s} {:>12s} {:>12s} {:>10s} {:>10s} {:>8s} {:>8s}".format(
+        "length", "packets", "bytes", "cycles", "bytes/cyc", "Gbps", "errors", "seq_err")]
+    for stats in results:
+        counters = stats.get("checker", stats["generator"])
+        lines.append("{:>8d} {:>10d} {:>12d} {:>12d} {:>10.2f} {:>10.3f} {:>8s} {:>8s}".format(
+            stats["length"],
+            counters["packets"],
+            counters["bytes"],
+            counters["cycles"],
+            counters["bytes"]/counters["cycles"] if counters["cycles"] else 0.0,
+            bandwidth(counters, sys_clk_freq)/1e9,
+            str(counters.get("errors", "-")),
+            str(counters.get("seq_errors", "-")),
+        ))
+    return "\n".join(lines)
+
+# Sweep --------------------------------------------------------------------------------------------
+
+def run(host, csr_csv, port, sizes, generator=None, checker=None, gap=0, count=1024, prbs=True, sys_clk_freq=None, timeout=10.0):
+    with RemoteClient(host=host, csr_csv=csr_csv, port=port) as bus:
+        generators = find_generators(bus.regs, generator)
+        checkers   = find_checkers(bus.regs, checker)
+        if not generators:
+            print("No StreamTrafficGenerator found.")
+            return
+        generator = generators[0]
+        checker   = checkers[0] if checkers else None
+        if sys_clk_freq is None:
+            constants    = getattr(getattr(bus, "constants", None), "d", {})
+            sys_clk_freq = int(constants.get("config_clock_frequency", 0))
+        if not sys_clk_freq:
+            raise ValueError("config_clock_frequency not found in constants, please provide --sys-clk-freq.")
+        print(f"{generator} -> {checker if checker is not None else '(no checker)'} @ {sys_clk_freq/1e6:.2f}MHz")
+        results = []
+        for length in sizes:
+            results.append(run_traffic(bus.regs, generator, checker,
+                length  = length,
+                gap     = gap,
+                count   = count,
+                prbs    = prbs,
+                timeout = timeout,
+            ))
+        print(format_results(results, sys_clk_freq))
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX Stream Traffic utility.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--csr-csv",      default="csr.csv",            help="CSR configuration file")
+    parser.add_argument("--host",         default="localhost",          help="Host ip address")
+    parser.add_argument("--port",         default="1234",               help="Host bind port.")
+    parser.add_argument("--generator",    default=None,                 help="StreamTrafficGenerator filter (first found if not specified).")
+    parser.add_argument("--checker",      default=None,                 help="StreamTrafficChecker filter (first found if not specified).")
+    parser.add_argument("--sizes",        default="1,4,16,64,256,1024", help="Packet sizes to sweep (in beats, comma separated).")
+    parser.add_argument("--gap",          default="0",                  help="Inter-packet gap (in cycles).")
+    parser.add_argument("--count",        default="1024",               help="Number of packets per size.")
+    parser.add_argument("--no-prbs",      action="store_true",          help="Use a counter payload instead of a PRBS payload.")
+    parser.add_argument("--sys-clk-freq", default=None,                 help="System clock frequency (from the constants if not specified).")
+    parser.add_argument("--timeout",      default="10.0",               help="Timeout per size (in seconds).")
+    args = parser.parse_args()
+
+    run(
+        host         = args.host,
+        csr_csv      = args.csr_csv,
+        port         = int(args.port, 0),
+        sizes        = [int(size, 0) for size in args.sizes.split(",")],
+        generator    = args.generator,
+        checker      = args.checker,
+        gap          = int(args.gap, 0),
+        count        = int(args.count, 0),
+        prbs         = not args.no_prbs,
+        sys_clk_freq = None if args.sys_clk_freq is None else int(float(args.sys_clk_freq)),
+        timeout      = float(args.timeout),
+    )
+
+if __name__ == "__main__":
+    main()
@@ -78,6 +78,8 @@ setup(
             "litex_contributors = litex.tools.litex_contributors:main",
             "litex_build_bundle = litex.tools.litex_build_bundle:main",
             "litex_remote_build = litex.tools.litex_remote_build:main",
+            "litex_stream_profiler = litex.tools.litex_stream_profiler:main",
+            "litex_stream_traffic = litex.tools.litex_stream_traffic:main",
         ],
     },
 )
@@ -0,0 +1,195 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from migen import ClockDomain, Module, Signal
+
+from litex.build import tools
+from litex.build.generic_platform import GenericPlatform
+from litex.build.generic_toolchain import GenericToolchain
+from litex.build.artifact_cache import (
+    HTTPArtifactCache,
+    LocalArtifactCache,
+    get_artifact_cache,
+)
+
+
+class _CacheHTTPServer(ThreadingHTTPServer):
+    def __init__(self):
+        self.objects = {}
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", 0), _CacheHTTPHandler)
+
+
+class _CacheHTTPHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        data = self.server.objects.get(self.path)
+        if data is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PUT(self):
+        self.server.objects[self.path] = self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _DummyToolchain(GenericToolchain):
+    def __init__(self):
+        GenericToolchain.__init__(self)
+        self.run_calls = []
+
+    def build_io_constraints(self):
+        return ("io.pcf", "PCF")
+
+    def build_script(self):
+        return "build.sh"
+
+    def run_script(self, script):
+        self.run_calls.append(script)
+        with open(self._build_name + ".bit", "w") as f:
+            f.write("bitstream")
+        with open(self._build_name + "_timing.rpt", "w") as f:
+            f.write("report")
+
+
+class _SourcesToolchain(_DummyToolchain):
+    # Build script referencing the platform sources/include paths (absolute paths).
+    def build_script(self):
+        script = "\n".join(f"read_verilog {filename}" for filename, *_ in self.platform.sources)
+        script += "\n" + "\n".join(f"include {path}" for path in self.platform.verilog_include_paths)
+        tools.write_to_file("build.sh", script + "\n")
+        return "build.sh"
+
+
+def _make_dut():
+    dut = Module()
+    dut.clock_domains.cd_sys = ClockDomain("sys")
+    counter = Signal(8)
+    dut.sync += counter.eq(counter + 1)
+    return dut
+
+
+def _build(toolchain, build_dir, cache, sources_dir=None, **kwargs):
+    platform = GenericPlatform(device="unit-device", io=[], name="unit_platform")
+    platform._bitstream_ext = ".bit"
+    platform.toolchain = toolchain
+    if sources_dir is not None:
+        platform.add_source(os.path.join(sources_dir, "core.v"))
+        platform.add_verilog_include_path(os.path.join(sources_dir, "include"))
+    toolchain.build(platform, _make_dut(), build_dir=build_dir, run=True, artifact_cache=cache, **kwargs)
+
+
+class TestArtifactCache(unittest.TestCase):
+    def _check_round_trip(self, cache, tmp_dir):
+        src = os.path.join(tmp_dir, "top.bit")
+        with open(src, "w") as f:
+            f.write("bitstream")
+
+        self.assertIsNone(cache.get("00" * 32, lambda name: name))
+        cache.put("ab" * 32, {"gateware/top.bit": src})
+        restored = cache.get("ab" * 32, lambda name: os.path.join(tmp_dir, "restored", name))
+
+        self.assertEqual(list(restored.keys()), ["gateware/top.bit"])
+        with open(restored["gateware/top.bit"]) as f:
+            self.assertEqual(f.read(), "bitstream")
+
+    def test_local_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = get_artifact_cache(os.path.join(tmp_dir, "cache"))
+
+            self.assertIsInstance(cache, LocalArtifactCache)
+            self._check_round_trip(cache, tmp_dir)
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "cache", "ab", "ab" * 32 + ".tar.gz")))
+
+    def test_http_cache_round_trip(self):
+        server = _CacheHTTPServer()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = get_artifact_cache("http://127.0.0.1:{}/bucket/".format(server.server_address[1]))
+
+            self.assertIsInstance(cache, HTTPArtifactCache)
+            self._check_round_trip(cache, tmp_dir)
+            self.assertIn("/bucket/" + "ab" * 32 + ".tar.gz", server.objects)
+
+    def test_toolchain_restores_gateware_and_extra_artifacts_on_hit(self):
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache    = os.path.join(tmp_dir, "cache")
+            csr_json = os.path.join(tmp_dir, "a", "csr.json")
+            os.makedirs(os.path.dirname(csr_json))
+            with open(csr_json, "w") as f:
+                f.write("{}")
+
+            first = _DummyToolchain()
+            _build(first, os.path.join(tmp_dir, "a", "gateware"), cache, extra_artifacts={"csr.json": csr_json})
+
+            # Different build directory (other checkout/runner): restored from cache.
+            second       = _DummyToolchain()
+            second_build = os.path.join(tmp_dir, "b", "gateware")
+            second_json  = os.path.join(tmp_dir, "b", "csr.json")
+            _build(second, second_build, cache, extra_artifacts={"csr.json": second_json})
+
+            with open(os.path.join(second_build, "top.bit")) as f:
+                self.assertEqual(f.read(), "bitstream")
+            self.assertTrue(os.path.exists(os.path.join(second_build, "top_timing.rpt")))
+            self.assertTrue(os.path.exists(os.path.join(second_build, "top.inputs.json")))
+            self.assertTrue(os.path.exists(second_json))
+
+            # Forced rebuild ignores the cache.
+            forced = _DummyToolchain()
+            _build(forced, os.path.join(tmp_dir, "c", "gateware"), cache, force_rebuild=True)
+
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(first.run_calls,  ["build.sh"])
+        self.assertEqual(second.run_calls, [])
+        self.assertEqual(forced.run_calls, ["build.sh"])
+
+    def test_toolchain_cache_hit_from_other_checkout(self):
+        # Same design and sources from another checkout: sources paths are not part of the key.
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = os.path.join(tmp_dir, "cache")
+            for checkout in ["a", "b", "c"]:
+                os.makedirs(os.path.join(tmp_dir, checkout, "src", "include"))
+                with open(os.path.join(tmp_dir, checkout, "src", "core.v"), "w") as f:
+                    f.write("module core(); endmodule\n" if checkout != "c" else "module core(input a); endmodule\n")
+                with open(os.path.join(tmp_dir, checkout, "src", "include", "defines.vh"), "w") as f:
+                    f.write("`define CORE\n")
+
+            toolchains = {checkout: _SourcesToolchain() for checkout in ["a", "b", "c"]}
+            for checkout, toolchain in toolchains.items():
+                _build(toolchain, os.path.join(tmp_dir, checkout, "build"), cache,
+                    sources_dir = os.path.join(tmp_dir, checkout, "src"))
+            with open(os.path.join(tmp_dir, "b", "build", "build.sh")) as f:
+                self.assertIn(os.path.join(tmp_dir, "b", "src", "core.v"), f.read())
+
+        self.assertEqual(toolchains["a"].run_calls, ["build.sh"])
+        self.assertEqual(toolchains["b"].run_calls, [])
+        # Different source contents: cache miss.
+        self.assertEqual(toolchains["c"].run_calls, ["build.sh"])
+
+
+if __name__ == "__main__":
+    unittest.main()
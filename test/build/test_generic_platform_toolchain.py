@@ -23,6 +23,7 @@ from litex.build.generic_platform import (
     PlatformInfo,
     Subsignal,
 )
+from litex.build import tools
 from litex.build.gowin.gowin import _build_cst
 from litex.build.generic_toolchain import GenericToolchain
 
@@ -544,6 +545,112 @@ class TestGenericToolchain(unittest.TestCase):
 
         self.assertEqual(toolchain.run_calls, ["build.sh"])
 
+    def _build_with_bitstream(self, toolchain, build_dir, dut_factory, **kwargs):
+        platform = _make_platform(io=[])
+        platform._bitstream_ext = ".bit"
+        platform.toolchain = toolchain
+        toolchain.build(platform, dut_factory(), build_dir=build_dir, run=True, **kwargs)
+        open(os.path.join(build_dir, "top.bit"), "w").close()
+        return platform
+
+    def test_build_skips_run_script_when_inputs_are_unchanged(self):
+        def dut_factory():
+            dut = Module()
+            dut.clock_domains.cd_sys = ClockDomain("sys")
+            return dut
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            first  = _DummyToolchain()
+            second = _DummyToolchain()
+            forced = _DummyToolchain()
+            self._build_with_bitstream(first,  build_dir, dut_factory)
+            self._build_with_bitstream(second, build_dir, dut_factory)
+            self._build_with_bitstream(forced, build_dir, dut_factory, force_rebuild=True)
+
+            self._assert_cwd_restored()
+            self.assertTrue(os.path.exists(os.path.join(build_dir, "top.inputs.json")))
+
+        self.assertEqual(first.run_calls,  ["build.sh"])
+        self.assertEqual(second.run_calls, [])
+        self.assertEqual(second.script_calls, 1)
+        self.assertEqual(forced.run_calls, ["build.sh"])
+
+    def test_build_reruns_script_when_inputs_change_or_bitstream_is_missing(self):
+        def dut_factory(width):
+            def factory():
+                dut = Module()
+                dut.clock_domains.cd_sys = ClockDomain("sys")
+                counter = Signal(width)
+                dut.sync += counter.eq(counter + 1)
+                return dut
+            return factory
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            first   = _DummyToolchain()
+            changed = _DummyToolchain()
+            missing = _DummyToolchain()
+            self._build_with_bitstream(first,   build_dir, dut_factory(4))
+            self._build_with_bitstream(changed, build_dir, dut_factory(8))
+            os.remove(os.path.join(build_dir, "top.bit"))
+            self._build_with_bitstream(missing, build_dir, dut_factory(8))
+
+        self.assertEqual(first.run_calls,   ["build.sh"])
+        self.assertEqual(changed.run_calls, ["build.sh"])
+        self.assertEqual(missing.run_calls, ["build.sh"])
+
+    def _build_soc_with_bitstream(self, toolchain, build_dir, epoch, **kwargs):
+        from litex.soc.integration.soc_core import SoCCore
+        platform = GenericPlatform(device="unit-device", io=[("clk", 0, Pins("A1"))], name="unit_platform")
+        platform._bitstream_ext     = ".bit"
+        platform.default_clk_name   = "clk"
+        platform.default_clk_period = 10
+        platform.toolchain = toolchain
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": str(epoch)}):
+            soc = SoCCore(platform, clk_freq=100e6, cpu_type=None, with_uart=False, with_timer=False, **kwargs)
+            toolchain.build(platform, soc, build_dir=build_dir, run=True)
+        open(os.path.join(build_dir, "top.bit"), "w").close()
+
+    def test_build_skips_run_script_with_identifier_build_time(self):
+        # The identifier build time (default ident_version) changes on each build but is not an input change.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            first  = _DummyToolchain()
+            second = _DummyToolchain()
+            self._build_soc_with_bitstream(first,  build_dir, epoch=1000000000, ident="Unit SoC", ident_version=True)
+            self._build_soc_with_bitstream(second, build_dir, epoch=1000003600, ident="Unit SoC", ident_version=True)
+            with open(os.path.join(build_dir, "top_mem.init")) as f:
+                self.assertIn("".join(f"{c:02x}\n" for c in b"2001-09-09"), f.read())
+
+        self.assertEqual(first.run_calls,  ["build.sh"])
+        self.assertEqual(second.run_calls, [])
+
+    def test_build_reruns_script_when_dates_in_inputs_change(self):
+        # Only the date of the generated files banner is ignored.
+        class _ProjectToolchain(_DummyToolchain):
+            def build_project(self):
+                tools.write_to_file("top.prj", tools.generated_banner("#") + f"set_option {self._synth_opts}\n")
+
+        def dut_factory():
+            dut = Module()
+            dut.clock_domains.cd_sys = ClockDomain("sys")
+            return dut
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            build_dir = os.path.join(tmp_dir, "build")
+            first   = _ProjectToolchain()
+            same    = _ProjectToolchain()
+            changed = _ProjectToolchain()
+            self._build_with_bitstream(first,   build_dir, dut_factory, synth_opts="-date 2026-01-01 00:00:00")
+            with mock.patch("time.time", return_value=2e9):
+                self._build_with_bitstream(same, build_dir, dut_factory, synth_opts="-date 2026-01-01 00:00:00")
+            self._build_with_bitstream(changed, build_dir, dut_factory, synth_opts="-date 2026-01-02 00:00:00")
+
+        self.assertEqual(first.run_calls,   ["build.sh"])
+        self.assertEqual(same.run_calls,    [])
+        self.assertEqual(changed.run_calls, ["build.sh"])
+
     def test_build_restores_cwd_when_finalize_fails(self):
         platform  = _make_platform(io=[])
         toolchain = _DummyToolchain()
@@ -0,0 +1,160 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import LiteXModule
+from litex.gen.sim import run_simulation
+from litex.gen.sim.verification import *
+
+from litex.soc.interconnect import stream, wishbone
+from litex.soc.interconnect.axi import AXIInterface, AXILiteInterface, AXISRAM, AXILiteSRAM, RESP_OKAY
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def fifo_layout():
+    return stream.EndpointDescription(
+        payload_layout = [("data", 8)],
+        param_layout   = [("tag",  4)],
+    )
+
+# Stream -------------------------------------------------------------------------------------------
+
+class TestStreamVerification(unittest.TestCase):
+    def test_driver_monitor_scoreboard(self):
+        packets    = [[(i*16 + j) & 0xff for j in range(1 + i%5)] for i in range(16)]
+        dut        = stream.SyncFIFO(fifo_layout(), depth=4)
+        scoreboard = Scoreboard()
+        driver     = StreamDriver(dut.sink, valid_rand=50)
+        monitor    = StreamMonitor(dut.source, ready_rand=50, callback=scoreboard.observe)
+        for i, datas in enumerate(packets):
+            driver.send_packet(datas, tag=i%16)
+            for j, data in enumerate(datas):
+                scoreboard.expect({"data": data, "tag": i%16, "first": int(j == 0), "last": int(j == len(datas) - 1)})
+
+        run_simulation(dut, [driver.generator(), monitor.generator(count=len(scoreboard.expected))])
+        scoreboard.check()
+        self.assertEqual([[beat["data"] for beat in packet] for packet in monitor.packets], packets)
+        self.assertEqual(len(driver.sent), sum(len(datas) for datas in packets))
+
+    def test_monitor_count(self):
+        dut     = stream.SyncFIFO(fifo_layout(), depth=2)
+        driver  = StreamDriver(dut.sink)
+        monitor = StreamMonitor(dut.source, ready_rand=75, fields=["data"])
+        for i in range(32):
+            driver.send(data=i)
+
+        run_simulation(dut, [driver.generator(), monitor.generator(count=32)])
+        self.assertEqual(monitor.beats, [{"data": i} for i in range(32)])
+
+    def test_driver_unknown_field(self):
+        with self.assertRaises(ValueError):
+            StreamDriver(stream.Endpoint(fifo_layout())).send(length=4)
+
+    def test_scoreboard(self):
+        scoreboard = Scoreboard()
+        scoreboard.expect_all([1, 2, 3])
+        for item in [1, 2, 3]:
+            scoreboard.observe(item)
+        scoreboard.check()
+        self.assertEqual(scoreboard.matched, 3)
+
+        scoreboard = Scoreboard()
+        scoreboard.expect_all([1, 2])
+        scoreboard.observe(2)
+        with self.assertRaises(AssertionError):
+            scoreboard.check()
+
+        scoreboard = Scoreboard(ordered=False)
+        scoreboard.expect_all([{"data": 1}, {"data": 2}])
+        scoreboard.observe({"data": 2, "last": 1})
+        self.assertFalse(scoreboard.done)
+        scoreboard.observe({"data": 1, "last": 0})
+        self.assertTrue(scoreboard.done)
+        scoreboard.observe({"data": 3})
+        with self.assertRaises(AssertionError):
+            scoreboard.check()
+
+# Bus Masters --------------------------------------------------------------------------------------
+
+class TestBusVerification(unittest.TestCase):
+    def test_wishbone_master(self):
+        for pipelined in [False, True]:
+            class DUT(LiteXModule):
+                def __init__(self):
+                    self.bus  = wishbone.Interface(data_width=32, address_width=32, pipelined=pipelined)
+                    self.sram = wishbone.SRAM(0x100, bus=self.bus)
+
+            dut    = DUT()
+            master = WishboneMaster(dut.bus)
+            def generator():
+                for i in range(16):
+                    yield from master.write(i, 0x0100_0000*i + i)
+                yield from master.write(3, 0xdead_beef, sel=0b0011)
+                for i in range(16):
+                    expected = (0x0300_beef if i == 3 else 0x0100_0000*i + i)
+                    self.assertEqual((yield from master.read(i)), expected)
+
+            run_simulation(dut, generator())
+
+    def test_wishbone_master_bus_error(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.bus = wishbone.Interface(data_width=32, address_width=32)
+                self.comb += self.bus.err.eq(self.bus.cyc & self.bus.stb)
+
+        dut    = DUT()
+        master = WishboneMaster(dut.bus)
+        errors = []
+        def generator():
+            try:
+                yield from master.read(0)
+            except ValueError:
+                errors.append(True)
+
+        run_simulation(dut, generator())
+        self.assertEqual(errors, [True])
+
+    def test_axi_lite_master(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.bus  = AXILiteInterface(data_width=32, address_width=32)
+                self.sram = AXILiteSRAM(0x100, bus=self.bus)
+
+        dut    = DUT()
+        master = AXIMaster(dut.bus, ready_rand=50)
+        def generator():
+            for i in range(16):
+                self.assertEqual((yield from master.write(4*i, 0x1000 + i)), RESP_OKAY)
+            for i in range(16):
+                self.assertEqual((yield from master.read(4*i)), (0x1000 + i, RESP_OKAY))
+
+        run_simulation(dut, generator())
+        with self.assertRaises(ValueError):
+            list(master.read_burst(0, 4))
+
+    def test_axi_master_bursts(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.bus  = AXIInterface(data_width=32, address_width=32, id_width=4)
+                self.sram = AXISRAM(0x100, bus=self.bus)
+
+        dut    = DUT()
+        master = AXIMaster(dut.bus, ready_rand=25)
+        datas  = [0x2000 + i for i in range(8)]
+        def generator():
+            self.assertEqual((yield from master.write_burst(0x20, datas, id=3)), RESP_OKAY)
+            self.assertEqual((yield from master.read_burst(0x20, len(datas), id=3)), (datas, RESP_OKAY))
+            self.assertEqual((yield from master.write(0x04, 0xcafe_f00d)), RESP_OKAY)
+            self.assertEqual((yield from master.read(0x04)), (0xcafe_f00d, RESP_OKAY))
+
+        run_simulation(dut, generator())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
+import os
 import re
+import tempfile
 import unittest
 
 from migen import *
@@ -155,6 +157,30 @@ class TestVerilog(unittest.TestCase):
         self.assertIn("assign address = 32'h80000000;", v)
         self.assertIn("assign mask = 16'hffff;", v)
 
+    def test_output_file_streams_main_source(self):
+        def strip_dates(v):
+            return re.sub(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "", v)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dut     = _SyncOutput()
+            ref     = convert(dut, ios={dut.clk, dut.i, dut.o}, name="top").main_source
+            v_file  = os.path.join(tmp_dir, "top.v")
+            dut     = _SyncOutput()
+            r       = convert(dut, ios={dut.clk, dut.i, dut.o}, name="top", output_file=v_file)
+
+            # Main source is already streamed to output_file before write.
+            with open(v_file) as f:
+                streamed = f.read()
+            self.assertEqual(strip_dates(streamed), strip_dates(ref))
+            self.assertEqual(r.main_source, streamed)
+
+            r.write(v_file)
+            r.write(os.path.join(tmp_dir, "copy.v"))
+            with open(v_file) as f:
+                self.assertEqual(f.read(), streamed)
+            with open(os.path.join(tmp_dir, "copy.v")) as f:
+                self.assertEqual(f.read(), streamed)
+
 
 if __name__ == "__main__":
     unittest.main()
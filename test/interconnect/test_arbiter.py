@@ -0,0 +1,128 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+from migen.genlib.roundrobin import RoundRobin, SP_CE, SP_WITHDRAW
+
+from litex.gen.genlib.arbiter import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def grants_sequence(arbiter, request, cycles):
+    """Keep `request` asserted, pulse ce on each cycle and return the sequence of grants."""
+    grants = []
+    def gen():
+        yield arbiter.request.eq(request)
+        yield arbiter.ce.eq(1)
+        yield
+        for i in range(cycles):
+            yield
+            grants.append((yield arbiter.grant))
+    run_simulation(arbiter, gen())
+    return grants
+
+# Arbiter ------------------------------------------------------------------------------------------
+
+class TestArbiter(unittest.TestCase):
+    def test_priority_grants_highest_priority(self):
+        arbiter = PriorityArbiter(3, priorities=[0, 2, 1], switch_policy=SP_CE)
+        self.assertEqual(set(grants_sequence(arbiter, 0b111, 8)), {1})
+        arbiter = PriorityArbiter(3, priorities=[0, 2, 1], switch_policy=SP_CE)
+        self.assertEqual(set(grants_sequence(arbiter, 0b101, 8)), {2})
+
+    def test_priority_withdraw_keeps_grant(self):
+        arbiter = PriorityArbiter(2, priorities=[0, 1])
+        grants  = []
+        def gen():
+            yield arbiter.request.eq(0b01)
+            yield
+            yield
+            # Higher priority requester can't preempt the current one.
+            yield arbiter.request.eq(0b11)
+            for i in range(4):
+                yield
+                grants.append((yield arbiter.grant))
+            yield arbiter.request.eq(0b10)
+            yield
+            yield
+            grants.append((yield arbiter.grant))
+        run_simulation(arbiter, gen())
+        self.assertEqual(grants, [0, 0, 0, 0, 1])
+
+    def test_weighted_round_robin_ratio(self):
+        arbiter = WeightedRoundRobin(2, weights=[3, 1], switch_policy=SP_CE)
+        grants  = grants_sequence(arbiter, 0b11, 40)
+        self.assertEqual(grants.count(0), 30)
+        self.assertEqual(grants.count(1), 10)
+
+    def test_weighted_round_robin_single_requester(self):
+        arbiter = WeightedRoundRobin(3, weights=[1, 4, 2], switch_policy=SP_CE)
+        self.assertEqual(set(grants_sequence(arbiter, 0b100, 16)), {2})
+
+    def test_qos_grants_highest_qos(self):
+        arbiter = QoSArbiter(2, aging=1024, switch_policy=SP_CE)
+        grants  = []
+        def gen():
+            yield arbiter.qos[0].eq(2)
+            yield arbiter.qos[1].eq(7)
+            yield arbiter.request.eq(0b11)
+            yield arbiter.ce.eq(1)
+            yield
+            for i in range(8):
+                yield
+                grants.append((yield arbiter.grant))
+        run_simulation(arbiter, gen())
+        self.assertEqual(set(grants), {1})
+
+    def test_qos_floor(self):
+        arbiter = QoSArbiter(2, floors=[5, 0], aging=1024, switch_policy=SP_CE)
+        grants  = []
+        def gen():
+            yield arbiter.qos[1].eq(3)
+            yield arbiter.request.eq(0b11)
+            yield arbiter.ce.eq(1)
+            yield
+            for i in range(8):
+                yield
+                grants.append((yield arbiter.grant))
+        run_simulation(arbiter, gen())
+        self.assertEqual(set(grants), {0})
+
+    def test_qos_aging_avoids_starvation(self):
+        arbiter = QoSArbiter(2, aging=2, switch_policy=SP_CE)
+        grants  = []
+        def gen():
+            yield arbiter.qos[0].eq(0)
+            yield arbiter.qos[1].eq(4)
+            yield arbiter.request.eq(0b11)
+            yield arbiter.ce.eq(1)
+            yield
+            for i in range(64):
+                yield
+                grants.append((yield arbiter.grant))
+        run_simulation(arbiter, gen())
+        self.assertIn(0, grants)
+        self.assertGreater(grants.count(1), grants.count(0))
+
+    def test_get_arbiter(self):
+        self.assertIsInstance(get_arbiter(2),                            RoundRobin)
+        self.assertIsInstance(get_arbiter(2, "priority"),                PriorityArbiter)
+        self.assertIsInstance(get_arbiter(2, "weighted", SP_CE, [1, 2]), WeightedRoundRobin)
+        self.assertIsInstance(get_arbiter(2, "qos", SP_CE, [None, 3]),   QoSArbiter)
+        with self.assertRaises(ValueError):
+            get_arbiter(2, "lottery")
+        with self.assertRaises(ValueError):
+            get_arbiter(2, "weighted", SP_CE, [0, 1])
+        with self.assertRaises(ValueError):
+            get_arbiter(2, "priority", SP_CE, [1])
+        with self.assertRaises(ValueError):
+            get_arbiter(2, "qos", SP_CE, [16, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
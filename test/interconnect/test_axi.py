@@ -1256,6 +1256,24 @@ class TestAXI(unittest.TestCase):
         for i, b in enumerate(log[7][5]):
             self.assertEqual(results[7][i], b, "slot 7 INCR-4 (after FIXED) cell mismatch")
 
+    def test_register_slice(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.master = AXIInterface(data_width=32, address_width=32, id_width=4)
+                self.slave  = AXIInterface(data_width=32, address_width=32, id_width=4)
+                self.rs     = AXIRegisterSlice(self.master, self.slave, stages=2)
+                self.sram   = AXISRAM(0x100, bus=self.slave)
+
+        beats = [0x1000_0000 + i for i in range(8)]
+        def generator(dut):
+            self.assertEqual((yield from axi_write_burst(dut.master, 0x20, beats)), RESP_OKAY)
+            self.assertEqual((yield from axi_read_burst(dut.master, 0x20, len(beats))), beats)
+            self.assertEqual((yield from axi_write_single(dut.master, 0x04, 0xcafe_f00d)), RESP_OKAY)
+            self.assertEqual((yield from axi_read_single(dut.master, 0x04)), (0xcafe_f00d, RESP_OKAY))
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut)])
+
     # AXISRAM helper: builds a DUT with a 32-bit AXI bus and runs the supplied generator.
     def _axisram_run(self, generator, size=64*4, init=None, data_width=32):
         class DUT(LiteXModule):
@@ -1420,3 +1438,221 @@ class TestAXI(unittest.TestCase):
 
         dut = self._axisram_run(gen, size=64 * 8, data_width=64)
         self.assertEqual(dut.errors, 0)
+
+# AXI ID Arbiter -----------------------------------------------------------------------------------
+
+@passive
+def axi_pipelined_read_slave(axi, accepted, latency=8):
+    """Passive AXI read slave accepting one AR per cycle and returning in-order responses
+    (data = address) after `latency` cycles."""
+    queue = []
+    cycle = 0
+    yield axi.ar.ready.eq(1)
+    while True:
+        # Current cycle handshakes.
+        if (yield axi.r.valid) and (yield axi.r.ready):
+            ready_cycle, id, addr, length = queue[0]
+            if length == 0:
+                queue.pop(0)
+            else:
+                queue[0] = (ready_cycle, id, addr + 4, length - 1)
+        if (yield axi.ar.valid):
+            accepted.append((cycle, (yield axi.ar.id)))
+            queue.append((cycle + latency, (yield axi.ar.id), (yield axi.ar.addr), (yield axi.ar.len)))
+        # Next cycle response.
+        if queue and queue[0][0] <= cycle:
+            _, id, addr, length = queue[0]
+            yield axi.r.valid.eq(1)
+            yield axi.r.id.eq(id)
+            yield axi.r.data.eq(addr)
+            yield axi.r.last.eq(length == 0)
+        else:
+            yield axi.r.valid.eq(0)
+        yield
+        cycle += 1
+
+class TestAXIIDArbiter(unittest.TestCase):
+    def read_overlap_test(self, target_id_width):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0     = AXIInterface(data_width=32, address_width=32, id_width=2)
+                self.m1     = AXIInterface(data_width=32, address_width=32, id_width=2)
+                self.target = AXIInterface(data_width=32, address_width=32, id_width=target_id_width)
+                self.arbiter = AXIIDArbiter([self.m0, self.m1], self.target)
+
+        dut      = DUT()
+        accepted = []
+        results  = {}
+
+        def master(m, name, addr, id):
+            yield m.r.ready.eq(1)
+            yield from axi_ar_send(m, addr, burst_len=3, id=id)
+            datas = []
+            while len(datas) < 4:
+                if (yield m.r.valid):
+                    datas.append(((yield m.r.data), (yield m.r.id)))
+                yield
+            results[name] = datas
+
+        run_simulation(dut, [
+            master(dut.m0, "m0", 0x100, 2),
+            master(dut.m1, "m1", 0x200, 3),
+            axi_pipelined_read_slave(dut.target, accepted),
+        ])
+        # Both address phases accepted before the first response (grant not locked).
+        self.assertEqual(len(accepted), 2)
+        self.assertLess(accepted[1][0], accepted[0][0] + 8)
+        self.assertEqual(results["m0"], [(0x100 + 4*i, 2) for i in range(4)])
+        self.assertEqual(results["m1"], [(0x200 + 4*i, 3) for i in range(4)])
+        return dut
+
+    def test_read_overlap_prefixed_ids(self):
+        dut = self.read_overlap_test(target_id_width=3)
+        self.assertEqual(dut.arbiter.id_mode, "prefix")
+
+    def test_read_overlap_remapped_ids(self):
+        dut = self.read_overlap_test(target_id_width=1)
+        self.assertEqual(dut.arbiter.id_mode, "remap")
+
+    def test_rejects_too_small_target_id(self):
+        masters = [AXIInterface(data_width=32, address_width=32) for _ in range(3)]
+        with self.assertRaises(ValueError):
+            AXIIDArbiter(masters, AXIInterface(data_width=32, address_width=32, id_width=1))
+
+    def interconnect_writes_then_reads_test(self, interconnect_cls):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0 = AXIInterface(data_width=32, address_width=32, id_width=1)
+                self.m1 = AXIInterface(data_width=32, address_width=32, id_width=1)
+                s0      = AXIInterface(data_width=32, address_width=32, id_width=2)
+                s1      = AXIInterface(data_width=32, address_width=32, id_width=2)
+                self.sram0 = AXISRAM(256, bus=s0)
+                self.sram1 = AXISRAM(256, bus=s1)
+                self.interconnect = interconnect_cls(
+                    masters = [self.m0, self.m1],
+                    slaves  = [
+                        (lambda a: a[8] == 0, s0),
+                        (lambda a: a[8] == 1, s1),
+                    ],
+                    arbiter = "id",
+                )
+
+        dut    = DUT()
+        errors = []
+
+        def master(m, bases):
+            for base in bases:
+                beats = [base + i for i in range(4)]
+                resp  = yield from axi_write_burst(m, base, beats)
+                if resp != RESP_OKAY:
+                    errors.append((base, resp))
+            for base in bases:
+                datas = yield from axi_read_burst(m, base, 4)
+                if datas != [base + i for i in range(4)]:
+                    errors.append((base, datas))
+
+        run_simulation(dut, [
+            master(dut.m0, [0x000, 0x400, 0x040]),
+            master(dut.m1, [0x020, 0x420, 0x460]),
+        ])
+        self.assertEqual(errors, [])
+
+    def test_interconnect_shared_writes_then_reads(self):
+        self.interconnect_writes_then_reads_test(AXIInterconnectShared)
+
+    def test_crossbar_writes_then_reads(self):
+        self.interconnect_writes_then_reads_test(AXICrossbar)
+
+    def test_interconnect_shared_rejects_unknown_arbiter(self):
+        with self.assertRaises(ValueError):
+            AXIInterconnectShared(
+                masters = [AXIInterface()],
+                slaves  = [(lambda a: 1, AXIInterface())],
+                arbiter = "transaction",
+            )
+
+# TestAXIArbiterPolicies ---------------------------------------------------------------------------
+
+class TestAXIArbiterPolicies(unittest.TestCase):
+    def qos_read_order_test(self, policy, priorities=None, qos=(0, 0)):
+        # Both masters issue back-to-back reads; return the order of the accepted masters.
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0     = AXIInterface(data_width=32, address_width=32, id_width=1)
+                self.m1     = AXIInterface(data_width=32, address_width=32, id_width=1)
+                self.target = AXIInterface(data_width=32, address_width=32, id_width=1)
+                self.arbiter = AXIIDArbiter([self.m0, self.m1], self.target,
+                    policy     = policy,
+                    priorities = priorities,
+                )
+
+        dut      = DUT()
+        accepted = []
+
+        def master(m, addr, qos):
+            yield m.r.ready.eq(1)
+            yield m.ar.qos.eq(qos)
+            for i in range(4):
+                yield from axi_ar_send(m, addr + 16*i)
+            for i in range(32):
+                yield
+
+        run_simulation(dut, [
+            master(dut.m0, 0x100, qos[0]),
+            master(dut.m1, 0x200, qos[1]),
+            axi_pipelined_read_slave(dut.target, accepted),
+        ])
+        return [index for _, index in accepted]
+
+    def test_round_robin_alternates(self):
+        self.assertEqual(self.qos_read_order_test("round-robin"), [0, 1, 0, 1, 0, 1, 0, 1])
+
+    def test_qos_serves_high_qos_master_first(self):
+        # m0 is granted at reset, m1 (higher QoS) then wins each arbitration.
+        order = self.qos_read_order_test("qos", qos=(0, 8))
+        self.assertEqual(order, [0, 1, 1, 1, 1, 0, 0, 0])
+
+    def test_qos_uses_static_priorities_as_floor(self):
+        order = self.qos_read_order_test("qos", priorities=[0, 8])
+        self.assertEqual(order, [0, 1, 1, 1, 1, 0, 0, 0])
+
+    def test_priority_policy(self):
+        order = self.qos_read_order_test("priority", priorities=[0, 1])
+        self.assertEqual(order, [0, 1, 1, 1, 1, 0, 0, 0])
+
+    def test_interconnect_policy_writes_then_reads(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0 = AXIInterface(data_width=32, address_width=32)
+                self.m1 = AXIInterface(data_width=32, address_width=32)
+                s0      = AXIInterface(data_width=32, address_width=32)
+                self.sram = AXISRAM(256, bus=s0)
+                self.interconnect = AXIInterconnectShared(
+                    masters    = [self.m0, self.m1],
+                    slaves     = [(lambda a: 1, s0)],
+                    policy     = "weighted",
+                    priorities = [2, 1],
+                )
+
+        dut    = DUT()
+        errors = []
+
+        def master(m, bases):
+            for base in bases:
+                resp = yield from axi_write_burst(m, base, [base + i for i in range(4)])
+                if resp != RESP_OKAY:
+                    errors.append((base, resp))
+            for base in bases:
+                datas = yield from axi_read_burst(m, base, 4)
+                if datas != [base + i for i in range(4)]:
+                    errors.append((base, datas))
+
+        run_simulation(dut, [
+            master(dut.m0, [0x000, 0x040]),
+            master(dut.m1, [0x020, 0x060]),
+        ])
+        self.assertEqual(errors, [])
+
+    def test_rejects_priorities_count_mismatch(self):
+        with self.assertRaises(ValueError):
+            AXIArbiter([AXIInterface(), AXIInterface()], AXIInterface(), policy="priority", priorities=[1])
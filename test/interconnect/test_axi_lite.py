@@ -360,6 +360,39 @@ class TestAXILite(unittest.TestCase):
         run_simulation(dut, [generator(dut), csr_mem_handler(dut.csr, mem)])
         self.assertEqual(dut.errors, 0)
 
+    def test_axilite2csr_latency(self):
+        latency = 2
+        @passive
+        def csr_pipelined_mem_handler(csr, mem):
+            # Read data only valid (1 + latency) cycles after the read request.
+            reads = [None]*latency
+            while True:
+                reads.append((yield csr.adr) if (yield csr.re) else None)
+                adr = reads.pop(0)
+                yield csr.dat_r.eq(0 if adr is None else mem[adr])
+                if (yield csr.we):
+                    mem[(yield csr.adr)] = (yield csr.dat_w)
+                yield
+
+        class DUT(Module):
+            def __init__(self):
+                self.axi_lite = AXILiteInterface(data_width=32)
+                self.csr = csr_bus.Interface(data_width=32)
+                self.submodules.axilite2csr = AXILite2CSR(self.axi_lite, self.csr, latency=latency)
+
+        mem = [0]*16
+        def generator(dut):
+            for adr in range(16):
+                resp = (yield from dut.axi_lite.write(adr << 2, 0x100 + adr))
+                self.assertEqual(resp, RESP_OKAY)
+            for adr in reversed(range(16)):
+                data, resp = (yield from dut.axi_lite.read(adr << 2))
+                self.assertEqual(resp, RESP_OKAY)
+                self.assertEqual(data, 0x100 + adr)
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut), csr_pipelined_mem_handler(dut.csr, mem)])
+
     def test_axilite_sram(self):
         class DUT(Module):
             def __init__(self, size, init):
@@ -761,6 +794,26 @@ class TestAXILiteInterconnect(unittest.TestCase):
         self.assertEqual(checker.writes, [(addr, data, 0b1111) for rw, addr, data in pattern if rw == "w"])
         self.assertEqual(checker.reads, [(addr, data) for rw, addr, data in pattern if rw == "r"])
 
+    def test_register_slice(self):
+        class DUT(Module):
+            def __init__(self):
+                self.master = AXILiteInterface(data_width=32, address_width=32)
+                self.slave  = AXILiteInterface(data_width=32, address_width=32)
+                self.submodules.rs   = AXILiteRegisterSlice(self.master, self.slave, stages=2)
+                self.submodules.sram = AXILiteSRAM(0x100, bus=self.slave)
+
+        def generator(dut):
+            for i in range(8):
+                resp = (yield from dut.master.write(4*i, 0x1000_0000 + i))
+                self.assertEqual(resp, RESP_OKAY)
+            for i in range(8):
+                data, resp = (yield from dut.master.read(4*i))
+                self.assertEqual(resp, RESP_OKAY)
+                self.assertEqual(data, 0x1000_0000 + i)
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut), timeout_generator(1000)])
+
     def test_timeout(self):
         class DUT(Module):
             def __init__(self):
@@ -153,6 +153,41 @@ class TestBusClockDomainCrossing(unittest.TestCase):
         run_simulation(dut, {"sys": [generator(dut)]}, self.clocks)
         self.assertEqual(dut.errors, 0)
 
+    def test_wishbone_cdc_pipelined_sram_read_write(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.clock_domains.cd_periph = ClockDomain("periph")
+                self.master = wishbone.Interface(data_width=32, address_width=32, addressing="word", pipelined=True)
+                self.slave  = wishbone.Interface(data_width=32, address_width=32, addressing="word", pipelined=True)
+                self.cdc    = wishbone.ClockDomainCrossing(
+                    master  = self.master,
+                    slave   = self.slave,
+                    cd_from = "sys",
+                    cd_to   = "periph",
+                )
+                self.sram   = ClockDomainsRenamer("periph")(wishbone.SRAM(256,
+                    bus  = self.slave,
+                    init = [0x1000 + i for i in range(64)]))
+                self.errors = 0
+
+        def generator(dut):
+            for addr in range(8):
+                data = (yield from dut.master.read(addr))
+                if data != 0x1000 + addr:
+                    dut.errors += 1
+
+            for addr in range(8):
+                yield from dut.master.write(addr, 0x2000 + addr)
+
+            for addr in range(8):
+                data = (yield from dut.master.read(addr))
+                if data != 0x2000 + addr:
+                    dut.errors += 1
+
+        dut = DUT()
+        run_simulation(dut, {"sys": [generator(dut)]}, self.clocks)
+        self.assertEqual(dut.errors, 0)
+
     def test_wishbone_cdc_cancelled_cycle_discards_late_response(self):
         class DelayedWishboneSlave(LiteXModule):
             def __init__(self, bus, delay=8):
@@ -137,5 +137,121 @@ class TestCSRBusInterconnect(unittest.TestCase):
         run_simulation(dut, gen())
 
 
+# Split Interconnect -------------------------------------------------------------------------------
+
+class _SplitDUT(Module):
+    """Banks spread over the CSR locations behind a split CSR Interconnect."""
+    LOCATIONS = {"moda": 0, "modb": 1, "modc": 16, "modd": 31}
+
+    def address_map(self, name, memory):
+        return self.LOCATIONS[name]
+
+    def __init__(self, segments, register, with_wishbone=False):
+        self.bus = csr_bus.Interface(data_width=32)
+        self.submodules.moda = _ModuleA()
+        self.submodules.modb = _ModuleB()
+        self.submodules.modc = _ModuleA()
+        self.submodules.modd = _ModuleB()
+        self.submodules.bankarray = csr_bus.CSRBankArray(
+            source      = self,
+            address_map = self.address_map,
+            paging      = _DUT.PAGING,
+            data_width  = 32,
+        )
+        if segments:
+            self.submodules.con = csr_bus.InterconnectSplit(
+                masters  = [self.bus],
+                slaves   = self.bankarray.get_mapped_buses(),
+                segments = segments,
+                paging   = _DUT.PAGING,
+                register = register,
+            )
+        else:
+            self.submodules.con = csr_bus.Interconnect(self.bus, self.bankarray.get_buses())
+            self.con.latency    = 0
+        if with_wishbone:
+            from litex.soc.interconnect import wishbone
+            self.wb = wishbone.Interface(data_width=32, address_width=32)
+            self.submodules.bridge = wishbone.Wishbone2CSR(self.wb, self.bus,
+                register = False,
+                latency  = self.con.latency,
+            )
+
+
+def split_bus_read(bus, adr, latency):
+    yield bus.adr.eq(adr)
+    yield bus.re.eq(1)
+    yield
+    yield bus.re.eq(0)
+    yield
+    for i in range(latency):
+        yield
+    return (yield bus.dat_r)
+
+
+class TestCSRBusInterconnectSplit(unittest.TestCase):
+    def check_split(self, segments, register):
+        dut = _SplitDUT(segments, register)
+        self.assertEqual(dut.con.latency, 2 if register else 0)
+
+        def gen():
+            for name, location in _SplitDUT.LOCATIONS.items():
+                yield from bus_write(dut.bus, csr_addr(location, 0), 0x10 + location)
+            for i in range(dut.con.latency):
+                yield
+            for name, location in _SplitDUT.LOCATIONS.items():
+                value = (yield from split_bus_read(dut.bus, csr_addr(location, 0), dut.con.latency))
+                self.assertEqual(value, 0x10 + location)
+                value = (yield from split_bus_read(dut.bus, csr_addr(location, 1), dut.con.latency))
+                self.assertEqual(value, {"moda": 0xA1, "modc": 0xA1}.get(name, 0xB1))
+
+        run_simulation(dut, gen())
+
+    def test_split_segments(self):
+        for segments in [1, 2, 4]:
+            for register in [False, True]:
+                self.check_split(segments, register)
+
+    def test_split_segments_buses(self):
+        # Empty segments do not create sub-buses.
+        self.assertEqual(len(_SplitDUT(segments=4, register=True).con.buses), 3)
+        with self.assertRaises(ValueError):
+            _SplitDUT(segments=64, register=True)
+
+    def test_split_with_wishbone_bridge(self):
+        dut = _SplitDUT(segments=2, register=True, with_wishbone=True)
+
+        def gen():
+            for name, location in _SplitDUT.LOCATIONS.items():
+                yield from dut.wb.write(csr_addr(location, 1), 0x20 + location)
+            for name, location in _SplitDUT.LOCATIONS.items():
+                self.assertEqual((yield from dut.wb.read(csr_addr(location, 1))), 0x20 + location)
+                self.assertEqual((yield from dut.wb.read(csr_addr(location, 0))),
+                    {"moda": 0xA0, "modc": 0xA0}.get(name, 0xB0))
+
+        run_simulation(dut, gen())
+
+    def test_split_read_latency(self):
+        # Wishbone read cycles through the bridge: unregistered segments do not add read latency.
+        def read_cycles(segments, register):
+            dut    = _SplitDUT(segments=segments, register=register, with_wishbone=True)
+            cycles = []
+            def gen():
+                yield dut.wb.adr.eq(csr_addr(_SplitDUT.LOCATIONS["modd"], 1))
+                yield dut.wb.cyc.eq(1)
+                yield dut.wb.stb.eq(1)
+                yield
+                cycle = 1
+                while not (yield dut.wb.ack):
+                    cycle += 1
+                    yield
+                cycles.append(cycle)
+            run_simulation(dut, gen())
+            return cycles[0]
+
+        self.assertEqual(read_cycles(segments=4, register=False), read_cycles(segments=0, register=False))
+        self.assertEqual(read_cycles(segments=4, register=True),  read_cycles(segments=0, register=False) + 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import *
+from litex.gen.genlib.decoder import TreeDecoder, logic_depth
+
+from litex.soc.interconnect import wishbone
+
+# Helpers ------------------------------------------------------------------------------------------
+
+REGIONS = [
+    (0x00, 0x40), # 0x00-0x3f.
+    (0x40, 0x20), # 0x40-0x5f.
+    (0x80, 0x10), # 0x80-0x8f.
+    (0x90, 0x10), # 0x90-0x9f.
+    (0xc0, 0x04), # 0xc0-0xc3.
+    (0xfc, 0x04), # 0xfc-0xff.
+]
+
+def expected_region(regions, address):
+    for i, (origin, size) in enumerate(regions):
+        if origin <= address < origin + size:
+            return i
+    return None
+
+
+def decode_all(decoder, address_width):
+    """Return the selected regions for all the addresses."""
+    adr      = Signal(address_width)
+    selects  = decoder.get_selects(adr)
+    selected = []
+    def generator():
+        for address in range(2**address_width):
+            yield adr.eq(address)
+            yield
+            values = []
+            for s in selects:
+                values.append((yield s))
+            selected.append([i for i, v in enumerate(values) if v])
+    run_simulation(decoder, generator())
+    return selected
+
+# Decoder ------------------------------------------------------------------------------------------
+
+class TestTreeDecoder(unittest.TestCase):
+    def test_full_decoding_is_exact(self):
+        decoder  = TreeDecoder(REGIONS, address_width=8)
+        selected = decode_all(decoder, 8)
+        for address, s in enumerate(selected):
+            expected = expected_region(REGIONS, address)
+            self.assertEqual(s, [] if expected is None else [expected], hex(address))
+
+    def test_priority_decoding_selects_one_region(self):
+        decoder  = TreeDecoder(REGIONS, address_width=8, mode="priority")
+        selected = decode_all(decoder, 8)
+        for address, s in enumerate(selected):
+            # Exactly one region selected, the right one for mapped addresses.
+            self.assertEqual(len(s), 1)
+            expected = expected_region(REGIONS, address)
+            if expected is not None:
+                self.assertEqual(s, [expected], hex(address))
+
+    def test_shared_prefixes_reduce_compared_bits(self):
+        full     = TreeDecoder(REGIONS, address_width=8)
+        priority = TreeDecoder(REGIONS, address_width=8, mode="priority")
+        flat     = sum(8 - log2_int(size) for _, size in REGIONS)
+        self.assertEqual(sum(full.flat_bits), flat)
+        self.assertLess(full.compared_bits, flat)
+        self.assertLess(priority.compared_bits, full.compared_bits)
+        self.assertLessEqual(priority.get_logic_depth()[0], full.get_logic_depth()[0])
+        self.assertIn("estimated logic depth", full.report())
+        self.assertEqual([logic_depth(n) for n in [1, 6, 7, 36, 37]], [0, 1, 2, 2, 3])
+
+    def test_parameters_checks(self):
+        with self.assertRaises(ValueError):
+            TreeDecoder([(0x00, 0x40), (0x20, 0x20)], address_width=8) # Overlap.
+        with self.assertRaises(ValueError):
+            TreeDecoder([(0x10, 0x20)], address_width=8)               # Unaligned.
+        with self.assertRaises(ValueError):
+            TreeDecoder([(0x00, 0x30)], address_width=8)               # Not a power of 2.
+        with self.assertRaises(ValueError):
+            TreeDecoder(REGIONS, address_width=8, mode="lut")
+
+    def test_registered_decoder_on_wishbone_interconnect(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.master  = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.srams   = [wishbone.SRAM(0x40) for _ in range(3)]
+                self.decoder = TreeDecoder([(0x000, 0x10), (0x100, 0x10), (0x200, 0x10)],
+                    address_width = 30,
+                    register      = True,
+                )
+                self.submodules += self.srams
+                self.interconnect = wishbone.InterconnectShared(
+                    masters = [self.master],
+                    slaves  = list(zip(self.decoder.get_decoders(), [s.bus for s in self.srams])),
+                )
+
+        dut = DUT()
+        def generator():
+            for i in range(3):
+                for j in range(4):
+                    yield from dut.master.write(0x100*i + j, 0x1000*i + j)
+            for i in range(3):
+                for j in range(4):
+                    self.assertEqual((yield from dut.master.read(0x100*i + j)), 0x1000*i + j)
+        run_simulation(dut, generator())
+
+
+if __name__ == "__main__":
+    unittest.main()
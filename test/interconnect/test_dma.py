@@ -12,7 +12,11 @@ from litex.gen import *
 
 from litex.soc.interconnect import wishbone
 from litex.soc.interconnect import stream
+from litex.soc.interconnect import axi
 from litex.soc.cores.dma import WishboneDMAReader, WishboneDMAWriter
+from litex.soc.cores.dma import WishboneSGDMAReader, WishboneSGDMAWriter
+from litex.soc.cores.dma import AXIDMAReader, AXIDMAWriter
+from litex.soc.cores.dma import SGDMA_LAST, SGDMA_IRQ, SGDMA_OWN
 
 
 # Helpers ------------------------------------------------------------------------------------------
@@ -437,5 +441,384 @@ class TestDMAWriter(unittest.TestCase):
         self.assertEqual([v for _, v in captures], payload)
 
 
+# Pipelined DMA ------------------------------------------------------------------------------------
+
+class _PipelinedDUT(LiteXModule):
+    def __init__(self, dma_cls):
+        self.bus  = wishbone.Interface(data_width=32, address_width=32, addressing="word", pipelined=True)
+        self.sram = wishbone.SRAM(256, bus=self.bus)
+        self.dma  = dma_cls(bus=self.bus, endianness="big")
+        self.dma.add_ctrl()
+
+
+class TestDMAPipelined(unittest.TestCase):
+    def test_writer_then_reader_back_to_back(self):
+        payload = [0x1000_0000 + i for i in range(16)]
+        outputs = []
+        issued  = []
+
+        writer = _PipelinedDUT(WishboneDMAWriter)
+        def write_driver(dut):
+            yield dut.dma.base.eq(0x20)
+            yield dut.dma.length.eq(len(payload)*4)
+            yield dut.dma.enable.eq(1)
+            for _ in range(4):
+                yield
+            for word in payload:
+                yield dut.dma.sink.data.eq(word)
+                yield dut.dma.sink.valid.eq(1)
+                yield
+                while not (yield dut.dma.sink.ready):
+                    yield
+            yield dut.dma.sink.valid.eq(0)
+            timeout = 0
+            while not (yield dut.dma.done):
+                yield
+                timeout += 1
+                self.assertLess(timeout, 200, "DMA writer never signalled done")
+            for i, word in enumerate(payload):
+                self.assertEqual((yield dut.sram.mem[8 + i]), word)
+        run_simulation(writer, write_driver(writer))
+
+        reader = _PipelinedDUT(WishboneDMAReader)
+        reader.sram.mem.init = [0]*8 + payload
+        def read_driver(dut):
+            yield dut.dma.base.eq(0x20)
+            yield dut.dma.length.eq(len(payload)*4)
+            yield dut.dma.source.ready.eq(1)
+            yield dut.dma.enable.eq(1)
+            timeout = 0
+            while len(outputs) < len(payload):
+                if (yield dut.bus.stb) and not (yield dut.bus.stall):
+                    issued.append((timeout, (yield dut.bus.adr)))
+                if (yield dut.dma.source.valid):
+                    outputs.append((yield dut.dma.source.data))
+                yield
+                timeout += 1
+                self.assertLess(timeout, 200, "DMA reader stalled")
+        run_simulation(reader, read_driver(reader))
+        self.assertEqual(outputs, payload)
+        # One read request per cycle: requests are not waiting for the previous ack.
+        cycles, adrs = zip(*issued)
+        self.assertEqual(list(adrs), list(range(8, 8 + len(payload))))
+        self.assertEqual(list(cycles), list(range(cycles[0], cycles[0] + len(payload))))
+
+
+# Scatter-Gather DMA -------------------------------------------------------------------------------
+
+@passive
+def wb_mem_slave(bus, mem, bus_cycles=None):
+    """Passive Wishbone read/write slave on a word-addressed dict memory."""
+    while True:
+        yield bus.ack.eq(0)
+        yield
+        if (yield bus.cyc) and (yield bus.stb):
+            adr = (yield bus.adr)
+            if bus_cycles is not None:
+                bus_cycles.append((adr, (yield bus.we), (yield bus.cti)))
+            if (yield bus.we):
+                mem[adr] = (yield bus.dat_w)
+            else:
+                yield bus.dat_r.eq(mem.get(adr, 0))
+            yield bus.ack.eq(1)
+            yield
+
+
+def sg_descriptors(mem, base, buffers, flags=SGDMA_OWN, ring=False):
+    """Write a descriptors list in mem (buffers: [(address, length, flags)]), return addresses."""
+    addresses = [base + 16*i for i in range(len(buffers))]
+    for i, (address, length, extra) in enumerate(buffers):
+        next = addresses[(i + 1) % len(buffers)] if (ring or i < len(buffers) - 1) else 0
+        mem[addresses[i]//4 + 0] = address
+        mem[addresses[i]//4 + 1] = length | flags | extra
+        mem[addresses[i]//4 + 2] = next
+    return addresses
+
+
+class _SGDUT(LiteXModule):
+    def __init__(self, cls, bursting=False, **kwargs):
+        self.bus = make_bus(bursting=bursting)
+        self.dma = cls(self.bus, with_byteswap=False, **kwargs)
+
+
+class TestSGDMA(unittest.TestCase):
+    def sg_read(self, dut, mem, count, kicks=None, bus_cycles=None, cycles=4000):
+        outputs = []
+        irqs    = []
+        def driver(dut):
+            yield dut.dma.base.eq(0x1000)
+            yield dut.dma.source.ready.eq(1)
+            yield dut.dma.enable.eq(1)
+            for i in range(cycles):
+                if (yield dut.dma.source.valid):
+                    outputs.append(((yield dut.dma.source.data), (yield dut.dma.source.last)))
+                if (yield dut.dma.irq):
+                    irqs.append(i)
+                if kicks is not None and i in kicks:
+                    kicks[i]()
+                    yield dut.dma.kick.eq(1)
+                    yield
+                    yield dut.dma.kick.eq(0)
+                yield
+                if count is not None and len(outputs) == count and (yield dut.dma.idle):
+                    break
+        run_simulation(dut, [driver(dut), wb_mem_slave(dut.bus, mem, bus_cycles)])
+        return outputs, irqs
+
+    def test_reader_linked_list(self):
+        mem = {0x100 + i: 0x100 + i for i in range(16)}
+        mem.update({0x200 + i: 0x200 + i for i in range(16)})
+        descs = sg_descriptors(mem, 0x1000, [
+            (0x400, 3*4, 0),
+            (0x800, 2*4, SGDMA_LAST),
+        ])
+        dut = _SGDUT(WishboneSGDMAReader)
+        outputs, _ = self.sg_read(dut, mem, 5)
+        self.assertEqual(outputs, [(0x100, 0), (0x101, 0), (0x102, 0), (0x200, 0), (0x201, 1)])
+        # Descriptors given back to software with the transferred length.
+        self.assertEqual(mem[descs[0]//4 + 1], 3*4)
+        self.assertEqual(mem[descs[1]//4 + 1], 2*4 | SGDMA_LAST)
+
+    def test_reader_ring_waits_on_not_owned_descriptor_until_kick(self):
+        mem   = {0x100 + i: i for i in range(32)}
+        descs = sg_descriptors(mem, 0x1000, [(0x400 + 8*i, 8, SGDMA_LAST) for i in range(4)], ring=True)
+        # Give only the first two descriptors to the DMA.
+        for d in descs[2:]:
+            mem[d//4 + 1] &= ~SGDMA_OWN
+        def give():
+            for d in descs[2:]:
+                mem[d//4 + 1] |= SGDMA_OWN
+        dut = _SGDUT(WishboneSGDMAReader)
+        outputs, _ = self.sg_read(dut, mem, 8, kicks={400: give})
+        self.assertEqual([d for d, _ in outputs], list(range(8)))
+        for d in descs:
+            self.assertEqual(mem[d//4 + 1] & SGDMA_OWN, 0)
+
+    def test_reader_ring_processes_in_flight_descriptors_once(self):
+        mem   = {0x100 + i: i for i in range(8)}
+        descs = sg_descriptors(mem, 0x1000, [(0x400 + 16*i, 16, SGDMA_LAST) for i in range(2)], ring=True)
+        bus_cycles = []
+        dut = _SGDUT(WishboneSGDMAReader)
+        # Run for a fixed duration: the ring must not be processed again once given back.
+        outputs, _ = self.sg_read(dut, mem, None, bus_cycles=bus_cycles, cycles=600)
+        self.assertEqual([d for d, _ in outputs], list(range(8)))
+        writebacks = [adr for adr, we, _ in bus_cycles if we]
+        self.assertEqual(writebacks, [d//4 + 1 for d in descs])
+        for d in descs:
+            self.assertEqual(mem[d//4 + 1], 16 | SGDMA_LAST)
+
+    def test_reader_irq_coalescing(self):
+        mem   = {0x100 + i: i for i in range(8)}
+        sg_descriptors(mem, 0x1000, [(0x400 + 4*i, 4, SGDMA_IRQ) for i in range(8)])
+        for irq_count, expected in [(1, 8), (4, 2), (0, 0)]:
+            dut = _SGDUT(WishboneSGDMAReader)
+            dut.comb += dut.dma.irq_count.eq(irq_count)
+            outputs, irqs = self.sg_read(dut, dict(mem), 8)
+            self.assertEqual(len(outputs), 8)
+            self.assertEqual(len(irqs), expected)
+
+    def test_reader_irq_timeout(self):
+        mem = {0x100: 0}
+        sg_descriptors(mem, 0x1000, [(0x400, 4, SGDMA_IRQ)])
+        dut = _SGDUT(WishboneSGDMAReader)
+        dut.comb += [dut.dma.irq_count.eq(4), dut.dma.irq_timeout.eq(16)]
+        # Run for a fixed duration: the interrupt is only generated on the timeout.
+        outputs, irqs = self.sg_read(dut, mem, None, cycles=200)
+        self.assertEqual(len(outputs), 1)
+        self.assertEqual(len(irqs), 1)
+
+    def test_reader_burst_aligned(self):
+        mem = {0x100 + i: i for i in range(16)}
+        sg_descriptors(mem, 0x1000, [(0x408, 10*4, SGDMA_LAST)])
+        bus_cycles = []
+        dut = _SGDUT(WishboneSGDMAReader, bursting=True, burst_length=4)
+        outputs, _ = self.sg_read(dut, mem, 10, bus_cycles=bus_cycles)
+        self.assertEqual([d for d, _ in outputs], list(range(2, 12)))
+        data_cycles = [(adr, cti) for adr, we, cti in bus_cycles if 0x100 <= adr < 0x200]
+        ends = [adr for adr, cti in data_cycles if cti == wishbone.CTI_BURST_END]
+        # Bursts end on 4-word boundaries and at the end of the buffer.
+        self.assertEqual(ends, [0x103, 0x107, 0x10b])
+
+    def test_writer_splits_packets_on_descriptors(self):
+        mem   = {}
+        descs = sg_descriptors(mem, 0x1000, [(0x400 + 0x40*i, 4*4, SGDMA_IRQ) for i in range(3)])
+        dut   = _SGDUT(WishboneSGDMAWriter)
+        # 6 words packet then 2 words packet.
+        packets = [[0x1000 + i for i in range(6)], [0x2000, 0x2001]]
+        def driver(dut):
+            yield dut.dma.base.eq(0x1000)
+            yield dut.dma.enable.eq(1)
+            for packet in packets:
+                for i, word in enumerate(packet):
+                    yield dut.dma.sink.valid.eq(1)
+                    yield dut.dma.sink.data.eq(word)
+                    yield dut.dma.sink.last.eq(i == len(packet) - 1)
+                    yield
+                    while not (yield dut.dma.sink.ready):
+                        yield
+                yield dut.dma.sink.valid.eq(0)
+            for i in range(1000):
+                yield
+                if (yield dut.dma.completed) == 3 and (yield dut.dma.idle):
+                    break
+        run_simulation(dut, [driver(dut), wb_mem_slave(dut.bus, mem)])
+        self.assertEqual([mem[0x100 + i] for i in range(4)],   packets[0][:4])
+        self.assertEqual([mem[0x110 + i] for i in range(2)],   packets[0][4:])
+        self.assertEqual([mem[0x120 + i] for i in range(2)],   packets[1])
+        self.assertEqual(mem[descs[0]//4 + 1], 4*4 | SGDMA_IRQ)
+        self.assertEqual(mem[descs[1]//4 + 1], 2*4 | SGDMA_IRQ | SGDMA_LAST)
+        self.assertEqual(mem[descs[2]//4 + 1], 2*4 | SGDMA_IRQ | SGDMA_LAST)
+
+    def test_requires_word_addressing(self):
+        with self.assertRaises(ValueError):
+            WishboneSGDMAReader(wishbone.Interface(addressing="byte"))
+
+
+# AXI DMA ------------------------------------------------------------------------------------------
+
+@passive
+def axi_mem_slave(bus, mem, ars, aws, latency=0):
+    """Passive AXI slave on a word-addressed dict memory (always ready, in-order responses returned
+    `latency` cycles after the requests), logging (addr, len) of the AR/AW requests."""
+    shift  = log2_int(bus.data_width//8)
+    reads  = []
+    writes = []
+    cycle  = 0
+    yield bus.ar.ready.eq(1)
+    yield bus.aw.ready.eq(1)
+    yield bus.w.ready.eq(1)
+    while True:
+        # Requests/Data accepted on this cycle.
+        if (yield bus.ar.valid):
+            addr, length = (yield bus.ar.addr), (yield bus.ar.len)
+            ars.append((addr, length))
+            reads += [(cycle + latency, (addr >> shift) + i, i == length) for i in range(length + 1)]
+        if (yield bus.aw.valid):
+            addr, length = (yield bus.aw.addr), (yield bus.aw.len)
+            aws.append((addr, length))
+            writes += [(addr >> shift) + i for i in range(length + 1)]
+        b = 0
+        if (yield bus.w.valid):
+            mem[writes.pop(0)] = (yield bus.w.data)
+            b = (yield bus.w.last)
+        yield bus.b.valid.eq(b)
+        # Responses presented on next cycle.
+        if reads and reads[0][0] <= cycle:
+            _, adr, last = reads.pop(0)
+            yield bus.r.valid.eq(1)
+            yield bus.r.data.eq(mem.get(adr, 0))
+            yield bus.r.last.eq(last)
+        else:
+            yield bus.r.valid.eq(0)
+        yield
+        cycle += 1
+
+
+class _AXIDMADUT(LiteXModule):
+    def __init__(self, cls, data_width=32, **kwargs):
+        self.bus = axi.AXIInterface(data_width=data_width, address_width=32)
+        self.dma = cls(self.bus, with_byteswap=False, **kwargs)
+
+
+class TestAXIDMA(unittest.TestCase):
+    def axi_read(self, dut, mem, count, latency=0, driver=None):
+        ars     = []
+        outputs = []
+        first   = []
+        def monitor(dut):
+            yield dut.dma.source.ready.eq(1)
+            for i in range(10_000):
+                yield
+                if (yield dut.dma.source.valid):
+                    if not outputs:
+                        first.append(len(ars))
+                    outputs.append(((yield dut.dma.source.data), (yield dut.dma.source.last)))
+                if len(outputs) == count:
+                    break
+        generators = [monitor(dut), axi_mem_slave(dut.bus, mem, ars, [], latency)]
+        if driver is not None:
+            generators.append(driver(dut))
+        run_simulation(dut, generators)
+        return outputs, ars, first[0]
+
+    def test_reader_bursts(self):
+        mem = {0x3f8 + i: 0x1000 + i for i in range(300)}
+        dut = _AXIDMADUT(AXIDMAReader)
+        dut.dma.add_ctrl()
+        def driver(dut):
+            yield dut.dma.base.eq(0x3f8*4)
+            yield dut.dma.length.eq(300*4)
+            yield dut.dma.enable.eq(1)
+        outputs, ars, _ = self.axi_read(dut, mem, 300, driver=driver)
+        self.assertEqual([d for d, _ in outputs], [0x1000 + i for i in range(300)])
+        self.assertEqual([l for _, l in outputs], [0]*299 + [1])
+        # Bursts: Split at the 4KB boundary and on max_burst_length.
+        self.assertEqual(ars, [(0xfe0, 7), (0x1000, 255), (0x1400, 35)])
+
+    def test_reader_outstanding_requests(self):
+        mem = {i: i for i in range(32)}
+        dut = _AXIDMADUT(AXIDMAReader, max_burst_length=4, fifo_depth=32)
+        dut.dma.add_ctrl()
+        def driver(dut):
+            yield dut.dma.length.eq(32*4)
+            yield dut.dma.enable.eq(1)
+        outputs, ars, first = self.axi_read(dut, mem, 32, latency=64, driver=driver)
+        self.assertEqual([d for d, _ in outputs], list(range(32)))
+        self.assertEqual(ars, [(16*i, 3) for i in range(8)])
+        # All requests issued before the first response.
+        self.assertEqual(first, 8)
+
+    def test_reader_raw_sink_contiguous_bursts(self):
+        mem       = {i: i for i in range(64)}
+        addresses = [0, 1, 2, 10, 11]
+        dut       = _AXIDMADUT(AXIDMAReader, data_width=64)
+        def driver(dut):
+            for i, address in enumerate(addresses):
+                yield dut.dma.sink.valid.eq(1)
+                yield dut.dma.sink.address.eq(address)
+                yield dut.dma.sink.last.eq(i == len(addresses) - 1)
+                yield
+                while not (yield dut.dma.sink.ready):
+                    yield
+            yield dut.dma.sink.valid.eq(0)
+        outputs, ars, _ = self.axi_read(dut, mem, 5, driver=driver)
+        self.assertEqual(outputs, [(0, 0), (1, 0), (2, 0), (10, 0), (11, 1)])
+        self.assertEqual(ars, [(0x00, 2), (0x50, 1)])
+
+    def test_writer_bursts(self):
+        payload = [0x2000 + i for i in range(20)]
+        mem     = {}
+        aws     = []
+        dut     = _AXIDMADUT(AXIDMAWriter, max_burst_length=8)
+        dut.dma.add_ctrl()
+        def driver(dut):
+            yield dut.dma.base.eq(0x100)
+            yield dut.dma.length.eq(len(payload)*4)
+            yield dut.dma.enable.eq(1)
+            for _ in range(4):
+                yield
+            yield dut.dma.sink.valid.eq(1)
+            for word in payload:
+                yield dut.dma.sink.data.eq(word)
+                yield
+                while not (yield dut.dma.sink.ready):
+                    yield
+            yield dut.dma.sink.valid.eq(0)
+            timeout = 0
+            while not (yield dut.dma.done):
+                yield
+                timeout += 1
+                self.assertLess(timeout, 200, "AXI DMA writer never signalled done")
+        run_simulation(dut, [driver(dut), axi_mem_slave(dut.bus, mem, [], aws)])
+        self.assertEqual([mem[0x40 + i] for i in range(len(payload))], payload)
+        self.assertEqual(aws, [(0x100, 7), (0x120, 7), (0x140, 3)])
+
+    def test_parameters_checks(self):
+        with self.assertRaises(TypeError):
+            AXIDMAReader(make_bus())
+        with self.assertRaises(ValueError):
+            AXIDMAWriter(axi.AXIInterface(version="axi3"), max_burst_length=32)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -9,6 +9,8 @@ import random
 
 from migen import *
 
+from litex.gen.sim.verification import StreamDriver, StreamMonitor
+
 from litex.soc.interconnect.stream import *
 from litex.soc.interconnect.packet import *
 
@@ -273,7 +275,7 @@ class TestPacket(unittest.TestCase):
     def test_128bit_loopback(self):
         self.loopback_test(dw=128)
 
-    def packet_fifo_test(self, layout, packets, payload_depth, param_depth=None, buffered=False):
+    def packet_fifo_test(self, layout, packets, payload_depth, param_depth=None, buffered=False, **kwargs):
         generator_prng = random.Random(42)
         checker_prng   = random.Random(42)
 
@@ -321,7 +323,7 @@ class TestPacket(unittest.TestCase):
                     yield
             yield
 
-        dut = PacketFIFO(layout, payload_depth=payload_depth, param_depth=param_depth, buffered=buffered)
+        dut = PacketFIFO(layout, payload_depth=payload_depth, param_depth=param_depth, buffered=buffered, **kwargs)
         run_simulation(dut, [generator(dut), checker(dut)])
         self.assertEqual(dut.errors, 0)
 
@@ -387,6 +389,127 @@ class TestPacket(unittest.TestCase):
             })
         self.packet_fifo_test(layout, packets, payload_depth=5, param_depth=1, buffered=True)
 
+    def test_packet_fifo_cut_through(self):
+        prng = random.Random(456)
+        layout = EndpointDescription(
+            payload_layout=[("data", 8)],
+            param_layout=[("tag", 8), ("kind", 2)],
+        )
+        packets = []
+        for packet_index in range(24):
+            packets.append({
+                "tag": packet_index,
+                "kind": packet_index % 4,
+                "datas": [prng.randrange(256) for _ in range(1 + (packet_index % 7))],
+            })
+        # Packets larger than the payload FIFO are supported in cut-through mode.
+        self.packet_fifo_test(layout, packets, payload_depth=4, param_depth=1, mode="cut-through")
+        self.packet_fifo_test(layout, packets, payload_depth=4, param_depth=1, mode="cut-through", buffered=True)
+
+    def packet_fifo_fill(self, dut, packets, cycles=32):
+        """Send `packets` (lists of datas) with the source stalled and return the occupancy."""
+        occupancy = {}
+        def generator():
+            for datas in packets:
+                for index, data in enumerate(datas):
+                    yield dut.sink.valid.eq(1)
+                    yield dut.sink.first.eq(index == 0)
+                    yield dut.sink.last.eq(index == (len(datas) - 1))
+                    yield dut.sink.data.eq(data)
+                    yield
+                    while (yield dut.sink.ready) == 0:
+                        yield
+            yield dut.sink.valid.eq(0)
+            for i in range(cycles):
+                yield
+            for name in ["level", "packets", "almost_full", "almost_empty", "packets_almost_full",
+                "packets_almost_empty", "dropped_packets", "dropped_beats"]:
+                occupancy[name] = (yield getattr(dut, name))
+        run_simulation(dut, generator())
+        return occupancy
+
+    def test_packet_fifo_cut_through_forwards_partial_packets(self):
+        dut = PacketFIFO(raw_description(8), payload_depth=8, mode="cut-through")
+        self.assertEqual(self.packet_fifo_fill(dut, [[1, 2, 3]])["level"], 3)
+        dut = PacketFIFO(raw_description(8), payload_depth=8, mode="cut-through")
+        valids = []
+        def generator():
+            yield dut.sink.valid.eq(1)
+            yield dut.sink.first.eq(1)
+            yield dut.sink.data.eq(0x5a)
+            yield
+            yield dut.sink.valid.eq(0)
+            for i in range(4):
+                yield
+                valids.append((yield dut.source.valid))
+        run_simulation(dut, generator())
+        self.assertEqual(valids, [1]*4)
+
+        # Store-and-forward waits for the last beat.
+        dut = PacketFIFO(raw_description(8), payload_depth=8)
+        occupancy = self.packet_fifo_fill(dut, [[1, 2, 3]])
+        self.assertEqual(occupancy["level"],   3)
+        self.assertEqual(occupancy["packets"], 1)
+
+    def test_packet_fifo_thresholds(self):
+        dut = PacketFIFO(raw_description(32), payload_depth=16,
+            almost_full          = 40, # 10 beats.
+            almost_empty         = 8,  # 2 beats.
+            packets_almost_full  = 3,
+            packets_almost_empty = 1,
+        )
+        occupancy = self.packet_fifo_fill(dut, [[0]*4, [1]*4])
+        self.assertEqual(occupancy["level"],   8)
+        self.assertEqual(occupancy["packets"], 2)
+        self.assertEqual(occupancy["almost_full"],          0)
+        self.assertEqual(occupancy["almost_empty"],         0)
+        self.assertEqual(occupancy["packets_almost_full"],  0)
+        self.assertEqual(occupancy["packets_almost_empty"], 0)
+
+        dut = PacketFIFO(raw_description(32), payload_depth=16, almost_full=40, packets_almost_full=3)
+        occupancy = self.packet_fifo_fill(dut, [[0]*4, [1]*4, [2]*2])
+        self.assertEqual(occupancy["almost_full"],         1)
+        self.assertEqual(occupancy["packets_almost_full"], 1)
+
+        dut = PacketFIFO(raw_description(32), payload_depth=16, almost_empty=8, packets_almost_empty=1)
+        occupancy = self.packet_fifo_fill(dut, [[0]*2])
+        self.assertEqual(occupancy["almost_empty"],         1)
+        self.assertEqual(occupancy["packets_almost_empty"], 1)
+
+    def test_packet_fifo_drop_on_overflow(self):
+        dut = PacketFIFO(raw_description(8), payload_depth=4, drop_on_overflow=True)
+        # 8-beat packet dropped after filling the FIFO, 3-beat packet dropped on its last beat.
+        packets   = [[0x10, 0x11], [0x20 + i for i in range(8)], [0x30, 0x31, 0x32], [0x40]]
+        occupancy = self.packet_fifo_fill(dut, packets)
+        self.assertEqual(occupancy["level"],           3)
+        self.assertEqual(occupancy["packets"],         2)
+        self.assertEqual(occupancy["dropped_packets"], 2)
+        self.assertEqual(occupancy["dropped_beats"],   11)
+
+        # Dropped packets are not forwarded and the sink is never stalled.
+        dut = PacketFIFO(raw_description(8), payload_depth=4, drop_on_overflow=True)
+        monitor = StreamMonitor(dut.source, ready_rand=50)
+        driver  = StreamDriver(dut.sink)
+        for datas in packets*4:
+            driver.send_packet(datas)
+        stalls = []
+        def stall_checker():
+            yield "passive"
+            while True:
+                stalls.append((yield dut.sink.valid) & ~(yield dut.sink.ready) & 1)
+                yield
+        run_simulation(dut, [driver.generator(), monitor.generator(), stall_checker()])
+        self.assertEqual(sum(stalls), 0)
+        for packet in monitor.packets:
+            self.assertIn([beat["data"] for beat in packet], packets)
+            self.assertNotEqual(len(packet), 8)
+
+    def test_packet_fifo_parameters(self):
+        with self.assertRaises(ValueError):
+            PacketFIFO(raw_description(8), payload_depth=4, mode="wormhole")
+        with self.assertRaises(ValueError):
+            PacketFIFO(raw_description(8), payload_depth=4, mode="cut-through", drop_on_overflow=True)
+
     def test_packetizer_depacketizer_single_byte_payload_with_error(self):
         packets = [
             {
@@ -760,6 +883,130 @@ class TestPacket(unittest.TestCase):
         ])
         self.assertEqual(received_tags, [0, 1, 0, 1])
 
+    def drr_arbiter_test(self, packets, ready_rand=0, **kwargs):
+        """Send packets (lists of packet lengths per master) through a DRRArbiter, check them and
+        return the received packets (as (master, length) tuples) and the bytes counters."""
+        layout = EndpointDescription(payload_layout=[("data", 8)], param_layout=[("tag", 4)])
+
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.sinks   = [Endpoint(layout) for _ in packets]
+                self.source  = Endpoint(layout)
+                self.arbiter = DRRArbiter(self.sinks, self.source, **kwargs)
+
+        dut      = DUT()
+        drivers  = [StreamDriver(sink) for sink in dut.sinks]
+        monitor  = StreamMonitor(dut.source, ready_rand=ready_rand)
+        expected = [[] for _ in packets]
+        for i, lengths in enumerate(packets):
+            for j, length in enumerate(lengths):
+                datas = [(j + k) & 0xff for k in range(length)]
+                drivers[i].send_packet(datas, tag=i)
+                expected[i].append(datas)
+        nbytes = []
+
+        def checker():
+            yield from monitor.generator(count=sum(sum(lengths) for lengths in packets))
+            yield
+            nbytes.extend((yield dut.arbiter.bytes))
+
+        run_simulation(dut, [driver.generator() for driver in drivers] + [checker()])
+        received = [[] for _ in packets]
+        for packet in monitor.packets:
+            tags = set(beat["tag"] for beat in packet)
+            self.assertEqual(len(tags), 1)
+            received[tags.pop()].append([beat["data"] for beat in packet])
+        for i in range(len(packets)):
+            self.assertEqual(received[i], expected[i][:len(received[i])])
+        return [(packet[0]["tag"], len(packet)) for packet in monitor.packets], nbytes
+
+    def test_drr_arbiter(self):
+        prng    = random.Random(42)
+        packets = [[1 + prng.randrange(16) for _ in range(16)] for _ in range(3)]
+        self.drr_arbiter_test(packets, ready_rand=30, quanta=[8, 16, 4])
+
+    def test_drr_arbiter_fairness(self):
+        # Jumbo (64-byte) vs small (2-byte) packets: bytes are shared equally with equal quanta
+        # (instead of per packet with round-robin) and proportionally to unequal quanta.
+        for quanta, share in [([16, 16], 1), ([48, 16], 3)]:
+            with self.subTest(quanta=quanta):
+                received, _ = self.drr_arbiter_test([[64]*16, [2]*256], quanta=quanta)
+                # Share while both masters are backlogged (until the first master is done).
+                end      = min(max(k for k, (tag, _) in enumerate(received) if tag == i) for i in range(2))
+                received = received[:end]
+                nbytes   = [sum(length for tag, length in received if tag == i) for i in range(2)]
+                self.assertAlmostEqual(nbytes[0]/nbytes[1], share, delta=0.1*share)
+                # Small packets are never delayed by more than one jumbo packet.
+                tags = "".join(str(tag) for tag, length in received)
+                self.assertNotIn("00", tags)
+
+    def test_drr_arbiter_single_master_throughput(self):
+        # A lone master sending packets larger than its quantum is not throttled by its deficit.
+        layout  = EndpointDescription(payload_layout=[("data", 64)])
+        sinks   = [Endpoint(layout) for _ in range(2)]
+        source  = Endpoint(layout)
+        dut     = DRRArbiter(sinks, source)
+        driver  = StreamDriver(sinks[0])
+        monitor = StreamMonitor(source)
+        for i in range(4):
+            driver.send_packet(list(range(100)))
+        cycles = []
+
+        def checker():
+            cycle = 0
+            while len(monitor.beats) < 400:
+                cycle += 1
+                yield
+            cycles.append(cycle)
+
+        run_simulation(dut, [driver.generator(), monitor.generator(count=400), checker()])
+        self.assertEqual(len(monitor.packets), 4)
+        self.assertLessEqual(cycles[0], 400 + 8)
+
+    def test_drr_arbiter_fairness_intermittent_master(self):
+        # Jumbo packets vs bursts of small packets separated by idle periods (longer than a jumbo
+        # packet): while both masters are valid, bytes are still shared equally with equal quanta.
+        for burst, idle in [(32, 300), (64, 100)]:
+            with self.subTest(burst=burst, idle=idle):
+                layout  = EndpointDescription(payload_layout=[("data", 8)], param_layout=[("tag", 4)])
+                sinks   = [Endpoint(layout) for _ in range(2)]
+                source  = Endpoint(layout)
+                dut     = DRRArbiter(sinks, source, quanta=[16, 16])
+                drivers = [StreamDriver(sink) for sink in sinks]
+                for i in range(64):
+                    drivers[0].send_packet([0]*64, tag=0)
+                nbytes = [0, 0]
+                done   = []
+
+                def bursts():
+                    for i in range(4):
+                        for j in range(burst):
+                            drivers[1].send_packet([0, 1], tag=1)
+                        yield from drivers[1].generator()
+                        for _ in range(idle):
+                            yield
+                    done.append(True)
+
+                def checker():
+                    yield source.ready.eq(1)
+                    while not done:
+                        if (yield source.valid) and (yield sinks[1].valid):
+                            nbytes[(yield source.tag)] += 1
+                        yield
+
+                run_simulation(dut, [drivers[0].generator(), bursts(), checker()])
+                self.assertEqual(nbytes[1], 4*burst*2)
+                self.assertAlmostEqual(nbytes[0]/nbytes[1], 1, delta=0.1)
+
+    def test_drr_arbiter_bytes(self):
+        received, nbytes = self.drr_arbiter_test([[4]*3, [2]*5], with_csr=True, quanta=[4, 2])
+        self.assertEqual([received.count((i, n)) for i, n in [(0, 4), (1, 2)]], [3, 5])
+        self.assertEqual(nbytes, [12, 10])
+        with self.assertRaises(ValueError):
+            DRRArbiter([Endpoint([("data", 8)])], Endpoint([("data", 8)]), quanta=[0])
+        with self.assertRaises(ValueError):
+            DRRArbiter([Endpoint([("data", 8)])]*2, Endpoint([("data", 8)]), quanta=[1])
+
     def dispatcher_hold_sel_test(self, one_hot):
         layout = EndpointDescription(payload_layout=[("data", 8)], param_layout=[("tag", 4)])
 
@@ -914,3 +1161,141 @@ class TestPacket(unittest.TestCase):
             "source1_valid": 0,
             "source2_valid": 0,
         })
+
+    # Wide Packetizer/Depacketizer -----------------------------------------------------------------
+
+    eth_header = Header(
+        fields = {
+            "dst"       : HeaderField(0,  0, 48),
+            "src"       : HeaderField(6,  0, 48),
+            "ethertype" : HeaderField(12, 0, 16),
+        },
+        length           = 14,
+        swap_field_bytes = True)
+
+    def wide_descriptions(self, dw, header, last_be=False):
+        payload_layout = [("data", dw)] + ([("last_be", dw//8)] if last_be else [])
+        return (
+            EndpointDescription(payload_layout, header.get_layout()),
+            EndpointDescription(payload_layout),
+        )
+
+    def wide_packets(self, dw, header, npackets, prng, last_be=False):
+        """Random packets as (params, payload bytes) with a whole number of beats without last_be."""
+        packets = []
+        for n in range(npackets):
+            params = {name: prng.randrange(2**width) for name, width in header.get_layout()}
+            if last_be:
+                length = 1 + prng.randrange(4*dw//8)
+            else:
+                length = (1 + prng.randrange(4))*dw//8
+            packets.append((params, [prng.randrange(256) for _ in range(length)]))
+        return packets
+
+    def wide_send(self, driver, dw, packets, last_be=False):
+        for params, payload in packets:
+            nbytes = dw//8
+            beats  = [payload[i:i + nbytes] for i in range(0, len(payload), nbytes)]
+            for i, beat in enumerate(beats):
+                fields = dict(params, data=int.from_bytes(bytes(beat), "little"), last=int(i == len(beats) - 1))
+                if last_be and (i == len(beats) - 1):
+                    fields["last_be"] = 1 << (len(beat) - 1)
+                driver.send(fields)
+
+    def wide_received(self, monitor, dw, header, last_be=False):
+        packets = []
+        for packet in monitor.packets:
+            payload = b""
+            for beat in packet:
+                nbytes   = dw//8
+                if beat["last"] and last_be:
+                    nbytes = beat["last_be"].bit_length()
+                payload += beat["data"].to_bytes(dw//8, "little")[:nbytes]
+            params = {name: packet[0][name] for name, _ in header.get_layout()}
+            packets.append((params, list(payload)))
+        return packets
+
+    def wide_loopback_test(self, dw, header, packetizer_cls=None, depacketizer_cls=None, last_be=False,
+        valid_rand=40, ready_rand=40):
+        packetizer_cls   = WidePacketizer   if packetizer_cls   is None else packetizer_cls
+        depacketizer_cls = WideDepacketizer if depacketizer_cls is None else depacketizer_cls
+        prng = random.Random(dw + header.length)
+        packet_desc, raw_desc = self.wide_descriptions(dw, header, last_be)
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.packetizer   = packetizer   = packetizer_cls(packet_desc, raw_desc, header)
+                self.submodules.depacketizer = depacketizer = depacketizer_cls(raw_desc, packet_desc, header)
+                self.comb += packetizer.source.connect(depacketizer.sink)
+                self.sink, self.source = packetizer.sink, depacketizer.source
+
+        dut     = DUT()
+        packets = self.wide_packets(dw, header, 12, prng, last_be)
+        driver  = StreamDriver(dut.sink, valid_rand=valid_rand)
+        monitor = StreamMonitor(dut.source, ready_rand=ready_rand)
+        self.wide_send(driver, dw, packets, last_be)
+        run_simulation(dut, [driver.generator(), monitor.generator(count=len(driver.queue))])
+        self.assertEqual(self.wide_received(monitor, dw, header, last_be), packets)
+
+    def test_wide_packetizer_depacketizer_loopback(self):
+        for dw in [8, 32, 64, 256, 512]:
+            for header in [packet_header, self.eth_header]:
+                with self.subTest(dw=dw, header_length=header.length):
+                    self.wide_loopback_test(dw, header)
+
+    def test_wide_packetizer_depacketizer_loopback_last_be(self):
+        for dw in [32, 64, 256, 512]:
+            for header in [packet_header, self.eth_header]:
+                with self.subTest(dw=dw, header_length=header.length):
+                    self.wide_loopback_test(dw, header, last_be=True)
+
+    def test_wide_packetizer_depacketizer_compatibility(self):
+        # Wide implementations are interoperable with Packetizer/Depacketizer (header >= data width).
+        for dw in [32, 64]:
+            self.wide_loopback_test(dw, packet_header, depacketizer_cls=Depacketizer)
+            self.wide_loopback_test(dw, packet_header, packetizer_cls=Packetizer)
+
+    def test_wide_packetizer_depacketizer_throughput(self):
+        dw = 256
+        for header in [packet_header, self.eth_header]:
+            for last_be in [False, True]:
+                prng = random.Random(1)
+                packet_desc, raw_desc = self.wide_descriptions(dw, header, last_be)
+                packets = self.wide_packets(dw, header, 8, prng, last_be)
+
+                # Packetizer: one output beat per cycle.
+                dut     = WidePacketizer(packet_desc, raw_desc, header)
+                driver  = StreamDriver(dut.sink)
+                monitor = StreamMonitor(dut.source)
+                self.wide_send(driver, dw, packets, last_be)
+                nbeats  = sum((header.length + len(payload) + dw//8 - 1)//(dw//8) for _, payload in packets)
+                cycles  = []
+                def counter():
+                    yield "passive"
+                    while True:
+                        cycles.append((yield dut.source.valid))
+                        yield
+                run_simulation(dut, [driver.generator(), monitor.generator(count=nbeats), counter()])
+                self.assertEqual(cycles[1:len(monitor.beats) + 1], [1]*len(monitor.beats))
+                self.assertEqual(len(monitor.packets), len(packets))
+
+                # Depacketizer: one input beat per cycle.
+                nbytes  = dw//8
+                dut     = WideDepacketizer(raw_desc, packet_desc, header)
+                driver  = StreamDriver(dut.sink)
+                monitor = StreamMonitor(dut.source)
+                for params, payload in packets:
+                    header_bytes = [prng.randrange(256) for _ in range(header.length)]
+                    self.wide_send(driver, dw, [({}, header_bytes + payload)], last_be)
+                nbeats  = len(driver.queue)
+                readys  = []
+                def counter():
+                    yield "passive"
+                    while True:
+                        readys.append((yield dut.sink.ready))
+                        yield
+                nbeats_out = sum((len(payload) + nbytes - 1)//nbytes for _, payload in packets)
+                run_simulation(dut, [driver.generator(), monitor.generator(count=nbeats_out), counter()])
+                self.assertEqual(readys[1:nbeats + 1], [1]*nbeats)
+                self.assertEqual([len(payload) for _, payload in self.wide_received(monitor, dw, header, last_be)],
+                    [len(payload) for _, payload in packets])
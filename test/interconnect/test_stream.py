@@ -6,9 +6,12 @@
 
 import unittest
 import random
+import math
 
 from migen import *
 
+from litex.gen.sim.verification import StreamDriver, StreamMonitor, Scoreboard
+
 from litex.soc.interconnect.stream import *
 
 
@@ -113,46 +116,17 @@ class TestStream(unittest.TestCase):
         self.assertEqual(dut.errors, 0)
 
     def pipe_test(self, dut):
-        prng = random.Random(42)
-        def generator(dut, valid_rand=90):
-            for data in range(128):
-                yield dut.sink.valid.eq(1)
-                yield dut.sink.first.eq((data % 7) == 0)
-                yield dut.sink.last.eq((data % 7) == 6)
-                yield dut.sink.data.eq(data)
-                if hasattr(dut.sink, "tag"):
-                    yield dut.sink.tag.eq(data % 16)
-                yield
-                while (yield dut.sink.ready) == 0:
-                    yield
-                yield dut.sink.valid.eq(0)
-                yield dut.sink.first.eq(0)
-                yield dut.sink.last.eq(0)
-                while prng.randrange(100) < valid_rand:
-                    yield
-
-        def checker(dut, ready_rand=90):
-            dut.errors = 0
-            for data in range(128):
-                yield dut.source.ready.eq(0)
-                yield
-                while (yield dut.source.valid) == 0:
-                    yield
-                while prng.randrange(100) < ready_rand:
-                    yield
-                yield dut.source.ready.eq(1)
-                yield
-                if ((yield dut.source.data) != data):
-                    dut.errors += 1
-                if ((yield dut.source.first) != ((data % 7) == 0)):
-                    dut.errors += 1
-                if ((yield dut.source.last) != ((data % 7) == 6)):
-                    dut.errors += 1
-                if hasattr(dut.source, "tag") and ((yield dut.source.tag) != (data % 16)):
-                    dut.errors += 1
-            yield
-        run_simulation(dut, [generator(dut), checker(dut)])
-        self.assertEqual(dut.errors, 0)
+        scoreboard = Scoreboard()
+        driver     = StreamDriver(dut.sink,   valid_rand=90)
+        monitor    = StreamMonitor(dut.source, ready_rand=90, callback=scoreboard.observe)
+        for data in range(128):
+            beat = {"data": data, "first": int((data % 7) == 0), "last": int((data % 7) == 6)}
+            if hasattr(dut.sink, "tag"):
+                beat["tag"] = data % 16
+            driver.send(beat)
+            scoreboard.expect(beat)
+        run_simulation(dut, [driver.generator(), monitor.generator(count=128)])
+        scoreboard.check()
 
     def test_pipe_valid(self):
         dut = PipeValid(EndpointDescription(
@@ -1065,6 +1039,124 @@ class TestStream(unittest.TestCase):
             (0x88776655, 0x0, 0x0, 0x3, 0, 1),
         ])
 
+    def width_converter_test(self, nbits_from, nbits_to, valid_rand=50, ready_rand=50, npackets=16):
+        prng = random.Random(nbits_from*nbits_to)
+        dut  = WidthConverter(nbits_from, nbits_to, with_keep=True)
+        self.assertEqual(dut.depth, nbits_from + nbits_to - math.gcd(nbits_from, nbits_to))
+        packets = [[prng.randrange(256) for _ in range(1 + prng.randrange(48))] for _ in range(npackets)]
+        driver  = StreamDriver(dut.sink, valid_rand=valid_rand)
+        for payload in packets:
+            nbytes = nbits_from//8
+            beats  = [payload[i:i + nbytes] for i in range(0, len(payload), nbytes)]
+            for i, beat in enumerate(beats):
+                driver.send(
+                    data = int.from_bytes(bytes(beat), "little"),
+                    keep = 2**len(beat) - 1,
+                    last = int(i == (len(beats) - 1)),
+                )
+        nbeats_out = sum((len(payload) + nbits_to//8 - 1)//(nbits_to//8) for payload in packets)
+        monitor    = StreamMonitor(dut.source, ready_rand=ready_rand)
+        run_simulation(dut, [driver.generator(), monitor.generator(count=nbeats_out)])
+        received   = []
+        for packet in monitor.packets:
+            payload = []
+            for beat in packet:
+                self.assertEqual(beat["keep"] & (beat["keep"] + 1), 0) # Contiguous.
+                payload += list(beat["data"].to_bytes(nbits_to//8, "little")[:beat["keep"].bit_length()])
+            received.append(payload)
+        self.assertEqual(received, packets)
+
+    def test_width_converter(self):
+        for nbits_from, nbits_to in [(24, 32), (32, 24), (40, 64), (64, 40), (80, 128), (128, 80), (16, 64)]:
+            with self.subTest(nbits_from=nbits_from, nbits_to=nbits_to):
+                self.width_converter_test(nbits_from, nbits_to)
+
+    def test_width_converter_empty_last(self):
+        # Packets ended by a last beat without kept units (keep == 0) are not merged.
+        for nbits_from, nbits_to in [(32, 24), (24, 32), (64, 40), (32, 32)]:
+            for valid_rand, ready_rand in [(0, 0), (50, 50)]:
+                with self.subTest(nbits_from=nbits_from, nbits_to=nbits_to, valid_rand=valid_rand, ready_rand=ready_rand):
+                    prng    = random.Random(nbits_from*nbits_to + valid_rand)
+                    dut     = WidthConverter(nbits_from, nbits_to, with_keep=True)
+                    nbytes  = nbits_from//8
+                    packets = [[prng.randrange(256) for _ in range(prng.randrange(3*nbytes + 1))] for _ in range(16)]
+                    driver  = StreamDriver(dut.sink, valid_rand=valid_rand)
+                    for payload in packets:
+                        beats = [payload[i:i + nbytes] for i in range(0, len(payload), nbytes)]
+                        for beat in beats:
+                            driver.send(data=int.from_bytes(bytes(beat), "little"), keep=2**len(beat) - 1)
+                        driver.send(keep=0, last=1)
+                    monitor = StreamMonitor(dut.source, ready_rand=ready_rand)
+                    def timeout():
+                        for i in range(1000):
+                            yield
+                    run_simulation(dut, [driver.generator(), monitor.generator(), timeout()])
+                    received = [[b for beat in packet
+                        for b in beat["data"].to_bytes(nbits_to//8, "little")[:beat["keep"].bit_length()]]
+                        for packet in monitor.packets]
+                    self.assertEqual(received, packets)
+
+    def test_width_converter_throughput(self):
+        for nbits_from, nbits_to in [(24, 32), (32, 24), (80, 128), (128, 80)]:
+            for last in [False, True]:
+                dut    = WidthConverter(nbits_from, nbits_to)
+                driver = StreamDriver(dut.sink)
+                for i in range(60):
+                    driver.send(data=i, last=int(last and (i % 5) == 4))
+                nbeats_out = (60*nbits_from)//nbits_to # Partial last beat only sent on last.
+                if last:
+                    nbeats_out = 12*((5*nbits_from + nbits_to - 1)//nbits_to)
+                monitor = StreamMonitor(dut.source)
+                stalls  = {"sink": 0, "source": 0}
+                def checker():
+                    yield "passive"
+                    while True:
+                        # Count the cycles where both sides are not transferring.
+                        sink_valid, sink_ready, source_valid = (yield [dut.sink.valid, dut.sink.ready, dut.source.valid])
+                        if sink_valid and not sink_ready and not source_valid:
+                            stalls["sink"] += 1
+                        if not (sink_valid and sink_ready) and not source_valid and (len(monitor.beats) < nbeats_out):
+                            stalls["source"] += 1
+                        yield
+                run_simulation(dut, [driver.generator(), monitor.generator(count=nbeats_out), checker()])
+                self.assertEqual(len(monitor.beats), nbeats_out)
+                # One transfer per cycle: no cycle without any transfer (besides the first one).
+                self.assertEqual(stalls["sink"], 0)
+                self.assertLessEqual(stalls["source"], 1)
+
+    def test_converter_non_integer_ratio(self):
+        for reverse in [False, True]:
+            dut = Converter(24, 32, reverse=reverse)
+            self.assertEqual(dut.cls, WidthConverter)
+            datas    = [0x332211, 0x665544, 0x998877, 0xccbbaa]
+            driver   = StreamDriver(dut.sink)
+            monitor  = StreamMonitor(dut.source, fields=["data", "last"])
+            for i, data in enumerate(datas):
+                driver.send(data=data, last=int(i == 3))
+            run_simulation(dut, [driver.generator(), monitor.generator(count=3)])
+            if reverse:
+                expected = [0x33221166, 0x55449988, 0x77ccbbaa]
+            else:
+                expected = [0x44332211, 0x88776655, 0xccbbaa99]
+            self.assertEqual([beat["data"] for beat in monitor.beats], expected)
+            self.assertEqual([beat["last"] for beat in monitor.beats], [0, 0, 1])
+        with self.assertRaises(ValueError):
+            Converter(24, 32, report_valid_token_count=True)
+
+    def test_stride_converter_non_integer_ratio(self):
+        # RGB888 pixels to 32-bit words.
+        dut = StrideConverter(
+            EndpointDescription(payload_layout=[("r", 8), ("g", 8), ("b", 8)]),
+            EndpointDescription(payload_layout=[("data", 32)]),
+        )
+        driver  = StreamDriver(dut.sink)
+        monitor = StreamMonitor(dut.source)
+        for i in range(8):
+            driver.send(r=3*i, g=3*i + 1, b=3*i + 2, last=int(i == 7))
+        run_simulation(dut, [driver.generator(), monitor.generator(count=6)])
+        self.assertEqual(b"".join(beat["data"].to_bytes(4, "little") for beat in monitor.beats), bytes(range(24)))
+        self.assertEqual([beat["last"] for beat in monitor.beats], [0]*5 + [1])
+
     def test_syncfifo_level(self):
         levels = {"depth0": [], "depth1": [], "depth4": []}
 
@@ -1487,3 +1579,324 @@ class TestStream(unittest.TestCase):
             "underflows_after_reset": 0,
             "packets_after_reset": 0,
         })
+
+    def test_stream_profiler(self):
+        endpoint = Endpoint([("data", 8)])
+        profiler = StreamProfiler(endpoint)
+        # (valid, ready, last) per cycle: 3 transfers (1 packet), 2 backpressure, 1 starvation, 2 idle.
+        pattern  = [(1, 1, 0), (1, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0), (1, 1, 1), (0, 0, 0)]
+        observations = {}
+
+        def stimulus():
+            yield profiler.reset.eq(1)
+            yield
+            yield profiler.reset.eq(0)
+            for valid, ready, last in pattern:
+                yield [endpoint.valid.eq(valid), endpoint.ready.eq(ready), endpoint.last.eq(last)]
+                yield
+            yield [endpoint.valid.eq(0), endpoint.ready.eq(0), profiler.latch.eq(1)]
+            yield
+            yield profiler.latch.eq(0)
+            yield
+            for name in ["cycles", "transfers", "backpressure", "starvation", "packets"]:
+                observations[name] = (yield getattr(profiler, f"_{name}").status)
+
+        run_simulation(profiler, stimulus())
+        self.assertEqual(observations, {
+            "cycles"       : len(pattern),
+            "transfers"    : 3,
+            "backpressure" : 2,
+            "starvation"   : 1,
+            "packets"      : 1,
+        })
+
+    def test_stream_profiler_latency(self):
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.pipe0 = pipe0 = PipeValid([("data", 8)])
+                self.submodules.pipe1 = pipe1 = PipeValid([("data", 8)])
+                self.submodules.pipe2 = pipe2 = PipeValid([("data", 8)])
+                self.submodules.pipeline = Pipeline(pipe0, pipe1, pipe2)
+                self.submodules.profiler = StreamProfiler(pipe0.sink, egress=pipe2.source,
+                    latency_bins      = 4,
+                    latency_bin_width = 2,
+                )
+
+        dut     = DUT()
+        driver  = StreamDriver(dut.pipe0.sink, valid_rand=50)
+        monitor = StreamMonitor(dut.pipe2.source, ready_rand=50)
+        packets = [[(i + j) & 0xff for j in range(1 + i%4)] for i in range(16)]
+        for datas in packets:
+            driver.send_packet(datas)
+        observations = {}
+
+        def checker():
+            yield from monitor.generator(count=sum(len(datas) for datas in packets))
+            yield dut.profiler.latch.eq(1)
+            yield
+            yield dut.profiler.latch.eq(0)
+            yield
+            for name in ["packets", "latency_count", "latency_min", "latency_max", "latency_sum"]:
+                observations[name] = (yield getattr(dut.profiler, f"_{name}").status)
+            observations["bins"] = (yield [getattr(dut.profiler, f"_latency_bin{i}").status for i in range(4)])
+
+        run_simulation(dut, [driver.generator(), checker()])
+        self.assertEqual(monitor.packets, [[{"first": int(j == 0), "last": int(j == len(datas) - 1), "data": data}
+            for j, data in enumerate(datas)] for datas in packets])
+        self.assertEqual(observations["packets"],       len(packets))
+        self.assertEqual(observations["latency_count"], len(packets))
+        self.assertEqual(sum(observations["bins"]),     len(packets))
+        self.assertGreaterEqual(observations["latency_min"], 3)
+        self.assertGreater(observations["latency_max"], observations["latency_min"])
+        self.assertGreaterEqual(observations["latency_sum"], 3*len(packets))
+        self.assertEqual(observations["bins"][0], 0)
+
+    def test_stream_profiler_latency_overflow(self):
+        # More packets in flight than latency_depth: the timestamps must stay paired with their packets.
+        class DUT(Module):
+            def __init__(self):
+                pipes = [PipeValid([("data", 8)]) for i in range(6)]
+                self.submodules += pipes
+                self.submodules.pipeline = Pipeline(*pipes)
+                self.sink     = pipes[0].sink
+                self.source   = pipes[-1].source
+                self.submodules.profiler = StreamProfiler(self.sink, egress=self.source, latency_depth=2)
+
+        dut     = DUT()
+        driver  = StreamDriver(dut.sink, valid_rand=25)
+        monitor = StreamMonitor(dut.source)
+        for i in range(64):
+            driver.send(data=i, last=1)
+        observations = {}
+
+        def checker():
+            yield from monitor.generator(count=64)
+            yield dut.profiler.latch.eq(1)
+            yield
+            yield dut.profiler.latch.eq(0)
+            yield
+            for name in ["packets", "latency_count", "latency_overflows", "latency_min", "latency_max"]:
+                observations[name] = (yield getattr(dut.profiler, f"_{name}").status)
+
+        run_simulation(dut, [driver.generator(), checker()])
+        self.assertEqual(observations["packets"], 64)
+        self.assertGreater(observations["latency_overflows"], 0)
+        self.assertGreater(observations["latency_count"], 0)
+        self.assertEqual(observations["latency_count"] + observations["latency_overflows"], 64)
+        self.assertEqual(observations["latency_min"], observations["latency_max"])
+
+    def test_stream_profiler_invalid_bin_width(self):
+        with self.assertRaises(ValueError):
+            StreamProfiler(Endpoint([("data", 8)]), egress=Endpoint([("data", 8)]), latency_bin_width=3)
+
+    def pipeline_balancing_test(self, modules, pipeline, offset):
+        driver  = StreamDriver(pipeline.sink, valid_rand=25)
+        monitor = StreamMonitor(pipeline.source, ready_rand=25, fields=["data"])
+        for i in range(64):
+            driver.send(data=i)
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules += modules
+                self.submodules.pipeline = pipeline
+
+        run_simulation(DUT(), [driver.generator(), monitor.generator(count=64)])
+        self.assertEqual(monitor.beats, [{"data": (i + offset) & 0xff} for i in range(64)])
+
+    def test_pipeline_balancing(self):
+        class Increment(LiteXModule):
+            def __init__(self, comb_depth=None):
+                self.sink   = sink   = Endpoint([("data", 8)])
+                self.source = source = Endpoint([("data", 8)])
+                if comb_depth is not None:
+                    self.comb_depth = comb_depth
+                self.comb += [
+                    sink.connect(source, omit={"data"}),
+                    source.data.eq(sink.data + 1),
+                ]
+
+        # Depth budget.
+        modules  = [Increment() for _ in range(6)]
+        pipeline = Pipeline(*modules, max_comb_depth=2)
+        self.assertEqual(pipeline.get_cuts(), [2, 4])
+        self.assertEqual(len(pipeline.stages), 2)
+        self.pipeline_balancing_test(modules, pipeline, offset=6)
+
+        # Stages budget.
+        modules  = [Increment() for _ in range(6)]
+        pipeline = Pipeline(*modules, max_stages=1, pipe_ready=True)
+        self.assertEqual(pipeline.get_cuts(), [3])
+        self.pipeline_balancing_test(modules, pipeline, offset=6)
+
+        # Registered modules cut paths.
+        modules  = [Increment(), Increment(), PipeValid([("data", 8)]), Increment(), Increment()]
+        pipeline = Pipeline(*modules, max_comb_depth=2)
+        self.assertEqual(pipeline.stages, [])
+        self.pipeline_balancing_test(modules, pipeline, offset=4)
+
+        # Per-module estimates.
+        modules  = [Increment(), Increment(comb_depth=3), Increment()]
+        pipeline = Pipeline(*modules, max_comb_depth=2)
+        self.assertEqual(pipeline.get_cuts(), [1, 2])
+        self.pipeline_balancing_test(modules, pipeline, offset=3)
+
+        # Unreachable depth with the stages budget.
+        with self.assertRaises(ValueError):
+            Pipeline(*[Increment() for _ in range(6)], max_comb_depth=1, max_stages=2)
+
+        # Ready-only stages don't cut the valid/payload paths.
+        with self.assertRaises(ValueError):
+            Pipeline(*[Increment() for _ in range(6)], max_comb_depth=2, pipe_valid=False, pipe_ready=True)
+
+    def test_pipeline_no_balancing(self):
+        modules  = [PipeValid([("data", 8)]), PipeValid([("data", 8)])]
+        pipeline = Pipeline(*modules)
+        self.assertEqual(pipeline.stages, [])
+        self.assertEqual(get_comb_depth(modules[0]), 0)
+        self.assertEqual(get_comb_depth(Endpoint([("data", 8)])), 0)
+
+    def multi_lane_fifo_packets(self, lanes, with_keep, n=24, seed=0):
+        prng    = random.Random(seed)
+        packets = []
+        for i in range(n):
+            beats = []
+            for j in range(1 + prng.randrange(5)):
+                kept  = (1 + prng.randrange(lanes)) if with_keep else lanes
+                beats.append([prng.randrange(256) for _ in range(kept)])
+            packets.append(beats)
+        return packets
+
+    def multi_lane_fifo_test(self, lanes, depth, with_keep, buffered=False, empty_last=False):
+        layout = [("data", 8*lanes)] + ([("keep", lanes)] if with_keep else [])
+        dut    = MultiLaneSyncFIFO(EndpointDescription(layout, [("tag", 4)]), depth, lanes, buffered=buffered)
+        driver  = StreamDriver(dut.sink, valid_rand=30)
+        monitor = StreamMonitor(dut.source, ready_rand=30)
+        packets = self.multi_lane_fifo_packets(lanes, with_keep)
+        expected_beats = 0
+        expected       = []
+        for i, beats in enumerate(packets):
+            for j, units in enumerate(beats):
+                beat = {
+                    "data"  : sum(unit << 8*k for k, unit in enumerate(units)),
+                    "first" : int(j == 0),
+                    "last"  : int(j == len(beats) - 1 and not empty_last),
+                    "tag"   : i%16,
+                }
+                if with_keep:
+                    beat["keep"] = 2**len(units) - 1
+                driver.send(beat)
+            # Packet ended by a last beat without kept lanes.
+            if empty_last:
+                driver.send({"data": 0, "first": 0, "last": 1, "tag": i%16, "keep": 0})
+            # Lanes are packed on the output.
+            units = sum(beats, [])
+            expected.append([units[k:k + lanes] for k in range(0, len(units), lanes)])
+            if empty_last and (len(units) % lanes) == 0:
+                expected[-1].append([])
+            expected_beats += len(expected[-1])
+
+        run_simulation(dut, [driver.generator(), monitor.generator(count=expected_beats)])
+        for i, (packet, beats) in enumerate(zip(monitor.packets, expected)):
+            self.assertEqual(len(packet), len(beats))
+            for j, (beat, units) in enumerate(zip(packet, beats)):
+                self.assertEqual(beat["first"], int(j == 0))
+                self.assertEqual(beat["tag"],   i%16)
+                self.assertEqual(beat["data"] & (2**(8*len(units)) - 1), sum(unit << 8*k for k, unit in enumerate(units)))
+                if with_keep:
+                    self.assertEqual(beat["keep"], 2**len(units) - 1)
+        self.assertEqual(len(monitor.packets), len(packets))
+
+    def test_multi_lane_fifo(self):
+        for lanes in [1, 3, 4]:
+            for buffered in [False, True]:
+                with self.subTest(lanes=lanes, buffered=buffered):
+                    self.multi_lane_fifo_test(lanes, depth=4, with_keep=False, buffered=buffered)
+
+    def test_multi_lane_fifo_keep(self):
+        for lanes in [2, 3, 4, 8]:
+            for buffered in [False, True]:
+                with self.subTest(lanes=lanes, buffered=buffered):
+                    self.multi_lane_fifo_test(lanes, depth=4, with_keep=True, buffered=buffered)
+
+    def test_multi_lane_fifo_empty_last(self):
+        for lanes in [1, 2, 3, 4]:
+            for buffered in [False, True]:
+                with self.subTest(lanes=lanes, buffered=buffered):
+                    self.multi_lane_fifo_test(lanes, depth=4, with_keep=True, buffered=buffered, empty_last=True)
+
+    def test_multi_lane_fifo_level(self):
+        dut    = MultiLaneSyncFIFO([("data", 32), ("keep", 4)], depth=4, lanes=4)
+        driver = StreamDriver(dut.sink)
+        for keep in [0b0011, 0b0111, 0b0001]:
+            driver.send(data=0, keep=keep)
+        levels = {}
+
+        def checker():
+            for i in range(8):
+                yield
+            levels["lanes"] = (yield dut.lane_level)
+            levels["level"] = (yield dut.level)
+
+        run_simulation(dut, [driver.generator(), checker()])
+        self.assertEqual(levels, {"lanes": [2, 2, 1, 1], "level": 6})
+
+    def test_multi_lane_fifo_invalid(self):
+        with self.assertRaises(ValueError):
+            MultiLaneSyncFIFO([("data", 30)], depth=4, lanes=4)
+        with self.assertRaises(ValueError):
+            MultiLaneSyncFIFO([("data", 32), ("keep", 2)], depth=4, lanes=4)
+        with self.assertRaises(ValueError):
+            MultiLaneSyncFIFO([("data", 32)], depth=1, lanes=4)
+
+    def credit_cdc_test(self, dut, clocks, n=128, valid_rand=0, ready_rand=0):
+        """Send n beats through dut, check them and return the read cycles between first/last beats."""
+        driver  = StreamDriver(dut.sink, valid_rand=valid_rand)
+        monitor = StreamMonitor(dut.source, ready_rand=ready_rand, fields=["data"])
+        for i in range(n):
+            driver.send(data=i)
+        cycles = []
+
+        def cycles_counter():
+            yield "passive"
+            while True:
+                if len(monitor.beats) > 0:
+                    cycles.append(len(monitor.beats))
+                yield
+
+        run_simulation(dut, {"write": [driver.generator()], "read": [monitor.generator(count=n), cycles_counter()]}, clocks)
+        self.assertEqual(monitor.beats, [{"data": i} for i in range(n)])
+        return cycles.index(n) - cycles.index(1)
+
+    def test_credit_async_fifo(self):
+        for credit_batch in [1, 4]:
+            for clocks in [{"write": 10, "read": 14}, {"write": 14, "read": 10}]:
+                with self.subTest(credit_batch=credit_batch, clocks=clocks):
+                    dut = CreditAsyncFIFO([("data", 8)], depth=8, credit_batch=credit_batch)
+                    self.credit_cdc_test(dut, clocks, valid_rand=30, ready_rand=30)
+
+    def test_credit_async_fifo_throughput(self):
+        # Line rate with get_cdc_min_depth depth, throttled with a shallow FIFO.
+        for credit_batch in [1, 4]:
+            depth  = get_cdc_min_depth(ratio=1.0, credit_batch=credit_batch)
+            cycles = self.credit_cdc_test(CreditAsyncFIFO([("data", 8)], depth, credit_batch), {"write": 10, "read": 10})
+            self.assertEqual(cycles, 127)
+            cycles = self.credit_cdc_test(CreditAsyncFIFO([("data", 8)], 4, credit_batch), {"write": 10, "read": 10})
+            self.assertGreater(cycles, 150)
+
+    def test_cdc_min_depth(self):
+        self.assertEqual(get_cdc_min_depth(), 8)
+        self.assertEqual(get_cdc_min_depth(credit_batch=4), 16)
+        self.assertEqual(get_cdc_min_depth(ratio=4.0), 4)
+        self.assertEqual(get_cdc_min_depth(ratio=1.0, latency=8), 32)
+        with self.assertRaises(ValueError):
+            get_cdc_min_depth(ratio=0)
+        with self.assertRaises(ValueError):
+            CreditAsyncFIFO([("data", 8)], depth=6)
+        with self.assertRaises(ValueError):
+            CreditAsyncFIFO([("data", 8)], depth=4, credit_batch=8)
+
+    def test_clock_domain_crossing_credit(self):
+        dut = ClockDomainCrossing([("data", 8)], cd_from="write", cd_to="read", mode="credit", ratio=14/10)
+        self.credit_cdc_test(dut, {"write": 10, "read": 14}, valid_rand=30, ready_rand=30)
+        with self.assertRaises(ValueError):
+            ClockDomainCrossing([("data", 8)], cd_from="write", cd_to="read", mode="lossy")
@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import unittest
+import random
 
 from migen import *
 
@@ -88,6 +89,41 @@ def wishbone_read_burst(bus, addrs, beat_cti=wishbone.CTI_BURST_INCREMENTING, bt
     yield
     return values
 
+
+def wishbone_pipelined_accesses(bus, accesses, timeout=1000):
+    """Issue (adr, dat_w or None for reads) requests back-to-back on a Pipelined bus.
+
+    Returns the list of read data/None (writes) responses and the cycles the requests were accepted.
+    """
+    responses = []
+    accepted  = []
+    pending   = 0
+    cycle     = 0
+    yield bus.cyc.eq(1)
+    yield bus.sel.eq(2**len(bus.sel) - 1)
+    requests = list(accesses)
+    while len(responses) < len(accesses):
+        if requests:
+            adr, dat_w = requests[0]
+            yield bus.stb.eq(1)
+            yield bus.adr.eq(adr)
+            yield bus.we.eq(dat_w is not None)
+            yield bus.dat_w.eq(dat_w or 0)
+        else:
+            yield bus.stb.eq(0)
+        yield
+        cycle += 1
+        assert cycle < timeout
+        if requests and not (yield bus.stall):
+            accepted.append(cycle)
+            requests.pop(0)
+        if (yield bus.ack):
+            responses.append((yield bus.dat_r) if accesses[len(responses)][1] is None else None)
+    yield bus.stb.eq(0)
+    yield bus.cyc.eq(0)
+    yield
+    return responses, accepted
+
 # TestWishbone -------------------------------------------------------------------------------------
 
 class TestWishbone(unittest.TestCase):
@@ -207,6 +243,57 @@ class TestWishbone(unittest.TestCase):
         dut = DUT()
         run_simulation(dut, generator(dut))
 
+    def test_wishbone2csr_posted_writes_and_read_ahead(self):
+        def timed(dut, transaction):
+            start = (yield dut.cycles)
+            value = yield from transaction
+            return value, (yield dut.cycles) - start
+
+        def generator(dut):
+            # Posted writes are acked immediately (and drained to the CSR bus in background).
+            duration = 0
+            for i in range(4):
+                _, cycles = yield from timed(dut, dut.wb.write(i, 0xa0 + i))
+                duration += cycles
+            self.assertEqual(duration, 4)
+
+            # Reads wait for the write FIFO to be drained.
+            self.assertEqual((yield from dut.wb.read(0)), 0xa0)
+
+            # Read-ahead of the next sub-register.
+            for i in range(1, 4):
+                yield
+                value, cycles = yield from timed(dut, dut.wb.read(i))
+                self.assertEqual(value,  0xa0 + i)
+                self.assertEqual(cycles, 1)
+            _, cycles = yield from timed(dut, dut.wb.read(8))
+            self.assertEqual(cycles, 2)
+
+            # Writes to the read-ahead sub-register are seen by the next read.
+            yield from dut.wb.write(9, 0x55)
+            self.assertEqual((yield from dut.wb.read(9)), 0x55)
+            self.assertEqual((yield from dut.wb.read(7)), 0x07)
+
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.wb  = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.csr = csr_bus.Interface(data_width=8, address_width=14, alignment=32)
+                self.submodules.bridge = wishbone.Wishbone2CSR(self.wb, self.csr,
+                    register      = False,
+                    posted_writes = 4,
+                    read_ahead    = True,
+                )
+                self.mem = Memory(8, 16, init=list(range(16)))
+                self.submodules.sram = csr_bus.SRAM(self.mem, 0, bus=self.csr)
+                self.cycles = Signal(32)
+                self.sync += self.cycles.eq(self.cycles + 1)
+
+        dut = DUT()
+        run_simulation(dut, generator(dut))
+
+        with self.assertRaises(ValueError):
+            wishbone.Wishbone2CSR(register=True, posted_writes=4)
+
     def test_converter_32_64_32(self):
         def generator(dut):
             yield from dut.wb32.write(0x0000, 0x12345678)
@@ -686,6 +773,44 @@ class TestWishboneArbiter(unittest.TestCase):
         self.assertEqual(m0_served, 8)
         self.assertEqual(m1_served, 8)
 
+    def policy_order_test(self, policy, priorities, n_accesses=8):
+        # Both masters issue back-to-back writes; return the order in which they are served.
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0     = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.m1     = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.target = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.arbiter = wishbone.Arbiter(
+                    masters    = [self.m0, self.m1],
+                    target     = self.target,
+                    mode       = "transaction",
+                    policy     = policy,
+                    priorities = priorities,
+                )
+                self.sram = wishbone.SRAM(64, bus=self.target)
+
+        dut   = DUT()
+        order = []
+
+        def master(bus, index):
+            for i in range(n_accesses):
+                yield from bus.write(16*index + i, i)
+                order.append(index)
+
+        run_simulation(dut, [master(dut.m0, 0), master(dut.m1, 1)])
+        return order
+
+    def test_priority_policy_serves_high_priority_master_first(self):
+        order = self.policy_order_test("priority", priorities=[0, 1])
+        # m0 is granted at reset, m1 then keeps the grant until done.
+        self.assertEqual(order[1:9], [1]*8)
+        self.assertEqual(sorted(order), [0]*8 + [1]*8)
+
+    def test_weighted_policy_shares_bandwidth_by_weight(self):
+        order = self.policy_order_test("weighted", priorities=[3, 1])
+        self.assertEqual(sorted(order), [0]*8 + [1]*8)
+        self.assertGreaterEqual(order[:8].count(0), 5)
+
 
 # Decoder ------------------------------------------------------------------------------------------
 
@@ -846,3 +971,286 @@ class TestWishboneInterconnectShared(unittest.TestCase):
             self.assertEqual((yield dut.shared.timeout.error), 1)
 
         run_simulation(dut, gen())
+
+
+    def test_register_slice(self):
+        class DUT(LiteXModule):
+            def __init__(self, stages):
+                self.m    = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.sram = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                self.rs   = wishbone.RegisterSlice(self.m, self.sram.bus, stages=stages)
+
+        def read_latency(bus, adr):
+            yield bus.adr.eq(adr)
+            yield bus.we.eq(0)
+            yield bus.cyc.eq(1)
+            yield bus.stb.eq(1)
+            yield
+            latency = 1
+            while not (yield bus.ack):
+                latency += 1
+                yield
+            data = (yield bus.dat_r)
+            yield bus.cyc.eq(0)
+            yield bus.stb.eq(0)
+            yield
+            return data, latency
+
+        latencies = {}
+        for stages in [1, 3]:
+            dut = DUT(stages)
+            def gen():
+                for i in range(8):
+                    yield from dut.m.write(i, 0x1000_0000 + i)
+                for i in range(8):
+                    data, latency = (yield from read_latency(dut.m, i))
+                    self.assertEqual(data, 0x1000_0000 + i)
+                    latencies[stages] = latency
+            run_simulation(dut, gen())
+        # Each stage adds 2 cycles of latency.
+        self.assertEqual(latencies[3] - latencies[1], 4)
+
+    def test_register_slice_parameters(self):
+        with self.assertRaises(ValueError):
+            wishbone.RegisterSlice(wishbone.Interface(pipelined=True), wishbone.Interface(pipelined=True))
+        with self.assertRaises(ValueError):
+            wishbone.RegisterSlice(wishbone.Interface(), wishbone.Interface(), stages=0)
+
+
+# Pipelined ----------------------------------------------------------------------------------------
+
+def make_pipelined_bus(data_width=32):
+    return wishbone.Interface(data_width=data_width, address_width=32, addressing="word", pipelined=True)
+
+class TestWishbonePipelined(unittest.TestCase):
+    def test_interface_like_preserves_pipelined(self):
+        clone = wishbone.Interface.like(make_pipelined_bus())
+        self.assertTrue(clone.pipelined)
+        self.assertTrue(hasattr(clone, "stall"))
+        self.assertFalse(hasattr(wishbone.Interface(), "stall"))
+
+    def test_sram_back_to_back(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.bus  = make_pipelined_bus()
+                self.sram = wishbone.SRAM(64, bus=self.bus)
+
+        dut = DUT()
+
+        def generator(dut):
+            writes = [(i, 0x1000 + i) for i in range(8)]
+            responses, accepted = yield from wishbone_pipelined_accesses(dut.bus, writes)
+            self.assertEqual(accepted, list(range(1, 9)))
+            responses, accepted = yield from wishbone_pipelined_accesses(dut.bus, [(i, None) for i in range(8)])
+            self.assertEqual(responses, [0x1000 + i for i in range(8)])
+            self.assertEqual(accepted, list(range(1, 9)))
+
+        run_simulation(dut, generator(dut))
+
+    def test_interface_read_write(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.bus  = make_pipelined_bus()
+                self.sram = wishbone.SRAM(64, bus=self.bus)
+
+        dut = DUT()
+
+        def generator(dut):
+            yield from dut.bus.write(0x03, 0xcafe_f00d)
+            self.assertEqual((yield from dut.bus.read(0x03)), 0xcafe_f00d)
+
+        run_simulation(dut, generator(dut))
+
+    def test_decoder_keeps_responses_in_order(self):
+        # Requests to a second slave are stalled until the first slave has returned its responses.
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.master = make_pipelined_bus()
+                s0          = make_pipelined_bus()
+                s1          = make_pipelined_bus()
+                self.sram0  = wishbone.SRAM(32, bus=s0, init=[0x0000 + i for i in range(8)])
+                self.sram1  = wishbone.SRAM(32, bus=s1, init=[0x1000 + i for i in range(8)])
+                self.decoder = wishbone.Decoder(self.master, [
+                    (lambda a: a[3] == 0, s0),
+                    (lambda a: a[3] == 1, s1),
+                ])
+
+        dut = DUT()
+
+        def generator(dut):
+            adrs = [0, 1, 8, 9, 2, 10]
+            responses, accepted = yield from wishbone_pipelined_accesses(dut.master, [(a, None) for a in adrs])
+            self.assertEqual(responses, [0x0000, 0x0001, 0x1000, 0x1001, 0x0002, 0x1002])
+            # Back-to-back within a slave, one bubble when switching slave.
+            self.assertEqual(accepted, [1, 2, 4, 5, 7, 9])
+
+        run_simulation(dut, generator(dut))
+
+    def test_interconnect_shared_two_masters(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0 = make_pipelined_bus()
+                self.m1 = make_pipelined_bus()
+                s0      = make_pipelined_bus()
+                s1      = make_pipelined_bus()
+                self.sram0 = wishbone.SRAM(32, bus=s0)
+                self.sram1 = wishbone.SRAM(32, bus=s1)
+                self.shared = wishbone.InterconnectShared(
+                    masters = [self.m0, self.m1],
+                    slaves  = [
+                        (lambda a: a[3] == 0, s0),
+                        (lambda a: a[3] == 1, s1),
+                    ],
+                    timeout_cycles = 1024,
+                    arbiter        = "transaction",
+                )
+
+        dut = DUT()
+
+        def m0_workflow():
+            writes = [(0x00, 0xaa00), (0x01, 0xaa01), (0x08, 0xaa08)]
+            yield from wishbone_pipelined_accesses(dut.m0, writes)
+            responses, _ = yield from wishbone_pipelined_accesses(dut.m0, [(a, None) for a, _ in writes])
+            self.assertEqual(responses, [v for _, v in writes])
+
+        def m1_workflow():
+            writes = [(0x04, 0xbb04), (0x0c, 0xbb0c), (0x0d, 0xbb0d)]
+            yield from wishbone_pipelined_accesses(dut.m1, writes)
+            responses, _ = yield from wishbone_pipelined_accesses(dut.m1, [(a, None) for a, _ in writes])
+            self.assertEqual(responses, [v for _, v in writes])
+
+        run_simulation(dut, [m0_workflow(), m1_workflow()])
+
+    def test_interconnect_rejects_mixed_pipelining(self):
+        with self.assertRaises(ValueError):
+            wishbone.InterconnectShared(
+                masters = [make_pipelined_bus()],
+                slaves  = [(lambda a: 1, wishbone.Interface(data_width=32, address_width=32, addressing="word"))],
+            )
+
+    def test_converter_pipelined_classic(self):
+        # Pipelined 64-bit master to Classic 32-bit SRAM and Classic master to Pipelined SRAM.
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.m0 = make_pipelined_bus(data_width=64)
+                s0      = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.m1 = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                s1      = make_pipelined_bus()
+                self.converter0 = wishbone.Converter(self.m0, s0)
+                self.converter1 = wishbone.Converter(self.m1, s1)
+                self.sram0 = wishbone.SRAM(64, bus=s0)
+                self.sram1 = wishbone.SRAM(64, bus=s1)
+
+        dut = DUT()
+
+        def m0_workflow():
+            writes = [(0, 0x1111_1111_0000_0000), (1, 0x3333_3333_2222_2222)]
+            yield from wishbone_pipelined_accesses(dut.m0, writes)
+            responses, _ = yield from wishbone_pipelined_accesses(dut.m0, [(0, None), (1, None)])
+            self.assertEqual(responses, [v for _, v in writes])
+            self.assertEqual((yield dut.sram0.mem[3]), 0x3333_3333)
+
+        def m1_workflow():
+            yield from dut.m1.write(0x05, 0x5555_5555)
+            yield from dut.m1.write(0x06, 0x6666_6666)
+            self.assertEqual((yield from dut.m1.read(0x05)), 0x5555_5555)
+            self.assertEqual((yield from dut.m1.read(0x06)), 0x6666_6666)
+
+        run_simulation(dut, [m0_workflow(), m1_workflow()])
+
+# Cache --------------------------------------------------------------------------------------------
+
+class TestWishboneSetAssociativeCache(unittest.TestCase):
+    def cache_test(self, ways=4, replacement="lru", write_through=False, prefetch=False,
+        slave_data_width=128, cachesize=64, accesses=None, check=None):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.master = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.slave  = wishbone.Interface(data_width=slave_data_width, address_width=32, addressing="word")
+                self.cache  = wishbone.SetAssociativeCache(
+                    cachesize     = cachesize,
+                    master        = self.master,
+                    slave         = self.slave,
+                    ways          = ways,
+                    replacement   = replacement,
+                    write_through = write_through,
+                    prefetch      = prefetch,
+                    with_csr      = True,
+                )
+                self.sram = wishbone.SRAM(1024*4, bus=self.slave)
+
+        dut = DUT()
+        if accesses is None:
+            prng     = random.Random(42)
+            # Conflicting addresses (same sets) to exercise replacement/evictions.
+            adrs     = [prng.choice([0, 1, 2, 3]) + 64*prng.randrange(12) for _ in range(64)]
+            accesses = [(prng.randrange(2), adr, prng.randrange(2**32)) for adr in adrs]
+        errors   = []
+        counters = {}
+
+        def generator():
+            model = {}
+            for we, adr, data in accesses:
+                if we:
+                    yield from dut.master.write(adr, data)
+                    model[adr] = data
+                else:
+                    value = (yield from dut.master.read(adr))
+                    if value != model.get(adr, 0):
+                        errors.append((adr, value, model.get(adr, 0)))
+            for _ in range(32):
+                yield
+            for name in ["hits", "misses", "evictions", "prefetches"]:
+                counters[name] = (yield getattr(dut.cache, "_" + name).status)
+            if check is not None:
+                yield from check(dut)
+
+        run_simulation(dut, generator())
+        self.assertEqual(errors, [])
+        return dut, counters
+
+    def test_ways_and_replacements(self):
+        for ways in [2, 4, 8]:
+            for replacement in ["lru", "plru", "random"]:
+                with self.subTest(ways=ways, replacement=replacement):
+                    _, counters = self.cache_test(ways=ways, replacement=replacement)
+                    self.assertEqual(counters["hits"] + counters["misses"], 64)
+                    self.assertGreater(counters["evictions"], 0)
+
+    def test_associativity_avoids_conflict_misses(self):
+        # 4 lines mapping to the same set: thrash a 2-way cache, fit in a 4-way cache.
+        accesses = [(0, 64*(i % 4), 0) for i in range(16)]
+        _, counters_2 = self.cache_test(ways=2, accesses=accesses)
+        _, counters_4 = self.cache_test(ways=4, accesses=accesses)
+        self.assertEqual(counters_2["misses"], 16)
+        self.assertEqual(counters_4["misses"], 4)
+        self.assertEqual(counters_4["hits"],   12)
+
+    def test_write_through(self):
+        dut, counters = self.cache_test(write_through=True)
+        self.assertEqual(counters["evictions"], 0)
+
+    def test_write_through_updates_slave(self):
+        values = []
+        def check(dut):
+            values.append((yield dut.sram.mem[1]))
+        self.cache_test(write_through=True, accesses=[(1, 5, 0x1234_5678)], check=check)
+        self.assertIn(0x1234_5678, [(values[0] >> 32*i) & 0xffff_ffff for i in range(4)])
+
+    def test_narrow_slave(self):
+        self.cache_test(slave_data_width=16)
+
+    def test_prefetch_sequential_reads(self):
+        accesses = [(0, 4*i + j, 0) for i in range(8) for j in range(4)]
+        _, counters = self.cache_test(prefetch=True, accesses=accesses)
+        self.assertGreater(counters["prefetches"], 0)
+        self.assertLess(counters["misses"], 8)
+        self.assertEqual(counters["hits"] + counters["misses"], 32)
+
+    def test_rejects_unsupported_parameters(self):
+        master = wishbone.Interface(data_width=32, address_width=32)
+        slave  = wishbone.Interface(data_width=128, address_width=32)
+        with self.assertRaises(ValueError):
+            wishbone.SetAssociativeCache(64, master, slave, ways=3)
+        with self.assertRaises(ValueError):
+            wishbone.SetAssociativeCache(64, master, slave, replacement="fifo")
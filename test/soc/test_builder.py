@@ -20,6 +20,7 @@ from unittest.mock import Mock, patch
 from litex.soc.integration.builder import Builder, builder_argdict, builder_args
 from litex.soc.integration.soc import SoCRegion
 from litex.build.log import buffer_build_log, start_build_log, stop_build_log
+from litex.build.sim.verilator import SimVerilatorToolchain
 
 
 class _FakePlatform:
@@ -194,6 +195,24 @@ class TestBuilderArguments(unittest.TestCase):
 
         self.assertIn("--build --no-compile", stdout.getvalue())
 
+    def test_force_rebuild_option_is_mapped(self):
+        self.assertFalse(_make_argdict()["force_rebuild"])
+        self.assertTrue(_make_argdict("--force-rebuild")["force_rebuild"])
+
+    def test_artifact_cache_option_is_mapped(self):
+        self.assertIsNone(_make_argdict()["artifact_cache"])
+        self.assertEqual(_make_argdict("--artifact-cache", "cache/gateware")["artifact_cache"], "cache/gateware")
+
+    def test_software_cache_option_is_mapped(self):
+        self.assertIsNone(_make_argdict()["software_cache"])
+        self.assertEqual(
+            _make_argdict("--software-cache", "https://cache.example.com/software")["software_cache"],
+            "https://cache.example.com/software")
+
+    def test_export_only_option_is_mapped(self):
+        self.assertFalse(_make_argdict()["export_only"])
+        self.assertTrue(_make_argdict("--export-only")["export_only"])
+
     def test_build_bundle_options_are_mapped(self):
         default  = _make_argdict()
         explicit = _make_argdict(
@@ -539,6 +558,7 @@ class TestBuilderRomSoftware(unittest.TestCase):
             builder = object.__new__(Builder)
             builder.software_dir       = tmp_dir
             builder.compile_software   = True
+            builder.software_cache     = None
             builder.software_packages  = [
                 ("libbase", os.path.join(tmp_dir, "libbase_src")),
                 ("bios",    os.path.join(tmp_dir, "bios_src")),
@@ -554,6 +574,82 @@ class TestBuilderRomSoftware(unittest.TestCase):
                 "-f", os.path.join(tmp_dir, "libbase_src", "Makefile"),
             ])
 
+    def test_generate_rom_software_reuses_packages_from_software_cache(self):
+        def make(command):
+            dst_dir = command[3]
+            os.makedirs(os.path.join(dst_dir, "obj"), exist_ok=True)
+            with open(os.path.join(dst_dir, "obj", os.path.basename(dst_dir) + ".a"), "w") as f:
+                f.write("compiled")
+
+        def make_builder(tmp_dir, build_name):
+            builder = object.__new__(Builder)
+            builder.software_dir       = os.path.join(tmp_dir, build_name, "software")
+            builder.compile_software   = True
+            builder.software_cache     = os.path.join(tmp_dir, "cache")
+            builder.software_packages  = [
+                ("libbase", os.path.join(tmp_dir, "libbase_src")),
+                ("bios",    os.path.join(tmp_dir, "bios_src")),
+            ]
+            builder._prepare_rom_software()
+            return builder
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["libbase_src", "bios_src"]:
+                os.makedirs(os.path.join(tmp_dir, name))
+                with open(os.path.join(tmp_dir, name, "main.c"), "w") as f:
+                    f.write(name)
+
+            with patch.object(Builder, "_get_software_cache_key", return_value="key"):
+                with patch("litex.soc.integration.builder.subprocess.check_call", side_effect=make) as first:
+                    make_builder(tmp_dir, "first")._generate_rom_software()
+                with patch("litex.soc.integration.builder.subprocess.check_call", side_effect=make) as second:
+                    make_builder(tmp_dir, "second")._generate_rom_software()
+
+                # Changing a package source only rebuilds this package and the following ones.
+                with open(os.path.join(tmp_dir, "bios_src", "main.c"), "w") as f:
+                    f.write("changed")
+                with patch("litex.soc.integration.builder.subprocess.check_call", side_effect=make) as third:
+                    make_builder(tmp_dir, "second")._generate_rom_software()
+
+            self.assertEqual(first.call_count, 2)
+            self.assertEqual(second.call_count, 0)
+            self.assertEqual(third.call_count, 1)
+            self.assertIn(os.path.join(tmp_dir, "second", "software", "bios"), third.call_args[0][0])
+            with open(os.path.join(tmp_dir, "second", "software", "libbase", "obj", "libbase.a")) as f:
+                self.assertEqual(f.read(), "compiled")
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, "second", "software", "bios", ".litex_software_cache")))
+
+    def test_generate_rom_software_without_cache_removes_restored_packages(self):
+        restored = []
+
+        def make(command):
+            dst_dir = command[3]
+            restored.append(os.listdir(dst_dir))
+            with open(os.path.join(dst_dir, "libbase.a"), "w") as f:
+                f.write("compiled")
+
+        def make_builder(tmp_dir, build_name, software_cache):
+            builder = object.__new__(Builder)
+            builder.software_dir       = os.path.join(tmp_dir, build_name, "software")
+            builder.compile_software   = True
+            builder.software_cache     = software_cache
+            builder.software_packages  = [("libbase", os.path.join(tmp_dir, "libbase_src"))]
+            builder._prepare_rom_software()
+            return builder
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "libbase_src"))
+            cache = os.path.join(tmp_dir, "cache")
+            with patch.object(Builder, "_get_software_cache_key", return_value="key"):
+                with patch("litex.soc.integration.builder.subprocess.check_call", side_effect=make):
+                    make_builder(tmp_dir, "first",  cache)._generate_rom_software()
+                    make_builder(tmp_dir, "second", cache)._generate_rom_software()
+                    # Objects/dependencies restored from the first build directory are not reused.
+                    make_builder(tmp_dir, "second", None)._generate_rom_software()
+                    make_builder(tmp_dir, "second", None)._generate_rom_software()
+
+            self.assertEqual(restored, [[], [], ["libbase.a"]])
+
     def test_generate_rom_software_is_noop_when_software_compile_is_disabled(self):
         builder = object.__new__(Builder)
         builder.software_dir       = "software"
@@ -775,6 +871,47 @@ class TestBuilderBuild(unittest.TestCase):
             self.assertEqual(kwargs["build_backend"], "edalize")
             self.assertEqual(kwargs["build_name"], "top")
 
+    def test_build_forwards_force_rebuild_only_to_supporting_toolchains(self):
+        class _IncrementalToolchain:
+            def build(self, platform, fragment, force_rebuild=False, **kwargs):
+                pass
+
+        for toolchain, forwarded in [(_IncrementalToolchain(), True), (SimVerilatorToolchain(), False)]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                soc     = _BuildableFakeSoC()
+                builder = _make_builder(tmp_dir, soc=soc, compile_software=False, force_rebuild=True)
+                soc.platform.toolchain = toolchain
+
+                builder._generate_includes = Mock()
+                builder._generate_csr_map  = Mock()
+                with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                    builder.build()
+
+                _, kwargs = soc.build_calls[0]
+                self.assertEqual("force_rebuild" in kwargs, forwarded)
+                self.assertEqual("force_rebuild ignored" in stdout.getvalue(), not forwarded)
+
+    def test_build_forwards_artifact_cache_only_to_supporting_toolchains(self):
+        class _CachingToolchain:
+            def build(self, platform, fragment, artifact_cache=None, extra_artifacts=None, **kwargs):
+                pass
+
+        for toolchain, forwarded in [(_CachingToolchain(), True), (SimVerilatorToolchain(), False)]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                soc     = _BuildableFakeSoC()
+                builder = _make_builder(tmp_dir, soc=soc, compile_software=False, artifact_cache=tmp_dir)
+                soc.platform.toolchain = toolchain
+
+                builder._generate_includes = Mock()
+                builder._generate_csr_map  = Mock()
+                with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                    builder.build()
+
+                _, kwargs = soc.build_calls[0]
+                self.assertEqual("artifact_cache"  in kwargs, forwarded)
+                self.assertEqual("extra_artifacts" in kwargs, forwarded)
+                self.assertEqual("artifact_cache ignored" in stdout.getvalue(), not forwarded)
+
     def test_build_without_cpu_does_not_add_bios_or_create_software_dir(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             soc     = _NoBiosBuildableFakeSoC()
@@ -911,6 +1048,27 @@ class TestBuilderBuild(unittest.TestCase):
                 "sphinx-build", "-M", "html", doc_dir, os.path.join(doc_dir, "_build")
             ])
 
+    def test_build_export_only_stops_before_software_and_gateware(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            soc     = _InitMemsFakeSoC()
+            builder = _make_builder(tmp_dir, soc=soc, export_only=True)
+
+            builder._generate_includes     = Mock()
+            builder._generate_csr_map      = Mock()
+            builder._create_build_bundle   = Mock()
+            builder._generate_rom_software = Mock()
+            vns = builder.build()
+
+            self.assertIsNone(vns)
+            self.assertEqual(soc.finalized, 1)
+            builder._generate_includes.assert_called_once_with(with_bios=True)
+            builder._generate_csr_map.assert_called_once_with()
+            builder._create_build_bundle.assert_not_called()
+            builder._generate_rom_software.assert_not_called()
+            self.assertEqual(soc.init_mems_calls, [])
+            self.assertEqual(soc.build_calls, [])
+            self.assertEqual(soc.exit_calls,  [])
+
     def test_build_removes_software_dir_when_variables_change(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             soc     = _BuildableFakeSoC()
@@ -13,12 +13,15 @@ import unittest
 from contextlib import contextmanager
 from types import SimpleNamespace
 
-from migen import ClockDomain, Record, Signal
+from migen import ClockDomain, If, Record, Signal
 from migen.sim import run_simulation
 
+from litex.gen import LiteXModule
+
 from litex.soc.cores.hyperbus import HyperRAM
 from litex.soc.cores.video import video_framebuffer_size
 from litex.soc.interconnect import axi, wishbone
+from litex.soc.interconnect.csr import CSRStatus, CSRStorage
 
 from litex.soc.integration.soc import (
     LiteXSoC,
@@ -336,6 +339,150 @@ class TestSoCBusHandler(unittest.TestCase):
         with _assert_raises_soc_error(self):
             SoCBusHandler(standard="axi", arbiter="transaction")
 
+    def test_bus_arbiter_id_is_axi_only(self):
+        self.assertEqual(SoCBusHandler(standard="axi", arbiter="id").arbiter, "id")
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="wishbone", arbiter="id")
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="axi-lite", arbiter="id")
+
+    def test_bus_arbiter_policies_use_master_priorities(self):
+        from litex.gen.genlib.arbiter import PriorityArbiter, WeightedRoundRobin
+        for arbiter, cls in [("priority", PriorityArbiter), ("weighted", WeightedRoundRobin)]:
+            class DUT(LiteXModule):
+                def __init__(self):
+                    self.bus  = SoCBusHandler(standard="wishbone", arbiter=arbiter)
+                    self.m0   = wishbone.Interface(data_width=32, address_width=32)
+                    self.m1   = wishbone.Interface(data_width=32, address_width=32)
+                    self.sram = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                    self.bus.add_master("m0", self.m0)
+                    self.bus.add_master("m1", self.m1, priority=3)
+                    self.bus.add_slave("sram", self.sram.bus, SoCRegion(origin=0x1000, size=0x100))
+
+            dut = DUT()
+            dut.finalize()
+            self.assertEqual(dut.bus.master_priorities, {"m0": None, "m1": 3})
+            self.assertIsInstance(dut.bus._interconnect.arbiter.rr, cls)
+
+            def generator():
+                yield from dut.m0.write(0x1004//4, 0x1234_5678)
+                self.assertEqual((yield from dut.m1.read(0x1004//4)), 0x1234_5678)
+
+            run_simulation(dut, generator())
+
+    def test_bus_tree_decoders(self):
+        from litex.gen.genlib.decoder import TreeDecoder
+        for decoder, register in [("tree", False), ("priority", False), ("tree", True)]:
+            class DUT(LiteXModule):
+                def __init__(self):
+                    self.bus   = SoCBusHandler(standard="wishbone", decoder=decoder, decoder_register=register)
+                    self.m0    = wishbone.Interface(data_width=32, address_width=32)
+                    self.sram0 = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                    self.sram1 = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                    self.bus.add_master("m0", self.m0)
+                    self.bus.add_slave("sram0", self.sram0.bus, SoCRegion(origin=0x1000, size=0x100))
+                    self.bus.add_slave("sram1", self.sram1.bus, SoCRegion(origin=0x2000, size=0x100))
+
+            dut = DUT()
+            dut.finalize()
+            self.assertIsInstance(dut.bus.tree_decoder, TreeDecoder)
+            self.assertEqual(dut.bus.tree_decoder.latency, int(register))
+
+            def generator():
+                yield from dut.m0.write(0x1004//4, 0x1234_5678)
+                yield from dut.m0.write(0x2004//4, 0xcafe_f00d)
+                self.assertEqual((yield from dut.m0.read(0x1004//4)), 0x1234_5678)
+                self.assertEqual((yield from dut.m0.read(0x2004//4)), 0xcafe_f00d)
+
+            run_simulation(dut, generator())
+
+    def test_bus_pipeline_inserts_register_slices(self):
+        for standard in ["wishbone", "axi-lite"]:
+            class DUT(LiteXModule):
+                def __init__(self):
+                    self.bus = SoCBusHandler(standard=standard, pipeline=1)
+                    if standard == "wishbone":
+                        self.m0    = wishbone.Interface(data_width=32, address_width=32)
+                        self.sram0 = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                        self.sram1 = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                    else:
+                        self.m0    = axi.AXILiteInterface(data_width=32, address_width=32)
+                        self.sram0 = axi.AXILiteSRAM(0x100, bus=axi.AXILiteInterface(data_width=32, address_width=32))
+                        self.sram1 = axi.AXILiteSRAM(0x100, bus=axi.AXILiteInterface(data_width=32, address_width=32))
+                    self.bus.add_master("m0", self.m0, pipeline=1)
+                    self.bus.add_slave("sram0", self.sram0.bus, SoCRegion(origin=0x1000, size=0x100))
+                    self.bus.add_slave("sram1", self.sram1.bus, SoCRegion(origin=0x2000, size=0x100, pipeline=0))
+
+            dut = DUT()
+            dut.finalize()
+            slice_cls = {"wishbone": wishbone.RegisterSlice, "axi-lite": axi.AXILiteRegisterSlice}[standard]
+            slices    = [m for _, m in dut.bus._submodules if isinstance(m, slice_cls)]
+            # Master + sram0 (Bus default), sram1 disabled by its Region.
+            self.assertEqual(len(slices), 2)
+
+            def generator():
+                for adr, value in [(0x1004, 0x1234_5678), (0x2008, 0xcafe_f00d)]:
+                    if standard == "wishbone":
+                        yield from dut.m0.write(adr//4, value)
+                        self.assertEqual((yield from dut.m0.read(adr//4)), value)
+                    else:
+                        yield from dut.m0.write(adr, value)
+                        self.assertEqual((yield from dut.m0.read(adr)), (value, 0))
+
+            run_simulation(dut, generator())
+
+    def test_bus_pipeline_parameters(self):
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="wishbone", pipelined=True, pipeline=1)
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="wishbone", pipeline=-1)
+        with _assert_raises_soc_error(self):
+            SoCRegion(origin=0x1000, size=0x100, pipeline="2")
+        bus = SoCBusHandler(standard="wishbone")
+        with _assert_raises_soc_error(self):
+            bus.add_master("m0", wishbone.Interface(), pipeline=-1)
+
+    def test_bus_decoder_register_is_wishbone_only(self):
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="axi-lite", decoder="tree", decoder_register=True)
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="wishbone", decoder="lut")
+
+    def test_bus_master_priority_must_be_positive(self):
+        bus = SoCBusHandler(standard="wishbone", arbiter="priority")
+        with _assert_raises_soc_error(self):
+            bus.add_master("m0", wishbone.Interface(data_width=32, address_width=32), priority=-1)
+        self.assertNotIn("m0", bus.masters)
+
+    def test_pipelined_bus_is_wishbone_only(self):
+        self.assertTrue(SoCBusHandler(standard="wishbone", pipelined=True).pipelined)
+        with _assert_raises_soc_error(self):
+            SoCBusHandler(standard="axi", pipelined=True)
+
+    def test_pipelined_bus_bridges_classic_interfaces(self):
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.bus    = SoCBusHandler(standard="wishbone", pipelined=True)
+                self.master = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.sram0  = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32, pipelined=True))
+                self.sram1  = wishbone.SRAM(0x100, bus=wishbone.Interface(data_width=32, address_width=32))
+                self.bus.add_master("master", self.master)
+                self.bus.add_slave("sram0", self.sram0.bus, SoCRegion(origin=0x0000, size=0x100))
+                self.bus.add_slave("sram1", self.sram1.bus, SoCRegion(origin=0x1000, size=0x100))
+
+        dut = DUT()
+        self.assertTrue(dut.bus.masters["master"].pipelined)
+        self.assertIs(dut.bus.slaves["sram0"], dut.sram0.bus)
+        self.assertTrue(dut.bus.slaves["sram1"].pipelined)
+
+        def generator():
+            yield from dut.master.write(0x0004//4, 0x1234_5678)
+            yield from dut.master.write(0x1008//4, 0x9abc_def0)
+            self.assertEqual((yield from dut.master.read(0x0004//4)), 0x1234_5678)
+            self.assertEqual((yield from dut.master.read(0x1008//4)), 0x9abc_def0)
+
+        run_simulation(dut, generator())
+
     def test_address_width_conversion_between_bus_standards(self):
         wishbone_bus = SoCBusHandler(standard="wishbone", data_width=32, address_width=32)
         axi_bus      = SoCBusHandler(standard="axi",      data_width=64, address_width=32)
@@ -1091,6 +1238,109 @@ class TestSoC(unittest.TestCase):
         self.assertIn("csr", soc.bus.slaves)
         self.assertIn("csr", soc.csr.masters)
 
+    def test_csr_bridge_posted_writes_and_read_ahead(self):
+        class Registers(LiteXModule):
+            def __init__(self):
+                self.reg0   = CSRStorage(32, reset=0x1234_5678)
+                self.reg1   = CSRStorage(32, reset=0x9abc_def0)
+                self.status = CSRStatus(8, reset=0x5a)
+                self.reads  = Signal(8)
+                self.sync += If(self.status.we, self.reads.eq(self.reads + 1))
+
+        class DUT(SoC):
+            def __init__(self):
+                SoC.__init__(self, _FakePlatform(), sys_clk_freq=1e6, csr_data_width=8,
+                    csr_posted_writes = 4,
+                    csr_read_ahead    = True,
+                )
+                self.mem_map["csr"] = 0x0000_0000
+                self.bus.add_region("io", SoCIORegion(origin=0x0000_0000, size=2**self.bus.address_width))
+                self.master = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+                self.bus.add_master("master", self.master)
+                self.registers = Registers()
+                self.cycles    = Signal(32)
+                self.sync += self.cycles.eq(self.cycles + 1)
+
+        # CSR Bridge created by the SoC (on finalize).
+        dut = DUT()
+        dut.finalize()
+        self.assertEqual(dut.csr_bridge.write_fifo.depth, 4)
+        base = dut.csr.regions["registers"].origin//4
+
+        def timed(transaction):
+            start = (yield dut.cycles)
+            value = yield from transaction
+            return value, (yield dut.cycles) - start
+
+        def read_words(adr, n, idle=0):
+            values, cycles = [], []
+            for i in range(n):
+                for _ in range(idle):
+                    yield
+                value, duration = yield from timed(dut.master.read(adr + i))
+                values.append(value)
+                cycles.append(duration)
+            return values, cycles
+
+        def generator():
+            yield dut.master.sel.eq(0b1111)
+
+            # Back-to-back multi-word reads: the sub-register following a pre-read one is read ahead
+            # (1-cycle ack) and all of them are read ahead with an idle cycle between the reads.
+            values, cycles = yield from read_words(base, 8)
+            self.assertEqual(values, [0x12, 0x34, 0x56, 0x78, 0x9a, 0xbc, 0xde, 0xf0])
+            self.assertEqual(cycles, [1, 2, 1, 2, 1, 2, 1, 2])
+            values, cycles = yield from read_words(base + 4, 4, idle=1)
+            self.assertEqual(values, [0x9a, 0xbc, 0xde, 0xf0])
+            self.assertEqual(cycles, [2, 1, 1, 1])
+
+            # Read strobes are still pulsed on read-ahead hits.
+            yield from dut.master.read(base + 7)
+            yield
+            self.assertEqual((yield from timed(dut.master.read(base + 8))), (0x5a, 1))
+            yield
+            self.assertEqual((yield dut.registers.reads), 1)
+
+            # Posted writes are acked immediately, reads wait for them to be written.
+            cycles = 0
+            for i, value in enumerate([0xca, 0xfe, 0xf0, 0x0d]):
+                _, duration = yield from timed(dut.master.write(base + i, value))
+                cycles += duration
+            self.assertEqual(cycles, 4)
+            values, _ = yield from read_words(base, 4)
+            self.assertEqual(values, [0xca, 0xfe, 0xf0, 0x0d])
+            self.assertEqual((yield dut.registers.reg0.storage), 0xcafe_f00d)
+
+            # Writes to the read-ahead sub-register invalidate the pre-read data.
+            yield from dut.master.read(base + 4)
+            yield
+            yield from dut.master.write(base + 5, 0x55)
+            self.assertEqual((yield from dut.master.read(base + 5)), 0x55)
+
+        run_simulation(dut, generator())
+
+    def test_csr_bridge_segments_latency(self):
+        for bus_standard, bridge_cls in [("wishbone", wishbone.Wishbone2CSR), ("axi-lite", axi.AXILite2CSR)]:
+            soc = SoC(_FakePlatform(), sys_clk_freq=1e6, bus_standard=bus_standard, csr_segments=4, csr_segment_register=True)
+            soc.bus.add_region("io", SoCIORegion(origin=0x00000000, size=2**soc.bus.address_width))
+            soc.add_csr_bridge(origin=0x00000000)
+
+            self.assertEqual(soc.csr.latency, 2)
+            self.assertIsInstance(soc.csr_bridge, bridge_cls)
+            self.assertIn("WAIT" if bus_standard == "wishbone" else "WAIT-READ-RESPONSE", soc.csr_bridge.fsm.actions)
+
+        # Segments are not registered by default: no additional read latency.
+        soc = SoC(_FakePlatform(), sys_clk_freq=1e6, csr_segments=4)
+        self.assertEqual(soc.csr.latency, 0)
+
+    def test_csr_segments_parameters(self):
+        with _assert_raises_soc_error(self):
+            SoC(_FakePlatform(), sys_clk_freq=1e6, csr_segments=3)
+        with _assert_raises_soc_error(self):
+            SoC(_FakePlatform(), sys_clk_freq=1e6, csr_segments=64)
+        with _assert_raises_soc_error(self):
+            SoC(_FakePlatform(), sys_clk_freq=1e6, csr_segments=2, csr_segment_register=True, csr_read_ahead=True)
+
     def test_finalize_bus_requires_csr_origin(self):
         soc = SoC(_FakePlatform(), sys_clk_freq=1e6)
 
@@ -0,0 +1,76 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+from types import SimpleNamespace
+
+from litex.tools.litex_stream_profiler import find_profilers, read_profiler, reset_profiler, format_profiler
+
+
+class FakeRegister:
+    def __init__(self, value=0):
+        self.value  = value
+        self.writes = []
+
+    def read(self):
+        return self.value
+
+    def write(self, value):
+        self.writes.append(value)
+
+
+def fake_regs(name, values, bins=None):
+    regs = SimpleNamespace()
+    setattr(regs, f"{name}_reset", FakeRegister())
+    setattr(regs, f"{name}_latch", FakeRegister())
+    for counter, value in values.items():
+        setattr(regs, f"{name}_{counter}", FakeRegister(value))
+    for i, value in enumerate(bins or []):
+        setattr(regs, f"{name}_latency_bin{i}", FakeRegister(value))
+    return regs
+
+
+class TestLiteXStreamProfiler(unittest.TestCase):
+    counters = {"cycles": 1000, "transfers": 500, "backpressure": 250, "starvation": 100, "packets": 10}
+
+    def test_find_profilers(self):
+        regs = fake_regs("dma_profiler", self.counters)
+        regs.ctrl_scratch = FakeRegister()
+        self.assertEqual(find_profilers(regs), ["dma_profiler"])
+        self.assertEqual(find_profilers(regs, filter="eth"), [])
+
+    def test_read_profiler(self):
+        regs  = fake_regs("dma_profiler", self.counters)
+        stats = read_profiler(regs, "dma_profiler")
+        self.assertEqual(regs.dma_profiler_latch.writes, [1])
+        self.assertEqual(stats, self.counters)
+        reset_profiler(regs, "dma_profiler")
+        self.assertEqual(regs.dma_profiler_reset.writes, [1])
+
+    def test_read_profiler_latency(self):
+        latency = {"latency_count": 10, "latency_min": 4, "latency_max": 40, "latency_sum": 120}
+        regs    = fake_regs("dma_profiler", dict(self.counters, **latency), bins=[0, 6, 3, 1])
+        stats   = read_profiler(regs, "dma_profiler")
+        self.assertEqual(stats["latency_bins"], [0, 6, 3, 1])
+        report = format_profiler("dma_profiler", stats)
+        self.assertIn("50.00% utilization", report)
+        self.assertIn("backpressure : 250 (25.00%)", report)
+        self.assertIn("starvation   : 100 (10.00%)", report)
+        self.assertIn("idle         : 150 (15.00%)", report)
+        self.assertIn("min 4 / avg 12.00 / max 40 cycles (10 packets)", report)
+        self.assertIn("60.00%", report)
+        self.assertNotIn("unmeasured", report)
+
+    def test_read_profiler_latency_overflows(self):
+        latency = {"latency_count": 10, "latency_min": 4, "latency_max": 40, "latency_sum": 120, "latency_overflows": 3}
+        regs    = fake_regs("dma_profiler", dict(self.counters, **latency), bins=[0, 6, 3, 1])
+        stats   = read_profiler(regs, "dma_profiler")
+        self.assertEqual(stats["latency_overflows"], 3)
+        self.assertIn("unmeasured   : 3 packets", format_profiler("dma_profiler", stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#
+# This file is part of LiteX.
+#
+# Copyright (c) 2026 LiteX Authors
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+from types import SimpleNamespace
+
+from litex.tools.litex_stream_traffic import find_generators, find_checkers, run_traffic, bandwidth, format_results
+
+
+class FakeRegister:
+    def __init__(self, value=0):
+        self.value  = value
+        self.writes = []
+
+    def read(self):
+        return self.value
+
+    def write(self, value):
+        self.writes.append(value)
+
+
+class RampRegister(FakeRegister):
+    def __init__(self, values):
+        FakeRegister.__init__(self)
+        self.values = list(values)
+
+    def read(self):
+        if len(self.values) > 1:
+            return self.values.pop(0)
+        return self.values[0]
+
+
+def fake_regs(values):
+    regs = SimpleNamespace()
+    for name in ["enable", "prbs", "length", "length_mask", "gap", "count"]:
+        setattr(regs, f"traffic_gen_{name}", FakeRegister())
+    for name in ["reset", "prbs"]:
+        setattr(regs, f"traffic_chk_{name}", FakeRegister())
+    regs.traffic_gen_done = FakeRegister(1)
+    for name, value in values.items():
+        setattr(regs, f"traffic_gen_{name}", FakeRegister(value))
+        setattr(regs, f"traffic_chk_{name}", FakeRegister(value))
+    regs.traffic_chk_errors     = FakeRegister(0)
+    regs.traffic_chk_seq_errors = FakeRegister(0)
+    return regs
+
+
+class TestLiteXStreamTraffic(unittest.TestCase):
+    counters = {"packets": 16, "bytes": 16*64*8, "cycles": 1280}
+
+    def test_find(self):
+        regs = fake_regs(self.counters)
+        regs.ctrl_scratch = FakeRegister()
+        self.assertEqual(find_generators(regs), ["traffic_gen"])
+        self.assertEqual(find_checkers(regs), ["traffic_chk"])
+        self.assertEqual(find_generators(regs, filter="eth"), [])
+
+    def test_run_traffic(self):
+        regs  = fake_regs(self.counters)
+        stats = run_traffic(regs, "traffic_gen", "traffic_chk", length=64, gap=16, count=16, prbs=False)
+        self.assertEqual(regs.traffic_gen_enable.writes, [0, 1, 0])
+        self.assertEqual(regs.traffic_gen_length.writes, [64])
+        self.assertEqual(regs.traffic_gen_gap.writes,    [16])
+        self.assertEqual(regs.traffic_gen_prbs.writes,   [0])
+        self.assertEqual(regs.traffic_chk_reset.writes,  [1])
+        self.assertEqual(stats["generator"], self.counters)
+        self.assertEqual(stats["checker"], dict(self.counters, errors=0, seq_errors=0))
+        with self.assertRaises(ValueError):
+            run_traffic(regs, "traffic_gen", count=0)
+
+    def test_run_traffic_timeout(self):
+        regs = fake_regs(self.counters)
+        regs.traffic_gen_done.value = 0
+        with self.assertRaises(TimeoutError):
+            run_traffic(regs, "traffic_gen", timeout=0.01)
+
+    def test_run_traffic_wait_checker(self):
+        # Packets still in flight when the generator is done are waited for on the checker.
+        regs = fake_regs(self.counters)
+        regs.traffic_chk_packets = RampRegister([14, 15, 16])
+        stats = run_traffic(regs, "traffic_gen", "traffic_chk", count=16)
+        self.assertEqual(stats["checker"]["packets"], 16)
+        regs.traffic_chk_packets = RampRegister([15])
+        with self.assertRaises(TimeoutError):
+            run_traffic(regs, "traffic_gen", "traffic_chk", count=16, timeout=0.01)
+        self.assertEqual(regs.traffic_gen_enable.writes[-1], 0)
+
+    def test_bandwidth(self):
+        self.assertAlmostEqual(bandwidth(self.counters, 100e6), 5.12e9)
+        self.assertEqual(bandwidth(dict(self.counters, cycles=0), 100e6), 0.0)
+        report = format_results([{"length": 64, "generator": self.counters}], 100e6)
+        self.assertIn("6.40", report)
+        self.assertIn("5.120", report)
+
+
+if __name__ == "__main__":
+    unittest.main()